@@ -0,0 +1,6 @@
+from apps.rental_announcement.alerts.search_matcher import (
+    MATCHING_FIELDS,
+    SavedSearchMatcher,
+    SearchBucket,
+    saved_search_matcher,
+)
@@ -0,0 +1,298 @@
+import logging
+import threading
+from datetime import timedelta
+from itertools import product
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.utils import timezone
+
+from apps.rental_announcement.models import Announcement, SavedSearch, SearchMatch
+
+logger = logging.getLogger(__name__)
+
+# Bucket key part of a criterion that is not set.
+ANY = ''
+
+# The saved search columns the index is built from.
+SEARCH_COLUMNS = [
+    'pk', 'user_id', 'is_active', 'city', 'federal_land', 'type_of_object',
+    'min_price', 'max_price', 'min_rooms', 'max_rooms',
+]
+# The announcement columns matched against the index, after the primary key and owner.
+ANNOUNCEMENT_COLUMNS = ['pk', 'owner_id', 'address__city', 'address__federal_land', 'type_of_object', 'price', 'rooms']
+# Announcement fields whose change can make the announcement match other saved searches.
+MATCHING_FIELDS = {'price', 'rooms', 'type_of_object', 'is_active', 'address', 'address_id'}
+
+
+def bucket_key(city, federal_land, type_of_object):
+    """
+    Builds the bucket key of the exact criteria of a saved search.
+
+    Args:
+        city (str): The city, or empty for any city.
+        federal_land (str): The federal land, or empty for any.
+        type_of_object (str): The housing type, or empty for any.
+
+    Returns:
+        tuple: The city, the federal land and the housing type, `ANY` where not set.
+    """
+    return city or ANY, federal_land or ANY, type_of_object or ANY
+
+
+def bound(value, default):
+    return default if value is None else float(value)
+
+
+class SearchBucket:
+    """
+    The saved searches sharing city, federal land and housing type.
+
+    The price and room bounds are kept as arrays sorted by the lowest price, which are
+    compiled on the first lookup after a change. A lookup bisects the searches whose lowest
+    price is at most the announcement price and checks the remaining three bounds of that
+    prefix with vectorized comparisons.
+    """
+
+    def __init__(self):
+        self.searches = {}
+        self.columns = None
+
+    def __len__(self):
+        return len(self.searches)
+
+    def put(self, search_id, user_id, min_price, max_price, min_rooms, max_rooms):
+        self.searches[search_id] = (user_id, min_price, max_price, min_rooms, max_rooms)
+        self.columns = None
+
+    def discard(self, search_id):
+        if self.searches.pop(search_id, None) is not None:
+            self.columns = None
+
+    def compile(self):
+        """
+        Builds the sorted bound arrays.
+
+        Returns:
+            dict: The search ids, user ids and the four bounds as arrays, by lowest price.
+        """
+        count = len(self.searches)
+        bounds = np.array(list(self.searches.values()), dtype=np.float64).reshape(count, 5)
+        order = np.argsort(bounds[:, 1], kind='stable')
+        bounds = bounds[order]
+        self.columns = {
+            'id': np.fromiter(self.searches, dtype=np.int64, count=count)[order],
+            'user': np.fromiter((search[0] for search in self.searches.values()), dtype=np.int64, count=count)[order],
+            'min_price': np.ascontiguousarray(bounds[:, 1]),
+            'max_price': np.ascontiguousarray(bounds[:, 2]),
+            'min_rooms': np.ascontiguousarray(bounds[:, 3]),
+            'max_rooms': np.ascontiguousarray(bounds[:, 4]),
+        }
+        return self.columns
+
+    def match(self, price, rooms):
+        """
+        Finds the searches of the bucket whose bounds contain a price and room count.
+
+        Args:
+            price (float): The price of the announcement.
+            rooms (int): The number of rooms of the announcement.
+
+        Returns:
+            tuple: The matching search ids and their user ids as arrays.
+        """
+        columns = self.columns or self.compile()
+        end = int(np.searchsorted(columns['min_price'], price, side='right'))
+        matching = ((columns['max_price'][:end] >= price)
+                    & (columns['min_rooms'][:end] <= rooms)
+                    & (columns['max_rooms'][:end] >= rooms))
+        return columns['id'][:end][matching], columns['user'][:end][matching]
+
+
+class SavedSearchMatcher:
+    """
+    In-memory inverted index of the active saved searches.
+
+    Searches are bucketed by their exact criteria, so an announcement only visits the eight
+    buckets of its own city, federal land and housing type combined with "any", instead of
+    every saved search. Each process keeps its own index and loads the searches changed
+    since its last lookup through the `updated_at` index, going back
+    `ANNOUNCEMENT_FEED_SETTLE_SECONDS` like the delta feed to pick up late commits.
+
+    Methods:
+        - `apply`: Puts saved search rows into the index or removes them.
+        - `sync`: Loads the saved searches changed since the last sync.
+        - `match`: Returns the searches matching one announcement.
+        - `match_announcements`: Stores the matches of announcements in the notification table.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """
+        Empties the index, so the next sync loads all active saved searches.
+        """
+        self.buckets = {}
+        self.bucket_of = {}
+        self.synced_at = None
+
+    def __len__(self):
+        return len(self.bucket_of)
+
+    def discard(self, search_id):
+        key = self.bucket_of.pop(search_id, None)
+        if key is None:
+            return
+        bucket = self.buckets[key]
+        bucket.discard(search_id)
+        if not bucket:
+            del self.buckets[key]
+
+    def apply(self, rows):
+        """
+        Puts saved search rows into the index; inactive ones are removed.
+
+        Applying a row again is harmless, so overlapping syncs may return it twice.
+
+        Args:
+            rows (iterable): `values_list(*SEARCH_COLUMNS)` rows.
+        """
+        for search_id, user_id, is_active, city, land, type_of_object, *bounds in rows:
+            self.discard(search_id)
+            if not is_active:
+                continue
+            min_price, max_price, min_rooms, max_rooms = bounds
+            key = bucket_key(city, land, type_of_object)
+            self.buckets.setdefault(key, SearchBucket()).put(
+                search_id, user_id,
+                bound(min_price, -np.inf), bound(max_price, np.inf),
+                bound(min_rooms, -np.inf), bound(max_rooms, np.inf),
+            )
+            self.bucket_of[search_id] = key
+
+    def sync(self, chunk_size=2000):
+        """
+        Loads the saved searches changed since the last sync, or all active ones at first.
+
+        Args:
+            chunk_size (int, optional): The number of searches read per database round trip.
+        """
+        started = timezone.now()
+        searches = SavedSearch.objects.order_by()
+        if self.synced_at is None:
+            searches = searches.filter(is_active=True)
+        else:
+            searches = searches.filter(updated_at__gte=self.synced_at)
+        self.apply(searches.values_list(*SEARCH_COLUMNS).iterator(chunk_size=chunk_size))
+        self.synced_at = started - timedelta(seconds=settings.ANNOUNCEMENT_FEED_SETTLE_SECONDS)
+
+    def match(self, city, federal_land, type_of_object, price, rooms):
+        """
+        Finds the saved searches matching an announcement.
+
+        Cities are compared exactly, like the `address__city` parameter of the search's
+        `filter_params`, so every match is also listed by the search's results.
+
+        Args:
+            city (str): The city of the announcement address.
+            federal_land (str): The federal land of the announcement address.
+            type_of_object (str): The housing type.
+            price (float): The price.
+            rooms (int): The number of rooms.
+
+        Returns:
+            tuple: The matching search ids and their user ids as arrays.
+        """
+        search_ids, user_ids = [], []
+        for key in product((city, ANY), (federal_land, ANY), (type_of_object, ANY)):
+            bucket = self.buckets.get(key)
+            if bucket is not None:
+                ids, users = bucket.match(price, rooms)
+                search_ids.append(ids)
+                user_ids.append(users)
+        if not search_ids:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        return np.concatenate(search_ids), np.concatenate(user_ids)
+
+    def match_announcements(self, announcement_ids, batch_size=1000):
+        """
+        Matches announcements against all saved searches and stores the matches.
+
+        Only active announcements are matched, and a user's own announcements never match
+        their searches. Matches are inserted `batch_size` rows per query; an announcement
+        already reported to a search is not reported again.
+
+        Args:
+            announcement_ids (iterable): The primary keys of the new or changed announcements.
+            batch_size (int, optional): The number of matches inserted per query.
+
+        Returns:
+            int: The number of matches found, including ones reported before.
+        """
+        rows = list(Announcement.objects.active()
+                    .filter(pk__in=set(announcement_ids))
+                    .values_list(*ANNOUNCEMENT_COLUMNS))
+        if not rows:
+            return 0
+
+        found = 0
+        matches = []
+        with self.lock:
+            self.sync()
+            for announcement_id, owner_id, city, land, type_of_object, price, rooms in rows:
+                search_ids, user_ids = self.match(city, land, type_of_object, float(price), rooms)
+                for search_id, user_id in zip(search_ids.tolist(), user_ids.tolist()):
+                    if user_id != owner_id:
+                        matches.append(SearchMatch(saved_search_id=search_id, user_id=user_id,
+                                                   announcement_id=announcement_id))
+                if len(matches) >= batch_size:
+                    found += self.save_matches(matches, batch_size)
+                    matches = []
+            found += self.save_matches(matches, batch_size)
+        return found
+
+    def save_matches(self, matches, batch_size):
+        """
+        Inserts matches, dropping the ones of searches deleted since they were indexed.
+
+        Args:
+            matches (list): Unsaved `SearchMatch` instances.
+            batch_size (int): The number of matches inserted per query.
+
+        Returns:
+            int: The number of saved matches.
+        """
+        if not matches:
+            return 0
+        try:
+            with transaction.atomic():
+                SearchMatch.objects.bulk_create(matches, batch_size=batch_size, ignore_conflicts=True)
+            return len(matches)
+        except IntegrityError:
+            # Users are deleted with their searches, which the index only learns from here.
+            search_ids = {match.saved_search_id for match in matches}
+            existing = set(SavedSearch.objects.filter(pk__in=search_ids, is_active=True).values_list('pk', flat=True))
+            for search_id in search_ids - existing:
+                self.discard(search_id)
+            matches = [match for match in matches if match.saved_search_id in existing]
+            SearchMatch.objects.bulk_create(matches, batch_size=batch_size, ignore_conflicts=True)
+            return len(matches)
+
+    def match_quietly(self, announcement_ids):
+        """
+        Matches announcements and logs instead of raising database errors, since the change
+        that triggered the matching is already committed.
+
+        Args:
+            announcement_ids (iterable): The primary keys of the new or changed announcements.
+        """
+        try:
+            self.match_announcements(announcement_ids)
+        except DatabaseError:
+            logger.exception('Could not match announcements against saved searches.')
+
+
+saved_search_matcher = SavedSearchMatcher()
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class RentalAnnouncementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.rental_announcement'
+
+    def ready(self):
+        import apps.rental_announcement.signals  # noqa: F401
@@ -0,0 +1,5 @@
+from apps.rental_announcement.archive.announcement_archive import (
+    archive_announcements,
+    cold_announcements,
+    restore_announcements,
+)
@@ -0,0 +1,170 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Case, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.models import (
+    Announcement,
+    ArchivedAnnouncement,
+    ArchivedBooking,
+    ArchivedDuplicateListing,
+    ArchivedRateRule,
+    ArchivedReview,
+    Booking,
+    DuplicateListing,
+    RateRule,
+    Review,
+)
+from apps.rental_announcement.search import get_search_backend
+
+# Hot model, archive model and the column linking the rows to their announcement.
+ARCHIVED_MODELS = [
+    (Announcement, ArchivedAnnouncement, 'pk'),
+    (Review, ArchivedReview, 'announcement_id'),
+    (Booking, ArchivedBooking, 'announcement_id'),
+    (RateRule, ArchivedRateRule, 'announcement_id'),
+]
+
+
+def cold_announcements(older_than_days):
+    """
+    Selects the announcements that can be moved to the archive.
+
+    An announcement is cold when it is inactive or soft-deleted, has not changed for
+    `older_than_days` days and has no booking that is neither canceled nor finished.
+
+    Args:
+        older_than_days (int): The number of days an announcement must have been unchanged.
+
+    Returns:
+        QuerySet: The cold announcements.
+    """
+    now = timezone.now()
+    unfinished_bookings = Booking.objects.filter(
+        announcement=OuterRef('pk'),
+        canceled=Value(False),
+        end_date__gte=now.date(),
+    )
+    return (Announcement.objects
+            .filter(Q(is_active=Value(False)) | Q(deleted=Value(True)))
+            .filter(updated_at__lt=now - timedelta(days=older_than_days))
+            .filter(~Exists(unfinished_bookings)))
+
+
+def duplicate_pairs(ids):
+    """
+    Builds the filter matching the duplicate flags involving the given announcements.
+
+    Args:
+        ids (list): The primary keys of the announcements.
+
+    Returns:
+        Q: The flags in which the announcements are the copy or the original.
+    """
+    return Q(announcement_id__in=ids) | Q(original_id__in=ids)
+
+
+def copy_rows(source_model, target_model, condition):
+    """
+    Copies the selected rows from one model to its counterpart.
+
+    Both models have the same column names. `bulk_create` assigns fresh `auto_now_add`
+    timestamps, so the original creation times are written back in one UPDATE.
+
+    Args:
+        source_model (type): The model the rows are read from.
+        target_model (type): The model the rows are written to.
+        condition (Q): Selects the rows to copy, e.g. those of some announcements.
+
+    Returns:
+        int: The number of copied rows.
+    """
+    columns = [field.attname for field in target_model._meta.concrete_fields]
+    rows = list(source_model._base_manager.filter(condition).values(*columns))
+    if not rows:
+        return 0
+    target_model.objects.bulk_create([target_model(**row) for row in rows])
+
+    auto_now_add = [field.name for field in target_model._meta.concrete_fields if getattr(field, 'auto_now_add', False)]
+    if auto_now_add:
+        target_model.objects.filter(pk__in=[row['id'] for row in rows]).update(**{
+            name: Case(*[When(pk=row['id'], then=Value(row[name])) for row in rows])
+            for name in auto_now_add
+        })
+    return len(rows)
+
+
+def archive_announcements(ids):
+    """
+    Moves announcements with their reviews, bookings and rate rules into the archive tables.
+
+    Runs in one transaction. Only announcements that are still cold when their rows are
+    locked are moved, so a listing reactivated meanwhile stays in the hot table. Duplicate
+    flags involving an archived announcement are archived as well, keeping the moderation
+    decisions.
+
+    Args:
+        ids (list): The primary keys of the announcements to archive.
+
+    Returns:
+        list: The primary keys of the archived announcements.
+    """
+    with transaction.atomic():
+        ids = list(
+            cold_announcements(older_than_days=0)
+            .filter(pk__in=ids)
+            .select_for_update()
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        if not ids:
+            return ids
+        for source_model, target_model, lookup in ARCHIVED_MODELS:
+            copy_rows(source_model, target_model, Q(**{f'{lookup}__in': ids}))
+        copy_rows(DuplicateListing, ArchivedDuplicateListing, duplicate_pairs(ids))
+        # Reviews, bookings, rate rules, duplicate flags and search terms go with the
+        # announcement through the foreign key cascade.
+        Announcement.objects.filter(pk__in=ids).delete()
+    invalidate_search_cache()
+    return ids
+
+
+def restore_announcements(ids):
+    """
+    Moves archived announcements with their reviews, bookings and rate rules back into the hot tables.
+
+    The restored announcements are indexed for search again. They keep their `is_active`
+    and `deleted` flags and their `updated_at` is refreshed. Archived duplicate flags are
+    restored once both of their announcements are current again.
+
+    Args:
+        ids (list): The primary keys of the archived announcements.
+
+    Returns:
+        list: The primary keys of the restored announcements.
+    """
+    with transaction.atomic():
+        ids = list(
+            ArchivedAnnouncement.objects.filter(pk__in=ids)
+            .select_for_update()
+            .order_by('pk')
+            .values_list('pk', flat=True)
+        )
+        if not ids:
+            return ids
+        for hot_model, archive_model, lookup in ARCHIVED_MODELS:
+            copy_rows(archive_model, hot_model, Q(**{f'{lookup}__in': ids}))
+        current = Announcement._base_manager.values('pk')
+        restorable = duplicate_pairs(ids) & Q(announcement_id__in=current, original_id__in=current)
+        copy_rows(ArchivedDuplicateListing, DuplicateListing, restorable)
+        ArchivedDuplicateListing.objects.filter(restorable).delete()
+        ArchivedAnnouncement.objects.filter(pk__in=ids).delete()
+
+        backend = get_search_backend()
+        if backend.maintains_index:
+            for announcement in Announcement.objects.filter(pk__in=ids).only('id', 'title', 'description'):
+                backend.index(announcement)
+    invalidate_search_cache()
+    return ids
@@ -0,0 +1,7 @@
+from apps.rental_announcement.autocomplete.address_autocomplete import (
+    AUTOCOMPLETE_KINDS,
+    CITY,
+    STREET,
+    address_autocomplete,
+    autocomplete_key,
+)
@@ -0,0 +1,204 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+import numpy as np
+from django.conf import settings
+from django.db import connection
+from django.db.models import Count, Q
+
+from apps.rental_announcement.cache.search_cache import get_cache, get_generation
+from apps.rental_announcement.models import Address
+from apps.rental_announcement.search import fold
+
+CITY = 'city'
+STREET = 'street'
+AUTOCOMPLETE_KINDS = [CITY, STREET]
+
+# Separates the city from the street in the keys of the streets-per-city index.
+KEY_SEPARATOR = '\x1f'
+# Sorts after every character a folded key can continue with.
+KEY_END = '\U0010ffff'
+
+logger = logging.getLogger(__name__)
+
+
+def autocomplete_key(*names):
+    """
+    Builds the folded key of a city or street name.
+
+    Args:
+        *names (str): The names the key is made of, e.g. a city and a street.
+
+    Returns:
+        str: The names folded like search terms, with whitespace collapsed, e.g.
+            "Münchner  Straße" becomes "muenchner strasse".
+    """
+    return KEY_SEPARATOR.join(' '.join(fold(name).split()) for name in names)
+
+
+class PrefixIndex:
+    """
+    Sorted array of folded keys with the display name and listing count of each key.
+
+    Names folding to the same key, such as "München" and "Muenchen", share one entry that
+    is displayed with the spelling having the most listings. A prefix is looked up with two
+    binary searches, and the best ranked entries of the matching range are picked with
+    `np.argpartition`, so a lookup costs O(log n + m) for m matching keys.
+    """
+
+    def __init__(self, listings):
+        """
+        Args:
+            listings (dict): The number of active listings by `(key, name)`.
+        """
+        names = defaultdict(Counter)
+        for (key, name), count in listings.items():
+            names[key][name] += count
+
+        self.keys = sorted(names)
+        self.names = [max(names[key].items(), key=lambda item: (item[1], item[0]))[0] for key in self.keys]
+        self.counts = np.fromiter((names[key].total() for key in self.keys), dtype=np.int64, count=len(self.keys))
+
+    def __len__(self):
+        return len(self.keys)
+
+    def search(self, prefix, limit):
+        """
+        Finds the entries whose key starts with the prefix.
+
+        Args:
+            prefix (str): A folded key prefix.
+            limit (int): The maximum number of entries.
+
+        Returns:
+            list: `(name, listings)` pairs, the most listed first and ties in key order.
+        """
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + KEY_END, start)
+        positions = np.arange(start, end)
+        if len(positions) > limit:
+            positions = start + np.argpartition(-self.counts[start:end], limit - 1)[:limit]
+        ranked = sorted(positions.tolist(), key=lambda position: (-self.counts[position], position))
+        return [(self.names[position], int(self.counts[position])) for position in ranked]
+
+
+class AddressAutocomplete:
+    """
+    In-memory prefix indexes of the city and street names of all addresses.
+
+    The indexes are built from one grouped query on the first lookup. They are outdated
+    after any change to announcements or addresses, which is detected through the search
+    cache generation, and after `ADDRESS_AUTOCOMPLETE_MAX_AGE_SECONDS` in any case, which
+    covers changes that do not reach the generation. Outdated indexes are rebuilt by a
+    daemon thread at most every `ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS`, and lookups are
+    served from the previous indexes until it has finished. With the setting at 0, no
+    thread is started and outdated indexes are rebuilt within the lookup.
+
+    Methods:
+        - `build`: Reads the listing counts and builds the indexes.
+        - `rebuild`: Builds the indexes in the rebuilder thread and replaces the served ones.
+        - `get_indexes`: Returns the indexes, starting a rebuild when they are outdated.
+        - `suggest`: Returns the best ranked names starting with a prefix.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.indexes = None
+        self.generation = None
+        self.built_at = 0
+        self.rebuilder = None
+
+    def build(self):
+        """
+        Reads the number of active listings per city and street and builds the indexes.
+
+        Returns:
+            dict: The `PrefixIndex` of cities, of streets and of streets per city.
+        """
+        rows = (Address.objects.order_by()
+                .values_list('city', 'street')
+                .annotate(listings=Count('announcements', filter=Q(announcements__is_active=True))))
+        cities, streets, city_streets = Counter(), Counter(), Counter()
+        for city, street, listings in rows:
+            city_key = autocomplete_key(city)
+            cities[city_key, city] += listings
+            streets[autocomplete_key(street), street] += listings
+            city_streets[f'{city_key}{KEY_SEPARATOR}{autocomplete_key(street)}', street] += listings
+        return {CITY: PrefixIndex(cities), STREET: PrefixIndex(streets), (CITY, STREET): PrefixIndex(city_streets)}
+
+    def rebuild(self, generation):
+        """
+        Builds the indexes in the rebuilder thread and replaces the served ones.
+
+        Errors are logged, and the previous indexes stay in use until the next rebuild.
+
+        Args:
+            generation (str): The search cache generation read before the build, so that a
+                change made during the build outdates the new indexes again.
+        """
+        try:
+            indexes = self.build()
+        except Exception:
+            logger.exception('Could not rebuild the address autocomplete indexes.')
+            indexes = None
+        finally:
+            connection.close()
+        with self.lock:
+            if indexes is not None:
+                self.indexes, self.generation, self.built_at = indexes, generation, time.monotonic()
+            self.rebuilder = None
+
+    def is_outdated(self, generation):
+        age = time.monotonic() - self.built_at
+        if age < settings.ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS:
+            return False
+        return generation != self.generation or age >= settings.ADDRESS_AUTOCOMPLETE_MAX_AGE_SECONDS
+
+    def get_indexes(self):
+        """
+        Returns the indexes, building them on the first lookup and starting a rebuild when
+        they are outdated.
+
+        Returns:
+            dict: The indexes built by `build`, possibly outdated while a rebuild runs.
+        """
+        generation = get_generation(get_cache())
+        with self.lock:
+            if self.indexes is None or (
+                not settings.ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS and self.is_outdated(generation)
+            ):
+                self.indexes, self.generation, self.built_at = self.build(), generation, time.monotonic()
+            elif self.rebuilder is None and self.is_outdated(generation):
+                self.rebuilder = threading.Thread(
+                    target=self.rebuild,
+                    args=(generation,),
+                    name='address-autocomplete-rebuilder',
+                    daemon=True,
+                )
+                self.rebuilder.start()
+            return self.indexes
+
+    def suggest(self, kind, prefix, city=None, limit=10):
+        """
+        Returns the city or street names starting with a prefix, ranked by listing count.
+
+        Args:
+            kind (str): `CITY` or `STREET`.
+            prefix (str): The typed prefix, matched case-insensitively and with umlauts
+                spelled out.
+            city (str, optional): Restricts street names to this city.
+            limit (int, optional): The maximum number of names.
+
+        Returns:
+            list: `(name, listings)` pairs.
+        """
+        indexes = self.get_indexes()
+        if kind == STREET and city:
+            return indexes[CITY, STREET].search(autocomplete_key(city, prefix), limit)
+        return indexes[kind].search(autocomplete_key(prefix), limit)
+
+
+address_autocomplete = AddressAutocomplete()
@@ -0,0 +1 @@
+from apps.rental_announcement.bulk.announcement_upsert import resolve_addresses, upsert_announcements
@@ -0,0 +1,225 @@
+from django.db import DatabaseError, connection, transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from apps.rental_announcement.alerts import saved_search_matcher
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.duplicates import DUPLICATE_FIELDS, check_quietly
+from apps.rental_announcement.models import Address, Announcement, PostalCode
+from apps.rental_announcement.rollups import apply_price_changes, price_contribution
+from apps.rental_announcement.search import get_search_backend
+from apps.rental_announcement.similarity import similar_listings
+
+# The columns of the `Address` unique constraint, in the order of an address key.
+ADDRESS_KEY = ['federal_land', 'city', 'street', 'house_number', 'postal_code']
+
+CREATED = 'created'
+UPDATED = 'updated'
+NOT_FOUND = 'not_found'
+
+
+def address_key(data):
+    """
+    Returns the unique key of an address.
+
+    Args:
+        data (dict): The address fields.
+
+    Returns:
+        tuple: The values of the `ADDRESS_KEY` columns.
+    """
+    return tuple(data[name] for name in ADDRESS_KEY)
+
+
+def folded_key(key):
+    """
+    Returns an address key in the case-insensitive form the MySQL collation compares.
+
+    Args:
+        key (tuple): An address key.
+
+    Returns:
+        tuple: The casefolded key.
+    """
+    return tuple(value.casefold() for value in key)
+
+
+def lookup_addresses(keys):
+    """
+    Finds the stored addresses with the given keys in one query.
+
+    The query selects the candidates matching each key column against the set of its
+    values, which is served by the unique index, and the exact keys are matched here.
+    Keys without an exact match fall back to a case-insensitive match, as the database
+    collation may already treat them as equal.
+
+    Args:
+        keys (set): Address keys.
+
+    Returns:
+        dict: The found addresses by key.
+    """
+    columns = {f'{name}__in': set(values) for name, values in zip(ADDRESS_KEY, zip(*keys))}
+    candidates = {address_key(vars(address)): address
+                  for address in Address.objects.filter(**columns).only('id', *ADDRESS_KEY)}
+    found = {key: candidates[key] for key in keys if key in candidates}
+
+    folded = {folded_key(key): address for key, address in candidates.items()}
+    for key in keys - found.keys():
+        if folded_key(key) in folded:
+            found[key] = folded[folded_key(key)]
+    return found
+
+
+def resolve_addresses(addresses, batch_size=500):
+    """
+    Maps address data to stored addresses, creating the missing ones in one `bulk_create`.
+
+    Missing addresses get the coordinates and tile key of their postal code centroid, as
+    `Address.save` would assign. Inserts that collide with a concurrently created address are ignored,
+    and the created addresses are read back with a second lookup, since not every backend
+    returns the primary keys of a bulk insert.
+
+    Args:
+        addresses (iterable): Address field dicts.
+        batch_size (int, optional): The number of addresses inserted per query.
+
+    Returns:
+        dict: The stored `Address` for every address key.
+    """
+    keys = {address_key(address) for address in addresses}
+    if not keys:
+        return {}
+    resolved = lookup_addresses(keys)
+    missing = sorted(keys - resolved.keys())
+    if missing:
+        centroids = {
+            postal_code: centroid
+            for postal_code, *centroid in PostalCode.objects
+            .filter(postal_code__in={key[-1] for key in missing})
+            .values_list('postal_code', 'latitude', 'longitude', 'tile_key')
+        }
+        new_addresses = []
+        for key in missing:
+            latitude, longitude, tile = centroids.get(key[-1], (None, None, None))
+            new_addresses.append(Address(
+                **dict(zip(ADDRESS_KEY, key)), latitude=latitude, longitude=longitude, tile_key=tile,
+            ))
+        Address.objects.bulk_create(new_addresses, batch_size=batch_size, ignore_conflicts=True)
+        resolved.update(lookup_addresses(set(missing)))
+    return resolved
+
+
+def insert_announcements(owner, announcements, batch_size):
+    """
+    Inserts new announcements of one owner in batches and assigns their primary keys.
+
+    Backends that cannot return the keys of a bulk insert, such as MySQL, give the rows
+    of one INSERT increasing ids, so the keys are read back in id order among the owner's
+    rows newer than before the insert. The transaction snapshot hides rows of concurrent
+    transactions, and the read back rows are checked against the inserted ones.
+
+    Args:
+        owner (User): The owner of the announcements.
+        announcements (list): Unsaved announcements.
+        batch_size (int): The number of announcements inserted per query.
+
+    Raises:
+        DatabaseError: If the read back rows do not match the inserted ones.
+    """
+    if connection.features.can_return_rows_from_bulk_insert:
+        Announcement.objects.bulk_create(announcements, batch_size=batch_size)
+        return
+
+    last_id = Announcement.objects.filter(owner=owner).aggregate(last_id=Max('id'))['last_id'] or 0
+    Announcement.objects.bulk_create(announcements, batch_size=batch_size)
+    rows = list(Announcement.objects.filter(owner=owner, pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', 'title', 'address_id'))
+    if [row[1:] for row in rows] != [(announcement.title, announcement.address_id) for announcement in announcements]:
+        raise DatabaseError('Could not read back the ids of the inserted announcements.')
+    for announcement, row in zip(announcements, rows):
+        announcement.pk = row[0]
+
+
+def upsert_announcements(owner, items, batch_size=500):
+    """
+    Creates and updates announcements of one owner in a single transaction.
+
+    Items with an `id` update that announcement of the owner with the given fields, the
+    others are created. All addresses are resolved together, announcements are written
+    with batched `bulk_create` and `bulk_update`, and the effects of the skipped model
+    signals (search index, price statistics, similar listings, saved search matches,
+    duplicate checks and search cache) are applied in bulk.
+
+    Args:
+        owner (User): The lessor owning the announcements.
+        items (list): Validated announcement field dicts with a nested `address` dict,
+            which is optional for updates.
+        batch_size (int, optional): The number of rows written per query.
+
+    Returns:
+        list: For every item, a pair of its status (`CREATED`, `UPDATED` or `NOT_FOUND`)
+            and the saved announcement, or None if it was not found.
+    """
+    results = []
+    if not items:
+        return results
+    with transaction.atomic():
+        existing = (Announcement.objects.filter(owner=owner)
+                    .select_for_update(of=('self',))
+                    .select_related('address')
+                    .in_bulk([item['id'] for item in items if 'id' in item]))
+        addresses = resolve_addresses(
+            [item['address'] for item in items if 'address' in item and item.get('id', None) in (None, *existing)],
+            batch_size=batch_size,
+        )
+
+        created, updated, removed = [], [], []
+        update_fields = {'updated_at'}
+        now = timezone.now()
+        for item in items:
+            data = dict(item)
+            announcement_id = data.pop('id', None)
+            address = data.pop('address', None)
+            if announcement_id is None:
+                announcement = Announcement(owner=owner, address=addresses[address_key(address)], **data)
+                created.append(announcement)
+                results.append((CREATED, announcement))
+                continue
+
+            announcement = existing.get(announcement_id)
+            if announcement is None:
+                results.append((NOT_FOUND, None))
+                continue
+            removed.append(price_contribution(announcement))
+            for name, value in data.items():
+                setattr(announcement, name, value)
+            if address is not None:
+                announcement.address = addresses[address_key(address)]
+                update_fields.add('address')
+            announcement.updated_at = now
+            update_fields.update(data)
+            updated.append(announcement)
+            results.append((UPDATED, announcement))
+
+        insert_announcements(owner, created, batch_size)
+        if updated:
+            Announcement.objects.bulk_update(updated, sorted(update_fields), batch_size=batch_size)
+
+        apply_price_changes(
+            removed=[contribution for contribution in removed if contribution],
+            added=[contribution for contribution in map(price_contribution, created + updated) if contribution],
+        )
+        backend = get_search_backend()
+        if backend.maintains_index:
+            backend.index_many(created + updated, batch_size=batch_size)
+        changed_ids = [announcement.pk for announcement in created + updated]
+        transaction.on_commit(lambda: similar_listings.update_quietly(changed_ids))
+        transaction.on_commit(lambda: saved_search_matcher.match_quietly(changed_ids))
+        signed = created + updated if DUPLICATE_FIELDS & update_fields else created
+        signed_ids = [announcement.pk for announcement in signed]
+        transaction.on_commit(lambda: check_quietly(signed_ids))
+
+    transaction.on_commit(invalidate_search_cache)
+    return results
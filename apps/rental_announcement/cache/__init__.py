@@ -0,0 +1,6 @@
+from apps.rental_announcement.cache.search_cache import (
+    get_cached_search,
+    set_cached_search,
+    invalidate_search_cache,
+    get_search_cache_stats,
+)
@@ -0,0 +1,205 @@
+import hashlib
+import time
+from decimal import Decimal, InvalidOperation
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import caches
+
+from apps.rental_announcement.filters import AnnouncementFilter
+from apps.rental_announcement.filters.stay_price_filter import STAY_PARAMS
+
+KEY_PREFIX = 'announcement_search'
+GENERATION_KEY = f'{KEY_PREFIX}:generation'
+HITS_KEY = f'{KEY_PREFIX}:hits'
+MISSES_KEY = f'{KEY_PREFIX}:misses'
+
+DECIMAL_PARAMS = {
+    'price__gte', 'price__lte', 'rating__gte', 'lat', 'lon', 'radius_km',
+    'address__latitude__gte', 'address__latitude__lte', 'address__longitude__gte', 'address__longitude__lte',
+    'total_price__gte', 'total_price__lte',
+}
+INTEGER_PARAMS = {'rooms__gte', 'rooms__lte', 'page_size'}
+RESULT_PARAMS = {'search', 'ordering', 'cursor', 'page_size', 'fields', 'expand'}
+LIST_PARAMS = {'fields', 'expand'}
+# Amenity values are matched ignoring case.
+AMENITY_PARAMS = {'amenities_all', 'amenities_any'}
+
+
+def get_cache():
+    return caches[getattr(settings, 'ANNOUNCEMENT_SEARCH_CACHE_ALIAS', 'default')]
+
+
+def get_timeout():
+    return getattr(settings, 'ANNOUNCEMENT_SEARCH_CACHE_TIMEOUT', 60)
+
+
+def cacheable_params():
+    """
+    Returns the query parameters that influence the announcement search result.
+
+    Returns:
+        set: The filter parameters of `AnnouncementFilter`, the priced stay, search, ordering
+            and pagination.
+    """
+    return set(AnnouncementFilter.base_filters) | set(STAY_PARAMS) | RESULT_PARAMS
+
+
+def canonical_value(name, value):
+    """
+    Brings a query parameter value into a canonical form, so equivalent requests share a key.
+
+    Args:
+        name (str): The parameter name.
+        value (str): The raw parameter value.
+
+    Returns:
+        str: The canonical value, e.g. "100.00" becomes "100" for price filters. Search terms
+            are only lowercased with their whitespace collapsed, since the search backends
+            differ in how they fold and order words.
+    """
+    value = value.strip()
+    if name in DECIMAL_PARAMS:
+        try:
+            return format(Decimal(value).normalize(), 'f')
+        except InvalidOperation:
+            return value
+    if name in INTEGER_PARAMS:
+        try:
+            return str(int(value))
+        except ValueError:
+            return value
+    if name == 'search':
+        # Only whitespace and case: word order, stop words and spelling matter to some backends.
+        return ' '.join(value.lower().split())
+    if name in AMENITY_PARAMS:
+        return ','.join(sorted({item.strip().casefold() for item in value.split(',') if item.strip()}))
+    if name in LIST_PARAMS:
+        return ','.join(sorted({item.strip() for item in value.split(',') if item.strip()}))
+    return value
+
+
+def normalize_query(query_params):
+    """
+    Builds the normalized query string of a search request.
+
+    Unknown parameters and empty values are dropped, the remaining parameters are
+    sorted by name and their values canonicalized.
+
+    Args:
+        query_params (QueryDict): The query parameters of the request.
+
+    Returns:
+        str: The normalized query string.
+    """
+    known = cacheable_params()
+    items = []
+    for name in sorted(query_params):
+        if name not in known:
+            continue
+        values = sorted(canonical_value(name, value) for value in query_params.getlist(name))
+        values = [value for value in values if value]
+        if values:
+            items.append((name, values))
+    return urlencode(items, doseq=True)
+
+
+def new_generation():
+    # Seeded from the clock, so a counter lost to eviction never reuses an older generation.
+    return int(time.time() * 1000)
+
+
+def get_generation(cache):
+    generation = cache.get(GENERATION_KEY)
+    if generation is None:
+        cache.add(GENERATION_KEY, new_generation(), timeout=None)
+        generation = cache.get(GENERATION_KEY)
+    return generation
+
+
+def make_key(request, cache):
+    """
+    Builds the cache key of a search request under the current generation.
+
+    The request path is part of the key, so the list and the facets of the same
+    query are cached separately.
+
+    Args:
+        request (Request): The HTTP request object.
+        cache (BaseCache): The cache holding the entries.
+
+    Returns:
+        str: The cache key.
+    """
+    normalized = f'{request.get_host()}{request.path}?{normalize_query(request.query_params)}'
+    digest = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+    return f'{KEY_PREFIX}:{get_generation(cache)}:{digest}'
+
+
+def increment(cache, key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def get_cached_search(request):
+    """
+    Returns the cached response data of a search request and records a hit or a miss.
+
+    Args:
+        request (Request): The HTTP request object.
+
+    Returns:
+        The cached response data, or None on a miss.
+    """
+    cache = get_cache()
+    data = cache.get(make_key(request, cache))
+    increment(cache, MISSES_KEY if data is None else HITS_KEY)
+    return data
+
+
+def set_cached_search(request, data):
+    """
+    Stores the response data of a search request.
+
+    Args:
+        request (Request): The HTTP request object.
+        data: The serialized response data.
+    """
+    cache = get_cache()
+    cache.set(make_key(request, cache), data, timeout=get_timeout())
+
+
+def invalidate_search_cache():
+    """
+    Invalidates every cached search response by moving to a new generation.
+
+    Entries of older generations are never read again and expire with their timeout.
+    """
+    cache = get_cache()
+    try:
+        cache.incr(GENERATION_KEY)
+    except ValueError:
+        cache.add(GENERATION_KEY, new_generation(), timeout=None)
+
+
+def get_search_cache_stats():
+    """
+    Returns the hit and miss counters of the search cache.
+
+    Returns:
+        dict: The `hits`, `misses`, `hit_ratio`, current `generation` and `timeout`.
+    """
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': round(hits / total, 4) if total else 0,
+        'generation': get_generation(cache),
+        'timeout': get_timeout(),
+    }
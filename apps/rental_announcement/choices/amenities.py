@@ -0,0 +1,87 @@
+from enum import Enum
+
+class Amenities(Enum):
+    """
+    Enumeration for the amenities of an announcement.
+
+    Announcements store their amenities as an integer bitmask in which every amenity is the
+    bit of its position in this enumeration. New amenities must be appended: reordering or
+    removing a member changes the meaning of the stored masks.
+    """
+    BALCONY = "Balcony"
+    WIFI = "Wi-Fi"
+    PETS_ALLOWED = "Pets allowed"
+    PARKING = "Parking"
+    WASHING_MACHINE = "Washing machine"
+    DISHWASHER = "Dishwasher"
+    ELEVATOR = "Elevator"
+    FURNISHED = "Furnished"
+    GARDEN = "Garden"
+    AIR_CONDITIONING = "Air conditioning"
+    WHEELCHAIR_ACCESSIBLE = "Wheelchair accessible"
+
+    @property
+    def bit(self):
+        """
+        Returns the bit of the amenity in an amenities mask.
+
+        Returns:
+            int: A power of two.
+        """
+        return 1 << type(self)._member_names_.index(self.name)
+
+    @classmethod
+    def choices(cls):
+        """
+        Provides choices for the amenities enumeration.
+
+        Returns:
+            list: A list of tuples where each tuple contains the value and the value of the amenity.
+        """
+        return [(attr.value, attr.value) for attr in cls]
+
+    @classmethod
+    def lookup(cls, name):
+        """
+        Finds an amenity by its value, ignoring case.
+
+        Args:
+            name (str): The amenity value, e.g. "wi-fi".
+
+        Returns:
+            Amenities: The amenity, or None if no amenity has that value.
+        """
+        name = name.strip().casefold()
+        return next((attr for attr in cls if attr.value.casefold() == name), None)
+
+    @classmethod
+    def to_mask(cls, values):
+        """
+        Encodes amenities as a bitmask.
+
+        Args:
+            values (iterable): Amenity values.
+
+        Returns:
+            int: The mask with the bit of every amenity set.
+
+        Raises:
+            ValueError: If a value is not an amenity.
+        """
+        mask = 0
+        for value in values:
+            mask |= cls(value).bit
+        return mask
+
+    @classmethod
+    def from_mask(cls, mask):
+        """
+        Decodes a bitmask into amenities.
+
+        Args:
+            mask (int): An amenities mask.
+
+        Returns:
+            list: The values of the amenities whose bit is set, in enumeration order.
+        """
+        return [attr.value for attr in cls if mask & attr.bit]
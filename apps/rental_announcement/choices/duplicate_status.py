@@ -0,0 +1,19 @@
+from enum import Enum
+
+class DuplicateStatus(Enum):
+    """
+    Enumeration for the moderation statuses of a suspected duplicate listing.
+    """
+    PENDING = 'Pending'
+    CONFIRMED = 'Confirmed'
+    DISMISSED = 'Dismissed'
+
+    @classmethod
+    def choices(cls):
+        """
+        Provides choices for the duplicate status enumeration.
+
+        Returns:
+            list: A list of tuples where each tuple contains the value and the value of the duplicate status.
+        """
+        return [(key.value, key.value) for key in cls]
@@ -0,0 +1,20 @@
+from enum import Enum
+
+class RateRuleKinds(Enum):
+    """
+    Enumeration for the kinds of announcement rate rules.
+    """
+    SEASON = 'Season'
+    WEEKEND = 'Weekend'
+    MIN_NIGHTS = 'Minimum nights'
+    LENGTH_OF_STAY = 'Length of stay'
+
+    @classmethod
+    def choices(cls):
+        """
+        Provides choices for the rate rule kinds enumeration.
+
+        Returns:
+            list: A list of tuples where each tuple contains the value and the value of the rate rule kind.
+        """
+        return [(key.value, key.value) for key in cls]
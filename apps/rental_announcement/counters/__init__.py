@@ -0,0 +1,6 @@
+from apps.rental_announcement.counters.view_counter import (
+    TRENDING_EPOCH,
+    ViewCounter,
+    flush_views,
+    view_counter,
+)
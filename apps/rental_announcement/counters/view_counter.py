@@ -0,0 +1,182 @@
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone as dt_timezone
+
+import numpy as np
+from django.conf import settings
+from django.db import DatabaseError, close_old_connections, transaction
+from django.db.models import Case, F, FloatField, PositiveIntegerField, Value, When
+from django.utils import timezone
+
+from apps.rental_announcement.models import Announcement
+
+logger = logging.getLogger(__name__)
+
+# Trending scores are log2 view weights relative to this moment, so stored scores never decay.
+TRENDING_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+def trending_boost(now):
+    """
+    Returns the log2 weight of one view at the given moment.
+
+    A view counts twice as much as a view one half-life earlier. Storing the log2 of the
+    view weights relative to `TRENDING_EPOCH` keeps the order of the decayed scores at any
+    later moment without rewriting idle rows.
+
+    Args:
+        now (datetime): The moment of the views.
+
+    Returns:
+        float: The number of half-lives between `TRENDING_EPOCH` and `now`.
+    """
+    half_life = settings.ANNOUNCEMENT_TRENDING_HALF_LIFE_HOURS * 3600
+    return (now - TRENDING_EPOCH).total_seconds() / half_life
+
+
+def flush_views(counts, batch_size=500, now=None):
+    """
+    Adds buffered view counts to the announcements.
+
+    Each batch locks its rows in primary key order, computes the new trending scores with
+    NumPy and writes counts and scores in a single `UPDATE ... CASE` statement. The update
+    leaves `updated_at` and the search index untouched. Views of announcements that were
+    deleted or archived in the meantime are dropped.
+
+    Args:
+        counts (dict): The number of views by announcement primary key.
+        batch_size (int, optional): The number of announcements updated per query.
+        now (datetime, optional): The moment of the views. Defaults to the current time.
+
+    Returns:
+        int: The number of updated announcements.
+    """
+    boost = trending_boost(now or timezone.now())
+    ids = sorted(counts)
+    updated = 0
+    for start in range(0, len(ids), batch_size):
+        with transaction.atomic():
+            scores = dict(Announcement.objects.select_for_update()
+                          .filter(pk__in=ids[start:start + batch_size])
+                          .order_by('pk')
+                          .values_list('pk', 'trending_score'))
+            if not scores:
+                continue
+            views = np.fromiter((counts[pk] for pk in scores), dtype=float, count=len(scores))
+            old_scores = np.fromiter(scores.values(), dtype=float, count=len(scores))
+            new_scores = np.logaddexp2(old_scores, np.log2(views) + boost)
+
+            Announcement.objects.filter(pk__in=scores).update(
+                view_count=F('view_count') + Case(
+                    *(When(pk=pk, then=Value(counts[pk])) for pk in scores),
+                    output_field=PositiveIntegerField(),
+                ),
+                trending_score=Case(
+                    *(When(pk=pk, then=Value(float(score))) for pk, score in zip(scores, new_scores)),
+                    output_field=FloatField(),
+                ),
+            )
+        updated += len(scores)
+    return updated
+
+
+class ViewCounter:
+    """
+    Write-behind buffer of announcement detail views.
+
+    Views are counted in process memory and written with `flush_views`. A daemon thread,
+    started with the first recorded view, flushes every `ANNOUNCEMENT_VIEW_FLUSH_SECONDS`
+    and the remaining views are flushed when the process exits. With the setting at 0, no
+    thread is started and views are only written by explicit calls to `flush`.
+
+    Methods:
+        - `record`: Counts one view of an announcement.
+        - `take`: Empties the buffer and returns its counts.
+        - `flush`: Writes the buffered views to the database.
+        - `run`: Flushes periodically in the flusher thread.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.flusher = None
+
+    def record(self, announcement_id):
+        """
+        Counts one view of an announcement.
+
+        Args:
+            announcement_id (int): The primary key of the viewed announcement.
+        """
+        with self.lock:
+            self.pending[announcement_id] += 1
+            if self.flusher is None and settings.ANNOUNCEMENT_VIEW_FLUSH_SECONDS:
+                self.flusher = threading.Thread(target=self.run, name='announcement-view-flusher', daemon=True)
+                self.flusher.start()
+
+    def take(self):
+        """
+        Empties the buffer.
+
+        Returns:
+            Counter: The buffered number of views by announcement primary key.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+        return pending
+
+    def flush(self, batch_size=500):
+        """
+        Writes the buffered views to the database.
+
+        If the write fails, the views are put back into the buffer for the next flush.
+
+        Args:
+            batch_size (int, optional): The number of announcements updated per query.
+
+        Returns:
+            int: The number of updated announcements.
+
+        Raises:
+            DatabaseError: If the views could not be written.
+        """
+        pending = self.take()
+        if not pending:
+            return 0
+        try:
+            return flush_views(pending, batch_size=batch_size)
+        except DatabaseError:
+            with self.lock:
+                self.pending.update(pending)
+            raise
+
+    def flush_quietly(self):
+        """
+        Flushes the buffered views and logs instead of raising database errors.
+        """
+        try:
+            self.flush()
+        except DatabaseError:
+            logger.exception('Could not flush announcement views.')
+        finally:
+            close_old_connections()
+
+    def run(self):
+        while True:
+            time.sleep(settings.ANNOUNCEMENT_VIEW_FLUSH_SECONDS or 1)
+            close_old_connections()
+            self.flush_quietly()
+
+    def flush_at_exit(self):
+        """
+        Flushes the views buffered since the last run of the flusher thread, if it was started.
+        """
+        if self.flusher is not None:
+            self.flush_quietly()
+
+
+view_counter = ViewCounter()
+atexit.register(view_counter.flush_at_exit)
@@ -0,0 +1,14 @@
+from apps.rental_announcement.duplicates.minhash import (
+    DUPLICATE_THRESHOLD,
+    band_buckets,
+    candidate_pairs,
+    find_duplicates,
+    listing_text,
+    signature_matrix,
+)
+from apps.rental_announcement.duplicates.detector import (
+    DUPLICATE_FIELDS,
+    check_announcements,
+    check_quietly,
+    detect_duplicates,
+)
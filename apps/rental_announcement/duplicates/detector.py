@@ -0,0 +1,221 @@
+import logging
+from collections import defaultdict
+
+import numpy as np
+from django.db import DatabaseError, transaction
+from django.db.models import Q
+
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.duplicates.minhash import (
+    DUPLICATE_THRESHOLD,
+    MAX_BUCKET_SIZE,
+    band_buckets,
+    find_duplicates,
+    listing_text,
+    signature_matrix,
+)
+from apps.rental_announcement.models import Announcement, DuplicateListing, ListingSignature, SignatureBand
+
+logger = logging.getLogger(__name__)
+
+# The announcement columns a signature is computed from, after the primary key.
+SIGNATURE_COLUMNS = ['pk', 'title', 'description']
+# Announcement fields whose change changes the signature.
+DUPLICATE_FIELDS = {'title', 'description'}
+# Number of buckets looked up per query.
+BUCKET_LOOKUP_SIZE = 500
+
+
+def compute_signatures(rows):
+    """
+    Computes the signatures of announcement rows.
+
+    Args:
+        rows (list): `values_list(*SIGNATURE_COLUMNS)` rows.
+
+    Returns:
+        tuple: An int64 array of primary keys and their `signature_matrix`.
+    """
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=len(rows))
+    return ids, signature_matrix([listing_text(title, description) for _, title, description in rows])
+
+
+def load_signatures(announcement_ids):
+    """
+    Reads stored signatures.
+
+    Args:
+        announcement_ids (iterable): The primary keys of the announcements.
+
+    Returns:
+        dict: The uint32 signature array by primary key, for the announcements that have one.
+    """
+    rows = ListingSignature.objects.filter(pk__in=list(announcement_ids)).values_list('pk', 'signature')
+    return {pk: np.frombuffer(bytes(signature), dtype='<u4') for pk, signature in rows}
+
+
+def store_signatures(ids, signatures, buckets, batch_size):
+    """
+    Inserts the signatures and band buckets of announcements without stored ones.
+
+    Args:
+        ids (ndarray): The primary keys of the announcements.
+        signatures (ndarray): Their signatures.
+        buckets (ndarray): Their `band_buckets`.
+        batch_size (int): The number of rows inserted per query.
+    """
+    pks = ids.tolist()
+    ListingSignature.objects.bulk_create(
+        (ListingSignature(announcement_id=pk, signature=signature.astype('<u4').tobytes())
+         for pk, signature in zip(pks, signatures)),
+        batch_size=batch_size,
+    )
+    SignatureBand.objects.bulk_create(
+        (SignatureBand(announcement_id=pk, bucket=bucket)
+         for pk, row in zip(pks, buckets.tolist()) for bucket in row),
+        batch_size=batch_size,
+    )
+
+
+def record_duplicates(pairs, scope, batch_size):
+    """
+    Brings the pending duplicate flags within a scope in line with the detected pairs.
+
+    New pairs are flagged as pending, with the newer announcement as the copy. Pending
+    flags within the scope that were not detected again are removed, since the texts
+    changed; confirmed and dismissed flags are moderation decisions and stay.
+
+    Args:
+        pairs (dict): The estimated similarity by `(original_id, announcement_id)` pair,
+            the original being the announcement with the smaller primary key.
+        scope (Q): The flags that were checked, e.g. those involving the checked announcements.
+        batch_size (int): The number of flags inserted per query.
+
+    Returns:
+        int: The number of pairs detected.
+    """
+    pending = DuplicateListing.objects.filter(scope, status=DuplicateStatus.PENDING.value)
+    stale = [pk for pk, original_id, announcement_id in pending.values_list('pk', 'original_id', 'announcement_id')
+             if (original_id, announcement_id) not in pairs]
+    if stale:
+        DuplicateListing.objects.filter(pk__in=stale).delete()
+    DuplicateListing.objects.bulk_create(
+        (DuplicateListing(original_id=original_id, announcement_id=announcement_id, similarity=similarity)
+         for (original_id, announcement_id), similarity in pairs.items()),
+        batch_size=batch_size,
+        ignore_conflicts=True,
+    )
+    if stale or pairs:
+        transaction.on_commit(invalidate_search_cache)
+    return len(pairs)
+
+
+def check_announcements(announcement_ids, batch_size=1000):
+    """
+    Signs new or changed announcements and flags their near-duplicates.
+
+    The band buckets of the new signatures are looked up in the stored buckets, so only
+    announcements sharing a bucket are compared, with their stored signatures.
+
+    Args:
+        announcement_ids (iterable): The primary keys of the announcements.
+        batch_size (int, optional): The number of rows written per query.
+
+    Returns:
+        int: The number of duplicate pairs involving the announcements.
+    """
+    rows = list(Announcement.objects.filter(pk__in=list(announcement_ids)).order_by()
+                .values_list(*SIGNATURE_COLUMNS))
+    if not rows:
+        return 0
+    ids, signatures = compute_signatures(rows)
+    buckets = band_buckets(signatures)
+
+    pks = ids.tolist()
+    with transaction.atomic():
+        ListingSignature.objects.filter(pk__in=pks).delete()
+        SignatureBand.objects.filter(announcement_id__in=pks).delete()
+        store_signatures(ids, signatures, buckets, batch_size)
+        positions = defaultdict(list)
+        for position, row in enumerate(buckets.tolist()):
+            for bucket in row:
+                positions[bucket].append(position)
+        members = defaultdict(list)
+        keys = list(positions)
+        for start in range(0, len(keys), BUCKET_LOOKUP_SIZE):
+            for announcement_id, bucket in (SignatureBand.objects
+                                            .filter(bucket__in=keys[start:start + BUCKET_LOOKUP_SIZE])
+                                            .order_by('bucket', 'announcement_id')
+                                            .values_list('announcement_id', 'bucket')):
+                if len(members[bucket]) < MAX_BUCKET_SIZE:
+                    members[bucket].append(announcement_id)
+
+        candidates = {(position, other) for bucket, others in members.items()
+                      for position in positions[bucket] for other in others if other != ids[position]}
+        stored = load_signatures({other for _, other in candidates})
+        candidates = [(position, other) for position, other in candidates if other in stored]
+        pairs = {}
+        if candidates:
+            first = signatures[[position for position, _ in candidates]]
+            second = np.stack([stored[other] for _, other in candidates])
+            scores = (first == second).mean(axis=1)
+            for (position, other), score in zip(candidates, scores.tolist()):
+                if score >= DUPLICATE_THRESHOLD:
+                    pk = int(ids[position])
+                    pairs[(min(pk, other), max(pk, other))] = score
+
+        scope = Q(announcement_id__in=pks) | Q(original_id__in=pks)
+        return record_duplicates(pairs, scope, batch_size)
+
+
+def detect_duplicates(chunk_size=2000, batch_size=1000):
+    """
+    Re-signs every announcement and flags all near-duplicate pairs.
+
+    Signatures are computed `chunk_size` announcements at a time, then all band buckets
+    are sorted at once by `find_duplicates`, which compares only announcements sharing a
+    bucket. The stored signatures and buckets are replaced.
+
+    Args:
+        chunk_size (int, optional): The number of announcements read and signed at once.
+        batch_size (int, optional): The number of rows written per query.
+
+    Returns:
+        tuple: The number of signed announcements and of duplicate pairs.
+    """
+    queryset = Announcement.objects.order_by('pk').values_list(*SIGNATURE_COLUMNS)
+    chunks, rows = [], []
+    for row in queryset.iterator(chunk_size=chunk_size):
+        rows.append(row)
+        if len(rows) == chunk_size:
+            chunks.append(compute_signatures(rows))
+            rows = []
+    if rows or not chunks:
+        chunks.append(compute_signatures(rows))
+    ids = np.concatenate([chunk[0] for chunk in chunks])
+    signatures = np.concatenate([chunk[1] for chunk in chunks])
+    first, second, scores = find_duplicates(signatures)
+    # Rows are in primary key order, so the first member of a pair is the original.
+    pairs = dict(zip(zip(ids[first].tolist(), ids[second].tolist()), scores.tolist()))
+
+    with transaction.atomic():
+        ListingSignature.objects.all().delete()
+        SignatureBand.objects.all().delete()
+        store_signatures(ids, signatures, band_buckets(signatures), batch_size)
+        record_duplicates(pairs, Q(), batch_size)
+    return len(ids), len(pairs)
+
+
+def check_quietly(announcement_ids):
+    """
+    Checks announcements for duplicates and logs instead of raising database errors,
+    since the change that triggered the check is already committed.
+
+    Args:
+        announcement_ids (iterable): The primary keys of the new or changed announcements.
+    """
+    try:
+        check_announcements(announcement_ids)
+    except DatabaseError:
+        logger.exception('Could not check announcements for duplicates.')
@@ -0,0 +1,190 @@
+import numpy as np
+
+from apps.rental_announcement.search import tokenize
+
+# Shingles are runs of this many bytes of the normalized text.
+SHINGLE_SIZE = 5
+# 16 bands of 8 rows make pairs with a similarity of 0.8 candidates with a probability
+# of 95%, and pairs of 0.5 with about 6%.
+NUM_PERMUTATIONS = 128
+BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // BANDS
+# Pairs with at least this estimated Jaccard similarity are duplicates.
+DUPLICATE_THRESHOLD = 0.8
+# Buckets larger than this, e.g. of template texts, only pair their first members.
+MAX_BUCKET_SIZE = 50
+# Number of shingles hashed at once, bounding the `(NUM_PERMUTATIONS, shingles)` buffer
+# to 16 MiB; a longer text gets a block of its own.
+BLOCK_SHINGLES = 1 << 15
+
+# Shingles are hashed to 32 bits, and each permutation is `a * x + b` modulo 2**32 with an
+# odd `a`, a bijection computed in place on uint32 arrays without any division. Stored
+# signatures depend on these constants, so the legacy generator is used, whose stream is
+# fixed across NumPy versions.
+_random = np.random.RandomState(20240601)
+PERMUTATION_A = _random.randint(0, 1 << 31, size=NUM_PERMUTATIONS, dtype=np.int64).astype(np.uint32) * 2 + 1
+PERMUTATION_B = _random.randint(0, 1 << 32, size=NUM_PERMUTATIONS, dtype=np.int64).astype(np.uint32)
+SHINGLE_MULTIPLIER = np.uint64(_random.randint(0, 1 << 62, dtype=np.int64)) * np.uint64(2) + np.uint64(1)
+SHINGLE_WEIGHTS = np.left_shift(np.uint64(1), np.arange(0, 8 * SHINGLE_SIZE, 8, dtype=np.uint64))
+# Odd multipliers combining the rows of a band, and a salt per band, into a bucket hash.
+BAND_MULTIPLIERS = _random.randint(0, 1 << 62, size=ROWS_PER_BAND, dtype=np.int64).astype(np.uint64) * 2 + 1
+BAND_SALTS = _random.randint(1, 1 << 62, size=BANDS, dtype=np.int64).astype(np.uint64)
+
+
+def listing_text(title, description):
+    """
+    Normalizes the text of an announcement for shingling.
+
+    Args:
+        title (str): The title.
+        description (str): The description.
+
+    Returns:
+        str: The folded search tokens of both, separated by single spaces, so case,
+            punctuation, umlaut spellings and stop words do not tell copies apart.
+    """
+    return ' '.join(tokenize(f'{title} {description}'))
+
+
+def shingle_hashes(text):
+    """
+    Hashes the distinct shingles of a normalized text.
+
+    Every window of `SHINGLE_SIZE` bytes is packed into an integer and mixed into 32 bits
+    by a multiply-shift hash. Texts shorter than a shingle are one shingle.
+
+    Args:
+        text (str): The normalized text.
+
+    Returns:
+        ndarray: The distinct uint32 shingle hashes, never empty.
+    """
+    data = np.frombuffer(text.encode(), dtype=np.uint8)
+    if len(data) < SHINGLE_SIZE:
+        data = np.pad(data, (0, SHINGLE_SIZE - len(data)))
+    windows = np.lib.stride_tricks.sliding_window_view(data, SHINGLE_SIZE).astype(np.uint64)
+    # Multiplications wrap modulo 2**64.
+    packed = (windows @ SHINGLE_WEIGHTS) * SHINGLE_MULTIPLIER
+    return np.unique((packed >> np.uint64(32)).astype(np.uint32))
+
+
+def signature_matrix(texts):
+    """
+    Computes the MinHash signatures of normalized texts.
+
+    The shingles of many texts are concatenated, all permutations are applied to them with
+    one broadcast product into a reused buffer, and `np.minimum.reduceat` takes the minimum
+    of every text.
+
+    Args:
+        texts (iterable): The normalized texts.
+
+    Returns:
+        ndarray: A `(len(texts), NUM_PERMUTATIONS)` uint32 matrix.
+    """
+    shingles = [shingle_hashes(text) for text in texts]
+    signatures = np.empty((len(shingles), NUM_PERMUTATIONS), dtype=np.uint32)
+    buffer = np.empty(NUM_PERMUTATIONS * BLOCK_SHINGLES, dtype=np.uint32)
+    start = 0
+    while start < len(shingles):
+        end, size = start, 0
+        while end < len(shingles) and (end == start or size + len(shingles[end]) <= BLOCK_SHINGLES):
+            size += len(shingles[end])
+            end += 1
+        block = shingles[start:end]
+        offsets = np.cumsum([0] + [len(hashes) for hashes in block[:-1]])
+        values = np.concatenate(block)
+        if len(values) > BLOCK_SHINGLES:
+            buffer = np.empty(NUM_PERMUTATIONS * len(values), dtype=np.uint32)
+        hashed = buffer[:NUM_PERMUTATIONS * len(values)].reshape(NUM_PERMUTATIONS, len(values))
+        # Products and sums wrap modulo 2**32.
+        np.multiply(PERMUTATION_A[:, None], values[None, :], out=hashed)
+        np.add(hashed, PERMUTATION_B[:, None], out=hashed)
+        signatures[start:end] = np.minimum.reduceat(hashed, offsets, axis=1).T
+        start = end
+    return signatures
+
+
+def band_buckets(signatures):
+    """
+    Hashes every band of the signatures into its LSH bucket.
+
+    Args:
+        signatures (ndarray): A `(n, NUM_PERMUTATIONS)` signature matrix.
+
+    Returns:
+        ndarray: A `(n, BANDS)` int64 matrix of bucket hashes, distinct between bands.
+    """
+    bands = signatures.astype(np.uint64).reshape(len(signatures), BANDS, ROWS_PER_BAND)
+    # Multiplications wrap modulo 2**64.
+    return ((bands * BAND_MULTIPLIERS).sum(axis=2, dtype=np.uint64) ^ BAND_SALTS).view(np.int64)
+
+
+def similarities(signatures, first, second):
+    """
+    Estimates the Jaccard similarity of pairs as the share of equal signature minimums.
+
+    Args:
+        signatures (ndarray): The signature matrix.
+        first (ndarray): The rows of the first members of the pairs.
+        second (ndarray): The rows of the second members.
+
+    Returns:
+        ndarray: The estimated similarity of each pair.
+    """
+    return (signatures[first] == signatures[second]).mean(axis=1)
+
+
+def candidate_pairs(buckets):
+    """
+    Finds the pairs of rows sharing at least one bucket.
+
+    All buckets are sorted once, so runs of equal buckets are found in `O(n log n)`.
+    Buckets of two rows, by far the most frequent, are paired with array operations;
+    larger buckets are paired within their first `MAX_BUCKET_SIZE` members.
+
+    Args:
+        buckets (ndarray): A `(n, BANDS)` bucket matrix.
+
+    Returns:
+        tuple: The first and second rows of the distinct pairs, the first always smaller.
+    """
+    count = len(buckets)
+    flat = buckets.ravel()
+    rows = np.repeat(np.arange(count, dtype=np.int64), buckets.shape[1])
+    order = np.argsort(flat, kind='stable')
+    flat, rows = flat[order], rows[order]
+    starts = np.flatnonzero(np.concatenate(([True], flat[1:] != flat[:-1])))
+    sizes = np.diff(np.append(starts, len(flat)))
+
+    twos = starts[sizes == 2]
+    firsts, seconds = [rows[twos]], [rows[twos + 1]]
+    for start, size in zip(starts[sizes > 2].tolist(), sizes[sizes > 2].tolist()):
+        members = rows[start:start + min(size, MAX_BUCKET_SIZE)]
+        first, second = np.triu_indices(len(members), 1)
+        firsts.append(members[first])
+        seconds.append(members[second])
+
+    first, second = np.concatenate(firsts), np.concatenate(seconds)
+    low, high = np.minimum(first, second), np.maximum(first, second)
+    codes = np.unique(low[low != high] * count + high[low != high])
+    return codes // count, codes % count
+
+
+def find_duplicates(signatures, threshold=DUPLICATE_THRESHOLD):
+    """
+    Finds the pairs of near-duplicate signatures.
+
+    Args:
+        signatures (ndarray): A `(n, NUM_PERMUTATIONS)` signature matrix.
+        threshold (float, optional): The lowest estimated similarity of a duplicate.
+
+    Returns:
+        tuple: The first and second rows of the duplicate pairs and their similarities.
+    """
+    if not len(signatures):
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty(0)
+    first, second = candidate_pairs(band_buckets(signatures))
+    scores = similarities(signatures, first, second)
+    keep = scores >= threshold
+    return first[keep], second[keep], scores[keep]
@@ -0,0 +1,6 @@
+from apps.rental_announcement.feeds.announcement_changes import (
+    changes_queryset,
+    decode_watermark,
+    encode_watermark,
+    iter_announcement_changes,
+)
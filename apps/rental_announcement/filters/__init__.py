@@ -1 +1,6 @@
-from apps.rental_announcement.filters.announcement_filter import AnnouncementFilter
\ No newline at end of file
+from apps.rental_announcement.filters.announcement_filter import AnnouncementFilter
+from apps.rental_announcement.filters.search_filter import AnnouncementSearchFilter
+from apps.rental_announcement.filters.ordering_filter import AnnouncementOrderingFilter
+from apps.rental_announcement.filters.announcement_facets import compute_facets
+from apps.rental_announcement.filters.map_clusters import cluster_queryset, compute_clusters
+from apps.rental_announcement.filters.stay_price_filter import StayPriceFilter
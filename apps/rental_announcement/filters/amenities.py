@@ -0,0 +1,70 @@
+import django_filters
+from django import forms
+from django.db.models import F, Q
+from django.db.models.lookups import Exact, GreaterThan
+
+from apps.rental_announcement.choices.amenities import Amenities
+
+
+def has_all_amenities(mask):
+    """
+    Builds the predicate of announcements offering every amenity of a mask.
+
+    Besides the bitwise test, the mask itself is a lower bound of every matching bitmask,
+    which lets the `(is_active, amenities)` index skip the smaller masks.
+
+    Args:
+        mask (int): The amenities mask.
+
+    Returns:
+        Q: The filter predicate.
+    """
+    return Q(amenities__gte=mask) & Q(Exact(F('amenities').bitand(mask), mask))
+
+
+def has_any_amenity(mask):
+    """
+    Builds the predicate of announcements offering at least one amenity of a mask.
+
+    Args:
+        mask (int): The amenities mask.
+
+    Returns:
+        Q: The filter predicate, with the lowest bit of the mask as lower bound.
+    """
+    return Q(amenities__gte=mask & -mask) & Q(GreaterThan(F('amenities').bitand(mask), 0))
+
+
+class AmenitiesField(forms.Field):
+    """
+    Form field parsing comma-separated amenity values, ignoring case, into a bitmask.
+    """
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        names = [name for name in value.split(',') if name.strip()]
+        unknown = [name.strip() for name in names if Amenities.lookup(name) is None]
+        if unknown:
+            raise forms.ValidationError(f'Unknown amenities: {", ".join(unknown)}.')
+        return Amenities.to_mask(Amenities.lookup(name).value for name in names) or None
+
+
+class AmenitiesFilter(django_filters.Filter):
+    """
+    Filter on the amenities bitmask, keeping announcements with all or any of the given amenities.
+
+    Args:
+        match (str): "all" or "any".
+    """
+    field_class = AmenitiesField
+
+    def __init__(self, match='all', **kwargs):
+        kwargs.setdefault('field_name', 'amenities')
+        super().__init__(**kwargs)
+        self.predicate = has_all_amenities if match == 'all' else has_any_amenity
+
+    def filter(self, qs, value):
+        if not value:
+            return qs
+        return qs.filter(self.predicate(value))
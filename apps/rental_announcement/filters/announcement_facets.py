@@ -0,0 +1,139 @@
+from collections import defaultdict
+
+from django.db.models import Case, Count, IntegerField, Value, When
+from rest_framework.exceptions import ValidationError
+
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.filters.announcement_filter import AnnouncementFilter
+from apps.rental_announcement.filters.search_filter import AnnouncementSearchFilter
+
+PRICE_BUCKET_EDGES = [0, 50, 100, 200, 500, 1000, 2000]
+CITY_FACET_LIMIT = 50
+
+# Each facet is grouped on one column and ignores the filters on its own dimension,
+# so the sidebar shows what selecting another value of that dimension would return.
+FACETS = {
+    'type_of_object': {
+        'column': 'type_of_object',
+        'excludes': {'type_of_object'},
+    },
+    'federal_land': {
+        'column': 'address__federal_land',
+        'excludes': {'address__federal_land'},
+    },
+    'city': {
+        'column': 'address__city',
+        'excludes': {'address__city', 'address__city__icontains'},
+    },
+    'price': {
+        'column': 'price_bucket',
+        'excludes': {'price__gte', 'price__lte'},
+    },
+    'rooms': {
+        'column': 'rooms',
+        'excludes': {'rooms__gte', 'rooms__lte'},
+    },
+}
+
+
+def price_bucket_expression():
+    """
+    Maps the price of an announcement to the index of its bucket in `PRICE_BUCKET_EDGES`.
+
+    Returns:
+        Case: An integer expression usable in `annotate`.
+    """
+    return Case(
+        *[When(price__lt=edge, then=Value(index - 1)) for index, edge in enumerate(PRICE_BUCKET_EDGES) if index],
+        default=Value(len(PRICE_BUCKET_EDGES) - 1),
+        output_field=IntegerField(),
+    )
+
+
+def filtered_queryset(queryset, params, request, excludes):
+    """
+    Applies the announcement filters and the search to the queryset, skipping the excluded filters.
+
+    Args:
+        queryset (QuerySet): The announcements to filter.
+        params (QueryDict): The query parameters of the request.
+        request (Request): The HTTP request object.
+        excludes (set): Names of the filters that must not be applied.
+
+    Returns:
+        QuerySet: The filtered announcements.
+
+    Raises:
+        ValidationError: If a filter parameter is invalid.
+    """
+    params = params.copy()
+    for name in excludes:
+        params.pop(name, None)
+
+    filterset = AnnouncementFilter(params, queryset=queryset, request=request)
+    if not filterset.is_valid():
+        raise ValidationError(filterset.errors)
+    return AnnouncementSearchFilter().filter_queryset(request, filterset.qs, view=None)
+
+
+def compute_facets(queryset, request):
+    """
+    Counts the announcements per value of every sidebar facet.
+
+    Facets whose effective filters are identical share one grouped query, so a request
+    without facet filters costs a single query and every active facet filter adds one.
+
+    Args:
+        queryset (QuerySet): The announcements the facets are computed over.
+        request (Request): The HTTP request object carrying the filter parameters.
+
+    Returns:
+        dict: A list of `{'value', 'count'}` entries per facet, and price buckets as
+            `{'min', 'max', 'count'}` entries.
+    """
+    params = request.query_params
+    active = {name for name in params if params.get(name, '').strip()}
+
+    groups = defaultdict(list)
+    for name, facet in FACETS.items():
+        groups[frozenset(facet['excludes'] & active)].append(name)
+
+    counts = {name: defaultdict(int) for name in FACETS}
+    for excludes, names in groups.items():
+        columns = [FACETS[name]['column'] for name in names]
+        rows = (filtered_queryset(queryset, params, request, excludes)
+                .order_by()
+                .annotate(price_bucket=price_bucket_expression())
+                .values(*columns)
+                .annotate(count=Count('id')))
+        for row in rows:
+            for name, column in zip(names, columns):
+                counts[name][row[column]] += row['count']
+
+    return {
+        'type_of_object': [
+            {'value': choice.value, 'count': counts['type_of_object'].get(choice.value, 0)}
+            for choice in HousingTypes
+        ],
+        'federal_land': [
+            {'value': choice.value, 'count': counts['federal_land'].get(choice.value, 0)}
+            for choice in FederalLands
+        ],
+        'city': [
+            {'value': city, 'count': count}
+            for city, count in sorted(counts['city'].items(), key=lambda item: (-item[1], item[0]))
+        ][:CITY_FACET_LIMIT],
+        'price': [
+            {
+                'min': edge,
+                'max': PRICE_BUCKET_EDGES[index + 1] if index + 1 < len(PRICE_BUCKET_EDGES) else None,
+                'count': counts['price'].get(index, 0),
+            }
+            for index, edge in enumerate(PRICE_BUCKET_EDGES)
+        ],
+        'rooms': [
+            {'value': rooms, 'count': count}
+            for rooms, count in sorted(counts['rooms'].items())
+        ],
+    }
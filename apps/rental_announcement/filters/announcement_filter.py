@@ -1,17 +1,154 @@
 import django_filters
-from apps.rental_announcement.models import Announcement
+from django import forms
+from django.db.models import Exists, OuterRef, Value
+
+from apps.rental_announcement.filters.amenities import AmenitiesFilter
+from apps.rental_announcement.filters.geo import bounding_box, haversine_distance
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.models import Announcement, Booking, DuplicateListing
+
+GEO_PARAMS = ('lat', 'lon', 'radius_km')
+AVAILABILITY_PARAMS = ('available_from', 'available_to')
+
+
+class AnnouncementFilterForm(forms.Form):
+    """
+    Form validating the parameters of `AnnouncementFilter` that only make sense together.
+    """
+
+    def clean(self):
+        cleaned_data = super().clean()
+        for group in (GEO_PARAMS, AVAILABILITY_PARAMS):
+            given = [name for name in group if cleaned_data.get(name) is not None]
+            if given and len(given) < len(group):
+                raise forms.ValidationError(f'The parameters {", ".join(group)} must be given together.')
+
+        available_from, available_to = (cleaned_data.get(name) for name in AVAILABILITY_PARAMS)
+        if available_from and available_to and available_to < available_from:
+            raise forms.ValidationError('available_to cannot be before available_from.')
+        return cleaned_data
+
 
 class AnnouncementFilter(django_filters.FilterSet):
     """
     FilterSet for filtering announcements based on various fields.
+
+    Besides the plain field filters, announcements can be searched within `radius_km` kilometers
+    around `lat`/`lon`, and within a bounding box through the `address__latitude` and
+    `address__longitude` range filters. Address coordinates are postal code centroids.
+    `available_from` and `available_to` keep only announcements without an approved,
+    non-canceled booking overlapping the dates. `amenities_all` and `amenities_any` take
+    comma-separated amenity values and compile to bitwise predicates on the amenities mask.
+    `exclude_duplicates` hides announcements flagged as copies of an active announcement,
+    unless a moderator dismissed the flag.
     """
+    lat = django_filters.NumberFilter(method='filter_geo', min_value=-90, max_value=90)
+    lon = django_filters.NumberFilter(method='filter_geo', min_value=-180, max_value=180)
+    radius_km = django_filters.NumberFilter(method='filter_geo', min_value=0, max_value=1000)
+    available_from = django_filters.DateFilter(method='filter_available')
+    available_to = django_filters.DateFilter(method='filter_available')
+    amenities_all = AmenitiesFilter(match='all')
+    amenities_any = AmenitiesFilter(match='any')
+    exclude_duplicates = django_filters.BooleanFilter(method='filter_duplicates')
 
     class Meta:
         model = Announcement
+        form = AnnouncementFilterForm
         fields = {
             'rooms': ['gte', 'lte'],
             'price': ['gte', 'lte'],
             'type_of_object': ['exact'],
             'address__city': ['exact', 'icontains'],
             'address__federal_land': ['exact'],
+            'address__latitude': ['gte', 'lte'],
+            'address__longitude': ['gte', 'lte'],
+            'rating': ['gte'],
         }
+
+    def filter_geo(self, queryset, name, value):
+        # The radius needs all three parameters at once, see `filter_queryset`.
+        return queryset
+
+    def filter_available(self, queryset, name, value):
+        # The date range needs both parameters at once, see `filter_queryset`.
+        return queryset
+
+    def filter_duplicates(self, queryset, name, value):
+        """
+        Excludes announcements with a pending or confirmed duplicate flag on an active original.
+
+        Args:
+            queryset (QuerySet): The announcements to filter.
+            name (str): The parameter name.
+            value (bool): Whether to exclude the duplicates.
+
+        Returns:
+            QuerySet: The announcements without suspected copies.
+        """
+        if not value:
+            return queryset
+        flags = DuplicateListing.objects.filter(
+            announcement=OuterRef('pk'),
+            original__is_active=Value(True),
+            status__in=[DuplicateStatus.PENDING.value, DuplicateStatus.CONFIRMED.value],
+        )
+        return queryset.filter(~Exists(flags))
+
+    def filter_queryset(self, queryset):
+        """
+        Applies the field filters, the availability filter and then the radius search.
+
+        Availability is a single `NOT EXISTS` on the bookings of each announcement, answered
+        by the `(announcement, is_approved, canceled, start_date, end_date)` index.
+
+        The radius search first restricts the addresses to the bounding box of the circle,
+        which the `(latitude, longitude)` index answers, and only computes the exact
+        haversine distance for the remaining rows. Matching announcements are annotated
+        with `distance` in kilometers.
+
+        Args:
+            queryset (QuerySet): The announcements to filter.
+
+        Returns:
+            QuerySet: The filtered announcements.
+        """
+        queryset = super().filter_queryset(queryset)
+        available_from, available_to = (self.form.cleaned_data.get(name) for name in AVAILABILITY_PARAMS)
+        if available_from is not None and available_to is not None:
+            queryset = self.filter_by_availability(queryset, available_from, available_to)
+
+        latitude, longitude, radius_km = (self.form.cleaned_data.get(name) for name in GEO_PARAMS)
+        if latitude is None or longitude is None or radius_km is None:
+            return queryset
+
+        latitude, longitude, radius_km = float(latitude), float(longitude), float(radius_km)
+        (min_lat, max_lat), (min_lon, max_lon) = bounding_box(latitude, longitude, radius_km)
+        return (queryset
+                .filter(address__latitude__range=(min_lat, max_lat), address__longitude__range=(min_lon, max_lon))
+                .annotate(distance=haversine_distance(latitude, longitude))
+                .filter(distance__lte=radius_km))
+
+    @staticmethod
+    def filter_by_availability(queryset, available_from, available_to):
+        """
+        Excludes announcements with an approved, non-canceled booking overlapping the dates.
+
+        Bookings overlap the same way `BookingCreateSerializer.validate` checks them, so an
+        announcement found here can be booked for the range.
+
+        Args:
+            queryset (QuerySet): The announcements to filter.
+            available_from (date): The first day of the requested stay.
+            available_to (date): The last day of the requested stay.
+
+        Returns:
+            QuerySet: The available announcements.
+        """
+        overlapping = Booking.objects.filter(
+            announcement=OuterRef('pk'),
+            is_approved=Value(True),
+            canceled=Value(False),
+            start_date__lte=available_to,
+            end_date__gte=available_from,
+        )
+        return queryset.filter(~Exists(overlapping))
@@ -0,0 +1,119 @@
+import math
+
+from django.db.models import FloatField, Value
+from django.db.models.functions import ASin, Cos, Least, Power, Radians, Sin, Sqrt
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LATITUDE = math.pi * EARTH_RADIUS_KM / 180
+
+# Tile keys address Web Mercator map tiles of this zoom level, about 38 m wide at the equator.
+MAX_TILE_ZOOM = 20
+MAX_MERCATOR_LATITUDE = 85.05112878
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """
+    Computes the latitude and longitude ranges enclosing a circle on the earth surface.
+
+    The box is slightly larger than the circle, so it can be used as an indexed prefilter
+    before the exact distance is checked.
+
+    Args:
+        latitude (float): The latitude of the center in degrees.
+        longitude (float): The longitude of the center in degrees.
+        radius_km (float): The radius of the circle in kilometers.
+
+    Returns:
+        tuple: The `(min_lat, max_lat)` and `(min_lon, max_lon)` ranges in degrees.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE_LATITUDE
+    min_lat, max_lat = max(latitude - delta_lat, -90.0), min(latitude + delta_lat, 90.0)
+
+    cos_lat = min(math.cos(math.radians(min_lat)), math.cos(math.radians(max_lat)))
+    if cos_lat <= 1e-9 or radius_km / (KM_PER_DEGREE_LATITUDE * cos_lat) >= 180:
+        return (min_lat, max_lat), (-180.0, 180.0)
+    delta_lon = radius_km / (KM_PER_DEGREE_LATITUDE * cos_lat)
+    return (min_lat, max_lat), (longitude - delta_lon, longitude + delta_lon)
+
+
+def haversine_distance(latitude, longitude, lat_field='address__latitude', lon_field='address__longitude'):
+    """
+    Builds a database expression for the great-circle distance to a point.
+
+    Args:
+        latitude (float): The latitude of the point in degrees.
+        longitude (float): The longitude of the point in degrees.
+        lat_field (str): The latitude column of the rows.
+        lon_field (str): The longitude column of the rows.
+
+    Returns:
+        Func: A float expression with the distance in kilometers.
+    """
+    half_delta_lat = (Radians(lat_field) - Value(math.radians(latitude))) / Value(2.0)
+    half_delta_lon = (Radians(lon_field) - Value(math.radians(longitude))) / Value(2.0)
+    haversine = (
+        Power(Sin(half_delta_lat), 2)
+        + Value(math.cos(math.radians(latitude))) * Cos(Radians(lat_field)) * Power(Sin(half_delta_lon), 2)
+    )
+    return Value(2 * EARTH_RADIUS_KM) * ASin(Sqrt(Least(haversine, Value(1.0), output_field=FloatField())))
+
+
+def tile_xy(latitude, longitude, zoom):
+    """
+    Computes the Web Mercator tile containing a point, as used by slippy map libraries.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+        zoom (int): The zoom level, with `2 ** zoom` tiles per axis.
+
+    Returns:
+        tuple: The `(x, y)` tile coordinates, counted from the north-west corner.
+    """
+    tiles = 1 << zoom
+    latitude = math.radians(max(-MAX_MERCATOR_LATITUDE, min(MAX_MERCATOR_LATITUDE, latitude)))
+    x = int((longitude + 180) / 360 * tiles)
+    y = int((1 - math.asinh(math.tan(latitude)) / math.pi) / 2 * tiles)
+    return min(max(x, 0), tiles - 1), min(max(y, 0), tiles - 1)
+
+
+def tile_key(latitude, longitude):
+    """
+    Computes the tile key of a point.
+
+    The key interleaves the bits of the `MAX_TILE_ZOOM` tile coordinates (a Morton code),
+    so the key of the enclosing tile at a lower zoom `z` is the key shifted right by
+    `2 * (MAX_TILE_ZOOM - z)` bits, and points can be grouped per tile of any zoom level.
+
+    Args:
+        latitude (float): The latitude in degrees.
+        longitude (float): The longitude in degrees.
+
+    Returns:
+        int: The tile key, or None if the point is unknown.
+    """
+    if latitude is None or longitude is None:
+        return None
+    x, y = tile_xy(latitude, longitude, MAX_TILE_ZOOM)
+    key = 0
+    for bit in range(MAX_TILE_ZOOM):
+        key |= ((x >> bit) & 1) << (2 * bit) | ((y >> bit) & 1) << (2 * bit + 1)
+    return key
+
+
+def key_tile(key, zoom):
+    """
+    Returns the tile coordinates of a tile key shifted to a zoom level.
+
+    Args:
+        key (int): A tile key shifted right by `2 * (MAX_TILE_ZOOM - zoom)` bits.
+        zoom (int): The zoom level of the shifted key.
+
+    Returns:
+        tuple: The `(x, y)` tile coordinates at that zoom level.
+    """
+    x = y = 0
+    for bit in range(zoom):
+        x |= ((key >> (2 * bit)) & 1) << bit
+        y |= ((key >> (2 * bit + 1)) & 1) << bit
+    return x, y
@@ -0,0 +1,93 @@
+from django.db.models import Avg, Count, F, Max, Min
+
+from apps.rental_announcement.filters.announcement_facets import filtered_queryset
+from apps.rental_announcement.filters.geo import MAX_TILE_ZOOM, key_tile
+
+# Clusters are computed on tiles this many zoom levels below the map zoom, so every
+# 256 pixel map tile is split into 4 x 4 cells of 64 pixels.
+CELL_ZOOM_OFFSET = 2
+
+
+def cell_zoom(zoom):
+    """
+    Returns the zoom level of the tiles clusters are grouped on.
+
+    Args:
+        zoom (int): The zoom level of the map.
+
+    Returns:
+        int: The cell zoom level, at most `MAX_TILE_ZOOM`.
+    """
+    return min(zoom + CELL_ZOOM_OFFSET, MAX_TILE_ZOOM)
+
+
+def cluster_queryset(queryset, request, viewport, zoom_of_cells):
+    """
+    Builds the grouped query of the announcements in a map viewport per cell.
+
+    The viewport is matched by the `(latitude, longitude)` index of the addresses, and the
+    announcements are grouped on their address tile key shifted to the cell zoom level.
+    The announcement filters and search of the request apply.
+
+    Args:
+        queryset (QuerySet): The announcements to cluster.
+        request (Request): The HTTP request object carrying the filter parameters.
+        viewport (tuple): The `(west, south, east, north)` bounds in degrees.
+        zoom_of_cells (int): The zoom level of the cells.
+
+    Returns:
+        QuerySet: One row per cell with its shifted tile key as `cell`, the `count`, the mean
+            `latitude` and `longitude` and the `min_price` and `max_price`.
+
+    Raises:
+        ValidationError: If a filter parameter is invalid.
+    """
+    west, south, east, north = viewport
+    return (filtered_queryset(queryset, request.query_params, request, excludes=set())
+            .filter(address__latitude__range=(south, north), address__longitude__range=(west, east))
+            .order_by()
+            .annotate(cell=F('address__tile_key').bitrightshift(2 * (MAX_TILE_ZOOM - zoom_of_cells)))
+            .values('cell')
+            .annotate(
+                count=Count('id'),
+                latitude=Avg('address__latitude'),
+                longitude=Avg('address__longitude'),
+                min_price=Min('price'),
+                max_price=Max('price'),
+            ))
+
+
+def compute_clusters(queryset, request, viewport, zoom):
+    """
+    Groups the announcements in a map viewport into cells with one query.
+
+    Args:
+        queryset (QuerySet): The announcements to cluster.
+        request (Request): The HTTP request object carrying the filter parameters.
+        viewport (tuple): The `(west, south, east, north)` bounds in degrees.
+        zoom (int): The zoom level of the map.
+
+    Returns:
+        dict: The cell zoom level and per cell its tile coordinates, the number of
+            announcements, the centroid of their coordinates and their price range.
+
+    Raises:
+        ValidationError: If a filter parameter is invalid.
+    """
+    zoom_of_cells = cell_zoom(zoom)
+    clusters = []
+    for row in cluster_queryset(queryset, request, viewport, zoom_of_cells):
+        if row['cell'] is None:
+            continue
+        x, y = key_tile(row['cell'], zoom_of_cells)
+        clusters.append({
+            'x': x,
+            'y': y,
+            'count': row['count'],
+            'latitude': row['latitude'],
+            'longitude': row['longitude'],
+            'min_price': row['min_price'],
+            'max_price': row['max_price'],
+        })
+    clusters.sort(key=lambda cluster: (cluster['y'], cluster['x']))
+    return {'zoom': zoom, 'cell_zoom': zoom_of_cells, 'clusters': clusters}
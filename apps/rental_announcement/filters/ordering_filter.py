@@ -0,0 +1,36 @@
+from rest_framework.filters import OrderingFilter
+
+
+class AnnouncementOrderingFilter(OrderingFilter):
+    """
+    OrderingFilter that also orders by annotations, when the queryset carries them.
+
+    `distance` is only annotated by the radius search of `AnnouncementFilter`, so ordering
+    by it is ignored when no radius search is active. `total_price` is only known when
+    `StayPriceFilter` quoted a stay; it is ordered by the paginator from the quotes on the
+    view, so it is left out of the SQL ordering.
+    """
+    annotation_fields = {'distance'}
+    quoted_fields = {'total_price'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        annotations = queryset.query.annotations
+        quoted = getattr(view, 'stay_quotes', None) is not None
+        ordering = [
+            term for term in ordering
+            if (term.lstrip('-') not in self.annotation_fields or term.lstrip('-') in annotations)
+            and (term.lstrip('-') not in self.quoted_fields or quoted)
+        ]
+        return ordering or self.get_default_ordering(view)
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = [
+            term for term in self.get_ordering(request, queryset, view) or []
+            if term.lstrip('-') not in self.quoted_fields
+        ]
+        if ordering:
+            return queryset.order_by(*ordering)
+        return queryset
@@ -0,0 +1,30 @@
+from rest_framework.filters import BaseFilterBackend
+
+from apps.rental_announcement.search import get_search_backend
+
+
+class AnnouncementSearchFilter(BaseFilterBackend):
+    """
+    Filter backend for ranked full-text search over announcement titles and descriptions.
+
+    Reads the `search` query parameter and delegates to the configured search backend.
+    Results are ordered by relevance unless the request also asks for an explicit ordering.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        query = request.query_params.get(self.search_param, '').strip()
+        if not query:
+            return queryset
+        return get_search_backend().search(queryset, query)
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Full-text search in title and description, ranked by relevance.',
+                'schema': {'type': 'string'},
+            },
+        ]
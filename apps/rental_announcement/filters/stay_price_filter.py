@@ -0,0 +1,67 @@
+import numpy as np
+from rest_framework.filters import BaseFilterBackend
+
+from apps.rental_announcement.pricing import quote_queryset
+from apps.rental_announcement.serializers.pricing_serializers import StaySearchQuerySerializer
+
+STAY_PARAMS = ('check_in', 'check_out', 'total_price__gte', 'total_price__lte')
+
+
+class StayPriceFilter(BaseFilterBackend):
+    """
+    Filter backend pricing the filtered announcements for the stay in `check_in` and `check_out`.
+
+    Every announcement left by the preceding filters is quoted with `quote_queryset`, in
+    vectorized batches. Announcements whose minimum stay is longer than the stay are
+    dropped, and `total_price__gte` and `total_price__lte` filter on the quoted totals.
+    The quotes are kept on the view as `stay_quotes`, where the ordering filter and the
+    paginator find them to order by `total_price`. They are computed once per request,
+    however often the view filters its queryset.
+
+    The queryset is only narrowed when quoting dropped announcements, by excluding the
+    dropped ones or keeping the quoted ones, whichever list is shorter, so a stay without
+    price bounds does not send every matching primary key back to the database.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        if not any(param in request.query_params for param in STAY_PARAMS):
+            return queryset
+
+        quotes = getattr(view, 'stay_quotes', None)
+        if quotes is None:
+            serializer = StaySearchQuerySerializer(data=request.query_params)
+            serializer.is_valid(raise_exception=True)
+            params = serializer.validated_data
+            quotes = quote_queryset(queryset, params['check_in'], params['check_out'])
+            keep = quotes.bookable
+            if 'total_price__gte' in params:
+                keep &= quotes.totals >= float(params['total_price__gte'])
+            if 'total_price__lte' in params:
+                keep &= quotes.totals <= float(params['total_price__lte'])
+            view.stay_dropped_ids = quotes.ids[~keep].tolist()
+            quotes = quotes.select(np.flatnonzero(keep))
+            view.stay_quotes = quotes
+
+        dropped = view.stay_dropped_ids
+        if not dropped:
+            return queryset
+        if len(dropped) < len(quotes):
+            return queryset.exclude(pk__in=dropped)
+        return queryset.filter(pk__in=quotes.ids.tolist())
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': name,
+                'required': False,
+                'in': 'query',
+                'description': description,
+                'schema': schema,
+            }
+            for name, description, schema in (
+                ('check_in', 'Arrival day of a stay to price the announcements for.', {'type': 'string', 'format': 'date'}),
+                ('check_out', 'Departure day of the stay.', {'type': 'string', 'format': 'date'}),
+                ('total_price__gte', 'Lowest total price of the stay.', {'type': 'number'}),
+                ('total_price__lte', 'Highest total price of the stay.', {'type': 'number'}),
+            )
+        ]
@@ -0,0 +1,61 @@
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.archive import archive_announcements, cold_announcements, restore_announcements
+
+
+class Command(BaseCommand):
+    """
+    Moves cold announcements into the archive tables, or restores archived ones.
+
+    Cold announcements are inactive or soft-deleted, unchanged for `--older-than-days`
+    days and without unfinished bookings. They are moved with their reviews, bookings, rate
+    rules and duplicate flags in primary key order, one transaction per batch. An interrupted
+    run loses at most the current batch, and running the command again continues with the
+    remaining rows.
+    """
+    help = 'Archive inactive and deleted announcements, or restore archived ones with --restore.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--older-than-days',
+            type=int,
+            default=90,
+            help='Only archive announcements unchanged for this many days.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of announcements moved per transaction.'
+        )
+        parser.add_argument(
+            '--restore',
+            type=int,
+            nargs='+',
+            metavar='ID',
+            help='Move the archived announcements with these ids back into the hot tables.'
+        )
+
+    def handle(self, *args, **options):
+        if options['restore']:
+            restored = restore_announcements(options['restore'])
+            self.stdout.write(self.style.SUCCESS(f'Restored {len(restored)} announcements.'))
+            return
+
+        batch_size = options['batch_size']
+        last_id = 0
+        archived = 0
+        while True:
+            ids = list(
+                cold_announcements(options['older_than_days'])
+                .filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            archived += len(archive_announcements(ids))
+            last_id = ids[-1]
+            self.stdout.write(f'Archived {archived} announcements...')
+
+        self.stdout.write(self.style.SUCCESS(f'Archived {archived} announcements.'))
@@ -0,0 +1,175 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.rental_announcement.choices.amenities import Amenities
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.filters import AnnouncementFilter
+from apps.rental_announcement.models import Address, Announcement
+from apps.users.models import User
+
+# Join table of the many-to-many design, holding the position of the amenity in `Amenities`.
+M2M_TABLE = 'benchmark_announcement_amenities'
+# Amenity combinations filtered on, from one to three amenities.
+FILTERS = [
+    [Amenities.WIFI],
+    [Amenities.BALCONY, Amenities.WASHING_MACHINE],
+    [Amenities.PETS_ALLOWED, Amenities.PARKING, Amenities.ELEVATOR],
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the amenities bitmask filters with a many-to-many design.
+
+    Synthetic announcements with random amenities are created inside a transaction that is
+    rolled back at the end, and their amenities are copied into a temporary join table with
+    a `(amenity, announcement_id)` primary key. Every filter is counted through
+    `AnnouncementFilter` on the bitmask and through one join per amenity (`amenities_all`)
+    or a distinct join on all amenities (`amenities_any`) on the join table, the queries
+    Django generates for chained filters on a many-to-many field. The command reports
+    queries per second of both designs and fails if their counts differ.
+    """
+    help = 'Benchmark the amenities bitmask filters against a many-to-many join table.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            default=100000,
+            help='Number of announcements to create.'
+        )
+        parser.add_argument(
+            '--repeat',
+            type=int,
+            default=20,
+            help='Number of times every query is run.'
+        )
+        parser.add_argument(
+            '--probability',
+            type=float,
+            default=0.3,
+            help='Probability of an announcement to offer each amenity.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows inserted per query while preparing the data.'
+        )
+        parser.add_argument('--seed', type=int, default=0, help='Seed of the random amenities.')
+
+    def create_rows(self, count, probability, batch_size):
+        """
+        Creates the synthetic announcements and fills the join table with their amenities.
+
+        Args:
+            count (int): The number of announcements to create.
+            probability (float): The probability of each amenity.
+            batch_size (int): The number of rows inserted per query.
+        """
+        owner = User.objects.create_user(
+            username='benchmark-owner', email='benchmark-owner@example.com', password='BenchPass123',
+            name='Bench', surname='Owner', phone='+4900000000001', is_lessor=True,
+        )
+        address = Address.objects.create(
+            federal_land=FederalLands.BERLIN.value, city='Berlin', street='Benchmarkstrasse',
+            house_number='1', postal_code='10115',
+        )
+        members = list(Amenities)
+        announcements = Announcement.objects.bulk_create(
+            (Announcement(
+                owner=owner, address=address, title=f'Benchmark flat {i}',
+                description='A flat used to benchmark the amenity filters.',
+                price=50 + i % 1000, rooms=i % 6 + 1, type_of_object=HousingTypes.APARTMENT.value,
+                amenities=Amenities.to_mask(amenity.value for amenity in members if random.random() < probability),
+                is_active=i % 10 != 0,
+            ) for i in range(count)),
+            batch_size=batch_size,
+        )
+
+        rows = [(position, announcement.pk)
+                for announcement in announcements
+                for position, amenity in enumerate(members) if announcement.amenities & amenity.bit]
+        with connection.cursor() as cursor:
+            # Temporary tables neither commit the transaction nor outlive the connection.
+            cursor.execute(
+                f'CREATE TEMPORARY TABLE {M2M_TABLE} ('
+                'amenity integer NOT NULL, announcement_id integer NOT NULL, '
+                'PRIMARY KEY (amenity, announcement_id))'
+            )
+            for start in range(0, len(rows), batch_size):
+                cursor.executemany(f'INSERT INTO {M2M_TABLE} (amenity, announcement_id) VALUES (%s, %s)',
+                                   rows[start:start + batch_size])
+
+    @staticmethod
+    def count_m2m(amenities, match):
+        """
+        Counts the active announcements matching the amenities through the join table.
+
+        Args:
+            amenities (list): The `Amenities` filtered on.
+            match (str): "all" or "any".
+
+        Returns:
+            int: The number of matching announcements.
+        """
+        members = list(Amenities)
+        positions = [members.index(amenity) for amenity in amenities]
+        table = Announcement._meta.db_table
+        if match == 'all':
+            joins = ' '.join(
+                f'JOIN {M2M_TABLE} t{i} ON t{i}.announcement_id = a.id AND t{i}.amenity = %s'
+                for i in range(len(positions))
+            )
+            sql = f'SELECT COUNT(*) FROM {table} a {joins} WHERE a.is_active = %s'
+        else:
+            placeholders = ', '.join(['%s'] * len(positions))
+            sql = (f'SELECT COUNT(DISTINCT a.id) FROM {table} a '
+                   f'JOIN {M2M_TABLE} t ON t.announcement_id = a.id AND t.amenity IN ({placeholders}) '
+                   f'WHERE a.is_active = %s')
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [*positions, True])
+            return cursor.fetchone()[0]
+
+    @staticmethod
+    def count_bitmask(amenities, match):
+        """
+        Counts the active announcements matching the amenities through `AnnouncementFilter`.
+
+        Args:
+            amenities (list): The `Amenities` filtered on.
+            match (str): "all" or "any".
+
+        Returns:
+            int: The number of matching announcements.
+        """
+        data = {f'amenities_{match}': ','.join(amenity.value for amenity in amenities)}
+        return AnnouncementFilter(data, queryset=Announcement.objects.active()).qs.count()
+
+    def handle(self, *args, **options):
+        random.seed(options['seed'])
+        repeat = options['repeat']
+        self.stdout.write(f'{"filter":<52}{"design":>8}{"matches":>10}{"queries/s":>12}')
+
+        with transaction.atomic():
+            self.create_rows(options['rows'], options['probability'], options['batch_size'])
+            for amenities in FILTERS:
+                for match in ('all', 'any'):
+                    label = f'{match}: {", ".join(amenity.value for amenity in amenities)}'
+                    counts = []
+                    for design, count in (('bitmask', self.count_bitmask), ('m2m', self.count_m2m)):
+                        started = time.perf_counter()
+                        for _ in range(repeat):
+                            matches = count(amenities, match)
+                        duration = time.perf_counter() - started
+                        counts.append(matches)
+                        self.stdout.write(f'{label:<52}{design:>8}{matches:>10}{repeat / duration:>12.1f}')
+                    if counts[0] != counts[1]:
+                        raise CommandError(f'The designs disagree on "{label}".')
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Both designs matched the same announcements.'))
@@ -0,0 +1,90 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from apps.rental_announcement.bulk import upsert_announcements
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.serializers import AnnouncementRetrieveUpdateDestroySerializer
+from apps.rental_announcement.serializers.bulk_serializers import BulkAnnouncementSerializer
+from apps.users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Compares onboarding a portfolio one announcement at a time with the bulk upsert.
+
+    For every item count both paths create the same synthetic announcements, each at its
+    own address, inside a transaction that is rolled back at the end. The command reports
+    items per second and the number of queries of each path.
+    """
+    help = 'Benchmark the bulk announcement upsert against per-item creation.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--items',
+            type=int,
+            nargs='+',
+            default=[100, 1000],
+            help='Item counts to benchmark.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Number of rows written per query by the bulk upsert.'
+        )
+
+    def make_items(self, path, count):
+        """
+        Builds the request items of one run.
+
+        Args:
+            path (str): The name of the path, which keeps the addresses of the runs apart.
+            count (int): The number of items.
+
+        Returns:
+            list: Announcement items with nested addresses.
+        """
+        return [{
+            'title': f'Portfolio flat {i}',
+            'description': 'A furnished flat of a large portfolio, ready to move in.',
+            'price': f'{600 + i % 900}.00',
+            'rooms': i % 5 + 1,
+            'type_of_object': HousingTypes.APARTMENT.value,
+            'address': {
+                'federal_land': FederalLands.BERLIN.value, 'city': 'Berlin', 'street': f'{path} {count} street',
+                'house_number': str(i), 'postal_code': '10115',
+            },
+        } for i in range(count)]
+
+    def create_one_by_one(self, owner, items, batch_size):
+        for item in items:
+            serializer = AnnouncementRetrieveUpdateDestroySerializer(data={**item, 'owner': owner.pk})
+            serializer.is_valid(raise_exception=True)
+            serializer.save()
+
+    def create_in_bulk(self, owner, items, batch_size):
+        serializer = BulkAnnouncementSerializer()
+        upsert_announcements(owner, [serializer.run_validation(item) for item in items], batch_size=batch_size)
+
+    def handle(self, *args, **options):
+        paths = [('single', self.create_one_by_one), ('bulk', self.create_in_bulk)]
+        self.stdout.write(f'{"items":>8}{"path":>8}{"items/s":>12}{"queries":>10}')
+
+        with transaction.atomic():
+            owner = User.objects.create_user(
+                username='benchmark-portfolio', email='benchmark-portfolio@example.com', password='BenchPass123',
+                name='Bench', surname='Portfolio', phone='+4900000000003', is_lessor=True,
+            )
+            for count in sorted(options['items']):
+                for path, create in paths:
+                    items = self.make_items(path, count)
+                    queries = []
+                    with connection.execute_wrapper(lambda execute, sql, *args: queries.append(sql) or execute(sql, *args)):
+                        started = time.perf_counter()
+                        create(owner, items, options['batch_size'])
+                        duration = time.perf_counter() - started
+                    self.stdout.write(f'{count:>8}{path:>8}{count / duration:>12.0f}{len(queries):>10}')
+            transaction.set_rollback(True)
@@ -0,0 +1,135 @@
+import time
+import tracemalloc
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from apps.rental_announcement.choices.booking_status import BookingStatus
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models import Address, Announcement, Booking
+from apps.rental_announcement.serializers import (
+    AllBookingsSerializer,
+    AnnouncementListDetailSerializer,
+    BookingCreateSerializer,
+)
+from apps.rental_announcement.serializers.fast_read import get_values_serializer
+from apps.users.models import User
+
+BENCHMARKS = [
+    ('announcement list', AnnouncementListDetailSerializer, lambda: Announcement.objects.for_list()),
+    ('booking list', BookingCreateSerializer, lambda: Booking.objects.select_related('renter')),
+    ('booking history', AllBookingsSerializer, lambda: Booking.objects.select_related('announcement')),
+]
+
+
+class Command(BaseCommand):
+    """
+    Compares the `ModelSerializer` read path with the `values_list()` read path.
+
+    Synthetic announcements and bookings are created inside a transaction that is rolled
+    back at the end. For every row count the command reports rows per second and peak
+    Python memory of both paths, and fails if their rendered JSON differs.
+    """
+    help = 'Benchmark the fast values() read serializers against the ModelSerializer path.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rows',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 100000],
+            help='Row counts to benchmark.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows inserted per query while preparing the data.'
+        )
+
+    def create_rows(self, count, batch_size):
+        """
+        Creates the synthetic announcements and bookings.
+
+        Args:
+            count (int): The number of announcements and of bookings to create.
+            batch_size (int): The number of rows inserted per query.
+        """
+        owner = User.objects.create_user(
+            username='benchmark-owner', email='benchmark-owner@example.com', password='BenchPass123',
+            name='Bench', surname='Owner', phone='+4900000000001', is_lessor=True,
+        )
+        renter = User.objects.create_user(
+            username='benchmark-renter', email='benchmark-renter@example.com', password='BenchPass123',
+            name='Bench', surname='Renter', phone='+4900000000002',
+        )
+        address = Address.objects.create(
+            federal_land=FederalLands.BERLIN.value, city='Berlin', street='Benchmarkstrasse',
+            house_number='1', postal_code='10115',
+        )
+        announcements = Announcement.objects.bulk_create(
+            (Announcement(
+                owner=owner, address=address, title=f'Benchmark flat {i}',
+                description='A bright flat used to benchmark the read serializers. ' * 4,
+                price=50 + i % 1000, rooms=i % 6 + 1, type_of_object=HousingTypes.APARTMENT.value,
+            ) for i in range(count)),
+            batch_size=batch_size,
+        )
+        Booking.objects.bulk_create(
+            (Booking(
+                renter=renter, announcement=announcement, start_date=date(2030, 1, 1),
+                end_date=date(2030, 1, 5), status=BookingStatus.PENDING.value,
+            ) for announcement in announcements),
+            batch_size=batch_size,
+        )
+
+    def measure(self, serialize):
+        """
+        Runs one serialization for its duration and once more under tracemalloc for its memory peak.
+
+        Args:
+            serialize (callable): Returns the serialized rows.
+
+        Returns:
+            tuple: The rendered JSON, the duration in seconds and the peak memory in bytes.
+        """
+        started = time.perf_counter()
+        content = JSONRenderer().render(serialize())
+        duration = time.perf_counter() - started
+
+        tracemalloc.start()
+        JSONRenderer().render(serialize())
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return content, duration, peak
+
+    def handle(self, *args, **options):
+        rows = sorted(options['rows'])
+        self.stdout.write(f'{"endpoint":<18}{"rows":>8}{"path":>8}{"rows/s":>12}{"peak MiB":>10}')
+
+        with transaction.atomic():
+            self.create_rows(rows[-1], options['batch_size'])
+            for name, serializer_class, get_queryset in BENCHMARKS:
+                values_serializer = get_values_serializer(serializer_class)
+                for count in rows:
+                    paths = [
+                        ('model', lambda: serializer_class(get_queryset().order_by('pk')[:count], many=True).data),
+                        ('values', lambda: values_serializer.represent(
+                            values_serializer.plan(get_queryset().order_by('pk')[:count])
+                        )),
+                    ]
+                    contents = []
+                    for path, serialize in paths:
+                        content, duration, peak = self.measure(serialize)
+                        contents.append(content)
+                        self.stdout.write(
+                            f'{name:<18}{count:>8}{path:>8}{count / duration:>12.0f}{peak / 2 ** 20:>10.1f}'
+                        )
+                    if contents[0] != contents[1]:
+                        raise CommandError(f'The {name} output differs between the read paths.')
+            transaction.set_rollback(True)
+
+        self.stdout.write(self.style.SUCCESS('Both read paths rendered identical JSON.'))
@@ -0,0 +1,128 @@
+import random
+import time
+
+import numpy as np
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.alerts import SavedSearchMatcher
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+
+CITIES = [f'City {number}' for number in range(200)]
+LANDS = [land.value for land in FederalLands]
+TYPES = [housing_type.value for housing_type in HousingTypes]
+
+
+class Command(BaseCommand):
+    """
+    Compares matching announcements through the saved search index with a scan of all searches.
+
+    Both paths match the same synthetic announcements against the same synthetic saved
+    searches in memory. The scan evaluates every search with vectorized comparisons, which
+    is what re-running the stored searches costs at best. The command reports announcements
+    and matches per second of each path and checks that both find the same matches.
+    """
+    help = 'Benchmark the saved search matcher against a scan of all saved searches.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--searches',
+            type=int,
+            default=100000,
+            help='Number of saved searches.'
+        )
+        parser.add_argument(
+            '--announcements',
+            type=int,
+            default=1000,
+            help='Number of announcements to match.'
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed of the synthetic data.'
+        )
+
+    def make_searches(self, rng, count):
+        """
+        Builds saved search rows where each criterion is set with some probability.
+
+        Args:
+            rng (Random): The random generator.
+            count (int): The number of searches.
+
+        Returns:
+            list: `SEARCH_COLUMNS` rows.
+        """
+        rows = []
+        for search_id in range(1, count + 1):
+            min_price = rng.choice([None, rng.randrange(300, 1500, 50)])
+            max_price = rng.choice([None, (min_price or 300) + rng.randrange(100, 1500, 50)])
+            min_rooms = rng.choice([None, None, rng.randint(1, 3)])
+            max_rooms = rng.choice([None, (min_rooms or 1) + rng.randint(0, 3)])
+            rows.append((
+                search_id, search_id % 5000 + 1, True,
+                rng.choice(CITIES) if rng.random() < 0.9 else '',
+                rng.choice(LANDS) if rng.random() < 0.2 else '',
+                rng.choice(TYPES) if rng.random() < 0.6 else '',
+                min_price, max_price, min_rooms, max_rooms,
+            ))
+        return rows
+
+    def make_announcements(self, rng, count):
+        return [(rng.choice(CITIES), rng.choice(LANDS), rng.choice(TYPES), float(rng.randrange(300, 3000)),
+                 rng.randint(1, 6)) for _ in range(count)]
+
+    def scan(self, searches):
+        """
+        Builds a matcher that evaluates every search for every announcement.
+
+        Args:
+            searches (list): `SEARCH_COLUMNS` rows.
+
+        Returns:
+            callable: Returns the sorted matching search ids of an announcement.
+        """
+        ids = np.array([row[0] for row in searches], dtype=np.int64)
+        columns = [np.array([row[index] for row in searches], dtype=object) for index in (3, 4, 5)]
+        bounds = [np.array([np.nan if row[index] is None else row[index] for row in searches], dtype=float)
+                  for index in (6, 7, 8, 9)]
+        low_price, high_price, low_rooms, high_rooms = (np.nan_to_num(values, nan=default) for values, default in
+                                                        zip(bounds, (-np.inf, np.inf, -np.inf, np.inf)))
+
+        def match(city, land, type_of_object, price, rooms):
+            matching = (low_price <= price) & (high_price >= price) & (low_rooms <= rooms) & (high_rooms >= rooms)
+            for values, value in zip(columns, (city, land, type_of_object)):
+                matching &= (values == value) | (values == '')
+            return np.sort(ids[matching])
+        return match
+
+    def index(self, searches):
+        matcher = SavedSearchMatcher()
+        matcher.apply(searches)
+
+        def match(city, land, type_of_object, price, rooms):
+            return np.sort(matcher.match(city, land, type_of_object, price, rooms)[0])
+        return match
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        searches = self.make_searches(rng, options['searches'])
+        announcements = self.make_announcements(rng, options['announcements'])
+        self.stdout.write(f'{"path":>8}{"build s":>10}{"ann/s":>12}{"matches/s":>14}{"matches":>10}')
+
+        results = {}
+        for path, build in (('scan', self.scan), ('index', self.index)):
+            started = time.perf_counter()
+            match = build(searches)
+            built = time.perf_counter() - started
+            started = time.perf_counter()
+            results[path] = [match(*announcement) for announcement in announcements]
+            duration = time.perf_counter() - started
+            matches = sum(len(found) for found in results[path])
+            self.stdout.write(f'{path:>8}{built:>10.2f}{len(announcements) / duration:>12.0f}'
+                              f'{matches / duration:>14.0f}{matches:>10}')
+
+        if not all(np.array_equal(scan, index) for scan, index in zip(results['scan'], results['index'])):
+            self.stderr.write('The index and the scan found different matches.')
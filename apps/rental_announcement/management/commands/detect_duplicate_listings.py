@@ -0,0 +1,38 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.duplicates import detect_duplicates
+
+
+class Command(BaseCommand):
+    """
+    Signs every announcement and flags all near-duplicate pairs for moderation.
+
+    Saves sign and check announcements incrementally, so the command is meant to run once
+    after a deploy, after restoring archived announcements, and whenever the shingling or
+    hashing constants changed, which invalidates the stored signatures.
+    """
+    help = 'Detect near-duplicate announcements with MinHash signatures and LSH banding.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of announcements read and signed at once.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of rows written per query.'
+        )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        count, pairs = detect_duplicates(chunk_size=options['chunk_size'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Signed {count} announcements and found {pairs} duplicate pairs '
+            f'in {time.perf_counter() - started:.1f}s.'
+        ))
@@ -0,0 +1,199 @@
+import csv
+import io
+import zipfile
+from collections import defaultdict
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+from django.utils import timezone
+
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.filters.geo import tile_key
+from apps.rental_announcement.models import Address, Announcement, PostalCode
+
+BUNDLED_FILE = Path(__file__).resolve().parents[2] / 'data' / 'postal_code_centroids.csv'
+# Number of unknown postal codes listed in the report.
+MAX_REPORTED_POSTAL_CODES = 20
+
+
+class Command(BaseCommand):
+    """
+    Loads German postal code centroids into the `postal_codes` table.
+
+    The command never accesses the network. By default it loads the complete GeoNames
+    postal code dump of Germany (`DE.zip` or `DE.txt`) from `POSTAL_CODES_FILE`, which is
+    copied onto the host once. Without that file, the CSV bundled with the app
+    (`postal_code,place,latitude,longitude`) is loaded; it only covers central postal codes
+    of the major cities. Another file is loaded with `--file`, in the GeoNames format with
+    `--geonames`. GeoNames lists a postal code once per place, so a postal code spanning
+    several places gets the mean of their coordinates.
+
+    Existing postal codes are updated, and the coordinates and map tile keys of the
+    addresses whose centroid changed are refreshed afterwards, together with `updated_at`
+    of their announcements. Addresses whose postal code is still unknown are not geocoded;
+    they are kept with empty coordinates and reported.
+    """
+    help = 'Load German postal code centroids and geocode addresses.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--file',
+            help='Path of the centroid file, defaults to POSTAL_CODES_FILE or, if it is missing, '
+                 'to the bundled CSV.'
+        )
+        parser.add_argument(
+            '--geonames',
+            action='store_true',
+            help='Read --file in the tab separated GeoNames postal code format, optionally zipped.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of postal codes written per query.'
+        )
+
+    @staticmethod
+    def open_text(source):
+        """
+        Opens a centroid file for reading.
+
+        Args:
+            source (str): Path of the file. The first `.txt` member of a `.zip` archive is read.
+
+        Returns:
+            TextIO: The text of the file.
+        """
+        data = Path(source).read_bytes()
+        if zipfile.is_zipfile(io.BytesIO(data)):
+            with zipfile.ZipFile(io.BytesIO(data)) as archive:
+                name = next(name for name in archive.namelist() if name.endswith('.txt'))
+                data = archive.read(name)
+        return io.StringIO(data.decode('utf-8'), newline='')
+
+    def read_rows(self, source, geonames):
+        """
+        Reads the centroids from the file.
+
+        Args:
+            source (str): Path of the centroid file.
+            geonames (bool): Whether the file uses the GeoNames format.
+
+        Returns:
+            tuple: `PostalCode` instances keyed by postal code, and the number of rows
+                skipped for lacking a valid postal code or coordinates.
+        """
+        places = {}
+        coordinates = defaultdict(list)
+        skipped = 0
+        with self.open_text(source) as file:
+            if geonames:
+                # country, postal code, place, admin names and codes, latitude, longitude, accuracy
+                rows = ((row[1], row[2], row[9], row[10]) for row in csv.reader(file, delimiter='\t') if row)
+            else:
+                rows = ((row['postal_code'], row['place'], row['latitude'], row['longitude'])
+                        for row in csv.DictReader(file))
+            for postal_code, place, latitude, longitude in rows:
+                try:
+                    latitude, longitude = float(latitude), float(longitude)
+                except ValueError:
+                    skipped += 1
+                    continue
+                if len(postal_code) != 5 or not postal_code.isdigit():
+                    skipped += 1
+                    continue
+                places.setdefault(postal_code, place[:100])
+                coordinates[postal_code].append((latitude, longitude))
+
+        postal_codes = {}
+        for postal_code, points in coordinates.items():
+            latitude = sum(point[0] for point in points) / len(points)
+            longitude = sum(point[1] for point in points) / len(points)
+            postal_codes[postal_code] = PostalCode(
+                postal_code=postal_code,
+                place=places[postal_code],
+                latitude=latitude,
+                longitude=longitude,
+                tile_key=tile_key(latitude, longitude),
+            )
+        return postal_codes, skipped
+
+    @staticmethod
+    def changed_postal_codes():
+        """
+        Finds the postal codes whose addresses do not have the current centroid.
+
+        Returns:
+            list: The postal codes of addresses with outdated coordinates or tile keys.
+        """
+        centroids = {
+            postal_code: (latitude, longitude, key)
+            for postal_code, latitude, longitude, key
+            in PostalCode.objects.values_list('postal_code', 'latitude', 'longitude', 'tile_key')
+        }
+        geocoded = (Address.objects.order_by()
+                    .values_list('postal_code', 'latitude', 'longitude', 'tile_key')
+                    .distinct())
+        return sorted({
+            postal_code
+            for postal_code, *location in geocoded
+            if tuple(location) != centroids.get(postal_code, (None, None, None))
+        })
+
+    def handle(self, *args, **options):
+        geonames = options['geonames']
+        source = options['file']
+        if not source:
+            geonames = Path(settings.POSTAL_CODES_FILE).is_file()
+            source = settings.POSTAL_CODES_FILE if geonames else str(BUNDLED_FILE)
+            if not geonames:
+                self.stdout.write(self.style.WARNING(
+                    f'{settings.POSTAL_CODES_FILE} not found, loading the bundled centroids of the major cities only.'
+                ))
+        try:
+            postal_codes, skipped = self.read_rows(source, geonames)
+        except (OSError, KeyError, IndexError, StopIteration, UnicodeDecodeError, zipfile.BadZipFile) as error:
+            raise CommandError(f'Could not read {source}: {error}')
+
+        centroids = PostalCode.objects.filter(postal_code=OuterRef('postal_code'))
+        batch_size = options['batch_size']
+        with transaction.atomic():
+            PostalCode.objects.bulk_create(
+                postal_codes.values(),
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['postal_code'],
+                update_fields=['place', 'latitude', 'longitude', 'tile_key'],
+            )
+            # A queryset update skips the address post_save signal, so the announcements
+            # are touched here to change their conditional GET validators.
+            changed = self.changed_postal_codes()
+            now = timezone.now()
+            for start in range(0, len(changed), batch_size):
+                chunk = changed[start:start + batch_size]
+                Address.objects.filter(postal_code__in=chunk).update(
+                    latitude=Subquery(centroids.values('latitude')[:1]),
+                    longitude=Subquery(centroids.values('longitude')[:1]),
+                    tile_key=Subquery(centroids.values('tile_key')[:1]),
+                )
+                Announcement.objects.filter(address__postal_code__in=chunk).update(updated_at=now)
+
+        invalidate_search_cache()
+        ungeocoded = Address.objects.filter(latitude__isnull=True)
+        geocoded = Address.objects.count() - ungeocoded.count()
+        self.stdout.write(self.style.SUCCESS(
+            f'Loaded {len(postal_codes)} postal codes and geocoded {geocoded} addresses.'
+        ))
+        if skipped:
+            self.stdout.write(self.style.WARNING(f'Skipped {skipped} rows without a valid postal code or coordinates.'))
+        unknown = list(ungeocoded.order_by('postal_code').values_list('postal_code', flat=True).distinct())
+        if unknown:
+            listed = ', '.join(unknown[:MAX_REPORTED_POSTAL_CODES])
+            if len(unknown) > MAX_REPORTED_POSTAL_CODES:
+                listed += ', ...'
+            self.stdout.write(self.style.WARNING(
+                f'{ungeocoded.count()} addresses at {len(unknown)} unknown postal codes are not geocoded: {listed}.'
+            ))
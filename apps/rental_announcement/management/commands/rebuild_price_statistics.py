@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.rollups import rebuild_price_statistics
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the price statistics of every slice from the active announcements.
+
+    Counts and sums are maintained on every announcement change, but the percentiles and
+    shrinking price ranges are only computed here, so the command is meant to run
+    periodically and once after the `price_statistics` table is created.
+    """
+    help = 'Rebuild the price statistics per city, housing type and number of rooms.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of announcements read per database round trip.'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1000,
+            help='Number of statistics inserted per query.'
+        )
+
+    def handle(self, *args, **options):
+        slices = rebuild_price_statistics(chunk_size=options['chunk_size'], batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Price statistics rebuilt for {slices} slices.'))
@@ -0,0 +1,78 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.models import Announcement, Review
+from apps.rental_announcement.models.announcement import RATING_AGGREGATE_FIELDS
+
+
+class Command(BaseCommand):
+    """
+    Recomputes the stored rating aggregates of announcements from their reviews.
+
+    Announcements are processed in primary key order, one chunk per transaction,
+    so the command can run on a live database after a drift or a bulk import.
+    """
+    help = 'Rebuild review_count, rating_sum, rating and the grade histogram of announcements.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of announcements rebuilt per transaction.'
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        last_id = 0
+        rebuilt = 0
+
+        while True:
+            ids = list(
+                Announcement.objects.filter(pk__gt=last_id)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:chunk_size]
+            )
+            if not ids:
+                break
+
+            with transaction.atomic():
+                self.rebuild_chunk(ids)
+
+            rebuilt += len(ids)
+            last_id = ids[-1]
+            self.stdout.write(f'Rebuilt {rebuilt} announcements...')
+
+        invalidate_search_cache()
+        self.stdout.write(self.style.SUCCESS(f'Rating aggregates rebuilt for {rebuilt} announcements.'))
+
+    def rebuild_chunk(self, ids):
+        """
+        Recomputes and stores the rating aggregates for one chunk of announcements.
+
+        Args:
+            ids (list): Primary keys of the announcements in the chunk.
+        """
+        histograms = defaultdict(dict)
+        grade_counts = (Review.objects.filter(announcement_id__in=ids)
+                        .order_by()
+                        .values_list('announcement_id', 'grade')
+                        .annotate(count=Count('id')))
+        for announcement_id, grade, count in grade_counts:
+            histograms[announcement_id][grade] = count
+
+        announcements = list(
+            Announcement.objects.select_for_update().filter(pk__in=ids).only('id', *RATING_AGGREGATE_FIELDS)
+        )
+        for announcement in announcements:
+            histogram = histograms[announcement.pk]
+            announcement.set_rating_aggregates(
+                review_count=sum(histogram.values()),
+                rating_sum=sum(grade * count for grade, count in histogram.items()),
+                histogram=histogram,
+            )
+        Announcement.objects.bulk_update(announcements, RATING_AGGREGATE_FIELDS)
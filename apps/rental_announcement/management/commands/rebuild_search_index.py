@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.models import Announcement
+from apps.rental_announcement.search import get_search_backend
+
+
+class Command(BaseCommand):
+    """
+    Rebuilds the full-text search index of all announcements.
+
+    Needed after a bulk import that bypassed `Announcement.save`, after switching the
+    search backend and, for the MySQL backend, after migrating to its search documents or
+    changing its FULLTEXT settings.
+    """
+    help = 'Rebuild the full-text search index of announcements.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=1000,
+            help='Number of announcements loaded and indexed per batch.'
+        )
+
+    def handle(self, *args, **options):
+        backend = get_search_backend()
+        if not backend.maintains_index:
+            self.stdout.write('The configured search backend maintains its own index, nothing to do.')
+            return
+
+        chunk_size = options['chunk_size']
+        indexed = 0
+        chunk = []
+        announcements = Announcement.objects.order_by('pk').only('id', 'title', 'description')
+        for announcement in announcements.iterator(chunk_size=chunk_size):
+            chunk.append(announcement)
+            if len(chunk) == chunk_size:
+                backend.index_many(chunk)
+                indexed += len(chunk)
+                chunk = []
+                self.stdout.write(f'Indexed {indexed} announcements...')
+        if chunk:
+            backend.index_many(chunk)
+            indexed += len(chunk)
+
+        invalidate_search_cache()
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt for {indexed} announcements.'))
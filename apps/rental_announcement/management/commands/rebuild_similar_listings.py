@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.similarity import similar_listings
+
+
+class Command(BaseCommand):
+    """
+    Writes the similar listings index from all active announcements.
+
+    Saves keep the index current, so the command is meant to run once per host after a
+    deploy, and whenever the index file was lost or the feature layout changed.
+    """
+    help = 'Rebuild the memory-mapped similar listings index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=2000,
+            help='Number of announcements read per database round trip.'
+        )
+
+    def handle(self, *args, **options):
+        count = similar_listings.rebuild(chunk_size=options['chunk_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Similar listings index rebuilt for {count} announcements at {similar_listings.path}.'
+        ))
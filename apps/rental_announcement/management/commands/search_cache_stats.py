@@ -0,0 +1,25 @@
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand
+
+from apps.rental_announcement.cache import get_search_cache_stats
+from apps.rental_announcement.cache.search_cache import get_cache
+
+
+class Command(BaseCommand):
+    """
+    Prints the hit and miss counters of the announcement search cache.
+
+    The counters are read from the configured cache, which the web workers share unless it
+    is the per-process local memory cache; in that case this command cannot see them.
+    """
+    help = 'Show hit/miss statistics of the announcement search cache.'
+
+    def handle(self, *args, **options):
+        if isinstance(get_cache(), LocMemCache):
+            self.stderr.write(self.style.WARNING(
+                'The search cache uses the local memory backend, which is private to each process: '
+                'these counters are not those of the web workers. Configure a shared CACHE_URL.'
+            ))
+        stats = get_search_cache_stats()
+        for name, value in stats.items():
+            self.stdout.write(f'{name}: {value}')
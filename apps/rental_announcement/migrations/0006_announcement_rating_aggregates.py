@@ -0,0 +1,53 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0005_remove_announcement_deleted_at_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='grade_1_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='grade_2_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='grade_3_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='grade_4_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='grade_5_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='rating',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
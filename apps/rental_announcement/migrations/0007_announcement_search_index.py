@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:47
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def add_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute(
+            'ALTER TABLE announcements ADD FULLTEXT INDEX announcements_title_description_ft (title, description)'
+        )
+
+
+def drop_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE announcements DROP INDEX announcements_title_description_ft')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0006_announcement_rating_aggregates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField()),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='rental_announcement.announcement')),
+            ],
+            options={
+                'verbose_name': 'Search term',
+                'verbose_name_plural': 'Search terms',
+                'db_table': 'announcement_search_terms',
+                'unique_together': {('term', 'announcement')},
+            },
+        ),
+        migrations.RunPython(add_fulltext_index, drop_fulltext_index),
+    ]
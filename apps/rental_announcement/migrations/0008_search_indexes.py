@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:49
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0007_announcement_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['city'], name='address_city_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'created_at'], name='ann_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'price'], name='ann_active_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'rooms'], name='ann_active_rooms_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'rating'], name='ann_active_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'type_of_object', 'price'], name='ann_active_type_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'address', 'created_at'], name='ann_active_address_idx'),
+        ),
+    ]
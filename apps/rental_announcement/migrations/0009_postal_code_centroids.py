@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0008_search_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostalCode',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('postal_code', models.CharField(max_length=5, unique=True)),
+                ('place', models.CharField(max_length=100)),
+                ('latitude', models.FloatField()),
+                ('longitude', models.FloatField()),
+            ],
+            options={
+                'verbose_name': 'Postal code',
+                'verbose_name_plural': 'Postal codes',
+                'db_table': 'postal_codes',
+            },
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='latitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='address',
+            name='longitude',
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['latitude', 'longitude'], name='address_lat_lon_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:58
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0009_postal_code_centroids'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['announcement', 'is_approved', 'canceled', 'start_date', 'end_date'], name='booking_availability_idx'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-17 12:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0010_booking_availability_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['updated_at', 'id'], name='ann_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:06
+
+import django.core.validators
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0011_announcement_updated_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedAnnouncement',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=50)),
+                ('description', models.TextField()),
+                ('price', models.DecimalField(decimal_places=2, max_digits=10)),
+                ('rooms', models.SmallIntegerField()),
+                ('type_of_object', models.CharField(choices=[('Apartment', 'Apartment'), ('House', 'House'), ('Room', 'Room'), ('Studio', 'Studio'), ('Loft', 'Loft'), ('Duplex', 'Duplex'), ('Townhouse', 'Townhouse'), ('Condo', 'Condo'), ('Cottage', 'Cottage'), ('Villa', 'Villa'), ('Penthouse', 'Penthouse'), ('Hotel', 'Hotel'), ('Hostel', 'Hostel')], max_length=50)),
+                ('is_active', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted', models.BooleanField(default=False)),
+                ('review_count', models.PositiveIntegerField(default=0)),
+                ('rating_sum', models.PositiveIntegerField(default=0)),
+                ('rating', models.FloatField(default=0)),
+                ('grade_1_count', models.PositiveIntegerField(default=0)),
+                ('grade_2_count', models.PositiveIntegerField(default=0)),
+                ('grade_3_count', models.PositiveIntegerField(default=0)),
+                ('grade_4_count', models.PositiveIntegerField(default=0)),
+                ('grade_5_count', models.PositiveIntegerField(default=0)),
+                ('address', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_announcements', to='rental_announcement.address')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_announcements', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived announcement',
+                'verbose_name_plural': 'Archived announcements',
+                'db_table': 'archived_announcements',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedBooking',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Approved', 'Approved'), ('Cancelled', 'Cancelled')], default='Pending', max_length=20)),
+                ('is_approved', models.BooleanField(default=False)),
+                ('canceled', models.BooleanField(default=False)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('deleted_at', models.DateTimeField(blank=True, null=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='bookings', to='rental_announcement.archivedannouncement')),
+                ('renter', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_bookings', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived booking',
+                'verbose_name_plural': 'Archived bookings',
+                'db_table': 'archived_bookings',
+            },
+        ),
+        migrations.CreateModel(
+            name='ArchivedReview',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('message', models.TextField(validators=[django.core.validators.MinLengthValidator(20)])),
+                ('grade', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)])),
+                ('created_at', models.DateTimeField()),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='rental_announcement.archivedannouncement')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_reviews', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived review',
+                'verbose_name_plural': 'Archived reviews',
+                'db_table': 'archived_reviews',
+                'ordering': ['-created_at'],
+            },
+        ),
+    ]
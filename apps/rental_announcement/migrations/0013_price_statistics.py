@@ -0,0 +1,41 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0012_announcement_archive'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PriceStatistic',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('city', models.CharField(blank=True, max_length=50)),
+                ('type_of_object', models.CharField(blank=True, max_length=50)),
+                ('rooms', models.SmallIntegerField()),
+                ('count', models.IntegerField(default=0)),
+                ('price_sum', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('p10', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('p25', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('median', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('p75', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('p90', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Price statistic',
+                'verbose_name_plural': 'Price statistics',
+                'db_table': 'price_statistics',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='pricestatistic',
+            constraint=models.UniqueConstraint(fields=('city', 'type_of_object', 'rooms'), name='price_statistic_slice_uniq'),
+        ),
+    ]
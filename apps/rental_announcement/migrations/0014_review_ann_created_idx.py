@@ -0,0 +1,19 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0013_price_statistics'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['announcement', 'created_at', 'id'], name='review_ann_created_idx'),
+        ),
+    ]
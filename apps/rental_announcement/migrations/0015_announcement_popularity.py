@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:23
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0014_review_ann_created_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='announcement',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedannouncement',
+            name='trending_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedannouncement',
+            name='view_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'view_count'], name='ann_active_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'trending_score'], name='ann_active_trending_idx'),
+        ),
+    ]
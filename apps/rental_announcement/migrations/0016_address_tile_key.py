@@ -0,0 +1,42 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:29
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+from apps.rental_announcement.filters.geo import tile_key
+
+
+def fill_tile_keys(apps, schema_editor):
+    PostalCode = apps.get_model('rental_announcement', 'PostalCode')
+    Address = apps.get_model('rental_announcement', 'Address')
+    postal_codes = list(PostalCode.objects.only('id', 'latitude', 'longitude'))
+    for postal_code in postal_codes:
+        postal_code.tile_key = tile_key(postal_code.latitude, postal_code.longitude)
+    PostalCode.objects.bulk_update(postal_codes, ['tile_key'], batch_size=1000)
+    centroids = PostalCode.objects.filter(postal_code=OuterRef('postal_code'))
+    Address.objects.update(tile_key=Subquery(centroids.values('tile_key')[:1]))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0015_announcement_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='address',
+            name='tile_key',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='postalcode',
+            name='tile_key',
+            field=models.BigIntegerField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='address',
+            index=models.Index(fields=['tile_key'], name='address_tile_idx'),
+        ),
+        migrations.RunPython(fill_tile_keys, migrations.RunPython.noop),
+    ]
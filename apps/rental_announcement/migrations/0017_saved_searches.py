@@ -0,0 +1,73 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0016_address_tile_key'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SavedSearch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(blank=True, max_length=50)),
+                ('city', models.CharField(blank=True, max_length=50)),
+                ('federal_land', models.CharField(blank=True, choices=[('Baden-Württemberg', 'Baden-Württemberg'), ('Bayern', 'Bayern'), ('Berlin', 'Berlin'), ('Brandenburg', 'Brandenburg'), ('Bremen', 'Bremen'), ('Hamburg', 'Hamburg'), ('Hessen', 'Hessen'), ('Mecklenburg-Vorpommern', 'Mecklenburg-Vorpommern'), ('Niedersachsen', 'Niedersachsen'), ('Nordrhein-Westfalen', 'Nordrhein-Westfalen'), ('Rheinland-Pfalz', 'Rheinland-Pfalz'), ('Saarland', 'Saarland'), ('Sachsen', 'Sachsen'), ('Sachsen-Anhalt', 'Sachsen-Anhalt'), ('Schleswig-Holstein', 'Schleswig-Holstein'), ('Thüringen', 'Thüringen')], max_length=50)),
+                ('type_of_object', models.CharField(blank=True, choices=[('Apartment', 'Apartment'), ('House', 'House'), ('Room', 'Room'), ('Studio', 'Studio'), ('Loft', 'Loft'), ('Duplex', 'Duplex'), ('Townhouse', 'Townhouse'), ('Condo', 'Condo'), ('Cottage', 'Cottage'), ('Villa', 'Villa'), ('Penthouse', 'Penthouse'), ('Hotel', 'Hotel'), ('Hostel', 'Hostel')], max_length=50)),
+                ('min_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('max_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True)),
+                ('min_rooms', models.SmallIntegerField(blank=True, null=True)),
+                ('max_rooms', models.SmallIntegerField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='saved_searches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Saved search',
+                'verbose_name_plural': 'Saved searches',
+                'db_table': 'saved_searches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchMatch',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('notified_at', models.DateTimeField(blank=True, null=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_matches', to='rental_announcement.announcement')),
+                ('saved_search', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='matches', to='rental_announcement.savedsearch')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_matches', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Search match',
+                'verbose_name_plural': 'Search matches',
+                'db_table': 'saved_search_matches',
+                'ordering': ['-created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['user', 'is_active', 'created_at'], name='saved_search_user_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='savedsearch',
+            index=models.Index(fields=['updated_at'], name='saved_search_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='searchmatch',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='search_match_user_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='searchmatch',
+            constraint=models.UniqueConstraint(fields=('saved_search', 'announcement'), name='search_match_unique'),
+        ),
+    ]
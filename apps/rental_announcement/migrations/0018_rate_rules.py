@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:40
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0017_saved_searches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RateRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('Season', 'Season'), ('Weekend', 'Weekend'), ('Minimum nights', 'Minimum nights'), ('Length of stay', 'Length of stay')], max_length=20)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('nightly_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('percent', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0')), django.core.validators.MaxValueValidator(Decimal('100'))])),
+                ('nights', models.PositiveSmallIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)])),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_rules', to='rental_announcement.announcement')),
+            ],
+            options={
+                'verbose_name': 'Rate rule',
+                'verbose_name_plural': 'Rate rules',
+                'db_table': 'announcement_rate_rules',
+                'ordering': ['kind', 'start_date', 'id'],
+                'indexes': [models.Index(fields=['announcement', 'kind'], name='rate_rule_announcement_idx')],
+            },
+        ),
+    ]
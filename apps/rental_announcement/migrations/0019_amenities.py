@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:46
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0018_rate_rules'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='announcement',
+            name='amenities',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='archivedannouncement',
+            name='amenities',
+            field=models.PositiveBigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='announcement',
+            index=models.Index(fields=['is_active', 'amenities'], name='ann_active_amenities_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.0.6 on 2026-10-17 13:53
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0019_amenities'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ListingSignature',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='signature', serialize=False, to='rental_announcement.announcement')),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Listing signature',
+                'verbose_name_plural': 'Listing signatures',
+                'db_table': 'announcement_signatures',
+            },
+        ),
+        migrations.CreateModel(
+            name='SignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('bucket', models.BigIntegerField()),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='rental_announcement.announcement')),
+            ],
+            options={
+                'verbose_name': 'Signature band',
+                'verbose_name_plural': 'Signature bands',
+                'db_table': 'announcement_signature_bands',
+            },
+        ),
+        migrations.CreateModel(
+            name='DuplicateListing',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('similarity', models.FloatField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Confirmed', 'Confirmed'), ('Dismissed', 'Dismissed')], default='Pending', max_length=20)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_flags', to='rental_announcement.announcement')),
+                ('original', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='duplicate_copies', to='rental_announcement.announcement')),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='reviewed_duplicates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Duplicate listing',
+                'verbose_name_plural': 'Duplicate listings',
+                'db_table': 'duplicate_listings',
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['status', 'created_at', 'id'], name='duplicate_status_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='duplicatelisting',
+            constraint=models.UniqueConstraint(fields=('announcement', 'original'), name='duplicate_listing_pair_uniq'),
+        ),
+        migrations.AddIndex(
+            model_name='signatureband',
+            index=models.Index(fields=['bucket', 'announcement'], name='signature_band_bucket_idx'),
+        ),
+    ]
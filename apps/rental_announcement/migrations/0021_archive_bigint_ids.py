@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0020_duplicate_listings'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedannouncement',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='archivedbooking',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+        migrations.AlterField(
+            model_name='archivedreview',
+            name='id',
+            field=models.BigIntegerField(primary_key=True, serialize=False),
+        ),
+    ]
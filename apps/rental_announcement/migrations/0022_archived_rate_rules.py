@@ -0,0 +1,35 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:24
+
+import django.core.validators
+import django.db.models.deletion
+from decimal import Decimal
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0021_archive_bigint_ids'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedRateRule',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(choices=[('Season', 'Season'), ('Weekend', 'Weekend'), ('Minimum nights', 'Minimum nights'), ('Length of stay', 'Length of stay')], max_length=20)),
+                ('start_date', models.DateField(blank=True, null=True)),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('nightly_price', models.DecimalField(blank=True, decimal_places=2, max_digits=10, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0'))])),
+                ('percent', models.DecimalField(blank=True, decimal_places=2, max_digits=5, null=True, validators=[django.core.validators.MinValueValidator(Decimal('0')), django.core.validators.MaxValueValidator(Decimal('100'))])),
+                ('nights', models.PositiveSmallIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)])),
+                ('created_at', models.DateTimeField()),
+                ('announcement', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='rate_rules', to='rental_announcement.archivedannouncement')),
+            ],
+            options={
+                'verbose_name': 'Archived rate rule',
+                'verbose_name_plural': 'Archived rate rules',
+                'db_table': 'archived_rate_rules',
+            },
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def replace_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE announcements DROP INDEX announcements_title_description_ft')
+        schema_editor.execute(
+            'ALTER TABLE announcement_search_documents ADD FULLTEXT INDEX announcement_search_documents_ft (text)'
+        )
+
+
+def restore_fulltext_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'mysql':
+        schema_editor.execute('ALTER TABLE announcement_search_documents DROP INDEX announcement_search_documents_ft')
+        schema_editor.execute(
+            'ALTER TABLE announcements ADD FULLTEXT INDEX announcements_title_description_ft (title, description)'
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0022_archived_rate_rules'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('announcement', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='rental_announcement.announcement')),
+                ('text', models.TextField()),
+            ],
+            options={
+                'verbose_name': 'Search document',
+                'verbose_name_plural': 'Search documents',
+                'db_table': 'announcement_search_documents',
+            },
+        ),
+        migrations.RunPython(replace_fulltext_index, restore_fulltext_index),
+    ]
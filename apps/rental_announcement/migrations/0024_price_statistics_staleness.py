@@ -0,0 +1,26 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:33
+
+from django.db import migrations, models
+
+
+def clear_price_statistics(apps, schema_editor):
+    # The "any rooms" rows shared rooms=0 with the studio slices and cannot be told apart;
+    # `rebuild_price_statistics` recreates the table after migrating.
+    PriceStatistic = apps.get_model('rental_announcement', 'PriceStatistic')
+    PriceStatistic.objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0023_search_documents'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='pricestatistic',
+            name='is_stale',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.RunPython(clear_price_statistics, migrations.RunPython.noop),
+    ]
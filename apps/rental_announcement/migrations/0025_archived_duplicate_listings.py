@@ -0,0 +1,34 @@
+# Generated by Django 5.0.6 on 2026-10-17 14:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('rental_announcement', '0024_price_statistics_staleness'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedDuplicateListing',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('announcement_id', models.BigIntegerField(db_index=True)),
+                ('original_id', models.BigIntegerField(db_index=True)),
+                ('similarity', models.FloatField()),
+                ('status', models.CharField(choices=[('Pending', 'Pending'), ('Confirmed', 'Confirmed'), ('Dismissed', 'Dismissed')], default='Pending', max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('reviewed_at', models.DateTimeField(blank=True, null=True)),
+                ('reviewed_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_reviewed_duplicates', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Archived duplicate listing',
+                'verbose_name_plural': 'Archived duplicate listings',
+                'db_table': 'archived_duplicate_listings',
+            },
+        ),
+    ]
@@ -2,3 +2,16 @@ from apps.rental_announcement.models.announcement import Announcement
 from apps.rental_announcement.models.addresses import Address
 from apps.rental_announcement.models.booking import Booking
 from apps.rental_announcement.models.review import Review
+from apps.rental_announcement.models.search_term import SearchDocument, SearchTerm
+from apps.rental_announcement.models.postal_code import PostalCode
+from apps.rental_announcement.models.price_statistic import PriceStatistic
+from apps.rental_announcement.models.archive import (
+    ArchivedAnnouncement,
+    ArchivedBooking,
+    ArchivedDuplicateListing,
+    ArchivedRateRule,
+    ArchivedReview,
+)
+from apps.rental_announcement.models.saved_search import SavedSearch, SearchMatch
+from apps.rental_announcement.models.rate_rule import RateRule
+from apps.rental_announcement.models.duplicate_listing import DuplicateListing, ListingSignature, SignatureBand
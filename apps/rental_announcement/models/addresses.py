@@ -1,5 +1,6 @@
 from django.db import models
 from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.models.postal_code import PostalCode
 
 class Address(models.Model):
     """
@@ -11,18 +12,43 @@ class Address(models.Model):
         street (str): The street of the address.
         house_number (str): The house number of the address.
         postal_code (str): The postal code of the address.
+        latitude (float): The latitude of the postal code centroid, if the postal code is known.
+        longitude (float): The longitude of the postal code centroid, if the postal code is known.
+        tile_key (int): The map tile key of the postal code centroid, if the postal code is known.
     """
     federal_land = models.CharField(max_length=50, choices=FederalLands.choices())
     city = models.CharField(max_length=50)
     street = models.CharField(max_length=75)
     house_number = models.CharField(max_length=5)
     postal_code = models.CharField(max_length=5)
+    latitude = models.FloatField(blank=True, null=True)
+    longitude = models.FloatField(blank=True, null=True)
+    tile_key = models.BigIntegerField(blank=True, null=True)
 
     class Meta:
         db_table = 'addresses'
         verbose_name = 'Address'
         verbose_name_plural = 'Addresses'
         unique_together = ['federal_land', 'city', 'street', 'house_number', 'postal_code']
+        # `federal_land` lookups are served by the leading column of the unique constraint.
+        indexes = [
+            models.Index(fields=['city'], name='address_city_idx'),
+            models.Index(fields=['latitude', 'longitude'], name='address_lat_lon_idx'),
+            models.Index(fields=['tile_key'], name='address_tile_idx'),
+        ]
 
     def __str__(self):
         return f"{self.street}, {self.house_number}, {self.postal_code}, {self.city}"
+
+    def save(self, *args, **kwargs):
+        """
+        Saves the address with coordinates and tile key taken from the centroid of its postal code.
+        """
+        centroid = (PostalCode.objects.filter(postal_code=self.postal_code)
+                    .values_list('latitude', 'longitude', 'tile_key')
+                    .first())
+        self.latitude, self.longitude, self.tile_key = centroid or (None, None, None)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'postal_code' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'latitude', 'longitude', 'tile_key'}
+        super().save(*args, **kwargs)
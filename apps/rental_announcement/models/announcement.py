@@ -1,9 +1,71 @@
-from django.db import models
-from django.db.models import Avg
+from django.db import models, transaction
+from django.db.models import Value
 
 from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models.review import Review
 from apps.users.models import User
 
+RATING_GRADES = range(1, 6)
+RATING_AGGREGATE_FIELDS = [
+    'review_count', 'rating_sum', 'rating',
+    *(f'grade_{grade}_count' for grade in RATING_GRADES),
+]
+
+
+def average_rating(review_count, rating):
+    """
+    Computes the displayed average rating from the stored rating aggregates.
+
+    Args:
+        review_count (int): The number of reviews.
+        rating (float): The mean grade of the reviews.
+
+    Returns:
+        float: The average rating rounded to one decimal place. If there are no reviews, returns 0.
+    """
+    if review_count:
+        return round(rating, 1)
+    return 0
+
+
+class AnnouncementQuerySet(models.QuerySet):
+    """
+    QuerySet with helpers that load everything the announcement serializers need
+    in a fixed number of queries.
+    """
+
+    def active(self):
+        """
+        Filters active announcements.
+
+        The comparison uses an expression so that every backend renders `is_active = true`
+        instead of a bare boolean column, which SQLite cannot seek on with the composite
+        `is_active` indexes.
+
+        Returns:
+            QuerySet: The active announcements.
+        """
+        return self.filter(is_active=Value(True))
+
+    def for_list(self):
+        """
+        Prepares the queryset for the list serializer.
+
+        Returns:
+            QuerySet: The queryset with owner and address joined.
+        """
+        return self.select_related('owner', 'address')
+
+    def for_detail(self):
+        """
+        Prepares the queryset for the detail serializer.
+
+        Returns:
+            QuerySet: The list queryset with the embedded reviews and their authors prefetched.
+        """
+        return self.for_list().prefetch_related(Review.objects.embedded_prefetch())
+
+
 class Announcement(models.Model):
     """
     Model representing a rental announcement.
@@ -16,10 +78,17 @@ class Announcement(models.Model):
         price (Decimal): The price of the rental.
         rooms (int): The number of rooms in the rental.
         type_of_object (str): The type of housing (e.g., apartment, house).
+        amenities (int): The bitmask of the announcement's `Amenities`.
         is_active (bool): Indicates if the announcement is active.
         created_at (datetime): The date and time when the announcement was created.
         updated_at (datetime): The date and time when the announcement was last updated.
         deleted (bool): Indicates if the announcement has been deleted.
+        review_count (int): The number of reviews left for the announcement.
+        rating_sum (int): The sum of all review grades.
+        rating (float): The average review grade, kept in sync with `rating_sum` and `review_count`.
+        grade_1_count .. grade_5_count (int): The number of reviews per grade.
+        view_count (int): The number of detail views, written behind by the view counter.
+        trending_score (float): The log2 of the decayed view count, normalized to a fixed epoch.
     """
     title = models.CharField(max_length=50)
     description = models.TextField()
@@ -32,10 +101,23 @@ class Announcement(models.Model):
     price = models.DecimalField(max_digits=10, decimal_places=2)
     rooms = models.SmallIntegerField()
     type_of_object = models.CharField(max_length=50, choices=HousingTypes.choices())
+    amenities = models.PositiveBigIntegerField(default=0)
     is_active = models.BooleanField(default=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     deleted = models.BooleanField(default=False)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating = models.FloatField(default=0)
+    grade_1_count = models.PositiveIntegerField(default=0)
+    grade_2_count = models.PositiveIntegerField(default=0)
+    grade_3_count = models.PositiveIntegerField(default=0)
+    grade_4_count = models.PositiveIntegerField(default=0)
+    grade_5_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0)
+
+    objects = AnnouncementQuerySet.as_manager()
 
     def __str__(self):
         return self.title
@@ -45,17 +127,89 @@ class Announcement(models.Model):
         ordering = ['-created_at']
         verbose_name = 'Announcement'
         verbose_name_plural = 'Announcements'
+        # Every search filters on `is_active`, so it leads each index; the second column
+        # serves the range filter or the ordering of the canonical AnnouncementFilter queries.
+        indexes = [
+            models.Index(fields=['is_active', 'created_at'], name='ann_active_created_idx'),
+            models.Index(fields=['is_active', 'price'], name='ann_active_price_idx'),
+            models.Index(fields=['is_active', 'rooms'], name='ann_active_rooms_idx'),
+            models.Index(fields=['is_active', 'rating'], name='ann_active_rating_idx'),
+            models.Index(fields=['is_active', 'view_count'], name='ann_active_views_idx'),
+            models.Index(fields=['is_active', 'trending_score'], name='ann_active_trending_idx'),
+            models.Index(fields=['is_active', 'type_of_object', 'price'], name='ann_active_type_price_idx'),
+            models.Index(fields=['is_active', 'address', 'created_at'], name='ann_active_address_idx'),
+            # Bitwise amenity predicates are checked on the index entries, without reading rows.
+            models.Index(fields=['is_active', 'amenities'], name='ann_active_amenities_idx'),
+            # Keyset order of the delta feed, which also returns inactive announcements.
+            models.Index(fields=['updated_at', 'id'], name='ann_updated_idx'),
+        ]
 
     @property
     def average_rating(self):
         """
-        Calculates the average rating of the announcement based on its reviews.
+        Returns the average rating of the announcement from the stored aggregates.
 
         Returns:
             float: The average rating rounded to one decimal place. If there are no reviews, returns 0.
         """
-        reviews = self.reviews.all()
-        if reviews:
-            avg_rate = sum(review.grade for review in reviews) / len(reviews)
-            return round(avg_rate, 1)
-        return 0
+        return average_rating(self.review_count, self.rating)
+
+    @property
+    def rating_histogram(self):
+        """
+        Returns the number of reviews per grade.
+
+        Returns:
+            dict: A mapping of each grade from 1 to 5 to its number of reviews.
+        """
+        return {grade: getattr(self, f'grade_{grade}_count') for grade in RATING_GRADES}
+
+    def set_rating_aggregates(self, review_count, rating_sum, histogram):
+        """
+        Assigns the rating aggregates without saving them.
+
+        Args:
+            review_count (int): The number of reviews.
+            rating_sum (int): The sum of all review grades.
+            histogram (dict): A mapping of each grade to its number of reviews.
+        """
+        self.review_count = review_count
+        self.rating_sum = rating_sum
+        self.rating = rating_sum / review_count if review_count else 0
+        for grade in RATING_GRADES:
+            setattr(self, f'grade_{grade}_count', histogram.get(grade, 0))
+
+    @classmethod
+    def update_rating(cls, announcement_id, removed_grade=None, added_grade=None):
+        """
+        Applies a single review change to the stored rating aggregates.
+
+        `updated_at` is refreshed as well, since the reviews are part of the announcement
+        representation and its conditional GET validators. The announcement row is locked for
+        the duration of the update, so concurrent review changes on the same announcement are
+        applied one after another.
+
+        Args:
+            announcement_id (int): The primary key of the reviewed announcement.
+            removed_grade (int, optional): The grade of a review that was deleted or replaced.
+            added_grade (int, optional): The grade of a review that was created or updated.
+        """
+        with transaction.atomic():
+            announcement = (cls.objects.select_for_update()
+                            .only('id', *RATING_AGGREGATE_FIELDS)
+                            .get(pk=announcement_id))
+            review_count = announcement.review_count
+            rating_sum = announcement.rating_sum
+            histogram = announcement.rating_histogram
+
+            if removed_grade is not None:
+                review_count -= 1
+                rating_sum -= removed_grade
+                histogram[removed_grade] -= 1
+            if added_grade is not None:
+                review_count += 1
+                rating_sum += added_grade
+                histogram[added_grade] += 1
+
+            announcement.set_rating_aggregates(review_count, rating_sum, histogram)
+            announcement.save(update_fields=[*RATING_AGGREGATE_FIELDS, 'updated_at'])
@@ -0,0 +1,197 @@
+from decimal import Decimal
+
+from django.core.validators import MinLengthValidator, MinValueValidator, MaxValueValidator
+from django.db import models
+
+from apps.rental_announcement.choices.booking_status import BookingStatus
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.choices.rate_rule_kinds import RateRuleKinds
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models.announcement import RATING_GRADES, average_rating
+from apps.rental_announcement.models.review import ReviewQuerySet
+from apps.users.models import User
+
+
+class ArchivedAnnouncementQuerySet(models.QuerySet):
+    """
+    QuerySet with the same loading helper as `AnnouncementQuerySet.for_detail`.
+    """
+
+    def for_detail(self):
+        """
+        Prepares the queryset for the detail serializer.
+
+        Returns:
+            QuerySet: The queryset with owner and address joined and the embedded reviews prefetched.
+        """
+        return self.select_related('owner', 'address').prefetch_related(ArchivedReview.objects.embedded_prefetch())
+
+
+class ArchivedAnnouncement(models.Model):
+    """
+    Model representing an inactive or deleted announcement moved out of the `announcements` table.
+
+    Rows keep the primary key and every column of the announcement, so reads by primary key
+    can fall back to the archive and restores put the same row back. Timestamps are plain
+    columns, so archiving does not touch them.
+
+    Attributes:
+        Same as `Announcement`.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=50)
+    description = models.TextField()
+    owner = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_announcements')
+    address = models.ForeignKey(
+        'rental_announcement.Address',
+        on_delete=models.CASCADE,
+        related_name='archived_announcements'
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    rooms = models.SmallIntegerField()
+    type_of_object = models.CharField(max_length=50, choices=HousingTypes.choices())
+    amenities = models.PositiveBigIntegerField(default=0)
+    is_active = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted = models.BooleanField(default=False)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    rating = models.FloatField(default=0)
+    grade_1_count = models.PositiveIntegerField(default=0)
+    grade_2_count = models.PositiveIntegerField(default=0)
+    grade_3_count = models.PositiveIntegerField(default=0)
+    grade_4_count = models.PositiveIntegerField(default=0)
+    grade_5_count = models.PositiveIntegerField(default=0)
+    view_count = models.PositiveIntegerField(default=0)
+    trending_score = models.FloatField(default=0)
+
+    objects = ArchivedAnnouncementQuerySet.as_manager()
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        db_table = 'archived_announcements'
+        verbose_name = 'Archived announcement'
+        verbose_name_plural = 'Archived announcements'
+
+    @property
+    def average_rating(self):
+        """
+        Returns the average rating of the announcement from the stored aggregates.
+
+        Returns:
+            float: The average rating rounded to one decimal place. If there are no reviews, returns 0.
+        """
+        return average_rating(self.review_count, self.rating)
+
+    @property
+    def rating_histogram(self):
+        """
+        Returns the number of reviews per grade.
+
+        Returns:
+            dict: A mapping of each grade from 1 to 5 to its number of reviews.
+        """
+        return {grade: getattr(self, f'grade_{grade}_count') for grade in RATING_GRADES}
+
+
+class ArchivedReview(models.Model):
+    """
+    Model representing a review of an archived announcement.
+
+    Attributes:
+        Same as `Review`, with `announcement` pointing to the archived announcement.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_reviews')
+    announcement = models.ForeignKey(ArchivedAnnouncement, on_delete=models.CASCADE, related_name='reviews')
+    message = models.TextField(validators=[MinLengthValidator(20)])
+    grade = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
+    created_at = models.DateTimeField()
+
+    objects = ReviewQuerySet.as_manager()
+
+    class Meta:
+        db_table = 'archived_reviews'
+        ordering = ['-created_at']
+        verbose_name = 'Archived review'
+        verbose_name_plural = 'Archived reviews'
+
+
+class ArchivedBooking(models.Model):
+    """
+    Model representing a finished booking of an archived announcement.
+
+    Attributes:
+        Same as `Booking`, with `announcement` pointing to the archived announcement.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    renter = models.ForeignKey(User, on_delete=models.CASCADE, related_name='archived_bookings')
+    announcement = models.ForeignKey(ArchivedAnnouncement, on_delete=models.CASCADE, related_name='bookings')
+    start_date = models.DateField()
+    end_date = models.DateField()
+    status = models.CharField(max_length=20, choices=BookingStatus.choices(), default=BookingStatus.PENDING.value)
+    is_approved = models.BooleanField(default=False)
+    canceled = models.BooleanField(default=False)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    deleted_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'archived_bookings'
+        verbose_name = 'Archived booking'
+        verbose_name_plural = 'Archived bookings'
+
+
+class ArchivedRateRule(models.Model):
+    """
+    Model representing a pricing rule of an archived announcement.
+
+    Attributes:
+        Same as `RateRule`, with `announcement` pointing to the archived announcement.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    announcement = models.ForeignKey(ArchivedAnnouncement, on_delete=models.CASCADE, related_name='rate_rules')
+    kind = models.CharField(max_length=20, choices=RateRuleKinds.choices())
+    start_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True)
+    nightly_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True,
+                                        validators=[MinValueValidator(Decimal('0'))])
+    percent = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True,
+                                  validators=[MinValueValidator(Decimal('0')), MaxValueValidator(Decimal('100'))])
+    nights = models.PositiveSmallIntegerField(blank=True, null=True, validators=[MinValueValidator(1)])
+    created_at = models.DateTimeField()
+
+    class Meta:
+        db_table = 'archived_rate_rules'
+        verbose_name = 'Archived rate rule'
+        verbose_name_plural = 'Archived rate rules'
+
+
+class ArchivedDuplicateListing(models.Model):
+    """
+    Model representing a duplicate flag of which at least one announcement is archived.
+
+    The two announcements are plain columns, since either of them can be in the hot or in
+    the archive table. A flag is restored once both of its announcements are current again,
+    so moderation decisions survive the round trip.
+
+    Attributes:
+        Same as `DuplicateListing`, with `announcement_id` and `original_id` as plain columns.
+    """
+    id = models.BigIntegerField(primary_key=True)
+    announcement_id = models.BigIntegerField(db_index=True)
+    original_id = models.BigIntegerField(db_index=True)
+    similarity = models.FloatField()
+    status = models.CharField(max_length=20, choices=DuplicateStatus.choices(), default=DuplicateStatus.PENDING.value)
+    created_at = models.DateTimeField()
+    reviewed_at = models.DateTimeField(blank=True, null=True)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True,
+                                    related_name='archived_reviewed_duplicates')
+
+    class Meta:
+        db_table = 'archived_duplicate_listings'
+        verbose_name = 'Archived duplicate listing'
+        verbose_name_plural = 'Archived duplicate listings'
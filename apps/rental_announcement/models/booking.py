@@ -34,3 +34,9 @@ class Booking(models.Model):
         db_table = 'bookings'
         verbose_name = 'Booking'
         verbose_name_plural = 'Bookings'
+        indexes = [
+            models.Index(
+                fields=['announcement', 'is_approved', 'canceled', 'start_date', 'end_date'],
+                name='booking_availability_idx',
+            ),
+        ]
@@ -0,0 +1,95 @@
+from django.db import models
+
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.users.models import User
+
+
+class ListingSignature(models.Model):
+    """
+    Model representing the MinHash signature of the title and description of an announcement.
+
+    Attributes:
+        announcement (Announcement): The signed announcement.
+        signature (bytes): The signature as little-endian uint32 minimums, one per permutation.
+        updated_at (datetime): The date and time when the signature was computed.
+    """
+    announcement = models.OneToOneField('Announcement', on_delete=models.CASCADE, primary_key=True,
+                                        related_name='signature')
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'announcement_signatures'
+        verbose_name = 'Listing signature'
+        verbose_name_plural = 'Listing signatures'
+
+    def __str__(self):
+        return f"Signature of {self.announcement_id}"
+
+
+class SignatureBand(models.Model):
+    """
+    Model representing one LSH band bucket of a listing signature.
+
+    Every signature is split into bands, and each band is hashed together with its number
+    into `bucket`. Announcements sharing a bucket are candidate duplicates.
+
+    Attributes:
+        announcement (Announcement): The signed announcement.
+        bucket (int): The hash of one band of the signature.
+    """
+    announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='signature_bands')
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        db_table = 'announcement_signature_bands'
+        verbose_name = 'Signature band'
+        verbose_name_plural = 'Signature bands'
+        indexes = [
+            # Candidate lookup of a new signature, one entry per band.
+            models.Index(fields=['bucket', 'announcement'], name='signature_band_bucket_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.bucket} of {self.announcement_id}"
+
+
+class DuplicateListing(models.Model):
+    """
+    Model representing a suspected duplicate listing awaiting or after moderation.
+
+    Of two near-identical announcements, the newer one is the suspected copy of the older one.
+
+    Attributes:
+        announcement (Announcement): The newer announcement, suspected to be a copy.
+        original (Announcement): The older announcement.
+        similarity (float): The estimated Jaccard similarity of their shingles.
+        status (str): The moderation status.
+        created_at (datetime): The date and time when the pair was detected.
+        reviewed_at (datetime): The date and time when a moderator decided, if already.
+        reviewed_by (User): The moderator who decided, if any.
+    """
+    announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='duplicate_flags')
+    original = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='duplicate_copies')
+    similarity = models.FloatField()
+    status = models.CharField(max_length=20, choices=DuplicateStatus.choices(), default=DuplicateStatus.PENDING.value)
+    created_at = models.DateTimeField(auto_now_add=True)
+    reviewed_at = models.DateTimeField(blank=True, null=True)
+    reviewed_by = models.ForeignKey(User, on_delete=models.SET_NULL, blank=True, null=True,
+                                    related_name='reviewed_duplicates')
+
+    class Meta:
+        db_table = 'duplicate_listings'
+        ordering = ['-created_at']
+        verbose_name = 'Duplicate listing'
+        verbose_name_plural = 'Duplicate listings'
+        constraints = [
+            # A pair is reported once, so dismissed pairs stay dismissed after later edits.
+            models.UniqueConstraint(fields=['announcement', 'original'], name='duplicate_listing_pair_uniq'),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at', 'id'], name='duplicate_status_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.announcement_id} duplicates {self.original_id}"
@@ -0,0 +1,30 @@
+from django.db import models
+
+
+class PostalCode(models.Model):
+    """
+    Model representing the centroid of a German postal code area.
+
+    Loaded offline with the `load_postal_codes` management command and used to
+    geocode addresses without calling an external service.
+
+    Attributes:
+        postal_code (str): The five-digit postal code.
+        place (str): The main place name of the postal code area.
+        latitude (float): The latitude of the area centroid in degrees.
+        longitude (float): The longitude of the area centroid in degrees.
+        tile_key (int): The map tile key of the centroid, see `filters.geo.tile_key`.
+    """
+    postal_code = models.CharField(max_length=5, unique=True)
+    place = models.CharField(max_length=100)
+    latitude = models.FloatField()
+    longitude = models.FloatField()
+    tile_key = models.BigIntegerField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'postal_codes'
+        verbose_name = 'Postal code'
+        verbose_name_plural = 'Postal codes'
+
+    def __str__(self):
+        return f"{self.postal_code} {self.place}"
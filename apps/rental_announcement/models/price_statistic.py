@@ -0,0 +1,72 @@
+from django.db import models
+
+# Slice value standing for every city, every housing type or every room count. Rooms use -1,
+# since 0 is the room count of studios.
+ANY_CITY = ''
+ANY_TYPE = ''
+ANY_ROOMS = -1
+
+
+class PriceStatistic(models.Model):
+    """
+    Model representing the price distribution of the active announcements in one slice.
+
+    A slice is a city, a housing type and a number of rooms, where each dimension can be
+    `ANY_CITY`, `ANY_TYPE` or `ANY_ROOMS` to cover all of its values. Every combination that
+    has announcements has its own row, so any slice is read with one unique index lookup.
+
+    `count` and `price_sum` are kept current on every announcement change. The order
+    statistics are computed by the `rebuild_price_statistics` command; in between, changes
+    only widen `min_price` and `max_price` and mark the slice as stale. Slices without
+    announcements are deleted.
+
+    Attributes:
+        city (str): The city of the slice.
+        type_of_object (str): The housing type of the slice.
+        rooms (int): The number of rooms of the slice.
+        count (int): The number of active announcements in the slice.
+        price_sum (Decimal): The sum of their prices.
+        min_price (Decimal): The lowest price.
+        max_price (Decimal): The highest price.
+        p10, p25, median, p75, p90 (Decimal): The price percentiles as of the last rebuild.
+        rebuilt_at (datetime): When the percentiles were last computed.
+        is_stale (bool): Whether announcements of the slice changed since then.
+    """
+    city = models.CharField(max_length=50, blank=True)
+    type_of_object = models.CharField(max_length=50, blank=True)
+    rooms = models.SmallIntegerField()
+    count = models.IntegerField(default=0)
+    price_sum = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p10 = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p25 = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    median = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p75 = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    p90 = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    rebuilt_at = models.DateTimeField(blank=True, null=True)
+    is_stale = models.BooleanField(default=False)
+
+    class Meta:
+        db_table = 'price_statistics'
+        verbose_name = 'Price statistic'
+        verbose_name_plural = 'Price statistics'
+        constraints = [
+            models.UniqueConstraint(fields=['city', 'type_of_object', 'rooms'], name='price_statistic_slice_uniq'),
+        ]
+
+    def __str__(self):
+        rooms = '*' if self.rooms == ANY_ROOMS else self.rooms
+        return f"{self.city or '*'} / {self.type_of_object or '*'} / {rooms}"
+
+    @property
+    def average_price(self):
+        """
+        Returns the mean price of the slice.
+
+        Returns:
+            Decimal: The mean price rounded to cents, or None if the slice is empty.
+        """
+        if not self.count:
+            return None
+        return round(self.price_sum / self.count, 2)
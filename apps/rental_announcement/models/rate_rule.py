@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+from django.core.validators import MaxValueValidator, MinValueValidator
+from django.db import models
+
+from apps.rental_announcement.choices.rate_rule_kinds import RateRuleKinds
+
+
+class RateRule(models.Model):
+    """
+    Model representing one pricing rule of an announcement.
+
+    The announcement `price` is the base rate per night. Depending on `kind`, a rule
+    replaces the rate of the nights within its dates (`SEASON`), adds a percentage to
+    Friday and Saturday nights (`WEEKEND`), requires a minimum number of nights
+    (`MIN_NIGHTS`) or discounts stays of at least `nights` nights (`LENGTH_OF_STAY`).
+    Seasons and weekend rules apply to the nights within `start_date` and `end_date`, the
+    other kinds to stays checking in within them; rules without dates always apply.
+
+    Attributes:
+        announcement (Announcement): The priced announcement.
+        kind (str): The kind of rule.
+        start_date (date): The first day the rule applies to, if limited.
+        end_date (date): The last day the rule applies to, if limited.
+        nightly_price (Decimal): The rate per night of a season.
+        percent (Decimal): The weekend surcharge or length-of-stay discount in percent.
+        nights (int): The minimum number of nights, or the stay length a discount starts at.
+        created_at (datetime): The date and time when the rule was created.
+    """
+    announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='rate_rules')
+    kind = models.CharField(max_length=20, choices=RateRuleKinds.choices())
+    start_date = models.DateField(blank=True, null=True)
+    end_date = models.DateField(blank=True, null=True)
+    nightly_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True,
+                                        validators=[MinValueValidator(Decimal('0'))])
+    percent = models.DecimalField(max_digits=5, decimal_places=2, blank=True, null=True,
+                                  validators=[MinValueValidator(Decimal('0')), MaxValueValidator(Decimal('100'))])
+    nights = models.PositiveSmallIntegerField(blank=True, null=True, validators=[MinValueValidator(1)])
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = 'announcement_rate_rules'
+        ordering = ['kind', 'start_date', 'id']
+        verbose_name = 'Rate rule'
+        verbose_name_plural = 'Rate rules'
+        indexes = [
+            models.Index(fields=['announcement', 'kind'], name='rate_rule_announcement_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} rule of {self.announcement_id}"
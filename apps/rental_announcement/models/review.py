@@ -1,8 +1,35 @@
 from django.core.validators import MinLengthValidator, MinValueValidator, MaxValueValidator
 from django.db import models
+from django.db.models import Prefetch
 
 from apps.users.models import User
 
+# Number of newest reviews embedded in an announcement; older ones are paged through its review list.
+EMBEDDED_REVIEW_LIMIT = 10
+# Attribute of the announcement holding its embedded reviews.
+EMBEDDED_REVIEWS_ATTR = 'newest_reviews'
+
+
+class ReviewQuerySet(models.QuerySet):
+    """
+    QuerySet with the loading helper for reviews embedded in announcements.
+    """
+
+    def embedded_prefetch(self):
+        """
+        Builds the prefetch of the newest reviews of each announcement with their authors.
+
+        Django turns the slice into a per-announcement window, so at most
+        `EMBEDDED_REVIEW_LIMIT` reviews are loaded for every announcement. Sliced prefetches
+        cannot fill the related manager cache, so the reviews are stored in `EMBEDDED_REVIEWS_ATTR`.
+
+        Returns:
+            Prefetch: The prefetch of the announcement `reviews` relation.
+        """
+        queryset = self.select_related('user').order_by('-created_at', '-id')[:EMBEDDED_REVIEW_LIMIT]
+        return Prefetch('reviews', queryset=queryset, to_attr=EMBEDDED_REVIEWS_ATTR)
+
+
 class Review(models.Model):
     """
     Model representing a review for a rental announcement.
@@ -20,6 +47,11 @@ class Review(models.Model):
     grade = models.PositiveSmallIntegerField(validators=[MinValueValidator(1), MaxValueValidator(5)])
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = ReviewQuerySet.as_manager()
+
     class Meta:
         db_table = 'reviews'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['announcement', 'created_at', 'id'], name='review_ann_created_idx'),
+        ]
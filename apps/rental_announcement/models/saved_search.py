@@ -0,0 +1,113 @@
+from django.db import models
+
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.users.models import User
+
+# Saved search fields and the `AnnouncementFilter` parameters they stand for.
+SAVED_SEARCH_FILTER_PARAMS = {
+    'city': 'address__city',
+    'federal_land': 'address__federal_land',
+    'type_of_object': 'type_of_object',
+    'min_price': 'price__gte',
+    'max_price': 'price__lte',
+    'min_rooms': 'rooms__gte',
+    'max_rooms': 'rooms__lte',
+}
+
+
+class SavedSearch(models.Model):
+    """
+    Model representing the stored criteria of a renter's announcement alert.
+
+    Empty criteria match every announcement. Deleted searches are only deactivated, so the
+    in-memory matcher of every process learns about the deletion from `updated_at`.
+
+    Attributes:
+        user (User): The user who saved the search.
+        name (str): An optional label chosen by the user.
+        city (str): The city of the address, or empty for any city.
+        federal_land (str): The federal land of the address, or empty for any.
+        type_of_object (str): The housing type, or empty for any.
+        min_price (Decimal): The lowest price, if bounded.
+        max_price (Decimal): The highest price, if bounded.
+        min_rooms (int): The lowest number of rooms, if bounded.
+        max_rooms (int): The highest number of rooms, if bounded.
+        is_active (bool): Indicates if the search still raises alerts.
+        created_at (datetime): The date and time when the search was saved.
+        updated_at (datetime): The date and time when the search was last changed.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='saved_searches')
+    name = models.CharField(max_length=50, blank=True)
+    city = models.CharField(max_length=50, blank=True)
+    federal_land = models.CharField(max_length=50, choices=FederalLands.choices(), blank=True)
+    type_of_object = models.CharField(max_length=50, choices=HousingTypes.choices(), blank=True)
+    min_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    max_price = models.DecimalField(max_digits=10, decimal_places=2, blank=True, null=True)
+    min_rooms = models.SmallIntegerField(blank=True, null=True)
+    max_rooms = models.SmallIntegerField(blank=True, null=True)
+    is_active = models.BooleanField(default=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'saved_searches'
+        ordering = ['-created_at']
+        verbose_name = 'Saved search'
+        verbose_name_plural = 'Saved searches'
+        indexes = [
+            models.Index(fields=['user', 'is_active', 'created_at'], name='saved_search_user_idx'),
+            # Incremental loading of changed searches by the matcher.
+            models.Index(fields=['updated_at'], name='saved_search_updated_idx'),
+        ]
+
+    def __str__(self):
+        return self.name or f"Saved search {self.pk}"
+
+    def filter_params(self):
+        """
+        Returns the `AnnouncementFilter` query of the search, e.g. to open its results.
+
+        Returns:
+            dict: The filter parameters of the set criteria.
+        """
+        params = {}
+        for field, param in SAVED_SEARCH_FILTER_PARAMS.items():
+            value = getattr(self, field)
+            if value not in (None, ''):
+                params[param] = str(value)
+        return params
+
+
+class SearchMatch(models.Model):
+    """
+    Model representing one notification of an announcement matching a saved search.
+
+    Attributes:
+        saved_search (SavedSearch): The matched saved search.
+        user (User): The owner of the saved search, stored for the per-user notification list.
+        announcement (Announcement): The matching announcement.
+        created_at (datetime): The date and time when the match was found.
+        notified_at (datetime): The date and time when the user was notified, if already.
+    """
+    saved_search = models.ForeignKey(SavedSearch, on_delete=models.CASCADE, related_name='matches')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='search_matches')
+    announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='search_matches')
+    created_at = models.DateTimeField(auto_now_add=True)
+    notified_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        db_table = 'saved_search_matches'
+        ordering = ['-created_at']
+        verbose_name = 'Search match'
+        verbose_name_plural = 'Search matches'
+        constraints = [
+            # An announcement is reported once per search, however often it is saved.
+            models.UniqueConstraint(fields=['saved_search', 'announcement'], name='search_match_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'created_at', 'id'], name='search_match_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.saved_search_id} -> {self.announcement_id}"
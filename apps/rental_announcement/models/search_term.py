@@ -0,0 +1,52 @@
+from django.db import models
+
+
+class SearchTerm(models.Model):
+    """
+    Model representing one entry of the announcement full-text inverted index.
+
+    Used by the built-in search backend on databases without FULLTEXT support.
+
+    Attributes:
+        term (str): A folded token from the title or description.
+        announcement (Announcement): The announcement containing the token.
+        weight (int): How strongly the token describes the announcement; title occurrences weigh more.
+    """
+    term = models.CharField(max_length=64)
+    announcement = models.ForeignKey('Announcement', on_delete=models.CASCADE, related_name='search_terms')
+    weight = models.PositiveIntegerField()
+
+    class Meta:
+        db_table = 'announcement_search_terms'
+        verbose_name = 'Search term'
+        verbose_name_plural = 'Search terms'
+        unique_together = ['term', 'announcement']
+
+    def __str__(self):
+        return f"{self.term} -> {self.announcement_id}"
+
+
+class SearchDocument(models.Model):
+    """
+    Model holding the folded text of an announcement for the MySQL FULLTEXT search backend.
+
+    The text is tokenized like the inverted index, so both backends see the same terms;
+    title tokens are repeated to weigh like `SearchTerm` weights. MySQL indexes `text`
+    with a FULLTEXT index created by the migration.
+
+    Attributes:
+        announcement (Announcement): The indexed announcement.
+        text (str): The folded tokens of the title and description, separated by spaces.
+    """
+    announcement = models.OneToOneField(
+        'Announcement', on_delete=models.CASCADE, primary_key=True, related_name='search_document'
+    )
+    text = models.TextField()
+
+    class Meta:
+        db_table = 'announcement_search_documents'
+        verbose_name = 'Search document'
+        verbose_name_plural = 'Search documents'
+
+    def __str__(self):
+        return f"Search document of {self.announcement_id}"
@@ -0,0 +1,4 @@
+from apps.rental_announcement.pagination.announcement_pagination import AnnouncementCursorPagination
+from apps.rental_announcement.pagination.review_pagination import ReviewCursorPagination
+from apps.rental_announcement.pagination.search_match_pagination import SearchMatchCursorPagination
+from apps.rental_announcement.pagination.duplicate_listing_pagination import DuplicateListingCursorPagination
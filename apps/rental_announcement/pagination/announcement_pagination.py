@@ -0,0 +1,293 @@
+import json
+import math
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from decimal import Decimal
+
+import numpy as np
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Case, IntegerField, Q, Value, When
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class AnnouncementCursorPagination(BasePagination):
+    """
+    Keyset pagination for the announcement search.
+
+    Pages are ordered by a single sort key followed by `id` as a tiebreaker. The sort key is
+    the field requested through `OrderingFilter`, the search relevance when a search is active,
+    or `-created_at` otherwise. The opaque cursor stores the sort key and the key values of the
+    last row of the previous page, so every page is fetched with an indexed range condition
+    instead of an offset and page N costs the same as page 1.
+
+    `total_price` is not a column: when the view carries the `stay_quotes` of a priced stay,
+    pages ordered by it are cut from the quotes sorted in memory and only the announcements
+    of the page are read.
+
+    Attributes:
+        page_size (int): The default number of announcements per page.
+        max_page_size (int): The largest page size a client may request.
+        cursor_query_param (str): The query parameter carrying the cursor.
+        page_size_query_param (str): The query parameter for a custom page size.
+        default_ordering (str): The sort key used when nothing else applies.
+    """
+    page_size = 20
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    default_ordering = '-created_at'
+    invalid_cursor_message = 'Invalid cursor'
+    quoted_totals = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        page_size = self.get_page_size(request)
+        results = list(self.get_page_queryset(queryset, request, view))
+        self.has_next = len(results) > page_size
+        self.page = results[:page_size]
+        if self.has_next:
+            last = self.page[-1]
+            self.next_position = (str(self.get_sort_value(last)), last.id)
+        return self.page
+
+    def get_sort_value(self, row):
+        """
+        Returns the sort key value of a row.
+
+        Args:
+            row (object): An announcement or a `values_list()` row of the page.
+
+        Returns:
+            object: The value of the sort key, the quoted total for `total_price`.
+        """
+        if self.quoted_totals is not None:
+            return self.quoted_totals[row.id]
+        return getattr(row, self.ordering.lstrip('-'))
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Orders the queryset by the sort key and restricts it to the requested page.
+
+        Args:
+            queryset (QuerySet): The filtered queryset.
+            request (Request): The HTTP request object.
+            view (View): The view being paginated.
+
+        Returns:
+            QuerySet: The unevaluated page, with one extra row to detect a following page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        field = self.ordering.lstrip('-')
+        descending = self.ordering.startswith('-')
+        quotes = getattr(view, 'stay_quotes', None)
+        self.quoted_totals = None
+        if field == 'total_price' and quotes is not None:
+            return self.get_quoted_page_queryset(queryset, request, quotes, descending)
+
+        tiebreaker = '-id' if descending else 'id'
+        queryset = queryset.order_by(self.ordering, tiebreaker)
+
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value, last_id = cursor
+            value = self.parse_sort_value(queryset, field, value)
+            direction = 'lt' if descending else 'gt'
+            queryset = queryset.filter(
+                Q(**{f'{field}__{direction}': value}) | Q(**{field: value, f'id__{direction}': last_id})
+            )
+        return queryset[:self.get_page_size(request) + 1]
+
+    def get_quoted_page_queryset(self, queryset, request, quotes, descending):
+        """
+        Restricts the queryset to the requested page by total price.
+
+        Args:
+            queryset (QuerySet): The filtered queryset.
+            request (Request): The HTTP request object.
+            quotes (StayQuotes): The quotes of the filtered announcements.
+            descending (bool): Whether the most expensive stays come first.
+
+        Returns:
+            QuerySet: The unevaluated page in total price order, with one extra row to
+                detect a following page.
+
+        Raises:
+            NotFound: If the cursor is malformed or was issued for another ordering.
+        """
+        sign = -1 if descending else 1
+        order = np.lexsort((sign * quotes.ids, sign * quotes.totals))
+        ids, totals = quotes.ids[order], quotes.totals[order]
+
+        start = 0
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            value = self.parse_sort_value(queryset, 'total_price', cursor[0])
+            after = (sign * totals > sign * value) | ((totals == value) & (sign * ids > sign * cursor[1]))
+            start = int(np.argmax(after)) if after.any() else len(ids)
+
+        end = start + self.get_page_size(request) + 1
+        page_ids = ids[start:end].tolist()
+        self.quoted_totals = dict(zip(page_ids, totals[start:end].tolist()))
+        if not page_ids:
+            return queryset.none()
+        position = Case(*(When(pk=pk, then=Value(index)) for index, pk in enumerate(page_ids)),
+                        output_field=IntegerField())
+        return queryset.filter(pk__in=page_ids).order_by(position)
+
+    def parse_sort_value(self, queryset, field, value):
+        """
+        Converts the sort key value of a cursor to the type of the sort field.
+
+        Args:
+            queryset (QuerySet): The filtered queryset.
+            field (str): The sort key without direction.
+            value (object): The value decoded from the cursor.
+
+        Returns:
+            object: The value as the model field or, for annotations such as `search_rank`
+                and `distance` and the quoted `total_price`, a float.
+
+        Raises:
+            NotFound: If the value does not fit the sort field.
+        """
+        try:
+            if value is None:
+                raise ValueError(value)
+            try:
+                value = queryset.model._meta.get_field(field).to_python(value)
+            except FieldDoesNotExist:
+                if isinstance(value, (bool, dict, list)):
+                    raise TypeError(value)
+                value = float(value)
+            if isinstance(value, (float, Decimal)) and not math.isfinite(value):
+                raise ValueError(value)
+        except (ValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return value
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Determines the sort key of the page.
+
+        Args:
+            request (Request): The HTTP request object.
+            queryset (QuerySet): The filtered queryset.
+            view (View): The view being paginated.
+
+        Returns:
+            str: A field name, prefixed with `-` for descending order.
+        """
+        if view is not None and request.query_params.get(OrderingFilter.ordering_param):
+            ordering_filter = next(
+                (backend for backend in getattr(view, 'filter_backends', []) if issubclass(backend, OrderingFilter)),
+                OrderingFilter,
+            )
+            ordering = ordering_filter().get_ordering(request, queryset, view)
+            if ordering:
+                return ordering[0]
+        if 'search_rank' in queryset.query.annotations:
+            return '-search_rank'
+        return self.default_ordering
+
+    def get_page_size(self, request):
+        """
+        Returns the requested page size, clamped to `max_page_size`.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            int: The number of announcements per page.
+        """
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def decode_cursor(self, request):
+        """
+        Decodes the cursor of the request.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            tuple: The sort key value and the id of the last row of the previous page,
+                or None for the first page.
+
+        Raises:
+            NotFound: If the cursor is malformed or was issued for another ordering.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            ordering, value, last_id = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            last_id = int(last_id)
+        except (TypeError, ValueError, UnicodeError, BinasciiError):
+            raise NotFound(self.invalid_cursor_message)
+        if ordering != self.ordering:
+            raise NotFound(self.invalid_cursor_message)
+        return value, last_id
+
+    def encode_cursor(self, position):
+        """
+        Builds the URL of the page following the given position.
+
+        Args:
+            position (tuple): The sort key value and the id of the last row on the current page.
+
+        Returns:
+            str: The absolute URL of the next page.
+        """
+        payload = json.dumps([self.ordering, *position], separators=(',', ':'))
+        encoded = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return self.encode_cursor(self.next_position)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'The pagination cursor value.',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
@@ -0,0 +1,14 @@
+from apps.rental_announcement.pagination.announcement_pagination import AnnouncementCursorPagination
+
+
+class DuplicateListingCursorPagination(AnnouncementCursorPagination):
+    """
+    Keyset pagination for the duplicate flags of one moderation status, newest first.
+
+    Uses the cursor format of `AnnouncementCursorPagination` with the fixed sort key
+    `-created_at`, answered by the `(status, created_at, id)` index of the flags.
+    """
+    default_ordering = '-created_at'
+
+    def get_ordering(self, request, queryset, view):
+        return self.default_ordering
@@ -0,0 +1,31 @@
+from apps.rental_announcement.pagination.announcement_pagination import AnnouncementCursorPagination
+
+
+class ReviewCursorPagination(AnnouncementCursorPagination):
+    """
+    Keyset pagination for the reviews of an announcement, newest first.
+
+    Uses the cursor format of `AnnouncementCursorPagination` with the fixed sort key
+    `-created_at`, so the announcement detail can link to the reviews following the
+    ones it embeds.
+    """
+    default_ordering = '-created_at'
+
+    def get_ordering(self, request, queryset, view):
+        return self.default_ordering
+
+    def get_link_after(self, request, url, review):
+        """
+        Builds the URL of the review page starting after the given review.
+
+        Args:
+            request (Request): The HTTP request object.
+            url (str): The path of the review list.
+            review (Review): The last review already shown.
+
+        Returns:
+            str: The absolute URL of the following page.
+        """
+        self.ordering = self.default_ordering
+        self.base_url = request.build_absolute_uri(url)
+        return self.encode_cursor((str(review.created_at), review.id))
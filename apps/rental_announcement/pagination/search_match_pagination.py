@@ -0,0 +1,14 @@
+from apps.rental_announcement.pagination.announcement_pagination import AnnouncementCursorPagination
+
+
+class SearchMatchCursorPagination(AnnouncementCursorPagination):
+    """
+    Keyset pagination for the saved search matches of a user, newest first.
+
+    Uses the cursor format of `AnnouncementCursorPagination` with the fixed sort key
+    `-created_at`, answered by the `(user, created_at, id)` index of the matches.
+    """
+    default_ordering = '-created_at'
+
+    def get_ordering(self, request, queryset, view):
+        return self.default_ordering
@@ -0,0 +1,7 @@
+from apps.rental_announcement.pricing.stay_quotes import (
+    MAX_STAY_NIGHTS,
+    StayQuotes,
+    quote_announcements,
+    quote_queryset,
+    quote_stays,
+)
@@ -0,0 +1,286 @@
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+import numpy as np
+
+from apps.rental_announcement.choices.rate_rule_kinds import RateRuleKinds
+from apps.rental_announcement.models import RateRule
+
+# The rate rule columns a quote reads.
+RULE_COLUMNS = ['announcement_id', 'kind', 'start_date', 'end_date', 'nightly_price', 'percent', 'nights']
+# Nights starting on Friday or Saturday (Monday is 0) are weekend nights.
+WEEKEND_WEEKDAYS = [4, 5]
+# Longest stay that can be quoted, which bounds the size of the rate matrices.
+MAX_STAY_NIGHTS = 365
+# Days are compared as day numbers since 1970-01-01, the epoch of `datetime64[D]`.
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+# Bounds of rules without dates.
+FIRST_DAY = date.min.toordinal() - EPOCH_ORDINAL
+LAST_DAY = date.max.toordinal() - EPOCH_ORDINAL
+
+
+def stay_dates(check_in, check_out):
+    """
+    Returns the nights of a stay.
+
+    Args:
+        check_in (date): The arrival day.
+        check_out (date): The departure day.
+
+    Returns:
+        ndarray: The `datetime64[D]` day each night starts on, from `check_in` to the day
+            before `check_out`.
+    """
+    return np.arange(np.datetime64(check_in, 'D'), np.datetime64(check_out, 'D'))
+
+
+def to_money(value):
+    return Decimal(f'{value:.2f}')
+
+
+class StayQuotes:
+    """
+    Prices of one stay for a batch of announcements, as arrays aligned with `ids`.
+
+    Attributes:
+        ids (ndarray): The primary keys of the announcements.
+        dates (ndarray): The day each night of the stay starts on.
+        rates (ndarray): The `(announcements, nights)` matrix of nightly rates, or None for
+            quotes of whole querysets, which drop it after every batch.
+        discounts (ndarray): The length-of-stay discount of each announcement in percent.
+        totals (ndarray): The total price of each stay, rounded to cents.
+        min_nights (ndarray): The minimum number of nights of each announcement for the stay.
+    """
+
+    def __init__(self, ids, dates, rates, discounts, totals, min_nights):
+        self.ids = ids
+        self.dates = dates
+        self.rates = rates
+        self.discounts = discounts
+        self.totals = totals
+        self.min_nights = min_nights
+
+    def __len__(self):
+        return len(self.ids)
+
+    @property
+    def nights(self):
+        return len(self.dates)
+
+    @property
+    def bookable(self):
+        """
+        Tells which announcements can be booked for the stay.
+
+        Returns:
+            ndarray: A boolean mask, False where the stay is shorter than the minimum nights.
+        """
+        return self.min_nights <= self.nights
+
+    def select(self, mask):
+        """
+        Returns the quotes of some announcements.
+
+        Args:
+            mask (ndarray): A boolean mask or positions of the announcements to keep.
+
+        Returns:
+            StayQuotes: The selected quotes.
+        """
+        return StayQuotes(self.ids[mask], self.dates, None if self.rates is None else self.rates[mask],
+                          self.discounts[mask], self.totals[mask], self.min_nights[mask])
+
+    @classmethod
+    def concatenate(cls, quotes, dates):
+        """
+        Joins the quotes of several batches of the same stay, without their rate matrices.
+
+        Args:
+            quotes (list): `StayQuotes` of the batches.
+            dates (ndarray): The nights of the stay.
+
+        Returns:
+            StayQuotes: The quotes of all batches.
+        """
+        names = ('ids', 'discounts', 'totals', 'min_nights')
+        dtypes = (np.int64, np.float64, np.float64, np.int64)
+        ids, discounts, totals, min_nights = (
+            np.concatenate([getattr(quote, name) for quote in quotes]) if quotes else np.empty(0, dtype=dtype)
+            for name, dtype in zip(names, dtypes)
+        )
+        return cls(ids, dates, None, discounts, totals, min_nights)
+
+    def totals_by_id(self):
+        """
+        Returns the total prices by announcement.
+
+        Returns:
+            dict: The total price as `Decimal` by primary key.
+        """
+        return dict(zip(self.ids.tolist(), map(to_money, self.totals.tolist())))
+
+    def breakdown(self, position):
+        """
+        Describes the quote of one announcement night by night.
+
+        Args:
+            position (int): The position of the announcement in the batch.
+
+        Returns:
+            dict: The nights with their rates, the subtotal, the discount in percent and the
+                total as decimal strings, the minimum nights and whether the stay can be booked.
+        """
+        rates = self.rates[position]
+        return {
+            'nights': [{'date': str(day), 'rate': str(to_money(rate))} for day, rate in zip(self.dates, rates.tolist())],
+            'subtotal': str(to_money(rates.sum())),
+            'discount_percent': str(to_money(self.discounts[position])),
+            'total_price': str(to_money(self.totals[position])),
+            'min_nights': int(self.min_nights[position]),
+            'bookable': bool(self.bookable[position]),
+        }
+
+
+def rule_arrays(rules, ids, order):
+    """
+    Turns the rules of one kind into arrays.
+
+    Args:
+        rules (list): `RULE_COLUMNS` rows of one kind.
+        ids (ndarray): The primary keys of the quoted announcements.
+        order (ndarray): The permutation sorting `ids`.
+
+    Returns:
+        tuple: The position of each rule's announcement in `ids`, the first and last days
+            as day numbers and the rules themselves, restricted to the quoted announcements.
+    """
+    rule_ids = np.fromiter((rule[0] for rule in rules), dtype=np.int64, count=len(rules))
+    if len(ids):
+        slots = order[np.minimum(np.searchsorted(ids, rule_ids, sorter=order), len(ids) - 1)]
+        known = ids[slots] == rule_ids
+    else:
+        slots, known = rule_ids, np.zeros(len(rules), dtype=bool)
+    starts = np.fromiter((rule[2].toordinal() - EPOCH_ORDINAL if rule[2] else FIRST_DAY for rule in rules),
+                         dtype=np.int64, count=len(rules))
+    ends = np.fromiter((rule[3].toordinal() - EPOCH_ORDINAL if rule[3] else LAST_DAY for rule in rules),
+                       dtype=np.int64, count=len(rules))
+    return slots[known], starts[known], ends[known], [rule for rule, keep in zip(rules, known.tolist()) if keep]
+
+
+def quote_stays(announcement_ids, base_prices, check_in, check_out, rules=()):
+    """
+    Prices one stay for a batch of announcements with array operations.
+
+    The nightly rates start as an `(announcements, nights)` matrix of the base prices.
+    Every rule kind is then applied to all announcements at once: the nights covered by
+    each season are found by broadcasting its dates against the nights of the stay, and
+    `np.maximum.at` resolves overlaps, so the season starting last sets the rate of a night,
+    the highest weekend surcharge applies, the largest length-of-stay discount reached is
+    taken and the strictest minimum stay counts. Python only loops over the rules, never
+    over announcements or nights.
+
+    Args:
+        announcement_ids (sequence): The primary keys of the announcements.
+        base_prices (sequence): Their base nightly prices.
+        check_in (date): The arrival day.
+        check_out (date): The departure day, after `check_in`.
+        rules (iterable, optional): `RULE_COLUMNS` rows of the announcements' rate rules.
+
+    Returns:
+        StayQuotes: The quotes, including the nightly rate matrix.
+    """
+    ids = np.asarray(announcement_ids, dtype=np.int64)
+    count = len(ids)
+    dates = stay_dates(check_in, check_out)
+    days = dates.astype(np.int64)
+    nights = len(dates)
+    arrival = check_in.toordinal() - EPOCH_ORDINAL
+    order = np.argsort(ids, kind='stable')
+    rates = np.repeat(np.asarray(base_prices, dtype=np.float64).reshape(count, 1), nights, axis=1)
+
+    by_kind = defaultdict(list)
+    for rule in rules:
+        by_kind[rule[1]].append(rule)
+
+    slots, starts, ends, seasons = rule_arrays(by_kind[RateRuleKinds.SEASON.value], ids, order)
+    if seasons:
+        covered_rule, covered_night = np.nonzero((days >= starts[:, None]) & (days <= ends[:, None]))
+        ranked = np.lexsort((np.arange(len(seasons)), starts))
+        rank = np.empty(len(seasons), dtype=np.int64)
+        rank[ranked] = np.arange(len(seasons))
+        prices = np.array([float(rule[4] or 0) for rule in seasons])[ranked]
+        winner = np.full((count, nights), -1, dtype=np.int64)
+        np.maximum.at(winner, (slots[covered_rule], covered_night), rank[covered_rule])
+        rates = np.where(winner >= 0, prices[winner], rates)
+
+    slots, starts, ends, weekends = rule_arrays(by_kind[RateRuleKinds.WEEKEND.value], ids, order)
+    if weekends:
+        # 1970-01-01 was a Thursday.
+        weekend = np.isin((days + 3) % 7, WEEKEND_WEEKDAYS)
+        covered_rule, covered_night = np.nonzero(weekend & (days >= starts[:, None]) & (days <= ends[:, None]))
+        percents = np.array([float(rule[5] or 0) for rule in weekends])
+        surcharges = np.zeros((count, nights))
+        np.maximum.at(surcharges, (slots[covered_rule], covered_night), percents[covered_rule])
+        rates = rates * (1 + surcharges / 100)
+
+    min_nights = np.ones(count, dtype=np.int64)
+    slots, starts, ends, minimums = rule_arrays(by_kind[RateRuleKinds.MIN_NIGHTS.value], ids, order)
+    if minimums:
+        applies = (starts <= arrival) & (ends >= arrival)
+        required = np.array([rule[6] or 1 for rule in minimums], dtype=np.int64)
+        np.maximum.at(min_nights, slots[applies], required[applies])
+
+    discounts = np.zeros(count)
+    slots, starts, ends, stays = rule_arrays(by_kind[RateRuleKinds.LENGTH_OF_STAY.value], ids, order)
+    if stays:
+        lengths = np.array([rule[6] or 1 for rule in stays], dtype=np.int64)
+        applies = (starts <= arrival) & (ends >= arrival) & (lengths <= nights)
+        percents = np.array([float(rule[5] or 0) for rule in stays])
+        np.maximum.at(discounts, slots[applies], percents[applies])
+
+    rates = np.round(rates, 2)
+    totals = np.round(rates.sum(axis=1) * (1 - discounts / 100), 2)
+    return StayQuotes(ids, dates, rates, discounts, totals, min_nights)
+
+
+def quote_announcements(announcements, check_in, check_out):
+    """
+    Prices one stay for announcement rows, loading their rate rules with one query.
+
+    Args:
+        announcements (list): `(pk, price)` pairs.
+        check_in (date): The arrival day.
+        check_out (date): The departure day.
+
+    Returns:
+        StayQuotes: The quotes, including the nightly rate matrix.
+    """
+    ids = [pk for pk, _ in announcements]
+    rules = RateRule.objects.filter(announcement_id__in=ids).order_by().values_list(*RULE_COLUMNS) if ids else []
+    return quote_stays(ids, [float(price) for _, price in announcements], check_in, check_out, rules)
+
+
+def quote_queryset(queryset, check_in, check_out, batch_size=2000):
+    """
+    Prices one stay for every announcement of a queryset.
+
+    The announcements are quoted `batch_size` at a time, each batch with one query for its
+    rate rules and one `quote_stays` call, so memory stays bounded by a batch of rate matrices.
+
+    Args:
+        queryset (QuerySet): The announcements to quote.
+        check_in (date): The arrival day.
+        check_out (date): The departure day.
+        batch_size (int, optional): The number of announcements quoted at once.
+
+    Returns:
+        StayQuotes: The quotes of all announcements, without the nightly rate matrix.
+    """
+    announcements = list(queryset.order_by().values_list('pk', 'price'))
+    quotes = []
+    for start in range(0, len(announcements), batch_size):
+        batch = quote_announcements(announcements[start:start + batch_size], check_in, check_out)
+        batch.rates = None
+        quotes.append(batch)
+    return StayQuotes.concatenate(quotes, stay_dates(check_in, check_out))
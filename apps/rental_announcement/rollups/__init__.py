@@ -0,0 +1,7 @@
+from apps.rental_announcement.rollups.price_statistics import (
+    apply_price_changes,
+    get_price_statistic,
+    price_contribution,
+    rebuild_price_statistics,
+    stored_price_contribution,
+)
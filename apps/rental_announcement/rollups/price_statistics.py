@@ -0,0 +1,267 @@
+from collections import defaultdict
+from decimal import Decimal
+from itertools import product
+
+import numpy as np
+from django.db import IntegrityError, transaction
+from django.db.models import DecimalField, F, Q, Value
+from django.db.models.functions import Coalesce, Greatest, Least
+from django.utils import timezone
+
+from apps.rental_announcement.models import Announcement, PriceStatistic
+from apps.rental_announcement.models.price_statistic import ANY_CITY, ANY_ROOMS, ANY_TYPE
+
+# Percentile columns of `PriceStatistic` and the quantile each of them stores.
+PERCENTILES = {'p10': 0.1, 'p25': 0.25, 'median': 0.5, 'p75': 0.75, 'p90': 0.9}
+
+# The announcement columns a slice is built from, in the order of the slice key.
+SLICE_COLUMNS = ['address__city', 'type_of_object', 'rooms']
+SLICE_ANY = (ANY_CITY, ANY_TYPE, ANY_ROOMS)
+
+# Announcement fields whose change can move the announcement to another slice or price.
+PRICE_STATISTIC_FIELDS = {'price', 'rooms', 'type_of_object', 'is_active', 'address', 'address_id'}
+
+
+def slice_keys(city, type_of_object, rooms):
+    """
+    Returns the keys of every slice an announcement counts towards.
+
+    Args:
+        city (str): The city of the announcement.
+        type_of_object (str): The housing type of the announcement.
+        rooms (int): The number of rooms of the announcement.
+
+    Returns:
+        list: The eight `(city, type_of_object, rooms)` keys, with each dimension either
+            the announcement value or its "any" value.
+    """
+    return list(product((city, ANY_CITY), (type_of_object, ANY_TYPE), (rooms, ANY_ROOMS)))
+
+
+def slice_lookup(keys):
+    """
+    Builds the filter matching the rows of the given slices.
+
+    Args:
+        keys (iterable): `(city, type_of_object, rooms)` slice keys.
+
+    Returns:
+        Q: One unique index lookup per key, combined with OR.
+    """
+    lookup = Q()
+    for city, type_of_object, rooms in keys:
+        lookup |= Q(city=city, type_of_object=type_of_object, rooms=rooms)
+    return lookup
+
+
+def price_contribution(announcement):
+    """
+    Returns what an announcement adds to the price statistics.
+
+    Args:
+        announcement (Announcement): The announcement, with its address.
+
+    Returns:
+        tuple: `(city, type_of_object, rooms, price)`, or None if the announcement is inactive.
+    """
+    if not announcement.is_active:
+        return None
+    return announcement.address.city, announcement.type_of_object, announcement.rooms, Decimal(str(announcement.price))
+
+
+def stored_price_contribution(announcement_id):
+    """
+    Returns what the stored row of an announcement adds to the price statistics.
+
+    Args:
+        announcement_id (int): The primary key of the announcement.
+
+    Returns:
+        tuple: `(city, type_of_object, rooms, price)`, or None if the announcement does not
+            exist or is inactive.
+    """
+    return (Announcement.objects.active()
+            .filter(pk=announcement_id)
+            .values_list(*SLICE_COLUMNS, 'price')
+            .first())
+
+
+def apply_price_changes(removed=(), added=()):
+    """
+    Applies announcement changes to the stored price statistics.
+
+    The changes are merged per slice, and slices with the same change are updated in one
+    UPDATE, so a single announcement change costs one statement for its eight slices plus
+    one INSERT per slice seen for the first time, and one DELETE of emptied slices when
+    slices lost announcements. Added prices widen `min_price` and `max_price`; removed prices cannot narrow
+    them without reading the slice, so every changed slice is marked as stale until the
+    next rebuild recomputes its range and percentiles.
+
+    Args:
+        removed (iterable): Contributions `(city, type_of_object, rooms, price)` to take away.
+        added (iterable): Contributions to add.
+    """
+    deltas = defaultdict(lambda: [0, Decimal(0), None, None])
+    for sign, contributions in ((-1, removed), (1, added)):
+        for city, type_of_object, rooms, price in contributions:
+            for key in slice_keys(city, type_of_object, rooms):
+                delta = deltas[key]
+                delta[0] += sign
+                delta[1] += sign * price
+                if sign > 0:
+                    delta[2] = price if delta[2] is None else min(delta[2], price)
+                    delta[3] = price if delta[3] is None else max(delta[3], price)
+
+    changes = defaultdict(list)
+    for key, (count, price_sum, low, high) in deltas.items():
+        if count or price_sum:
+            changes[count, price_sum, low, high].append(key)
+
+    with transaction.atomic():
+        for (count, price_sum, low, high), keys in changes.items():
+            update = {'count': F('count') + count, 'price_sum': F('price_sum') + price_sum, 'is_stale': True}
+            if low is not None:
+                low_value = Value(low, output_field=DecimalField())
+                high_value = Value(high, output_field=DecimalField())
+                update['min_price'] = Coalesce(Least('min_price', low_value), low_value)
+                update['max_price'] = Coalesce(Greatest('max_price', high_value), high_value)
+
+            updated = PriceStatistic.objects.filter(slice_lookup(keys)).update(**update)
+            if updated == len(keys) or count <= 0:
+                continue
+
+            existing = set(PriceStatistic.objects.filter(slice_lookup(keys))
+                           .values_list('city', 'type_of_object', 'rooms'))
+            for city, type_of_object, rooms in set(keys) - existing:
+                try:
+                    with transaction.atomic():
+                        PriceStatistic.objects.create(
+                            city=city, type_of_object=type_of_object, rooms=rooms, count=count,
+                            price_sum=price_sum, min_price=low, max_price=high, is_stale=True,
+                        )
+                except IntegrityError:
+                    # Created concurrently since the lookup above.
+                    PriceStatistic.objects.filter(slice_lookup([(city, type_of_object, rooms)])).update(**update)
+
+        shrunk = [key for (count, *_), keys in changes.items() if count < 0 for key in keys]
+        if shrunk:
+            PriceStatistic.objects.filter(slice_lookup(shrunk), count__lte=0).delete()
+
+
+def summarize_groups(codes, cents):
+    """
+    Computes the price statistics of every group in bulk.
+
+    The prices are sorted by group and price once; counts, sums, extremes and the linearly
+    interpolated percentiles (NumPy's default quantile method) are then read for all groups
+    at once from the group boundaries.
+
+    Args:
+        codes (ndarray): The group code of every announcement.
+        cents (ndarray): The price of every announcement in cents.
+
+    Returns:
+        tuple: The index of one announcement per group, and per group the count, the sum,
+            the minimum and the maximum in cents and a `(groups, len(PERCENTILES))` array of
+            percentiles in cents.
+    """
+    order = np.lexsort((cents, codes))
+    codes = codes[order]
+    prices = cents[order]
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+    counts = np.diff(np.r_[starts, len(prices)])
+
+    positions = starts[:, None] + np.fromiter(PERCENTILES.values(), dtype=float) * (counts[:, None] - 1)
+    lower = np.floor(positions).astype(np.int64)
+    upper = np.ceil(positions).astype(np.int64)
+    percentiles = prices[lower] + (prices[upper] - prices[lower]) * (positions - lower)
+
+    return (order[starts], counts, np.add.reduceat(prices, starts),
+            prices[starts], prices[starts + counts - 1], percentiles)
+
+
+def from_cents(cents):
+    """
+    Converts an amount in cents to a decimal amount.
+
+    Args:
+        cents (int | float): The amount in cents, rounded to whole cents.
+
+    Returns:
+        Decimal: The amount with two decimal places.
+    """
+    return Decimal(int(round(cents))).scaleb(-2)
+
+
+def rebuild_price_statistics(chunk_size=2000, batch_size=1000):
+    """
+    Recomputes every price statistic from the active announcements.
+
+    The slice columns and prices are streamed into NumPy arrays and every grouping of
+    city, housing type and rooms is summarized with `summarize_groups`. The table is then
+    replaced in one transaction. Its rows are locked first, so announcement changes made
+    during the rebuild wait and are applied to the new rows.
+
+    Args:
+        chunk_size (int): The number of announcements read per database round trip.
+        batch_size (int): The number of statistics inserted per query.
+
+    Returns:
+        int: The number of stored slices.
+    """
+    with transaction.atomic():
+        list(PriceStatistic.objects.select_for_update().values_list('pk', flat=True))
+
+        rows = (Announcement.objects.active()
+                .order_by()
+                .values_list(*SLICE_COLUMNS, 'price')
+                .iterator(chunk_size=chunk_size))
+        cities, types, rooms, cents = [], [], [], []
+        for city, type_of_object, room_count, price in rows:
+            cities.append(city)
+            types.append(type_of_object)
+            rooms.append(room_count)
+            cents.append(int(price * 100))
+
+        statistics = []
+        if cents:
+            keys = list(zip(cities, types, rooms))
+            columns = [np.unique(np.array(values, dtype=object), return_inverse=True)[1]
+                       for values in (cities, types, rooms)]
+            cents = np.array(cents, dtype=np.int64)
+            rebuilt_at = timezone.now()
+
+            for grouped in product((True, False), repeat=len(SLICE_COLUMNS)):
+                codes = np.zeros(len(cents), dtype=np.int64)
+                for is_grouped, column in zip(grouped, columns):
+                    codes = codes * (column.max() + 1) + (column if is_grouped else 0)
+
+                for index, count, total, low, high, percentiles in zip(*summarize_groups(codes, cents)):
+                    key = [value if is_grouped else any_value
+                           for value, is_grouped, any_value in zip(keys[index], grouped, SLICE_ANY)]
+                    statistics.append(PriceStatistic(
+                        city=key[0], type_of_object=key[1], rooms=key[2], count=int(count),
+                        price_sum=from_cents(total), min_price=from_cents(low), max_price=from_cents(high),
+                        rebuilt_at=rebuilt_at,
+                        **{name: from_cents(value) for name, value in zip(PERCENTILES, percentiles)},
+                    ))
+
+        PriceStatistic.objects.all().delete()
+        PriceStatistic.objects.bulk_create(statistics, batch_size=batch_size)
+    return len(statistics)
+
+
+def get_price_statistic(city=ANY_CITY, type_of_object=ANY_TYPE, rooms=ANY_ROOMS):
+    """
+    Reads the price statistics of one slice.
+
+    Args:
+        city (str, optional): The city, or `ANY_CITY` for all cities.
+        type_of_object (str, optional): The housing type, or `ANY_TYPE` for all types.
+        rooms (int, optional): The number of rooms, or `ANY_ROOMS` for any number.
+
+    Returns:
+        PriceStatistic: The stored row, or an unsaved empty one if the slice has no announcements.
+    """
+    key = {'city': city, 'type_of_object': type_of_object, 'rooms': rooms}
+    return PriceStatistic.objects.filter(**key).first() or PriceStatistic(**key)
@@ -0,0 +1,2 @@
+from apps.rental_announcement.search.backends import get_search_backend
+from apps.rental_announcement.search.tokenizer import fold, tokenize
@@ -0,0 +1,219 @@
+import math
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Case, Count, ExpressionWrapper, F, FloatField, OuterRef, Subquery, Sum, Value, When
+from django.db.models.expressions import RawSQL
+
+from apps.rental_announcement.models import Announcement, SearchDocument, SearchTerm
+from apps.rental_announcement.search.tokenizer import tokenize
+
+TITLE_WEIGHT = 3
+DESCRIPTION_WEIGHT = 1
+
+
+def weighted_terms(announcement):
+    """
+    Weighs the search terms of an announcement by where they occur.
+
+    Args:
+        announcement (Announcement): The announcement to index.
+
+    Returns:
+        Counter: The summed weight of every folded term of the title and description.
+    """
+    weights = Counter()
+    for token in tokenize(announcement.title):
+        weights[token] += TITLE_WEIGHT
+    for token in tokenize(announcement.description):
+        weights[token] += DESCRIPTION_WEIGHT
+    return weights
+
+
+class InvertedIndexSearchBackend:
+    """
+    Search backend that keeps its own inverted index in the `announcement_search_terms` table.
+
+    Every announcement is stored as a set of folded terms weighted by where they occur.
+    Queries match announcements containing all query terms and rank them by the summed
+    term weight multiplied by the inverse document frequency of each term.
+    """
+    maintains_index = True
+
+    def index(self, announcement):
+        """
+        Replaces the indexed terms of one announcement.
+
+        Args:
+            announcement (Announcement): The announcement to index.
+        """
+        self.index_many([announcement])
+
+    def index_many(self, announcements, batch_size=1000):
+        """
+        Replaces the indexed terms of several announcements with one delete and batched inserts.
+
+        Args:
+            announcements (list): The announcements to index.
+            batch_size (int, optional): The number of terms inserted per query.
+        """
+        terms = [
+            SearchTerm(term=term, announcement=announcement, weight=weight)
+            for announcement in announcements
+            for term, weight in weighted_terms(announcement).items()
+        ]
+
+        with transaction.atomic():
+            SearchTerm.objects.filter(announcement__in=[announcement.pk for announcement in announcements]).delete()
+            SearchTerm.objects.bulk_create(terms, batch_size=batch_size)
+
+    def search(self, queryset, query):
+        """
+        Filters the queryset to announcements matching every term of the query.
+
+        Args:
+            queryset (QuerySet): The announcements to search in.
+            query (str): The raw search string.
+
+        Returns:
+            QuerySet: The matching announcements annotated with `search_rank` and ordered by it.
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return queryset
+
+        document_frequency = dict(
+            SearchTerm.objects.filter(term__in=terms)
+            .order_by()
+            .values_list('term')
+            .annotate(count=Count('id'))
+        )
+        if len(document_frequency) < len(terms):
+            return queryset.none()
+
+        total = max(Announcement.objects.count(), 1)
+        idf = Case(
+            *[When(term=term, then=Value(math.log(1 + total / count))) for term, count in document_frequency.items()],
+            output_field=FloatField(),
+        )
+        rank = (SearchTerm.objects.filter(announcement=OuterRef('pk'), term__in=terms)
+                .order_by()
+                .values('announcement')
+                .annotate(rank=Sum(ExpressionWrapper(F('weight') * idf, output_field=FloatField())))
+                .values('rank'))
+        matching = (SearchTerm.objects.filter(term__in=terms)
+                    .order_by()
+                    .values('announcement')
+                    .annotate(matched=Count('id'))
+                    .filter(matched=len(terms))
+                    .values('announcement'))
+
+        return (queryset.filter(pk__in=matching)
+                .annotate(search_rank=Subquery(rank, output_field=FloatField()))
+                .order_by('-search_rank', '-created_at'))
+
+
+class MySQLFullTextSearchBackend:
+    """
+    Search backend that uses a MySQL FULLTEXT index on `announcement_search_documents.text`.
+
+    The stored documents hold the folded terms of the inverted index, each repeated as
+    often as its weight, and queries are folded the same way and matched as whole terms.
+    So "Muenchen" and "München" or "Strasse" and "Straße" find each other in both
+    directions, whatever the column collation, and a query matches the announcements it
+    matches with the inverted index. Only the ranking differs, being MySQL's relevance.
+
+    MySQL must index two-letter terms and keep its own stop word list out of the way,
+    since the tokenizer already drops stop words: set `innodb_ft_min_token_size = 2` and
+    `innodb_ft_enable_stopword = OFF`, then run `rebuild_search_index`.
+    """
+    maintains_index = True
+
+    def index(self, announcement):
+        """
+        Replaces the search document of one announcement.
+
+        Args:
+            announcement (Announcement): The announcement to index.
+        """
+        self.index_many([announcement])
+
+    def index_many(self, announcements, batch_size=1000):
+        """
+        Replaces the search documents of several announcements with one delete and batched inserts.
+
+        Args:
+            announcements (list): The announcements to index.
+            batch_size (int, optional): The number of documents inserted per query.
+        """
+        documents = [
+            SearchDocument(
+                announcement=announcement,
+                text=' '.join(' '.join([term] * weight) for term, weight in weighted_terms(announcement).items()),
+            )
+            for announcement in announcements
+        ]
+        with transaction.atomic():
+            SearchDocument.objects.filter(announcement__in=[announcement.pk for announcement in announcements]).delete()
+            SearchDocument.objects.bulk_create(documents, batch_size=batch_size)
+
+    @staticmethod
+    def boolean_query(query):
+        """
+        Builds the boolean mode query requiring every folded term of a search string.
+
+        Args:
+            query (str): The raw search string.
+
+        Returns:
+            str: The query, e.g. "+muenchen +strasse", or an empty string without terms.
+        """
+        return ' '.join(f'+{term}' for term in sorted(set(tokenize(query))))
+
+    def search(self, queryset, query):
+        """
+        Filters the queryset with `MATCH ... AGAINST` in boolean mode on the search documents.
+
+        Args:
+            queryset (QuerySet): The announcements to search in.
+            query (str): The raw search string.
+
+        Returns:
+            QuerySet: The matching announcements annotated with `search_rank` and ordered by it.
+        """
+        boolean_query = self.boolean_query(query)
+        if not boolean_query:
+            return queryset
+
+        table = SearchDocument._meta.db_table
+        announcements = Announcement._meta.db_table
+        match = f'MATCH ({table}.text) AGAINST (%s IN BOOLEAN MODE)'
+        rank = (f'SELECT {match} FROM {table} '
+                f'WHERE {table}.announcement_id = {announcements}.id')
+
+        return (queryset.annotate(search_rank=RawSQL(rank, [boolean_query], output_field=FloatField()))
+                .filter(search_rank__gt=0)
+                .order_by('-search_rank', '-created_at'))
+
+
+SEARCH_BACKENDS = {
+    'index': InvertedIndexSearchBackend,
+    'mysql': MySQLFullTextSearchBackend,
+}
+
+
+def get_search_backend():
+    """
+    Returns the configured announcement search backend.
+
+    The `ANNOUNCEMENT_SEARCH_BACKEND` setting selects `mysql` or `index` explicitly;
+    without it the MySQL backend is used on MySQL and the inverted index everywhere else.
+
+    Returns:
+        object: An instance of the selected search backend.
+    """
+    name = getattr(settings, 'ANNOUNCEMENT_SEARCH_BACKEND', None)
+    if name is None:
+        name = 'mysql' if connection.vendor == 'mysql' else 'index'
+    return SEARCH_BACKENDS[name]()
@@ -0,0 +1,46 @@
+import re
+import unicodedata
+
+GERMAN_FOLDING = str.maketrans({'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+TOKEN_RE = re.compile(r'\w+')
+MIN_TOKEN_LENGTH = 2
+MAX_TOKEN_LENGTH = 64
+
+STOP_WORDS = frozenset({
+    'aber', 'als', 'am', 'an', 'auch', 'auf', 'aus', 'bei', 'bis', 'das', 'dass', 'dem', 'den',
+    'der', 'des', 'die', 'ein', 'eine', 'einem', 'einen', 'einer', 'es', 'fuer', 'im', 'in',
+    'ist', 'mit', 'nach', 'nicht', 'oder', 'sich', 'sie', 'sind', 'und', 'vom', 'von', 'zu',
+    'zum', 'zur', 'and', 'for', 'in', 'is', 'of', 'on', 'or', 'the', 'to', 'with',
+})
+
+
+def fold(text):
+    """
+    Normalizes text for matching: case-folded, German umlauts and ß spelled out,
+    remaining diacritics stripped.
+
+    Args:
+        text (str): The text to normalize.
+
+    Returns:
+        str: The folded text, e.g. "Straße in München" becomes "strasse in muenchen".
+    """
+    text = text.casefold().translate(GERMAN_FOLDING)
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    """
+    Splits text into folded search tokens, dropping stop words and very short tokens.
+
+    Args:
+        text (str): The text to tokenize.
+
+    Returns:
+        list: The folded tokens in their original order, duplicates included.
+    """
+    return [
+        token[:MAX_TOKEN_LENGTH] for token in TOKEN_RE.findall(fold(text))
+        if len(token) >= MIN_TOKEN_LENGTH and token not in STOP_WORDS
+    ]
@@ -4,15 +4,17 @@ from apps.rental_announcement.models.addresses import Address
 
 class DetailAddressSerializer(serializers.ModelSerializer):
     """
-    Serializer for the Address model, including all fields.
+    Serializer for the Address model, including all fields but the internal map tile key.
 
     This serializer is used to convert Address model instances into JSON format
     and validate incoming data for Address model instances.
 
     Meta:
         model (Address): The model to be serialized.
-        fields (list): The fields to include in the serialized representation.
+        exclude (list): The map tile key, which only serves the map clusters.
+        read_only_fields (list): The coordinates, which are derived from the postal code.
     """
     class Meta:
         model = Address
-        fields = '__all__'
+        exclude = ['tile_key']
+        read_only_fields = ['latitude', 'longitude']
@@ -0,0 +1,19 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.choices.amenities import Amenities
+
+
+class AmenitiesField(serializers.ListField):
+    """
+    Serializer field exposing an amenities bitmask as the list of its amenity values.
+
+    Input is a list of `Amenities` values, stored as the mask with their bits set. The
+    representation only needs the mask column, so `ValuesSerializer` renders it from rows.
+    """
+    child = serializers.ChoiceField(choices=Amenities.choices())
+
+    def to_internal_value(self, data):
+        return Amenities.to_mask(super().to_internal_value(data))
+
+    def to_representation(self, value):
+        return Amenities.from_mask(value)
@@ -1,42 +1,119 @@
+from django.urls import reverse
 from rest_framework import serializers
 
-from apps.rental_announcement.models import Announcement, Address
+from apps.rental_announcement.models import Announcement, Address, Review
+from apps.rental_announcement.models.announcement import RATING_AGGREGATE_FIELDS, RATING_GRADES
+from apps.rental_announcement.models.review import EMBEDDED_REVIEWS_ATTR
+from apps.rental_announcement.pagination import ReviewCursorPagination
 from apps.rental_announcement.serializers import DetailAddressSerializer
+from apps.rental_announcement.serializers.amenities_field import AmenitiesField
+from apps.rental_announcement.serializers.field_selection import FieldSelectionMixin
+from apps.rental_announcement.serializers.owner_serializers import OwnerSerializer
 from apps.rental_announcement.serializers.review_list_serializer import ReviewListSerializer
 
+# Rating aggregates that are exposed through `average_rating` and `rating_histogram` instead.
+HIDDEN_RATING_FIELDS = [field for field in RATING_AGGREGATE_FIELDS if field != 'review_count']
+# Popularity counters change without `updated_at`, so they stay out of the validated representation.
+HIDDEN_POPULARITY_FIELDS = ['view_count', 'trending_score']
+ANNOUNCEMENT_EXPANDABLE_FIELDS = {
+    'address': lambda: DetailAddressSerializer(read_only=True),
+    'owner': lambda: OwnerSerializer(read_only=True),
+    'reviews': lambda: ReviewListSerializer(many=True, read_only=True, source=EMBEDDED_REVIEWS_ATTR),
+}
+ANNOUNCEMENT_FIELD_COLUMNS = {
+    'average_rating': ['review_count', 'rating'],
+    'rating_histogram': [f'grade_{grade}_count' for grade in RATING_GRADES],
+    # Nested reviews render their announcement by its title; the count decides on a link to more.
+    'reviews': ['title', 'review_count'],
+}
+ANNOUNCEMENT_RELATION_PREFETCHES = {
+    EMBEDDED_REVIEWS_ATTR: Review.objects.embedded_prefetch,
+}
 
-class AnnouncementListDetailSerializer(serializers.ModelSerializer):
+
+class AnnouncementListDetailSerializer(FieldSelectionMixin, serializers.ModelSerializer):
 
     owner = serializers.StringRelatedField(read_only=True)
     address = serializers.StringRelatedField(read_only=True)
+    amenities = AmenitiesField(required=False)
     average_rating = serializers.SerializerMethodField()
 
+    expandable_fields = ANNOUNCEMENT_EXPANDABLE_FIELDS
+    collapsed_fields = {
+        'address': lambda: serializers.StringRelatedField(read_only=True),
+        'owner': lambda: serializers.StringRelatedField(read_only=True),
+    }
+    field_columns = ANNOUNCEMENT_FIELD_COLUMNS
+    relation_prefetches = ANNOUNCEMENT_RELATION_PREFETCHES
+
     def get_average_rating(self, obj):
         return obj.average_rating
 
     class Meta:
         model = Announcement
-        exclude = ['updated_at', 'deleted']
+        exclude = ['updated_at', 'deleted', *HIDDEN_RATING_FIELDS, *HIDDEN_POPULARITY_FIELDS]
+        read_only_fields = ['review_count']
 
 
-class AnnouncementRetrieveUpdateDestroySerializer(serializers.ModelSerializer):
+class AnnouncementRetrieveUpdateDestroySerializer(FieldSelectionMixin, serializers.ModelSerializer):
 
     # owner = serializers.SlugRelatedField(slug_field='email', queryset=User.objects.all())
     address = DetailAddressSerializer()
-    reviews = ReviewListSerializer(many=True, read_only=True)
+    reviews = ReviewListSerializer(many=True, read_only=True, source=EMBEDDED_REVIEWS_ATTR)
+    amenities = AmenitiesField(required=False)
     average_rating = serializers.SerializerMethodField()
+    review_count = serializers.IntegerField(read_only=True)
+    rating_histogram = serializers.SerializerMethodField()
+
+    expandable_fields = ANNOUNCEMENT_EXPANDABLE_FIELDS
+    collapsed_fields = {
+        'address': lambda: serializers.StringRelatedField(read_only=True),
+        'owner': lambda: serializers.PrimaryKeyRelatedField(read_only=True),
+    }
+    default_expand = {'address', 'reviews'}
+    field_columns = ANNOUNCEMENT_FIELD_COLUMNS
+    relation_prefetches = ANNOUNCEMENT_RELATION_PREFETCHES
 
     def get_average_rating(self, obj):
         return obj.average_rating
 
+    def get_rating_histogram(self, obj):
+        return {str(grade): count for grade, count in obj.rating_histogram.items()}
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        if 'reviews' in data:
+            data['reviews_next'] = self.get_reviews_next(instance, len(data['reviews']))
+        return data
+
+    def get_reviews_next(self, instance, embedded):
+        """
+        Links the review page following the embedded reviews.
+
+        Args:
+            instance (Announcement): The announcement, with its embedded reviews prefetched.
+            embedded (int): The number of embedded reviews.
+
+        Returns:
+            str: The absolute URL of the next review page, or None if every review is embedded.
+        """
+        request = self.context.get('request')
+        if request is None or not embedded or instance.review_count <= embedded:
+            return None
+        last = getattr(instance, EMBEDDED_REVIEWS_ATTR)[-1]
+        url = reverse('announcement_reviews', args=[instance.pk])
+        return ReviewCursorPagination().get_link_after(request, url, last)
+
     class Meta:
         model = Announcement
-        exclude = ['updated_at', 'deleted', 'is_active']
+        exclude = ['updated_at', 'deleted', 'is_active', *HIDDEN_RATING_FIELDS, *HIDDEN_POPULARITY_FIELDS]
 
     def create(self, validated_data):
         raw_address_data = validated_data.pop('address')
         address, _ = Address.objects.get_or_create(**raw_address_data)
-        return Announcement.objects.create(address=address, **validated_data)
+        announcement = Announcement.objects.create(address=address, **validated_data)
+        setattr(announcement, EMBEDDED_REVIEWS_ATTR, [])
+        return announcement
 
     def update(self, instance, validated_data):
         address_data = validated_data.pop('address', None)
@@ -0,0 +1,15 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.autocomplete import AUTOCOMPLETE_KINDS, CITY
+
+
+class AddressAutocompleteQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the city and street autocomplete.
+
+    `city` only applies to street suggestions and restricts them to that city.
+    """
+    q = serializers.CharField(max_length=75)
+    kind = serializers.ChoiceField(choices=AUTOCOMPLETE_KINDS, required=False, default=CITY)
+    city = serializers.CharField(max_length=50, required=False)
+    limit = serializers.IntegerField(min_value=1, max_value=20, required=False, default=10)
@@ -0,0 +1,49 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.bulk.announcement_upsert import ADDRESS_KEY
+from apps.rental_announcement.models import Address, Announcement
+from apps.rental_announcement.serializers.amenities_field import AmenitiesField
+
+
+class BulkAddressSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the address of an announcement in a bulk upsert.
+
+    Existing addresses are reused instead of rejected, so the uniqueness validator of the
+    model is not applied.
+
+    Meta:
+        model (Address): The model to be validated.
+        fields (list): The columns identifying the address.
+        validators (list): No object-level validators.
+    """
+    class Meta:
+        model = Address
+        fields = ADDRESS_KEY
+        validators = []
+
+
+class BulkAnnouncementSerializer(serializers.ModelSerializer):
+    """
+    Serializer validating one announcement of a bulk upsert.
+
+    An item with an `id` updates that announcement and is validated partially; when it
+    changes the address, the address must be complete. Items without an `id` are created.
+
+    Meta:
+        model (Announcement): The model to be validated.
+        fields (list): The fields a lessor can set.
+    """
+    id = serializers.IntegerField(min_value=1, required=False)
+    address = BulkAddressSerializer()
+    amenities = AmenitiesField(required=False)
+
+    class Meta:
+        model = Announcement
+        fields = ['id', 'title', 'description', 'price', 'rooms', 'type_of_object', 'amenities', 'is_active', 'address']
+
+    def validate_address(self, value):
+        missing = [name for name in ADDRESS_KEY if name not in value]
+        if missing:
+            raise serializers.ValidationError(f'Missing address fields: {", ".join(missing)}.')
+        return value
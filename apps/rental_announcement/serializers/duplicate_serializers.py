@@ -0,0 +1,57 @@
+from django.utils import timezone
+from rest_framework import serializers
+
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.models import Announcement, DuplicateListing
+
+
+class DuplicateAnnouncementSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the summary of an announcement of a duplicate pair.
+    """
+    class Meta:
+        model = Announcement
+        fields = ['id', 'title', 'owner', 'is_active', 'created_at']
+
+
+class DuplicateListingSerializer(serializers.ModelSerializer):
+    """
+    Serializer for moderating suspected duplicate listings.
+
+    Includes:
+        - `id`: The primary key of the flag.
+        - `announcement`: A summary of the newer announcement, the suspected copy.
+        - `original`: A summary of the older announcement.
+        - `similarity`: The estimated Jaccard similarity of their texts.
+        - `status`: The moderation status, the only writable field.
+        - `created_at`: The date and time when the pair was detected.
+        - `reviewed_at`, `reviewed_by`: When and by whom the status was last set.
+
+    Meta:
+        model (DuplicateListing): The model to be serialized.
+        fields (list): The fields to include in the serialized representation.
+    """
+    announcement = DuplicateAnnouncementSerializer(read_only=True)
+    original = DuplicateAnnouncementSerializer(read_only=True)
+
+    class Meta:
+        model = DuplicateListing
+        fields = ['id', 'announcement', 'original', 'similarity', 'status', 'created_at', 'reviewed_at', 'reviewed_by']
+        read_only_fields = ['similarity', 'created_at', 'reviewed_at', 'reviewed_by']
+
+    def update(self, instance, validated_data):
+        """
+        Records the moderator's decision.
+
+        Args:
+            instance (DuplicateListing): The flag.
+            validated_data (dict): The new status.
+
+        Returns:
+            DuplicateListing: The updated flag.
+        """
+        instance.status = validated_data.get('status', instance.status)
+        instance.reviewed_at = None if instance.status == DuplicateStatus.PENDING.value else timezone.now()
+        instance.reviewed_by = None if instance.reviewed_at is None else self.context['request'].user
+        instance.save(update_fields=['status', 'reviewed_at', 'reviewed_by'])
+        return instance
@@ -0,0 +1,181 @@
+from functools import lru_cache
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from rest_framework import serializers
+
+from apps.rental_announcement.models.announcement import average_rating
+
+# `__str__` of the models rendered by `StringRelatedField`, as columns and a format string.
+STRING_REPRESENTATIONS = {
+    'users.user': (['name', 'surname', 'phone'], '{name} {surname} | {phone}'),
+    'rental_announcement.address': (
+        ['street', 'house_number', 'postal_code', 'city'], '{street}, {house_number}, {postal_code}, {city}'
+    ),
+    'rental_announcement.announcement': (['title'], '{title}'),
+}
+
+# `SerializerMethodField`s, as the columns they read and a function of those columns.
+METHOD_FIELDS = {
+    ('rental_announcement.announcement', 'average_rating'): (['review_count', 'rating'], average_rating),
+}
+
+# Fields whose `to_representation` returns database values of their type unchanged.
+PASSTHROUGH_FIELDS = (serializers.IntegerField, serializers.CharField, serializers.BooleanField, serializers.FloatField)
+
+
+class ValuesSerializer:
+    """
+    Read-only serializer that renders the output of a `ModelSerializer` from `values_list()` rows.
+
+    The fields of the model serializer are compiled once into a list of column lookups and
+    one accessor per field, so serializing a row neither instantiates a model nor a field
+    serializer. The output is identical to the model serializer: the same keys in the same
+    order, `None` for null values and the same `to_representation` for dates and decimals.
+
+    Attributes:
+        serializer_class (type): The model serializer whose output is reproduced.
+        lookups (list): The `values_list()` lookups read by the fields.
+        accessors (list): Pairs of field name and a function building the field value from a row.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.lookups = []
+        self.accessors = []
+
+        serializer = serializer_class()
+        model = serializer.Meta.model
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+            accessor = self.compile_field(model, name, field)
+            if accessor is not None:
+                self.accessors.append((name, accessor))
+
+    def add_lookups(self, *lookups):
+        """
+        Registers column lookups and returns their positions in the row.
+
+        Args:
+            *lookups (str): The `values_list()` lookups.
+
+        Returns:
+            list: The index of every lookup in the row.
+        """
+        for lookup in lookups:
+            if lookup not in self.lookups:
+                self.lookups.append(lookup)
+        return [self.lookups.index(lookup) for lookup in lookups]
+
+    def compile_field(self, model, name, field):
+        """
+        Builds the accessor of one serializer field.
+
+        Args:
+            model (type): The model of the serializer.
+            name (str): The field name.
+            field (Field): The serializer field.
+
+        Returns:
+            callable: A function of the row returning the field value, or None for fields the
+                model serializer skips because their source does not exist.
+
+        Raises:
+            ImproperlyConfigured: If the field type cannot be rendered from column values.
+        """
+        label = model._meta.label_lower
+        if isinstance(field, serializers.SerializerMethodField):
+            try:
+                columns, function = METHOD_FIELDS[(label, name)]
+            except KeyError:
+                raise ImproperlyConfigured(f'No values accessor for {label}.{name}.')
+            get_columns = itemgetter(*self.add_lookups(*columns))
+            return lambda row: function(*get_columns(row))
+
+        source = field.source
+        try:
+            model_field = model._meta.get_field(source)
+        except FieldDoesNotExist:
+            if hasattr(model, source):
+                raise ImproperlyConfigured(f'No values accessor for {label}.{name}.')
+            # The model serializer skips read-only fields whose attribute is missing.
+            return None
+
+        if not model_field.is_relation:
+            index, = self.add_lookups(source)
+            if isinstance(field, PASSTHROUGH_FIELDS):
+                return itemgetter(index)
+            to_representation = field.to_representation
+            return lambda row: None if row[index] is None else to_representation(row[index])
+
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            return itemgetter(*self.add_lookups(source))
+        if isinstance(field, serializers.SlugRelatedField):
+            return itemgetter(*self.add_lookups(f'{source}__{field.slug_field}'))
+        if isinstance(field, serializers.StringRelatedField):
+            try:
+                columns, template = STRING_REPRESENTATIONS[model_field.related_model._meta.label_lower]
+            except KeyError:
+                raise ImproperlyConfigured(f'No string representation for {model_field.related_model}.')
+            related_index, = self.add_lookups(source)
+            indexes = self.add_lookups(*(f'{source}__{column}' for column in columns))
+
+            def represent(row):
+                if row[related_index] is None:
+                    return None
+                return template.format(**{column: row[index] for column, index in zip(columns, indexes)})
+            return represent
+        raise ImproperlyConfigured(f'No values accessor for {label}.{name}.')
+
+    def plan(self, queryset, columns=()):
+        """
+        Turns the queryset into named `values_list()` rows with every column the fields read.
+
+        Args:
+            queryset (QuerySet): The queryset to serialize.
+            columns (iterable): Additional model columns or annotations to read, e.g. sort keys.
+
+        Returns:
+            QuerySet: The queryset of named tuples.
+        """
+        opts = queryset.model._meta
+        extra = []
+        for column in columns:
+            if column in queryset.query.annotations:
+                extra.append(column)
+                continue
+            try:
+                if opts.get_field(column).concrete:
+                    extra.append(column)
+            except FieldDoesNotExist:
+                continue
+        lookups = list(dict.fromkeys([*self.lookups, *extra]))
+        return queryset.values_list(*lookups, named=True)
+
+    def represent(self, rows):
+        """
+        Serializes the rows.
+
+        Args:
+            rows (iterable): Rows of a queryset returned by `plan`.
+
+        Returns:
+            list: The serialized rows, as the model serializer would return them.
+        """
+        accessors = self.accessors
+        return [{name: accessor(row) for name, accessor in accessors} for row in rows]
+
+
+@lru_cache(maxsize=None)
+def get_values_serializer(serializer_class):
+    """
+    Returns the compiled values serializer of a model serializer class.
+
+    Args:
+        serializer_class (type): The model serializer class.
+
+    Returns:
+        ValuesSerializer: The values serializer, compiled on first use.
+    """
+    return ValuesSerializer(serializer_class)
@@ -0,0 +1,150 @@
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Prefetch
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def parse_names(value):
+    """
+    Splits a comma-separated query parameter into a set of names.
+
+    Args:
+        value (str): The raw parameter value.
+
+    Returns:
+        set: The non-empty, stripped names.
+    """
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+class FieldSelectionMixin:
+    """
+    Serializer mixin for sparse fieldsets (`?fields=`) and on-demand nesting (`?expand=`) on reads.
+
+    On safe requests the serialized fields are limited to the names in `fields`, and the
+    relations named in `expand` are rendered by their nested serializers. A relation that is
+    not expanded uses its field from `collapsed_fields`, or is dropped if it has none.
+    Without `expand` the relations in `default_expand` are expanded. Write requests always
+    use the full serializer.
+
+    `plan_queryset` derives the queryset from the selected fields, so unrequested columns are
+    deferred and relations are only joined or prefetched when they are rendered.
+
+    Attributes:
+        expandable_fields (dict): Relation name mapped to a factory of its nested serializer.
+        collapsed_fields (dict): Relation name mapped to a factory of its field when not expanded.
+        default_expand (set): Relations expanded when the request has no `expand` parameter.
+        field_columns (dict): Field name mapped to the model columns it reads besides its source.
+        relation_querysets (dict): Reverse relation name mapped to the queryset it is prefetched with.
+        relation_prefetches (dict): Field source that is not a model field mapped to a factory of
+            the `Prefetch` filling it, e.g. a sliced prefetch with `to_attr`.
+    """
+    expandable_fields = {}
+    collapsed_fields = {}
+    default_expand = set()
+    field_columns = {}
+    relation_querysets = {}
+    relation_prefetches = {}
+
+    def get_selection(self):
+        """
+        Reads the field selection of the request.
+
+        Returns:
+            tuple: The selected field names (or None for all fields) and the expanded relations,
+                or None when the request is not a read.
+
+        Raises:
+            ValidationError: If the request names unknown fields or relations.
+        """
+        request = self.context.get('request')
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+
+        params = request.query_params
+        expand = parse_names(params[EXPAND_PARAM]) if EXPAND_PARAM in params else set(self.default_expand)
+        unknown = expand - set(self.expandable_fields)
+        if unknown:
+            raise serializers.ValidationError({EXPAND_PARAM: f'Unknown relations: {", ".join(sorted(unknown))}.'})
+
+        selected = parse_names(params[FIELDS_PARAM]) if params.get(FIELDS_PARAM, '').strip() else None
+        return selected, expand
+
+    def get_fields(self):
+        fields = super().get_fields()
+        selection = self.get_selection()
+        if selection is None:
+            return fields
+
+        selected, expand = selection
+        for name, factory in self.expandable_fields.items():
+            if name in expand:
+                fields[name] = factory()
+            elif self.collapsed_fields.get(name):
+                fields[name] = self.collapsed_fields[name]()
+            else:
+                fields.pop(name, None)
+
+        if selected is not None:
+            unknown = selected - set(fields) - set(self.expandable_fields)
+            if unknown:
+                raise serializers.ValidationError({FIELDS_PARAM: f'Unknown fields: {", ".join(sorted(unknown))}.'})
+            fields = {name: field for name, field in fields.items() if name in selected}
+        return fields
+
+    def plan_queryset(self, queryset, columns=()):
+        """
+        Restricts the queryset to what the selected fields read.
+
+        Concrete columns go into `only()`, rendered forward relations into `select_related()`
+        and rendered reverse relations and `relation_prefetches` into `prefetch_related()`.
+
+        Args:
+            queryset (QuerySet): The queryset to plan.
+            columns (iterable): Additional columns to load, e.g. the sort keys of a paginator.
+
+        Returns:
+            QuerySet: The planned queryset.
+        """
+        opts = queryset.model._meta
+        only = {opts.pk.name}
+        select_related = set()
+        prefetch = []
+
+        for name, field in self.fields.items():
+            only.update(self.field_columns.get(name, []))
+            if field.source == '*':
+                continue
+            source = field.source.split('.')[0]
+            if source in self.relation_prefetches:
+                prefetch.append(self.relation_prefetches[source]())
+                continue
+            try:
+                model_field = opts.get_field(source)
+            except FieldDoesNotExist:
+                continue
+            if model_field.one_to_many or model_field.many_to_many:
+                prefetch.append(Prefetch(source, queryset=self.relation_querysets.get(source)))
+            elif model_field.is_relation:
+                only.add(source)
+                if not isinstance(field, serializers.PrimaryKeyRelatedField):
+                    select_related.add(source)
+            else:
+                only.add(source)
+
+        for column in columns:
+            try:
+                if opts.get_field(column).concrete:
+                    only.add(column)
+            except FieldDoesNotExist:
+                continue
+
+        queryset = queryset.only(*sorted(only))
+        if select_related:
+            queryset = queryset.select_related(*sorted(select_related))
+        if prefetch:
+            queryset = queryset.prefetch_related(*prefetch)
+        return queryset
@@ -0,0 +1,23 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.filters.geo import MAX_TILE_ZOOM
+
+
+class MapClusterQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the viewport and zoom level of the map clusters.
+
+    `bbox` is given as `west,south,east,north` in degrees, like the bounds of slippy map
+    libraries, and validated into a tuple of floats.
+    """
+    bbox = serializers.CharField()
+    zoom = serializers.IntegerField(min_value=0, max_value=MAX_TILE_ZOOM)
+
+    def validate_bbox(self, value):
+        try:
+            west, south, east, north = (float(part) for part in value.split(','))
+        except ValueError:
+            raise serializers.ValidationError('Expected four numbers: west,south,east,north.')
+        if not (-180 <= west <= east <= 180 and -90 <= south <= north <= 90):
+            raise serializers.ValidationError('The bounds must be ordered and within the coordinate ranges.')
+        return west, south, east, north
@@ -0,0 +1,17 @@
+from rest_framework import serializers
+
+from apps.users.models import User
+
+
+class OwnerSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the owner of an announcement, used when the owner is expanded.
+
+    Meta:
+        model (User): The model to be serialized.
+        fields (list): The public contact fields of the owner.
+    """
+    class Meta:
+        model = User
+        fields = ['id', 'name', 'surname', 'phone']
+        read_only_fields = fields
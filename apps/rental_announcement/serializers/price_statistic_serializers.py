@@ -0,0 +1,44 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models import PriceStatistic
+from apps.rental_announcement.models.price_statistic import ANY_CITY, ANY_ROOMS, ANY_TYPE
+
+
+class PriceStatisticQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters selecting a price statistics slice.
+
+    Omitted parameters select all cities, housing types or room counts.
+    """
+    city = serializers.CharField(max_length=50, required=False, default=ANY_CITY)
+    type_of_object = serializers.ChoiceField(choices=HousingTypes.choices(), required=False, default=ANY_TYPE)
+    rooms = serializers.IntegerField(min_value=0, required=False, default=ANY_ROOMS)
+
+
+class PriceStatisticSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the price statistics of one slice.
+
+    Dimensions covering all of their values are rendered as null.
+
+    Meta:
+        model (PriceStatistic): The model to be serialized.
+        fields (list): The slice, the count and the price distribution.
+    """
+    average_price = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = PriceStatistic
+        fields = [
+            'city', 'type_of_object', 'rooms', 'count', 'average_price', 'min_price',
+            'p10', 'p25', 'median', 'p75', 'p90', 'max_price', 'rebuilt_at', 'is_stale',
+        ]
+        read_only_fields = fields
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        for name, any_value in (('city', ANY_CITY), ('type_of_object', ANY_TYPE), ('rooms', ANY_ROOMS)):
+            if data[name] == any_value:
+                data[name] = None
+        return data
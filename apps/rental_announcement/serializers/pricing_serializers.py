@@ -0,0 +1,85 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.choices.rate_rule_kinds import RateRuleKinds
+from apps.rental_announcement.models import RateRule
+from apps.rental_announcement.pricing import MAX_STAY_NIGHTS
+
+# The fields each kind of rate rule needs.
+RATE_RULE_REQUIRED_FIELDS = {
+    RateRuleKinds.SEASON.value: ['start_date', 'end_date', 'nightly_price'],
+    RateRuleKinds.WEEKEND.value: ['percent'],
+    RateRuleKinds.MIN_NIGHTS.value: ['nights'],
+    RateRuleKinds.LENGTH_OF_STAY.value: ['nights', 'percent'],
+}
+
+
+class RateRuleSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the rate rules of an announcement.
+
+    Includes:
+        - `id`: The primary key of the rule.
+        - `announcement`: The priced announcement, taken from the URL.
+        - `kind`: The kind of rule.
+        - `start_date`, `end_date`: The days the rule is limited to, if any.
+        - `nightly_price`: The nightly rate of a season.
+        - `percent`: The weekend surcharge or length-of-stay discount.
+        - `nights`: The minimum stay, or the stay length a discount starts at.
+
+    Meta:
+        model (RateRule): The model to be serialized.
+        fields (list): The fields to include in the serialized representation.
+    """
+    class Meta:
+        model = RateRule
+        fields = ['id', 'announcement', 'kind', 'start_date', 'end_date', 'nightly_price', 'percent', 'nights']
+        read_only_fields = ['announcement']
+
+    def validate(self, data):
+        """
+        Validates that the rule has the fields of its kind and ordered dates.
+
+        Args:
+            data (dict): The data to validate.
+
+        Returns:
+            dict: The validated data.
+
+        Raises:
+            serializers.ValidationError: If a field of the kind is missing or the dates are reversed.
+        """
+        values = {field: data.get(field, getattr(self.instance, field, None))
+                  for field in ['kind', 'start_date', 'end_date', 'nightly_price', 'percent', 'nights']}
+        missing = [field for field in RATE_RULE_REQUIRED_FIELDS[values['kind']] if values[field] is None]
+        if missing:
+            raise serializers.ValidationError(f'A {values["kind"]} rule needs {", ".join(missing)}.')
+        if values['start_date'] and values['end_date'] and values['end_date'] < values['start_date']:
+            raise serializers.ValidationError('end_date cannot be before start_date.')
+        return data
+
+
+class StayQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the stay of a price quote.
+
+    `check_out` is the departure day, so a stay has `check_out - check_in` nights, like the
+    `start_date` and `end_date` of a booking.
+    """
+    check_in = serializers.DateField()
+    check_out = serializers.DateField()
+
+    def validate(self, data):
+        nights = (data['check_out'] - data['check_in']).days
+        if nights < 1:
+            raise serializers.ValidationError('check_out must be after check_in.')
+        if nights > MAX_STAY_NIGHTS:
+            raise serializers.ValidationError(f'A stay can have at most {MAX_STAY_NIGHTS} nights.')
+        return data
+
+
+class StaySearchQuerySerializer(StayQuerySerializer):
+    """
+    Serializer for the stay and total price bounds of the announcement search.
+    """
+    total_price__gte = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
+    total_price__lte = serializers.DecimalField(max_digits=12, decimal_places=2, required=False)
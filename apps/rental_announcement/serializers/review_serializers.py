@@ -1,5 +1,6 @@
+from django.db import transaction
 from rest_framework import serializers
-from apps.rental_announcement.models import Review, Booking
+from apps.rental_announcement.models import Announcement, Review, Booking
 from apps.rental_announcement.choices.booking_status import BookingStatus
 
 
@@ -51,7 +52,8 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Creates a new review instance with the validated data.
+        Creates a new review instance with the validated data and adds its grade
+        to the rating aggregates of the announcement in the same transaction.
 
         Args:
             validated_data (dict): The validated data for the review.
@@ -60,4 +62,7 @@ class ReviewCreateSerializer(serializers.ModelSerializer):
             Review: The created review instance.
         """
         user = self.context['request'].user
-        return Review.objects.create(user=user, **validated_data)
+        with transaction.atomic():
+            review = Review.objects.create(user=user, **validated_data)
+            Announcement.update_rating(review.announcement_id, added_grade=review.grade)
+        return review
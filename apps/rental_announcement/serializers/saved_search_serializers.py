@@ -0,0 +1,96 @@
+from rest_framework import serializers
+
+from apps.rental_announcement.models import Announcement, SavedSearch, SearchMatch
+
+# Active saved searches a user may keep at once.
+MAX_SAVED_SEARCHES_PER_USER = 50
+
+
+class SavedSearchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for creating, listing and updating saved searches.
+
+    Includes:
+        - `id`: The primary key of the saved search.
+        - `name`: An optional label.
+        - `city`, `federal_land`, `type_of_object`: Exact criteria, empty for any.
+        - `min_price`, `max_price`, `min_rooms`, `max_rooms`: Inclusive bounds, null for open ends.
+        - `filter_params`: The equivalent `GET /announcement/` query parameters.
+        - `created_at`: The date and time when the search was saved.
+
+    Meta:
+        model (SavedSearch): The model to be serialized.
+        fields (list): The fields to include in the serialized representation.
+    """
+    filter_params = serializers.DictField(read_only=True)
+
+    class Meta:
+        model = SavedSearch
+        fields = [
+            'id', 'name', 'city', 'federal_land', 'type_of_object',
+            'min_price', 'max_price', 'min_rooms', 'max_rooms', 'filter_params', 'created_at',
+        ]
+        read_only_fields = ['created_at']
+
+    def validate(self, data):
+        """
+        Validates that the bounds are ordered and that the user has room for another search.
+
+        Args:
+            data (dict): The data to validate.
+
+        Returns:
+            dict: The validated data.
+
+        Raises:
+            serializers.ValidationError: If a lower bound exceeds its upper bound, or a new
+                search would exceed `MAX_SAVED_SEARCHES_PER_USER`.
+        """
+        for low, high in (('min_price', 'max_price'), ('min_rooms', 'max_rooms')):
+            low_value = data.get(low, getattr(self.instance, low, None))
+            high_value = data.get(high, getattr(self.instance, high, None))
+            if low_value is not None and high_value is not None and low_value > high_value:
+                raise serializers.ValidationError(f'{low} cannot exceed {high}.')
+
+        if self.instance is None:
+            user = self.context['request'].user
+            if SavedSearch.objects.filter(user=user, is_active=True).count() >= MAX_SAVED_SEARCHES_PER_USER:
+                raise serializers.ValidationError(
+                    f'A user can keep at most {MAX_SAVED_SEARCHES_PER_USER} saved searches.'
+                )
+        return data
+
+
+class SearchMatchAnnouncementSerializer(serializers.ModelSerializer):
+    """
+    Serializer for the summary of the announcement of a search match.
+    """
+    city = serializers.CharField(source='address.city', read_only=True)
+
+    class Meta:
+        model = Announcement
+        fields = ['id', 'title', 'price', 'rooms', 'type_of_object', 'city']
+
+
+class SearchMatchSerializer(serializers.ModelSerializer):
+    """
+    Serializer for listing the matches of a user's saved searches.
+
+    Includes:
+        - `id`: The primary key of the match.
+        - `saved_search`: The primary key of the matched saved search.
+        - `saved_search_name`: The name of the matched saved search.
+        - `announcement`: A summary of the matching announcement.
+        - `created_at`: The date and time when the match was found.
+        - `notified_at`: The date and time when the user was notified, if already.
+
+    Meta:
+        model (SearchMatch): The model to be serialized.
+        fields (list): The fields to include in the serialized representation.
+    """
+    saved_search_name = serializers.CharField(source='saved_search.name', read_only=True)
+    announcement = SearchMatchAnnouncementSerializer(read_only=True)
+
+    class Meta:
+        model = SearchMatch
+        fields = ['id', 'saved_search', 'saved_search_name', 'announcement', 'created_at', 'notified_at']
@@ -0,0 +1,8 @@
+from rest_framework import serializers
+
+
+class SimilarAnnouncementsQuerySerializer(serializers.Serializer):
+    """
+    Serializer for the query parameters of the similar announcements.
+    """
+    limit = serializers.IntegerField(min_value=1, max_value=20, required=False, default=6)
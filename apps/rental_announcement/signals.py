@@ -0,0 +1,222 @@
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.db import transaction
+from django.dispatch import receiver
+from django.utils import timezone
+
+from apps.rental_announcement.alerts import MATCHING_FIELDS, saved_search_matcher
+from apps.rental_announcement.cache import invalidate_search_cache
+from apps.rental_announcement.duplicates import DUPLICATE_FIELDS, check_quietly
+from apps.rental_announcement.models import Address, Announcement, Booking, DuplicateListing, RateRule, Review
+from apps.rental_announcement.rollups import apply_price_changes, price_contribution, stored_price_contribution
+from apps.rental_announcement.rollups.price_statistics import PRICE_STATISTIC_FIELDS
+from apps.rental_announcement.search import get_search_backend
+from apps.rental_announcement.similarity import SIMILARITY_FIELDS, similar_listings
+from apps.users.models import User
+
+SEARCH_INDEXED_FIELDS = {'title', 'description'}
+
+
+@receiver(post_save, sender=Announcement)
+def index_announcement(sender, instance, update_fields=None, **kwargs):
+    """
+    Re-indexes an announcement for full-text search after it is saved.
+
+    Saves restricted to fields outside the title and description are skipped.
+    Index rows of deleted announcements are removed by the foreign key cascade.
+    """
+    if update_fields is not None and not SEARCH_INDEXED_FIELDS & set(update_fields):
+        return
+
+    backend = get_search_backend()
+    if backend.maintains_index:
+        backend.index(instance)
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+@receiver(post_save, sender=Address)
+@receiver(post_delete, sender=Address)
+@receiver(post_save, sender=Review)
+@receiver(post_delete, sender=Review)
+@receiver(post_save, sender=DuplicateListing)
+@receiver(post_delete, sender=DuplicateListing)
+def invalidate_announcement_search(sender, **kwargs):
+    """
+    Invalidates the cached announcement search responses once any change that can alter
+    them is committed, so a request running meanwhile cannot cache the old rows again.
+    """
+    transaction.on_commit(invalidate_search_cache)
+
+
+@receiver(post_save, sender=Address)
+def touch_address_announcements(sender, instance, **kwargs):
+    """
+    Refreshes `updated_at` of the announcements at an address after the address changes,
+    so their conditional GET validators change with the nested address.
+    """
+    Announcement.objects.filter(address=instance).update(updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def touch_booked_announcement(sender, instance, **kwargs):
+    """
+    Refreshes `updated_at` of the booked announcement and invalidates the search cache once
+    an approved booking change is committed, since it alters the availability search.
+    """
+    if not instance.is_approved:
+        return
+    Announcement.objects.filter(pk=instance.announcement_id).update(updated_at=timezone.now())
+    transaction.on_commit(invalidate_search_cache)
+
+
+@receiver(post_save, sender=RateRule)
+@receiver(post_delete, sender=RateRule)
+def touch_priced_announcement(sender, instance, **kwargs):
+    """
+    Refreshes `updated_at` of an announcement and invalidates the search cache once a change
+    of its rate rules is committed, since the rules alter the stay prices of the search.
+    """
+    Announcement.objects.filter(pk=instance.announcement_id).update(updated_at=timezone.now())
+    transaction.on_commit(invalidate_search_cache)
+
+
+@receiver(post_save, sender=User)
+def touch_owner_announcements(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Refreshes `updated_at` of a lessor's announcements after the lessor profile changes,
+    since announcement lists show the owner. Login bookkeeping saves are ignored.
+    """
+    if created or (update_fields is not None and set(update_fields) <= {'last_login'}):
+        return
+    if Announcement.objects.filter(owner=instance).update(updated_at=timezone.now()):
+        transaction.on_commit(invalidate_search_cache)
+
+
+@receiver(pre_save, sender=Announcement)
+def remember_price_contribution(sender, instance, update_fields=None, **kwargs):
+    """
+    Remembers what the stored announcement adds to the price statistics before it changes.
+
+    Saves restricted to fields that cannot change the statistics, such as the rating
+    aggregates, are skipped.
+    """
+    if instance._state.adding or (update_fields is not None and not PRICE_STATISTIC_FIELDS & set(update_fields)):
+        return
+    instance._price_contribution = stored_price_contribution(instance.pk)
+
+
+@receiver(post_save, sender=Announcement)
+def update_price_statistics(sender, instance, created, **kwargs):
+    """
+    Moves the contribution of a created or changed announcement in the price statistics.
+    """
+    if not created and not hasattr(instance, '_price_contribution'):
+        return
+    before = instance.__dict__.pop('_price_contribution', None)
+    after = price_contribution(instance)
+    if before != after:
+        apply_price_changes(removed=[before] if before else [], added=[after] if after else [])
+
+
+@receiver(pre_delete, sender=Announcement)
+def remove_price_contribution(sender, instance, **kwargs):
+    """
+    Removes a deleted active announcement from the price statistics.
+
+    Runs before the delete, while the address of the announcement can still be read.
+    """
+    if instance.is_active:
+        apply_price_changes(removed=[price_contribution(instance)])
+
+
+@receiver(pre_save, sender=Address)
+def remember_address_city(sender, instance, update_fields=None, **kwargs):
+    """
+    Remembers the stored city of an address before it changes.
+    """
+    if instance._state.adding or (update_fields is not None and 'city' not in update_fields):
+        return
+    instance._stored_city = Address.objects.filter(pk=instance.pk).values_list('city', flat=True).first()
+
+
+@receiver(post_save, sender=Address)
+def move_address_price_statistics(sender, instance, **kwargs):
+    """
+    Moves the active announcements at an address to the slices of its new city.
+    """
+    stored_city = instance.__dict__.pop('_stored_city', None)
+    if stored_city is None or stored_city == instance.city:
+        return
+    rows = list(Announcement.objects.active().filter(address=instance).values_list('type_of_object', 'rooms', 'price'))
+    if rows:
+        apply_price_changes(
+            removed=[(stored_city, *row) for row in rows],
+            added=[(instance.city, *row) for row in rows],
+        )
+
+
+@receiver(post_save, sender=Announcement)
+@receiver(post_delete, sender=Announcement)
+def update_similar_listings(sender, instance, update_fields=None, **kwargs):
+    """
+    Refreshes the similar listings vector of an announcement once the change is committed.
+
+    Saves restricted to fields outside the vector are skipped.
+    """
+    if update_fields is not None and not SIMILARITY_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(lambda: similar_listings.update_quietly([instance.pk]))
+
+
+@receiver(post_save, sender=Address)
+def update_address_similar_listings(sender, instance, created, **kwargs):
+    """
+    Refreshes the similar listings vectors of the announcements at a changed address,
+    whose federal land is part of the vector.
+    """
+    if created:
+        return
+    address_id = instance.pk
+    transaction.on_commit(lambda: similar_listings.update_quietly(
+        Announcement.objects.filter(address_id=address_id).values_list('pk', flat=True)
+    ))
+
+
+@receiver(post_save, sender=Announcement)
+def match_saved_searches(sender, instance, update_fields=None, **kwargs):
+    """
+    Matches a new or changed active announcement against the saved searches once the
+    change is committed.
+
+    Saves restricted to fields no saved search looks at are skipped.
+    """
+    if not instance.is_active or (update_fields is not None and not MATCHING_FIELDS & set(update_fields)):
+        return
+    transaction.on_commit(lambda: saved_search_matcher.match_quietly([instance.pk]))
+
+
+@receiver(post_save, sender=Address)
+def match_address_saved_searches(sender, instance, created, **kwargs):
+    """
+    Matches the announcements at a changed address against the saved searches, since a
+    new city or federal land can make them match other searches.
+    """
+    if created:
+        return
+    address_id = instance.pk
+    transaction.on_commit(lambda: saved_search_matcher.match_quietly(
+        Announcement.objects.filter(address_id=address_id).values_list('pk', flat=True)
+    ))
+
+
+@receiver(post_save, sender=Announcement)
+def check_duplicates(sender, instance, update_fields=None, **kwargs):
+    """
+    Signs a new or changed announcement and flags its near-duplicates once the change is committed.
+
+    Saves restricted to fields outside the title and description are skipped.
+    """
+    if update_fields is not None and not DUPLICATE_FIELDS & set(update_fields):
+        return
+    transaction.on_commit(lambda: check_quietly([instance.pk]))
@@ -0,0 +1,6 @@
+from apps.rental_announcement.similarity.similar_listings import (
+    SIMILARITY_FIELDS,
+    SimilarListingsIndex,
+    feature_matrix,
+    similar_listings,
+)
@@ -0,0 +1,280 @@
+import fcntl
+import logging
+import os
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+from django.conf import settings
+
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models import Announcement
+
+logger = logging.getLogger(__name__)
+
+# Scale of each feature block. The distance between two announcements is the Euclidean
+# distance of their vectors: a doubled price or doubled room count adds 1, another housing
+# type adds sqrt(2) and another federal land sqrt(2) * 2.
+FEATURE_SCALES = {'price': 1.0, 'rooms': 1.0, 'type_of_object': 1.0, 'federal_land': 2.0}
+
+TYPE_CODES = {housing_type.value: code for code, housing_type in enumerate(HousingTypes)}
+LAND_CODES = {land.value: code for code, land in enumerate(FederalLands)}
+PRICE_COLUMN = 0
+ROOMS_COLUMN = 1
+TYPE_OFFSET = 2
+LAND_OFFSET = TYPE_OFFSET + len(TYPE_CODES)
+DIMENSIONS = LAND_OFFSET + len(LAND_CODES)
+
+# One row per slot; slots with id 0 are free for announcements activated later. The squared
+# norm of each vector is stored, so a lookup needs a single matrix-vector product.
+INDEX_DTYPE = np.dtype([('id', '<i8'), ('norm', '<f4'), ('vector', '<f4', (DIMENSIONS,))])
+MIN_CAPACITY = 1024
+GROWTH = 1.25
+
+# The announcement columns a vector is built from, after the primary key.
+FEATURE_COLUMNS = ['pk', 'price', 'rooms', 'type_of_object', 'address__federal_land']
+# Announcement fields whose change moves the announcement in or out of the index or changes its vector.
+SIMILARITY_FIELDS = {'price', 'rooms', 'type_of_object', 'is_active', 'address', 'address_id'}
+
+
+def feature_matrix(prices, rooms, types, lands):
+    """
+    Builds the feature vectors of announcements.
+
+    Prices and room counts are compared on a log2 scale, housing types and federal lands
+    are one-hot encoded. Every block is multiplied by its `FEATURE_SCALES` entry.
+
+    Args:
+        prices (sequence): The prices.
+        rooms (sequence): The numbers of rooms.
+        types (sequence): The housing types.
+        lands (sequence): The federal lands of the addresses.
+
+    Returns:
+        ndarray: A `(len(prices), DIMENSIONS)` float32 matrix.
+    """
+    count = len(prices)
+    vectors = np.zeros((count, DIMENSIONS), dtype=np.float32)
+    vectors[:, PRICE_COLUMN] = FEATURE_SCALES['price'] * np.log2(np.maximum(np.asarray(prices, dtype=float), 1))
+    vectors[:, ROOMS_COLUMN] = FEATURE_SCALES['rooms'] * np.log2(np.maximum(np.asarray(rooms, dtype=float), 1))
+    rows = np.arange(count)
+    for name, values, codes, offset in (('type_of_object', types, TYPE_CODES, TYPE_OFFSET),
+                                        ('federal_land', lands, LAND_CODES, LAND_OFFSET)):
+        columns = np.fromiter((codes.get(value, -1) for value in values), dtype=np.int64, count=count)
+        known = columns >= 0
+        vectors[rows[known], offset + columns[known]] = FEATURE_SCALES[name]
+    return vectors
+
+
+def feature_rows(rows):
+    """
+    Splits `FEATURE_COLUMNS` rows into their primary keys and feature vectors.
+
+    Args:
+        rows (list): `values_list(*FEATURE_COLUMNS)` rows.
+
+    Returns:
+        tuple: An int64 array of primary keys and their `feature_matrix`.
+    """
+    ids, prices, rooms, types, lands = zip(*rows) if rows else ((), (), (), (), ())
+    return np.array(ids, dtype=np.int64), feature_matrix(prices, rooms, types, lands)
+
+
+class SimilarListingsIndex:
+    """
+    Feature vectors of the active announcements in a memory-mapped `.npy` file.
+
+    All worker processes map the same file, so they share one copy of the matrix in the
+    page cache. Saves update the rows of the changed announcements in place, and a file
+    that runs out of free slots is replaced by a larger one, which the other processes
+    notice by its inode and map again. Writers serialize on an exclusive lock file.
+
+    Methods:
+        - `open`: Maps the index file.
+        - `rebuild`: Writes a new index from all active announcements.
+        - `update`: Refreshes the rows of some announcements.
+        - `similar`: Returns the nearest announcements of one announcement.
+    """
+
+    def __init__(self):
+        self.rows = None
+        self.identity = None
+
+    @property
+    def path(self):
+        return Path(settings.SIMILAR_LISTINGS_INDEX_PATH)
+
+    @contextmanager
+    def locked(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(f'{self.path}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def open(self):
+        """
+        Maps the index file, again if it was replaced since it was last mapped.
+
+        Returns:
+            memmap: The index rows, or None if there is no index file in the current layout.
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            self.rows = self.identity = None
+            return None
+        identity = (str(self.path), stat.st_dev, stat.st_ino)
+        if identity != self.identity:
+            rows = np.load(self.path, mmap_mode='r+')
+            self.rows, self.identity = (rows, identity) if rows.dtype == INDEX_DTYPE else (None, None)
+        return self.rows
+
+    def write(self, rows):
+        """
+        Replaces the index file atomically.
+
+        Args:
+            rows (ndarray): The index rows, including free slots.
+        """
+        temporary = self.path.with_name(f'{self.path.name}.tmp')
+        with open(temporary, 'wb') as file:
+            np.save(file, rows)
+        os.replace(temporary, self.path)
+
+    def rebuild(self, chunk_size=2000, min_capacity=MIN_CAPACITY):
+        """
+        Writes a new index from all active announcements.
+
+        The lock is taken before the announcements are read, so updates committed during
+        the rebuild wait and are applied to the new file.
+
+        Args:
+            chunk_size (int): The number of announcements read per database round trip.
+            min_capacity (int, optional): The minimum number of slots of the new file.
+
+        Returns:
+            int: The number of indexed announcements.
+        """
+        with self.locked():
+            ids, vectors = feature_rows(list(
+                Announcement.objects.active()
+                .order_by('pk')
+                .values_list(*FEATURE_COLUMNS)
+                .iterator(chunk_size=chunk_size)
+            ))
+            rows = np.zeros(max(min_capacity, int(len(ids) * GROWTH)), dtype=INDEX_DTYPE)
+            rows['id'][:len(ids)] = ids
+            rows['norm'][:len(ids)] = np.square(vectors).sum(axis=1)
+            rows['vector'][:len(ids)] = vectors
+            self.write(rows)
+        return len(ids)
+
+    def update(self, announcement_ids):
+        """
+        Refreshes the rows of some announcements after they changed.
+
+        Active announcements get their current vector, in a free slot if they were not
+        indexed yet; others are removed. Nothing happens before the first rebuild.
+
+        Args:
+            announcement_ids (iterable): The primary keys of the changed announcements.
+        """
+        announcement_ids = set(announcement_ids)
+        if not announcement_ids or not self.path.exists():
+            return
+        with self.locked():
+            rows = self.open()
+            if rows is None:
+                return
+            ids, vectors = feature_rows(list(Announcement.objects.active()
+                                             .filter(pk__in=announcement_ids)
+                                             .values_list(*FEATURE_COLUMNS)))
+            active = ids.tolist()
+            active_ids = set(active)
+            slots = np.flatnonzero(np.isin(rows['id'], list(announcement_ids)))
+            slot_of = dict(zip(rows['id'][slots].tolist(), slots.tolist()))
+            rows['id'][[slot for pk, slot in slot_of.items() if pk not in active_ids]] = 0
+
+            new = [index for index, pk in enumerate(active) if pk not in slot_of]
+            free = np.flatnonzero(rows['id'] == 0)
+            if len(free) < len(new):
+                # Grow by at least the missing slots, so a batch larger than the growth still fits.
+                added = max(MIN_CAPACITY, int(len(rows) * (GROWTH - 1)), len(new) - len(free))
+                rows = np.concatenate([rows, np.zeros(added, INDEX_DTYPE)])
+                free = np.flatnonzero(rows['id'] == 0)
+            targets = [slot_of.get(pk) for pk in active]
+            for index, slot in zip(new, free):
+                targets[index] = slot
+            rows['id'][targets] = ids
+            rows['norm'][targets] = np.square(vectors).sum(axis=1)
+            rows['vector'][targets] = vectors
+
+            if isinstance(rows, np.memmap):
+                rows.flush()
+            else:
+                self.write(rows)
+
+    def update_quietly(self, announcement_ids):
+        """
+        Updates the index and logs instead of raising any error, since the change that
+        triggered the update is already committed and the next rebuild repairs the index.
+
+        Args:
+            announcement_ids (iterable): The primary keys of the changed announcements.
+        """
+        try:
+            self.update(announcement_ids)
+        except Exception:
+            logger.exception('Could not update the similar listings index.')
+
+    def similar(self, announcement_id, limit=6):
+        """
+        Finds the active announcements nearest to an announcement.
+
+        Announcements that are not indexed, such as inactive ones, are compared by their
+        stored features. Lookups never build the index, which would scan every announcement
+        within a request; until `rebuild_similar_listings` has run, nothing is similar.
+
+        Args:
+            announcement_id (int): The primary key of the announcement.
+            limit (int, optional): The maximum number of announcements.
+
+        Returns:
+            list: The primary keys of the nearest announcements, nearest first, or None if
+                the announcement does not exist.
+        """
+        rows = self.open()
+        if rows is None:
+            if not Announcement.objects.filter(pk=announcement_id).exists():
+                return None
+            logger.warning('The similar listings index does not exist, run `manage.py rebuild_similar_listings`.')
+            return []
+        ids = rows['id']
+        vectors = rows['vector']
+
+        # Free slots hold id 0, which is never a primary key.
+        position = np.flatnonzero(ids == announcement_id) if announcement_id else []
+        if len(position):
+            query = np.array(vectors[position[0]])
+        else:
+            row = Announcement.objects.filter(pk=announcement_id).values_list(*FEATURE_COLUMNS).first()
+            if row is None:
+                return None
+            query = feature_rows([row])[1][0]
+
+        # Squared distances without the constant squared norm of the query.
+        distances = rows['norm'] - 2 * (vectors @ query)
+        distances[(ids == 0) | (ids == announcement_id)] = np.inf
+        limit = min(limit, int(np.isfinite(distances).sum()))
+        if limit <= 0:
+            return []
+        nearest = np.argpartition(distances, limit - 1)[:limit]
+        nearest = nearest[np.lexsort((ids[nearest], distances[nearest]))]
+        return ids[nearest].tolist()
+
+
+similar_listings = SimilarListingsIndex()
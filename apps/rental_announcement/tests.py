@@ -1,3 +1,2261 @@
-from django.test import TestCase
+import json
+import re
+from base64 import urlsafe_b64encode
+import tempfile
+import threading
+import zipfile
+import zlib
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+import numpy as np
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.http import QueryDict
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from apps.rental_announcement.alerts import SavedSearchMatcher, saved_search_matcher
+from apps.rental_announcement.autocomplete import CITY, address_autocomplete
+from apps.rental_announcement.autocomplete.address_autocomplete import AddressAutocomplete
+from apps.rental_announcement.cache import get_search_cache_stats
+from apps.rental_announcement.cache.search_cache import normalize_query
+from apps.rental_announcement.feeds import changes_queryset
+from apps.rental_announcement.filters import AnnouncementFilter, cluster_queryset
+from apps.rental_announcement.filters.geo import MAX_TILE_ZOOM, key_tile, tile_key, tile_xy
+from apps.rental_announcement.choices.amenities import Amenities
+from apps.rental_announcement.choices.booking_status import BookingStatus
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.duplicates import find_duplicates, listing_text, signature_matrix
+from apps.rental_announcement.counters import ViewCounter, flush_views, view_counter
+from apps.rental_announcement.choices.federal_lands import FederalLands
+from apps.rental_announcement.choices.rate_rule_kinds import RateRuleKinds
+from apps.rental_announcement.choices.type_of_object import HousingTypes
+from apps.rental_announcement.models import (
+    Address,
+    Announcement,
+    ArchivedAnnouncement,
+    ArchivedBooking,
+    ArchivedDuplicateListing,
+    ArchivedRateRule,
+    ArchivedReview,
+    Booking,
+    DuplicateListing,
+    ListingSignature,
+    PostalCode,
+    PriceStatistic,
+    RateRule,
+    Review,
+    SavedSearch,
+    SearchMatch,
+    SearchDocument,
+    SearchTerm,
+    SignatureBand,
+)
+from apps.rental_announcement.models.price_statistic import ANY_ROOMS
+from apps.rental_announcement.search import get_search_backend, tokenize
+from apps.rental_announcement.serializers.fast_read import STRING_REPRESENTATIONS
+from apps.rental_announcement.serializers.review_list_serializer import ReviewListSerializer
+from apps.rental_announcement.pricing import quote_stays
+from apps.rental_announcement.similarity import similar_listings
+from apps.rental_announcement.similarity.similar_listings import MIN_CAPACITY
+from apps.rental_announcement.views import AnnouncementListCreateAPIView, ReviewRetrieveUpdateDestroyAPIView
+from apps.users.models import User
+
+
+class AnnouncementTestMixin:
+    """
+    Helpers for creating users, addresses, announcements and reviews in tests.
+    """
+
+    def create_user(self, username, is_lessor=False):
+        return User.objects.create_user(
+            username=username,
+            email=f'{username}@example.com',
+            password='StrongPass123',
+            name='Test',
+            surname='User',
+            phone=f'+49{zlib.crc32(username.encode()):011d}',
+            is_lessor=is_lessor,
+        )
+
+    def create_address(self, city='Berlin', street='Hauptstrasse', house_number='1',
+                       postal_code='10115', federal_land=FederalLands.BERLIN.value):
+        return Address.objects.create(
+            federal_land=federal_land,
+            city=city,
+            street=street,
+            house_number=house_number,
+            postal_code=postal_code,
+        )
+
+    def create_announcement(self, owner, address=None, **kwargs):
+        data = {
+            'title': 'Cosy flat',
+            'description': 'A cosy flat in the city centre.',
+            'price': 100,
+            'rooms': 2,
+            'type_of_object': HousingTypes.APARTMENT.value,
+        }
+        data.update(kwargs)
+        return Announcement.objects.create(owner=owner, address=address or self.create_address(), **data)
+
+    def create_review(self, announcement, user, grade):
+        Booking.objects.create(
+            renter=user,
+            announcement=announcement,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            status=BookingStatus.APPROVED.value,
+            is_approved=True,
+        )
+        review = Review.objects.create(
+            announcement=announcement,
+            user=user,
+            message='A very pleasant stay, would recommend.',
+            grade=grade,
+        )
+        Announcement.update_rating(announcement.pk, added_grade=grade)
+        return review
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class AnnouncementQueryCountTests(AnnouncementTestMixin, TestCase):
+    """
+    Pins the number of queries issued by the announcement read endpoints.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renters = [self.create_user(f'renter{i}') for i in range(3)]
+        for i in range(5):
+            announcement = self.create_announcement(
+                self.lessor,
+                address=self.create_address(house_number=str(i)),
+                title=f'Flat {i}',
+            )
+            for renter in self.renters:
+                self.create_review(announcement, renter, grade=(i % 5) + 1)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def test_list_uses_two_queries(self):
+        # One aggregate for the conditional GET validators, one for the page.
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('create_announcement'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 5)
+
+    def test_detail_uses_three_queries(self):
+        # The validators lookup, the announcement with owner and address, and its reviews.
+        announcement = Announcement.objects.first()
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('update_announcement', args=[announcement.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['reviews']), 3)
+
+    def test_sparse_list_skips_unrequested_columns_and_joins(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('create_announcement'), {'fields': 'id,price', 'ordering': 'price'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'price'})
+        self.assertEqual(len(queries), 2)
+        page_sql = queries[-1]['sql']
+        self.assertNotIn('description', page_sql)
+        self.assertNotIn('JOIN', page_sql)
+
+    def test_list_expansions(self):
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse('create_announcement'), {'expand': 'owner,address'})
+        item = response.data['results'][0]
+        self.assertEqual(item['owner']['id'], self.lessor.pk)
+        self.assertEqual(item['address']['house_number'], '4')
+        self.assertNotIn('reviews', item)
+
+        # The reviews are prefetched with their authors in one more query.
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('create_announcement'), {'expand': 'reviews', 'fields': 'id,reviews'})
+        self.assertEqual([len(item['reviews']) for item in response.data['results']], [3] * 5)
+
+    def test_detail_without_expansions(self):
+        announcement = Announcement.objects.first()
+        url = reverse('update_announcement', args=[announcement.pk])
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'expand': '', 'fields': 'title,address,average_rating'})
+        self.assertEqual(response.data, {
+            'title': announcement.title,
+            'address': str(announcement.address),
+            'average_rating': announcement.average_rating,
+        })
+
+    def test_unknown_fields_are_rejected(self):
+        for params in [{'fields': 'id,secret'}, {'expand': 'bookings'}]:
+            with self.subTest(params=params):
+                response = self.client.get(reverse('create_announcement'), params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_average_rating_matches_reviews(self):
+        announcement = self.create_announcement(self.lessor, address=self.create_address(house_number='99'))
+        self.create_review(announcement, self.renters[0], grade=4)
+        self.create_review(announcement, self.renters[1], grade=5)
+        response = self.client.get(reverse('update_announcement', args=[announcement.pk]))
+        self.assertEqual(response.data['average_rating'], 4.5)
+
+    def test_average_rating_without_reviews_is_zero(self):
+        announcement = self.create_announcement(self.lessor, address=self.create_address(house_number='98'))
+        response = self.client.get(reverse('update_announcement', args=[announcement.pk]))
+        self.assertEqual(response.data['average_rating'], 0)
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class EmbeddedReviewTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the newest reviews embedded in the announcement detail and the review page.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.announcement = self.create_announcement(self.lessor)
+        self.reviews = [self.create_review(self.announcement, self.renter, grade=i % 5 + 1) for i in range(13)]
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def test_detail_embeds_the_newest_reviews_with_a_link_to_the_rest(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('update_announcement', args=[self.announcement.pk]))
+        self.assertEqual(response.data['review_count'], 13)
+        self.assertEqual(
+            [review['grade'] for review in response.data['reviews']],
+            [review.grade for review in reversed(self.reviews[3:])],
+        )
+
+        with self.assertNumQueries(2):
+            page = self.client.get(response.data['reviews_next'])
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual([review['grade'] for review in page.data['results']], [3, 2, 1])
+        self.assertEqual(page.data['results'][0]['announcement'], self.announcement.title)
+        self.assertIsNone(page.data['next'])
+
+    def test_review_page_is_paged_by_cursor(self):
+        url = reverse('announcement_reviews', args=[self.announcement.pk])
+        first = self.client.get(url, {'page_size': 8})
+        second = self.client.get(first.data['next'])
+        self.assertEqual(len(first.data['results']) + len(second.data['results']), 13)
+        self.assertIsNone(second.data['next'])
+        self.assertEqual(self.client.get(reverse('announcement_reviews', args=[0])).status_code, 404)
+
+    def test_listing_with_few_reviews_has_no_link(self):
+        announcement = self.create_announcement(self.lessor, address=self.create_address(house_number='2'))
+        self.create_review(announcement, self.renter, grade=5)
+        response = self.client.get(reverse('update_announcement', args=[announcement.pk]))
+        self.assertEqual(len(response.data['reviews']), 1)
+        self.assertIsNone(response.data['reviews_next'])
+
+    def test_list_expansion_is_capped(self):
+        response = self.client.get(reverse('create_announcement'), {'expand': 'reviews', 'fields': 'id,reviews'})
+        self.assertEqual(len(response.data['results'][0]['reviews']), 10)
+
+
+class BulkUpsertTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for creating and updating announcements in bulk.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.other = self.create_user('other', is_lessor=True)
+        self.address = self.create_address()
+        self.announcement = self.create_announcement(self.lessor, address=self.address)
+        self.foreign = self.create_announcement(self.other, address=self.address)
+        PostalCode.objects.create(postal_code='80331', place='München', latitude=48.137, longitude=11.575)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def item(self, title, house_number='1', **kwargs):
+        data = {
+            'title': title,
+            'description': 'A renovated flat close to the park.',
+            'price': '950.00',
+            'rooms': 3,
+            'type_of_object': HousingTypes.APARTMENT.value,
+            'address': {
+                'federal_land': FederalLands.BAYERN.value, 'city': 'München', 'street': 'Marienplatz',
+                'house_number': house_number, 'postal_code': '80331',
+            },
+        }
+        data.update(kwargs)
+        return data
+
+    def test_upserts_valid_items_and_reports_errors_per_item(self):
+        items = [
+            self.item('Balcony flat one'),
+            self.item('Balcony flat two'),
+            self.item('Garden flat', house_number='2'),
+            self.item('Broken', rooms='many'),
+            {'id': self.announcement.pk, 'price': '1200.00'},
+            {'id': self.foreign.pk, 'price': '1.00'},
+            {'id': self.announcement.pk, 'title': 'Twice'},
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('bulk_announcements'), items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['created'], response.data['updated'], response.data['failed']), (3, 1, 3))
+        self.assertEqual(
+            [result['status'] for result in response.data['results']],
+            ['created', 'created', 'created', 'failed', 'updated', 'failed', 'failed'],
+        )
+        self.assertIn('rooms', response.data['results'][3]['errors'])
+
+        created = Announcement.objects.filter(pk__in=[result['id'] for result in response.data['results'][:3]])
+        self.assertEqual(created.filter(owner=self.lessor).count(), 3)
+        self.assertEqual(Address.objects.filter(city='München').count(), 2)
+        self.assertEqual(Address.objects.get(city='München', house_number='1').latitude, 48.137)
+        self.assertEqual(Announcement.objects.get(pk=self.announcement.pk).price, Decimal('1200.00'))
+        self.assertEqual(Announcement.objects.get(pk=self.foreign.pk).price, Decimal('100.00'))
+        self.assertTrue(SearchTerm.objects.filter(announcement__title='Garden flat', term='garden').exists())
+
+        # Doubling the items must not add queries per item.
+        more = [self.item(f'Flat {i}', house_number=str(10 + i)) for i in range(14)]
+        with CaptureQueriesContext(connection) as more_queries:
+            self.client.post(reverse('bulk_announcements'), more, format='json')
+        self.assertLessEqual(len(more_queries), len(queries))
+
+    def test_keeps_price_statistics_current(self):
+        call_command('rebuild_price_statistics', stdout=StringIO())
+        self.client.post(reverse('bulk_announcements'), [
+            self.item('Balcony flat'), {'id': self.announcement.pk, 'address': self.item('')['address']},
+        ], format='json')
+        row = PriceStatistic.objects.get(city='München', type_of_object='', rooms=ANY_ROOMS)
+        self.assertEqual((row.count, row.price_sum), (2, Decimal('1050.00')))
+        self.assertEqual(PriceStatistic.objects.get(city='Berlin', type_of_object='', rooms=ANY_ROOMS).count, 1)
+
+    def test_rejects_invalid_bodies(self):
+        url = reverse('bulk_announcements')
+        self.assertEqual(self.client.post(url, {'title': 'Not a list'}, format='json').status_code, 400)
+        self.assertEqual(self.client.post(url, [], format='json').status_code, 400)
+        response = self.client.post(url, [self.item('Broken', price='free')], format='json')
+        self.assertEqual((response.status_code, response.data['failed']), (400, 1))
+        self.client.force_authenticate(self.create_user('renter'))
+        self.assertEqual(self.client.post(url, [self.item('Flat')], format='json').status_code, 403)
+
+
+class RatingAggregateTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the denormalized rating aggregates on announcements.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.announcement = self.create_announcement(self.lessor)
+        Booking.objects.create(
+            renter=self.renter,
+            announcement=self.announcement,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+            status=BookingStatus.APPROVED.value,
+            is_approved=True,
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.renter)
+
+    def post_review(self, grade):
+        response = self.client.post(reverse('create_review'), {
+            'announcement': self.announcement.pk,
+            'message': 'A very pleasant stay, would recommend.',
+            'grade': grade,
+        })
+        self.assertEqual(response.status_code, 201)
+        return Review.objects.latest('pk')
+
+    def test_create_update_delete_keep_aggregates_in_sync(self):
+        review = self.post_review(5)
+        self.post_review(2)
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.review_count, 2)
+        self.assertEqual(self.announcement.rating_sum, 7)
+        self.assertEqual(self.announcement.rating_histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 1})
+        self.assertEqual(self.announcement.average_rating, 3.5)
+
+        response = self.client.patch(reverse('update_review', args=[review.pk]), {'grade': 3})
+        self.assertEqual(response.status_code, 200)
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.rating_sum, 5)
+        self.assertEqual(self.announcement.rating_histogram, {1: 0, 2: 1, 3: 1, 4: 0, 5: 0})
+
+        response = self.client.delete(reverse('update_review', args=[review.pk]))
+        self.assertEqual(response.status_code, 204)
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.review_count, 1)
+        self.assertEqual(self.announcement.rating, 2)
+
+    def test_update_removes_the_stored_grade_not_the_loaded_one(self):
+        review = self.post_review(5)
+        stale = Review.objects.get(pk=review.pk)
+        # Another request changes the grade after this one has loaded the review.
+        Review.objects.filter(pk=review.pk).update(grade=4)
+        Announcement.update_rating(self.announcement.pk, removed_grade=5, added_grade=4)
+
+        serializer = ReviewListSerializer(stale, data={'grade': 3}, partial=True)
+        self.assertTrue(serializer.is_valid())
+        ReviewRetrieveUpdateDestroyAPIView().perform_update(serializer)
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.review_count, 1)
+        self.assertEqual(self.announcement.rating_sum, 3)
+        self.assertEqual(self.announcement.rating_histogram, {1: 0, 2: 0, 3: 1, 4: 0, 5: 0})
+
+    def test_filter_and_order_by_rating(self):
+        other = self.create_announcement(self.lessor, address=self.create_address(house_number='2'))
+        self.create_review(other, self.create_user('other'), grade=5)
+        self.post_review(3)
+
+        response = self.client.get(reverse('create_announcement'), {'rating__gte': 4})
+        self.assertEqual([item['id'] for item in response.data['results']], [other.pk])
+
+        response = self.client.get(reverse('create_announcement'), {'ordering': '-rating'})
+        self.assertEqual([item['id'] for item in response.data['results']], [other.pk, self.announcement.pk])
+
+    def test_rebuild_command_repairs_drift(self):
+        self.post_review(4)
+        Announcement.objects.update(review_count=0, rating_sum=0, rating=0, grade_4_count=0)
+
+        call_command('rebuild_rating_aggregates', chunk_size=1, stdout=StringIO())
+
+        self.announcement.refresh_from_db()
+        self.assertEqual(self.announcement.review_count, 1)
+        self.assertEqual(self.announcement.rating, 4)
+        self.assertEqual(self.announcement.grade_4_count, 1)
+
+
+class AnnouncementSearchTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the ranked full-text search on the announcement list.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def search(self, query, **params):
+        response = self.client.get(reverse('create_announcement'), {'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [item['id'] for item in response.data['results']]
+
+    def test_tokenizer_folds_german_spelling(self):
+        self.assertEqual(tokenize('Große Wohnung in MÜNCHEN, Straße'), ['grosse', 'wohnung', 'muenchen', 'strasse'])
+
+    def test_rebuild_indexes_in_batches(self):
+        announcements = [
+            self.create_announcement(self.lessor, address=self.create_address(house_number=str(i)), title=f'Loft {i}')
+            for i in range(6)
+        ]
+        SearchTerm.objects.all().delete()
+        with CaptureQueriesContext(connection) as queries:
+            call_command('rebuild_search_index', '--chunk-size', '4', stdout=StringIO())
+        self.assertLess(len(queries), 12)
+        self.assertEqual(sorted(self.search('loft')), sorted(announcement.pk for announcement in announcements))
+
+    @override_settings(ANNOUNCEMENT_SEARCH_BACKEND='mysql')
+    def test_mysql_documents_and_queries_are_folded_alike(self):
+        announcement = self.create_announcement(self.lessor, title='München flat',
+                                                description='Quiet Straße near the Muenchen park.')
+        document = SearchDocument.objects.get(announcement=announcement)
+        self.assertEqual(sorted(document.text.split()),
+                         sorted(['muenchen'] * 4 + ['flat'] * 3 + ['quiet', 'strasse', 'near', 'park']))
+        backend = get_search_backend()
+        self.assertEqual(backend.boolean_query('Muenchen STRASSE'), backend.boolean_query('straße München'))
+        self.assertEqual(backend.boolean_query('the Straße in München'), '+muenchen +strasse')
+        self.assertEqual(backend.boolean_query('+- * ()'), '')
+
+    def test_title_matches_rank_above_description_matches(self):
+        in_description = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='1'),
+            title='Flat', description='Quiet flat with a balcony.',
+        )
+        in_title = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='2'),
+            title='Balcony flat', description='Quiet flat.',
+        )
+        self.create_announcement(self.lessor, address=self.create_address(house_number='3'), title='Loft')
+
+        self.assertEqual(self.search('balcony'), [in_title.pk, in_description.pk])
+
+    def test_all_terms_must_match_with_umlaut_folding(self):
+        match = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='1'),
+            title='Altbau in München', description='Ruhige Straße.',
+        )
+        self.create_announcement(
+            self.lessor, address=self.create_address(house_number='2'),
+            title='Altbau in Berlin', description='Ruhige Strasse.',
+        )
+
+        self.assertEqual(self.search('muenchen strasse'), [match.pk])
+        self.assertEqual(self.search('Altbau Hamburg'), [])
+
+    def test_index_follows_saves_and_deletes(self):
+        announcement = self.create_announcement(self.lessor, title='Penthouse')
+        self.assertEqual(self.search('penthouse'), [announcement.pk])
+
+        announcement.title = 'Studio'
+        with self.captureOnCommitCallbacks(execute=True):
+            announcement.save()
+        self.assertEqual(self.search('penthouse'), [])
+        self.assertEqual(self.search('studio'), [announcement.pk])
+
+        announcement.delete()
+        self.assertFalse(SearchTerm.objects.exists())
+
+
+class AnnouncementPaginationTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the keyset pagination of the announcement list.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.announcements = [
+            self.create_announcement(
+                self.lessor,
+                address=self.create_address(house_number=str(i)),
+                title=f'Balcony flat {i}',
+                price=[100, 200, 100, 300, 100][i],
+                rooms=i + 1,
+            )
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def collect(self, **params):
+        ids = []
+        response = self.client.get(reverse('create_announcement'), {'page_size': 2, **params})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 2)
+            ids.extend(item['id'] for item in response.data['results'])
+            if response.data['next'] is None:
+                return ids
+            response = self.client.get(response.data['next'])
+
+    def test_default_ordering_walks_every_page(self):
+        expected = list(Announcement.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+        self.assertEqual(self.collect(), expected)
+
+    def test_price_ordering_breaks_ties_by_id(self):
+        expected = list(Announcement.objects.order_by('price', 'id').values_list('id', flat=True))
+        self.assertEqual(self.collect(ordering='price'), expected)
+        self.assertEqual(self.collect(ordering='-price'), list(
+            Announcement.objects.order_by('-price', '-id').values_list('id', flat=True)
+        ))
+
+    def test_combines_with_filters_and_search(self):
+        expected = list(
+            Announcement.objects.filter(rooms__gte=2).order_by('price', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual(self.collect(rooms__gte=2, ordering='price', search='balcony'), expected)
+        self.assertEqual(sorted(self.collect(search='balcony')), sorted(a.pk for a in self.announcements))
+
+    def test_cursor_from_another_ordering_is_rejected(self):
+        response = self.client.get(reverse('create_announcement'), {'page_size': 2, 'ordering': 'price'})
+        cursor_url = response.data['next'].replace('ordering=price', 'ordering=-created_at')
+        self.assertEqual(self.client.get(cursor_url).status_code, 404)
+        response = self.client.get(reverse('create_announcement'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 404)
+
+    def test_forged_sort_values_are_rejected(self):
+        sort_keys = [
+            ('price', {}), ('-created_at', {}), ('rating', {}), ('view_count', {}), ('trending_score', {}),
+            ('distance', {'lat': '52.52', 'lon': '13.40', 'radius_km': '20'}),
+            ('-search_rank', {'search': 'balcony'}),
+            ('total_price', {'check_in': '2030-07-01', 'check_out': '2030-07-05'}),
+        ]
+        for ordering, params in sort_keys:
+            for value in ['abc', 'notadate', {'price': 1}, [1, 2], None, 'NaN']:
+                with self.subTest(ordering=ordering, value=value):
+                    payload = json.dumps([ordering, value, self.announcements[0].pk]).encode()
+                    query = {**params, 'cursor': urlsafe_b64encode(payload).decode()}
+                    if ordering != '-search_rank':
+                        query['ordering'] = ordering
+                    response = self.client.get(reverse('create_announcement'), query)
+                    self.assertEqual(response.status_code, 404)
+
+
+class GeoSearchTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for geocoding addresses from postal codes and the radius and bounding box search.
+    """
+
+    def setUp(self):
+        call_command('load_postal_codes', stdout=StringIO())
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.mitte = self.create_announcement(self.lessor, address=self.create_address(postal_code='10115'))
+        self.kreuzberg = self.create_announcement(self.lessor, address=self.create_address(postal_code='10999'))
+        self.potsdam = self.create_announcement(
+            self.lessor, address=self.create_address(city='Potsdam', postal_code='14467')
+        )
+        self.hamburg = self.create_announcement(
+            self.lessor, address=self.create_address(city='Hamburg', postal_code='20095')
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def ids(self, params):
+        response = self.client.get(reverse('create_announcement'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [item['id'] for item in response.data['results']]
+
+    def test_addresses_are_geocoded_on_save(self):
+        address = self.mitte.address
+        self.assertAlmostEqual(address.latitude, 52.5323)
+        self.assertAlmostEqual(address.longitude, 13.3846)
+        address.postal_code = '00000'
+        address.save(update_fields=['postal_code'])
+        address.refresh_from_db()
+        self.assertIsNone(address.latitude)
+
+    def test_load_command_geocodes_existing_addresses(self):
+        Address.objects.filter(postal_code='10115').update(latitude=None, longitude=None)
+        PostalCode.objects.filter(postal_code='10115').update(latitude=1.0)
+        Announcement.objects.update(updated_at=timezone.now() - timedelta(days=1))
+        touched_before = dict(Announcement.objects.values_list('pk', 'updated_at'))
+        call_command('load_postal_codes', stdout=StringIO())
+        self.mitte.address.refresh_from_db()
+        self.assertAlmostEqual(self.mitte.address.latitude, 52.5323)
+        touched = dict(Announcement.objects.values_list('pk', 'updated_at'))
+        self.assertGreater(touched[self.mitte.pk], touched_before[self.mitte.pk])
+        self.assertEqual(touched[self.kreuzberg.pk], touched_before[self.kreuzberg.pk])
+
+    def test_load_command_reads_the_configured_file_offline(self):
+        rows = [['DE', '10115', 'Berlin', 'Berlin', 'BE', '', '00', '', '', '52.5', '13.4', '4']]
+        with tempfile.NamedTemporaryFile('w', suffix='.txt') as file:
+            file.write('\n'.join('\t'.join(row) for row in rows) + '\n')
+            file.flush()
+            with override_settings(POSTAL_CODES_FILE=file.name):
+                call_command('load_postal_codes', stdout=StringIO())
+        self.mitte.address.refresh_from_db()
+        self.assertAlmostEqual(self.mitte.address.latitude, 52.5)
+
+        out = StringIO()
+        with override_settings(POSTAL_CODES_FILE='/nonexistent/DE.zip'):
+            call_command('load_postal_codes', stdout=out)
+        self.assertIn('/nonexistent/DE.zip not found', out.getvalue())
+        self.mitte.address.refresh_from_db()
+        self.assertAlmostEqual(self.mitte.address.latitude, 52.5323)
+
+    def test_load_command_reads_zipped_geonames_dump(self):
+        rows = [
+            ['DE', '01945', 'Grünewald', 'Brandenburg', 'BB', '', '00', '', '', '51.4', '14.0', '4'],
+            ['DE', '01945', 'Guteborn', 'Brandenburg', 'BB', '', '00', '', '', '51.6', '13.8', '4'],
+            ['DE', '01946', 'Broken', 'Brandenburg', 'BB', '', '00', '', '', '', '', ''],
+        ]
+        with tempfile.NamedTemporaryFile(suffix='.zip') as file:
+            with zipfile.ZipFile(file, 'w') as archive:
+                archive.writestr('DE.txt', '\n'.join('\t'.join(row) for row in rows) + '\n')
+            file.flush()
+            out = StringIO()
+            call_command('load_postal_codes', file=file.name, geonames=True, stdout=out)
+        postal_code = PostalCode.objects.get(postal_code='01945')
+        self.assertEqual(postal_code.place, 'Grünewald')
+        self.assertAlmostEqual(postal_code.latitude, 51.5)
+        self.assertAlmostEqual(postal_code.longitude, 13.9)
+        self.assertFalse(PostalCode.objects.filter(postal_code='01946').exists())
+        self.assertIn('Skipped 1 rows', out.getvalue())
+
+    def test_load_command_reports_addresses_that_are_not_geocoded(self):
+        unknown = self.create_announcement(self.lessor, address=self.create_address(postal_code='99999'))
+        out = StringIO()
+        call_command('load_postal_codes', stdout=out)
+        unknown.address.refresh_from_db()
+        self.assertIsNone(unknown.address.latitude)
+        self.assertIn('1 addresses at 1 unknown postal codes are not geocoded: 99999.', out.getvalue())
+        self.assertIn(unknown.pk, self.ids({}))
+        self.assertNotIn(unknown.pk, self.ids({'lat': '52.52', 'lon': '13.40', 'radius_km': '1000'}))
+
+    def test_radius_search_uses_exact_distance(self):
+        berlin = {'lat': '52.5200', 'lon': '13.4050'}
+        self.assertEqual(sorted(self.ids({**berlin, 'radius_km': '10'})), sorted([self.mitte.pk, self.kreuzberg.pk]))
+        self.assertEqual(
+            sorted(self.ids({**berlin, 'radius_km': '40'})),
+            sorted([self.mitte.pk, self.kreuzberg.pk, self.potsdam.pk]),
+        )
+        self.assertEqual(
+            self.ids({**berlin, 'radius_km': '300', 'ordering': 'distance'}),
+            [self.mitte.pk, self.kreuzberg.pk, self.potsdam.pk, self.hamburg.pk],
+        )
+
+    def test_distance_ordering_walks_every_page(self):
+        params = {'lat': '53.55', 'lon': '10.00', 'radius_km': '300', 'ordering': '-distance', 'page_size': 1}
+        ids = []
+        response = self.client.get(reverse('create_announcement'), params)
+        while True:
+            ids.extend(item['id'] for item in response.data['results'])
+            if response.data['next'] is None:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(ids, [self.kreuzberg.pk, self.mitte.pk, self.potsdam.pk, self.hamburg.pk])
+
+    def test_bounding_box(self):
+        params = {
+            'address__latitude__gte': '52.3', 'address__latitude__lte': '52.6',
+            'address__longitude__gte': '13.0', 'address__longitude__lte': '13.5',
+        }
+        self.assertEqual(sorted(self.ids(params)), sorted([self.mitte.pk, self.kreuzberg.pk, self.potsdam.pk]))
+
+    def test_incomplete_radius_is_rejected(self):
+        response = self.client.get(reverse('create_announcement'), {'lat': '52.52', 'lon': '13.40'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(reverse('create_announcement'), {'lat': '95', 'lon': '13.40', 'radius_km': '5'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_distance_ordering_without_radius_is_ignored(self):
+        self.assertEqual(len(self.ids({'ordering': 'distance'})), 4)
+
+
+class MapClusterTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the address tile keys and the map clusters.
+    """
+    GERMANY = '5.8,47.2,15.1,55.1'
+
+    def setUp(self):
+        call_command('load_postal_codes', stdout=StringIO())
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        self.mitte = self.create_announcement(self.lessor, address=self.create_address(postal_code='10115'), price=900)
+        self.kreuzberg = self.create_announcement(
+            self.lessor, address=self.create_address(postal_code='10999'), price=700,
+            type_of_object=HousingTypes.HOUSE.value,
+        )
+        self.hamburg = self.create_announcement(
+            self.lessor, address=self.create_address(city='Hamburg', postal_code='20095'), price=1200,
+        )
+
+    def clusters(self, **params):
+        response = self.client.get(reverse('announcement_clusters'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_tile_keys_follow_the_postal_code(self):
+        address = self.mitte.address
+        self.assertEqual(address.tile_key, tile_key(address.latitude, address.longitude))
+        x, y = tile_xy(address.latitude, address.longitude, 12)
+        self.assertEqual(key_tile(address.tile_key >> 2 * (MAX_TILE_ZOOM - 12), 12), (x, y))
+
+        Address.objects.update(tile_key=None)
+        call_command('load_postal_codes', stdout=StringIO())
+        address.refresh_from_db()
+        self.assertEqual(address.tile_key, tile_key(address.latitude, address.longitude))
+
+    def test_clusters_per_cell_in_one_query(self):
+        with self.assertNumQueries(1):
+            data = self.clusters(bbox=self.GERMANY, zoom=4)
+        self.assertEqual(data['cell_zoom'], 6)
+        self.assertEqual([(cluster['count'], cluster['min_price'], cluster['max_price']) for cluster in data['clusters']],
+                         [(1, Decimal('1200.00'), Decimal('1200.00')), (2, Decimal('700.00'), Decimal('900.00'))])
+        berlin = data['clusters'][1]
+        self.assertEqual((berlin['x'], berlin['y']), tile_xy(52.52, 13.4, 6))
+        self.assertAlmostEqual(berlin['latitude'],
+                               (self.mitte.address.latitude + self.kreuzberg.address.latitude) / 2)
+
+        self.assertEqual(len(self.clusters(bbox=self.GERMANY, zoom=12)['clusters']), 3)
+
+    def test_filters_and_viewport_apply(self):
+        data = self.clusters(bbox='13.0,52.3,13.8,52.7', zoom=4, type_of_object=HousingTypes.APARTMENT.value)
+        self.assertEqual([cluster['count'] for cluster in data['clusters']], [1])
+        self.assertEqual(data['clusters'][0]['max_price'], Decimal('900.00'))
+
+    def test_invalid_viewport(self):
+        for params in ({'bbox': '13,52,12,53', 'zoom': 4}, {'bbox': '13,52', 'zoom': 4}, {'bbox': self.GERMANY}):
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get(reverse('announcement_clusters'), params).status_code, 400)
+
+
+class AvailabilitySearchTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the `available_from`/`available_to` announcement filter.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.free, self.booked, self.pending = [
+            self.create_announcement(self.lessor, address=self.create_address(house_number=str(price)), price=price)
+            for price in (100, 200, 300)
+        ]
+        self.booking = self.book(self.booked, date(2030, 1, 5), date(2030, 1, 10), approved=True)
+        self.book(self.pending, date(2030, 1, 5), date(2030, 1, 10), approved=False)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def book(self, announcement, start_date, end_date, approved):
+        return Booking.objects.create(
+            renter=self.renter,
+            announcement=announcement,
+            start_date=start_date,
+            end_date=end_date,
+            status=(BookingStatus.APPROVED if approved else BookingStatus.PENDING).value,
+            is_approved=approved,
+        )
+
+    def ids(self, **params):
+        response = self.client.get(reverse('create_announcement'), {'ordering': 'price', **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return [item['id'] for item in response.data['results']]
+
+    def test_overlapping_approved_bookings_exclude(self):
+        for available_from, available_to in [('2030-01-01', '2030-01-05'), ('2030-01-10', '2030-01-12'),
+                                             ('2030-01-06', '2030-01-07'), ('2030-01-01', '2030-02-01')]:
+            with self.subTest(available_from=available_from, available_to=available_to):
+                self.assertEqual(
+                    self.ids(available_from=available_from, available_to=available_to),
+                    [self.free.pk, self.pending.pk],
+                )
+        self.assertEqual(
+            self.ids(available_from='2030-01-11', available_to='2030-01-20'),
+            [self.free.pk, self.booked.pk, self.pending.pk],
+        )
+
+    def test_canceling_frees_the_dates_and_invalidates_the_cache(self):
+        params = {'available_from': '2030-01-06', 'available_to': '2030-01-07'}
+        self.assertEqual(self.ids(**params), [self.free.pk, self.pending.pk])
+        self.booking.canceled = True
+        with self.captureOnCommitCallbacks(execute=True):
+            self.booking.save()
+        self.assertEqual(self.ids(**params), [self.free.pk, self.booked.pk, self.pending.pk])
+
+    def test_composes_with_filters_and_pagination(self):
+        params = {'available_from': '2030-01-06', 'available_to': '2030-01-07', 'page_size': 1}
+        response = self.client.get(reverse('create_announcement'), {**params, 'price__gte': 150})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.pending.pk])
+        self.assertIsNone(response.data['next'])
+        response = self.client.get(reverse('create_announcement'), {**params, 'ordering': 'price'})
+        self.assertEqual([item['id'] for item in response.data['results']], [self.free.pk])
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['id'] for item in response.data['results']], [self.pending.pk])
+
+    def test_invalid_ranges_are_rejected(self):
+        for params in [{'available_from': '2030-01-06'}, {'available_from': '2030-01-06', 'available_to': '2030-01-01'}]:
+            with self.subTest(params=params):
+                response = self.client.get(reverse('create_announcement'), params)
+                self.assertEqual(response.status_code, 400)
+
+
+class QueryPlanAssertionsMixin:
+    """
+    Assertions on the query plans reported by `EXPLAIN` for SQLite and MySQL.
+    """
+
+    def full_table_scans(self, queryset):
+        """
+        Returns the tables the database reads in full to answer the queryset.
+
+        Args:
+            queryset (QuerySet): The queryset to explain.
+
+        Returns:
+            list: Names of the fully scanned tables.
+        """
+        if connection.vendor == 'sqlite':
+            return re.findall(r'\bSCAN (\w+)', queryset.explain())
+        if connection.vendor == 'mysql':
+            scans = []
+            pending = [json.loads(queryset.explain(format='JSON'))]
+            while pending:
+                node = pending.pop()
+                if isinstance(node, dict):
+                    if node.get('access_type') == 'ALL':
+                        scans.append(node.get('table_name'))
+                    pending.extend(node.values())
+                elif isinstance(node, list):
+                    pending.extend(node)
+            return scans
+        self.skipTest(f'No query plan parser for {connection.vendor}.')
+
+    def assertNoFullTableScan(self, queryset, msg=None):
+        scans = self.full_table_scans(queryset)
+        self.assertEqual(scans, [], msg or f'Full table scan in plan:\n{queryset.explain()}')
+
+
+class AnnouncementQueryPlanTests(QueryPlanAssertionsMixin, AnnouncementTestMixin, TestCase):
+    """
+    Fails when a canonical announcement search degrades to a full table scan.
+    """
+    CANONICAL_SEARCHES = [
+        {},
+        {'ordering': 'price'},
+        {'ordering': '-rating'},
+        {'ordering': '-trending_score'},
+        {'price__gte': '50', 'price__lte': '150'},
+        {'price__gte': '50', 'ordering': 'price'},
+        {'rooms__gte': '2', 'rooms__lte': '4'},
+        {'type_of_object': HousingTypes.HOUSE.value, 'price__lte': '150'},
+        {'address__city': 'Berlin'},
+        {'address__city__icontains': 'ber'},
+        {'address__federal_land': FederalLands.BAYERN.value},
+        {'rating__gte': '4'},
+        {'search': 'balcony'},
+        {'lat': '52.52', 'lon': '13.40', 'radius_km': '10'},
+        {'lat': '52.52', 'lon': '13.40', 'radius_km': '10', 'ordering': 'distance'},
+        {'address__latitude__gte': '52.4', 'address__latitude__lte': '52.6',
+         'address__longitude__gte': '13.2', 'address__longitude__lte': '13.6'},
+        {'available_from': '2030-01-03', 'available_to': '2030-01-10'},
+        {'available_from': '2030-01-03', 'available_to': '2030-01-10', 'ordering': 'price'},
+    ]
+
+    def setUp(self):
+        lessor = self.create_user('lessor', is_lessor=True)
+        for i in range(30):
+            self.create_announcement(
+                lessor,
+                address=self.create_address(
+                    city=['Berlin', 'München', 'Hamburg'][i % 3],
+                    house_number=str(i),
+                ),
+                title=f'Balcony flat {i}',
+                price=50 + i * 5,
+                rooms=i % 5 + 1,
+                type_of_object=[HousingTypes.APARTMENT.value, HousingTypes.HOUSE.value][i % 2],
+                is_active=i % 4 != 0,
+            )
+
+    def build_page_queryset(self, params):
+        request = Request(APIRequestFactory().get(reverse('create_announcement'), params))
+        view = AnnouncementListCreateAPIView(request=request, format_kwarg=None, args=(), kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        return view.paginator.get_page_queryset(queryset, request, view)
+
+    def test_canonical_searches_use_indexes(self):
+        for params in self.CANONICAL_SEARCHES:
+            with self.subTest(params=params):
+                self.assertNoFullTableScan(self.build_page_queryset(params))
+
+    def test_map_clusters_use_indexes(self):
+        request = Request(APIRequestFactory().get(reverse('announcement_clusters'), {'price__lte': '150'}))
+        queryset = cluster_queryset(Announcement.objects.active(), request, (13.2, 52.4, 13.6, 52.6), 12)
+        self.assertNoFullTableScan(queryset)
+
+
+@override_settings(ANNOUNCEMENT_FEED_SETTLE_SECONDS=0)
+class AnnouncementChangesFeedTests(QueryPlanAssertionsMixin, AnnouncementTestMixin, TestCase):
+    """
+    Tests for the `changes since` delta feed of announcements.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.announcements = [
+            self.create_announcement(self.lessor, address=self.create_address(house_number=str(i)), title=f'Flat {i}')
+            for i in range(5)
+        ]
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def changes(self, **params):
+        response = self.client.get(reverse('announcement_changes'), params)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(b''.join(response.streaming_content))
+
+    def sync(self, since=None):
+        changes, params = [], {'limit': 2}
+        if since:
+            params['since'] = since
+        while True:
+            data = self.changes(**params)
+            changes.extend(data['changes'])
+            params['since'] = data['next_watermark']
+            if not data['has_more']:
+                return changes, data['next_watermark']
+
+    def test_full_sync_then_only_changes(self):
+        changes, watermark = self.sync()
+        self.assertEqual([change['id'] for change in changes], [a.pk for a in self.announcements])
+        self.assertEqual(changes[0]['announcement']['title'], 'Flat 0')
+
+        self.assertEqual(self.sync(watermark), ([], watermark))
+
+        renamed, deactivated, deleted = self.announcements[3], self.announcements[1], self.announcements[2]
+        renamed.title = 'Renamed flat'
+        renamed.save()
+        deactivated.is_active = False
+        deactivated.save()
+        deleted.deleted = True
+        deleted.save()
+        changes, _ = self.sync(watermark)
+        self.assertEqual(
+            [(change['id'], change['change']) for change in changes],
+            [(renamed.pk, 'upserted'), (deactivated.pk, 'deactivated'), (deleted.pk, 'deleted')],
+        )
+        self.assertEqual(changes[0]['announcement']['title'], 'Renamed flat')
+        self.assertIsNone(changes[1]['announcement'])
+
+    def test_deleted_announcements_are_synced_as_deleted(self):
+        _, watermark = self.sync()
+        announcement = self.announcements[2]
+        url = reverse('update_announcement', args=[announcement.pk])
+        self.assertEqual(self.client.delete(url).status_code, 204)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+        changes, _ = self.sync(watermark)
+        self.assertEqual(changes, [
+            {'id': announcement.pk, 'change': 'deleted', 'updated_at': changes[0]['updated_at'], 'announcement': None},
+        ])
+        announcement.refresh_from_db()
+        self.assertFalse(announcement.is_active)
+
+    def test_recent_changes_are_held_back(self):
+        with self.settings(ANNOUNCEMENT_FEED_SETTLE_SECONDS=60):
+            data = self.changes()
+        self.assertEqual(data, {'changes': [], 'next_watermark': None, 'has_more': False})
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in [{'since': 'not-a-watermark'}, {'limit': 0}, {'limit': 'many'}]:
+            with self.subTest(params=params):
+                response = self.client.get(reverse('announcement_changes'), params)
+                self.assertEqual(response.status_code, 400)
+
+    def test_sync_reads_only_changed_rows(self):
+        _, watermark = self.sync()
+        self.assertNoFullTableScan(changes_queryset(watermark)[:501])
+
+
+class AnnouncementSearchCacheTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the response cache of the announcement list.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.announcement = self.create_announcement(self.lessor, price=120)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def get(self, params):
+        return self.client.get(reverse('create_announcement'), params)
+
+    def test_equivalent_queries_share_an_entry(self):
+        self.assertEqual(self.get({'price__lte': '150.00', 'rooms__gte': '1'})['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get({'rooms__gte': ' 1', 'price__lte': '150', 'utm_source': 'app'})
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual([item['id'] for item in response.data['results']], [self.announcement.pk])
+
+    def test_normalize_query(self):
+        self.assertEqual(
+            normalize_query(QueryDict('search= Straße  München&price__gte=100.50&ordering=price&foo=bar&rooms__lte=')),
+            'ordering=price&price__gte=100.5&search=stra%C3%9Fe+m%C3%BCnchen',
+        )
+        for first, second in [('a b', 'b a'), ('Straße', 'Strasse'), ('München', 'Muenchen'), ('flat', 'the flat')]:
+            with self.subTest(first=first, second=second):
+                self.assertNotEqual(normalize_query(QueryDict(f'search={first}')),
+                                    normalize_query(QueryDict(f'search={second}')))
+
+    def test_saves_and_deletes_invalidate(self):
+        self.get({})
+        self.announcement.price = 90
+        with self.captureOnCommitCallbacks(execute=True):
+            self.announcement.save()
+        response = self.get({})
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['price'], '90.00')
+
+        self.announcement.address.city = 'Hamburg'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.announcement.address.save()
+        self.assertEqual(self.get({})['X-Cache'], 'MISS')
+
+    def test_invalidation_waits_for_the_commit(self):
+        self.get({})
+        self.announcement.price = 90
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.announcement.save()
+            self.assertEqual(self.get({})['X-Cache'], 'HIT')
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.get({})['X-Cache'], 'MISS')
+
+    def test_stats_count_hits_and_misses(self):
+        self.get({})
+        self.get({})
+        self.get({'ordering': 'price'})
+        stats = get_search_cache_stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 2))
+
+    def test_stats_command_reads_the_shared_counters(self):
+        self.get({})
+        self.get({})
+        out, err = StringIO(), StringIO()
+        call_command('search_cache_stats', stdout=out, stderr=err)
+        self.assertIn('hits: 1\nmisses: 1\n', out.getvalue())
+        self.assertEqual(err.getvalue(), '')
+
+        with self.settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}):
+            call_command('search_cache_stats', stdout=StringIO(), stderr=err)
+        self.assertIn('private to each process', err.getvalue())
+
+
+class FastReadSerializerTests(AnnouncementTestMixin, TestCase):
+    """
+    Checks that the `values_list()` read path renders exactly the `ModelSerializer` output.
+    """
+
+    def setUp(self):
+        call_command('load_postal_codes', stdout=StringIO())
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.announcements = [
+            self.create_announcement(
+                self.lessor,
+                address=self.create_address(house_number=str(i), postal_code=['10115', '10999', '20095'][i % 3]),
+                title=f'Balcony flat {i}',
+                price=['99.50', '120', '99.50'][i % 3],
+                amenities=i % 4,
+            )
+            for i in range(6)
+        ]
+        self.create_review(self.announcements[0], self.renter, grade=4)
+        self.client = APIClient()
+
+    def assertSameContent(self, user, url, params=None):
+        self.client.force_authenticate(user)
+        responses = []
+        for fast in (False, True):
+            cache.clear()
+            with self.settings(FAST_READ_SERIALIZERS=fast):
+                responses.append(self.client.get(url, params))
+        self.assertEqual(responses[0].status_code, 200)
+        self.assertEqual(responses[1].content, responses[0].content)
+        return json.loads(responses[0].content)
+
+    def test_string_representations_match_the_models(self):
+        announcement = self.announcements[0]
+        instances = [announcement.owner, announcement.address, announcement]
+        self.assertEqual(set(STRING_REPRESENTATIONS), {instance._meta.label_lower for instance in instances})
+        for instance in instances:
+            label = instance._meta.label_lower
+            with self.subTest(model=label):
+                columns, template = STRING_REPRESENTATIONS[label]
+                self.assertEqual(template.format(**{column: getattr(instance, column) for column in columns}),
+                                 str(instance))
+
+    def test_announcement_list(self):
+        url = reverse('create_announcement')
+        for params in [{}, {'ordering': 'price', 'page_size': 2}, {'search': 'balcony', 'page_size': 4},
+                       {'lat': '52.52', 'lon': '13.40', 'radius_km': '20', 'ordering': 'distance'},
+                       {'check_in': '2030-07-01', 'check_out': '2030-07-05', 'ordering': 'total_price', 'page_size': 4},
+                       {'amenities_any': 'Balcony,Wi-Fi', 'fields': 'id,amenities'}]:
+            with self.subTest(params=params):
+                data = self.assertSameContent(self.lessor, url, params)
+                if data['next']:
+                    self.assertSameContent(self.lessor, data['next'])
+
+    def test_booking_lists(self):
+        Booking.objects.create(
+            renter=self.renter,
+            announcement=self.announcements[1],
+            start_date=date(2030, 2, 1),
+            end_date=date(2030, 2, 3),
+        )
+        for user in (self.renter, self.lessor):
+            with self.subTest(user=user.username):
+                self.assertSameContent(user, reverse('create_booking'))
+        data = self.assertSameContent(self.renter, reverse('all_bookings'))
+        self.assertEqual(data[0]['announcement'], 'Balcony flat 0')
+
+    def test_fast_path_skips_model_instances(self):
+        self.client.force_authenticate(self.lessor)
+        with self.settings(FAST_READ_SERIALIZERS=True), self.assertNumQueries(2):
+            response = self.client.get(reverse('create_announcement'))
+        self.assertEqual(len(response.data['results']), 6)
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class AnnouncementArchiveTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for moving cold announcements to the archive tables and back.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.active = self.create_announcement(self.lessor, address=self.create_address(house_number='1'))
+        self.cold = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='2'), title='Old balcony flat', is_active=False
+        )
+        self.booked = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='3'), deleted=True
+        )
+        self.create_review(self.cold, self.renter, grade=4)
+        self.finished_booking = Booking.objects.get(announcement=self.cold)
+        Booking.objects.filter(pk=self.finished_booking.pk).update(
+            start_date=date(2020, 1, 1), end_date=date(2020, 1, 5)
+        )
+        Booking.objects.create(
+            renter=self.renter, announcement=self.booked, start_date=date(2030, 1, 1), end_date=date(2030, 1, 5)
+        )
+        Announcement.objects.update(updated_at=Announcement.objects.get(pk=self.cold.pk).updated_at - timedelta(days=100))
+        self.client = APIClient()
+
+    def archive(self, *args):
+        call_command('archive_announcements', *args, stdout=StringIO())
+
+    def test_archive_tables_mirror_the_hot_tables(self):
+        for hot_model, archive_model in [(Announcement, ArchivedAnnouncement), (Review, ArchivedReview),
+                                         (Booking, ArchivedBooking), (RateRule, ArchivedRateRule),
+                                         (DuplicateListing, ArchivedDuplicateListing)]:
+            with self.subTest(model=hot_model.__name__):
+                self.assertEqual(
+                    [field.attname for field in hot_model._meta.concrete_fields],
+                    [field.attname for field in archive_model._meta.concrete_fields],
+                )
+
+    def test_moves_only_cold_announcements_without_open_bookings(self):
+        self.archive('--older-than-days', '200')
+        self.assertFalse(ArchivedAnnouncement.objects.exists())
+
+        self.archive('--older-than-days', '30', '--batch-size', '1')
+        self.assertEqual(list(ArchivedAnnouncement.objects.values_list('pk', flat=True)), [self.cold.pk])
+        self.assertEqual(sorted(Announcement.objects.values_list('pk', flat=True)), [self.active.pk, self.booked.pk])
+        self.assertEqual(ArchivedReview.objects.get().announcement_id, self.cold.pk)
+        self.assertEqual(ArchivedBooking.objects.get().pk, self.finished_booking.pk)
+        self.assertFalse(SearchTerm.objects.filter(announcement_id=self.cold.pk).exists())
+
+    def test_reads_by_primary_key_fall_back_to_the_archive(self):
+        self.client.force_authenticate(self.lessor)
+        url = reverse('update_announcement', args=[self.cold.pk])
+        before = self.client.get(url)
+        self.archive('--older-than-days', '30')
+
+        after = self.client.get(url)
+        self.assertEqual(after.status_code, 200)
+        self.assertEqual(after.content, before.content)
+        self.assertEqual(after['ETag'], before['ETag'])
+        self.assertEqual(self.client.put(url, {'title': 'Revived'}).status_code, 404)
+
+        self.client.force_authenticate(self.renter)
+        response = self.client.get(reverse('update_booking', args=[self.finished_booking.pk]))
+        self.assertEqual(response.status_code, 200)
+        history = self.client.get(reverse('all_bookings'))
+        self.assertIn('Old balcony flat', [booking['announcement'] for booking in history.data])
+
+    def test_restore_puts_the_rows_back(self):
+        created_at = Announcement.objects.get(pk=self.cold.pk).created_at
+        rule = RateRule.objects.create(announcement=self.cold, kind=RateRuleKinds.WEEKEND.value, percent=Decimal('15'))
+        rule_created_at = RateRule.objects.get(pk=rule.pk).created_at
+        Announcement.objects.filter(pk=self.cold.pk).update(updated_at=timezone.now() - timedelta(days=100))
+        self.archive('--older-than-days', '30')
+        self.assertFalse(RateRule.objects.exists())
+        self.assertEqual(ArchivedRateRule.objects.get().announcement_id, self.cold.pk)
+        call_command('archive_announcements', '--restore', str(self.cold.pk), stdout=StringIO())
+
+        restored_rule = RateRule.objects.get()
+        self.assertEqual((restored_rule.pk, restored_rule.percent, restored_rule.created_at),
+                         (rule.pk, Decimal('15.00'), rule_created_at))
+        self.assertFalse(ArchivedRateRule.objects.exists())
+
+        self.assertFalse(ArchivedAnnouncement.objects.exists())
+        restored = Announcement.objects.get(pk=self.cold.pk)
+        self.assertEqual(restored.created_at, created_at)
+        self.assertEqual((restored.review_count, restored.is_active), (1, False))
+        self.assertEqual(Review.objects.filter(announcement=restored).count(), 1)
+        self.assertTrue(Booking.objects.filter(pk=self.finished_booking.pk).exists())
+        self.assertTrue(SearchTerm.objects.filter(announcement=restored, term='balcony').exists())
+
+    def test_duplicate_decisions_survive_the_archive(self):
+        other_cold = self.create_announcement(
+            self.lessor, address=self.create_address(house_number='4'), is_active=False
+        )
+        moderator = self.create_user('moderator')
+        dismissed = DuplicateListing.objects.create(
+            announcement=self.cold, original=self.active, similarity=0.9, status=DuplicateStatus.DISMISSED.value,
+            reviewed_at=timezone.now(), reviewed_by=moderator,
+        )
+        pair = DuplicateListing.objects.create(
+            announcement=other_cold, original=self.cold, similarity=0.85, status=DuplicateStatus.CONFIRMED.value,
+        )
+        created_at = DuplicateListing.objects.get(pk=dismissed.pk).created_at
+        Announcement.objects.update(updated_at=timezone.now() - timedelta(days=100))
+        self.archive('--older-than-days', '30')
+        self.assertFalse(DuplicateListing.objects.exists())
+        self.assertEqual(sorted(ArchivedDuplicateListing.objects.values_list('pk', flat=True)),
+                         sorted([dismissed.pk, pair.pk]))
+
+        call_command('archive_announcements', '--restore', str(self.cold.pk), stdout=StringIO())
+        restored = DuplicateListing.objects.get()
+        self.assertEqual((restored.pk, restored.status, restored.reviewed_by, restored.created_at),
+                         (dismissed.pk, DuplicateStatus.DISMISSED.value, moderator, created_at))
+        self.assertEqual(ArchivedDuplicateListing.objects.get().pk, pair.pk)
+
+        call_command('archive_announcements', '--restore', str(other_cold.pk), stdout=StringIO())
+        self.assertEqual(DuplicateListing.objects.get(pk=pair.pk).status, DuplicateStatus.CONFIRMED.value)
+        self.assertFalse(ArchivedDuplicateListing.objects.exists())
+
+
+class PriceStatisticsTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the price statistics rollup, its incremental maintenance and its endpoint.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.berlin = self.create_address(house_number='1')
+        self.munich = self.create_address(
+            city='München', street='Leopoldstrasse', postal_code='80802', federal_land=FederalLands.BAYERN.value
+        )
+        for price, rooms, address in [(500, 1, self.berlin), (800, 2, self.berlin), (1250.50, 2, self.berlin),
+                                      (2000, 3, self.berlin), (900, 2, self.munich), (1500, 3, self.munich)]:
+            self.create_announcement(self.lessor, address=address, price=price, rooms=rooms)
+        self.create_announcement(self.lessor, address=self.berlin, price=99999, is_active=False)
+        self.rebuild()
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def rebuild(self):
+        call_command('rebuild_price_statistics', '--chunk-size', '2', stdout=StringIO())
+
+    def stored(self):
+        return {
+            (row.city, row.type_of_object, row.rooms): (row.count, row.price_sum)
+            for row in PriceStatistic.objects.filter(count__gt=0)
+        }
+
+    def test_rebuild_matches_numpy_percentiles(self):
+        self.assertEqual(PriceStatistic.objects.count(), 22)
+        for slice_filter, expected in [
+            ({'city': 'Berlin', 'rooms': ANY_ROOMS}, [500, 800, 1250.50, 2000]),
+            ({'city': '', 'rooms': 2}, [800, 1250.50, 900]),
+            ({'city': '', 'rooms': ANY_ROOMS}, [500, 800, 1250.50, 2000, 900, 1500]),
+        ]:
+            with self.subTest(**slice_filter):
+                row = PriceStatistic.objects.get(type_of_object='', **slice_filter)
+                percentiles = np.percentile(expected, [10, 25, 50, 75, 90])
+                self.assertEqual(row.count, len(expected))
+                self.assertEqual(row.average_price, round(Decimal(str(sum(expected))) / len(expected), 2))
+                self.assertEqual((row.min_price, row.max_price), (Decimal(min(expected)), Decimal(max(expected))))
+                self.assertEqual(
+                    [row.p10, row.p25, row.median, row.p75, row.p90],
+                    [Decimal(str(round(value, 2))).quantize(Decimal('0.01')) for value in percentiles],
+                )
+
+    def test_changes_keep_counts_and_sums_current(self):
+        announcement = self.create_announcement(self.lessor, address=self.munich, price=700, rooms=1)
+        announcement.price = 750
+        announcement.save()
+        Announcement.update_rating(announcement.pk, added_grade=5)
+        moved = Announcement.objects.get(price=2000)
+        moved.is_active = False
+        moved.save()
+        self.munich.city = 'Muenchen'
+        self.munich.save()
+        Announcement.objects.get(price=500).delete()
+
+        row = PriceStatistic.objects.get(city='Muenchen', type_of_object='', rooms=ANY_ROOMS)
+        self.assertEqual((row.count, row.price_sum, row.min_price), (3, Decimal('3150.00'), Decimal('750.00')))
+        incremental = self.stored()
+        self.rebuild()
+        self.assertEqual(incremental, self.stored())
+
+    def test_changed_slices_are_stale_and_emptied_slices_removed(self):
+        self.assertFalse(PriceStatistic.objects.filter(is_stale=True).exists())
+        flat = Announcement.objects.get(price=900)
+        flat.is_active = False
+        flat.save()
+        self.assertFalse(PriceStatistic.objects.filter(city='München', rooms=2).exists())
+        row = PriceStatistic.objects.get(city='München', type_of_object='', rooms=ANY_ROOMS)
+        self.assertEqual((row.count, row.is_stale), (1, True))
+        self.assertFalse(PriceStatistic.objects.get(city='Berlin', type_of_object='', rooms=ANY_ROOMS).is_stale)
+
+        response = self.client.get(reverse('announcement_price_statistics'), {'city': 'München', 'rooms': 2})
+        self.assertEqual((response.data['count'], response.data['min_price'], response.data['median']), (0, None, None))
+        self.rebuild()
+        self.assertFalse(PriceStatistic.objects.filter(is_stale=True).exists())
+
+    def test_studios_have_their_own_slice(self):
+        self.create_announcement(self.lessor, address=self.berlin, price=400, rooms=0)
+        self.rebuild()
+        self.assertEqual(PriceStatistic.objects.get(city='Berlin', type_of_object='', rooms=0).count, 1)
+        self.assertEqual(PriceStatistic.objects.get(city='Berlin', type_of_object='', rooms=ANY_ROOMS).count, 5)
+        response = self.client.get(reverse('announcement_price_statistics'), {'city': 'Berlin', 'rooms': 0})
+        self.assertEqual((response.data['rooms'], response.data['count']), (0, 1))
+        self.assertIsNone(self.client.get(reverse('announcement_price_statistics'), {'city': 'Berlin'}).data['rooms'])
+
+    def test_endpoint_reads_one_row(self):
+        url = reverse('announcement_price_statistics')
+        with self.assertNumQueries(1):
+            response = self.client.get(url, {'city': 'Berlin', 'rooms': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['city'], 'Berlin')
+        self.assertIsNone(response.data['type_of_object'])
+        self.assertEqual((response.data['count'], response.data['average_price']), (2, '1025.25'))
+
+        empty = self.client.get(url, {'city': 'Hamburg'})
+        self.assertEqual((empty.data['count'], empty.data['median']), (0, None))
+        self.assertEqual(self.client.get(url, {'type_of_object': 'Castle'}).status_code, 400)
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class ConditionalGetTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for ETag and Last-Modified handling on announcement and booking reads.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.renter = self.create_user('renter')
+        self.announcement = self.create_announcement(self.lessor)
+        self.booking = Booking.objects.create(
+            renter=self.renter,
+            announcement=self.announcement,
+            start_date=date(2030, 1, 1),
+            end_date=date(2030, 1, 5),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        etag = response['ETag']
+        self.assertTrue(response.has_header('Last-Modified'))
+
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_announcement_detail(self):
+        def change():
+            self.announcement.price = 150
+            self.announcement.save()
+
+        self.assertRevalidates(reverse('update_announcement', args=[self.announcement.pk]), change)
+
+    def test_announcement_detail_changes_with_address(self):
+        def change():
+            self.announcement.address.street = 'Nebenstrasse'
+            self.announcement.address.save()
+
+        self.assertRevalidates(reverse('update_announcement', args=[self.announcement.pk]), change)
+
+    def test_announcement_list_changes_when_row_leaves(self):
+        def change():
+            self.announcement.is_active = False
+            with self.captureOnCommitCallbacks(execute=True):
+                self.announcement.save()
+
+        url = reverse('create_announcement')
+        response = self.client.get(url)
+        etag = response['ETag']
+        with self.assertNumQueries(0):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_if_modified_since(self):
+        url = reverse('update_announcement', args=[self.announcement.pk])
+        last_modified = self.client.get(url)['Last-Modified']
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+    def test_booking_reads(self):
+        self.client.force_authenticate(self.renter)
+
+        def change():
+            self.booking.start_date = date(2030, 1, 2)
+            self.booking.save()
+
+        self.assertRevalidates(reverse('update_booking', args=[self.booking.pk]), change)
+        self.assertRevalidates(reverse('create_booking'), change)
+
+    def test_booking_list_changes_with_renters_and_announcements(self):
+        def change_renter():
+            self.renter.email = 'moved@example.com'
+            self.renter.save()
+
+        def change_announcement():
+            self.announcement.title = 'Renamed flat'
+            self.announcement.save()
+
+        url = reverse('create_booking')
+        self.assertRevalidates(url, change_renter)
+        self.assertRevalidates(url, change_announcement)
+
+    def test_booking_list_etag_differs_per_user(self):
+        url = reverse('create_booking')
+        lessor_etag = self.client.get(url)['ETag']
+        self.client.force_authenticate(self.renter)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=lessor_etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], lessor_etag)
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class ViewCounterTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the write-behind view counters and the popularity orderings.
+    """
+
+    def setUp(self):
+        cache.clear()
+        view_counter.take()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        self.announcements = [
+            self.create_announcement(self.lessor, address=self.create_address(house_number=str(i)), title=f'Flat {i}')
+            for i in range(3)
+        ]
+
+    def list_titles(self, ordering):
+        response = self.client.get(reverse('create_announcement'), {'ordering': ordering})
+        return [item['title'] for item in response.data['results']]
+
+    def test_detail_reads_are_buffered(self):
+        url = reverse('update_announcement', args=[self.announcements[0].pk])
+        etag = self.client.get(url)['ETag']
+        self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.client.get(reverse('update_announcement', args=[0]))
+
+        self.assertEqual(view_counter.take(), {self.announcements[0].pk: 2})
+        self.announcements[0].refresh_from_db()
+        self.assertEqual(self.announcements[0].view_count, 0)
+
+    def test_flush_writes_batches_without_touching_updated_at(self):
+        counter = ViewCounter()
+        for announcement, views in zip(self.announcements, [3, 1, 2]):
+            for _ in range(views):
+                counter.record(announcement.pk)
+        counter.record(0)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(counter.flush(batch_size=2), 3)
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 2)
+        self.assertIn('CASE WHEN', updates[0])
+        self.assertEqual(counter.take(), {})
+
+        for announcement, views in zip(self.announcements, [3, 1, 2]):
+            stored = Announcement.objects.get(pk=announcement.pk)
+            self.assertEqual(stored.view_count, views)
+            self.assertEqual(stored.updated_at, announcement.updated_at)
+
+    def test_popularity_orderings(self):
+        now = timezone.now()
+        first, second, third = self.announcements
+        flush_views({first.pk: 5, second.pk: 2}, now=now - timedelta(days=3))
+        flush_views({second.pk: 2, third.pk: 1}, now=now)
+
+        self.assertEqual(self.list_titles('-view_count'), ['Flat 0', 'Flat 1', 'Flat 2'])
+        # Five views three half-lives ago weigh less than one view now.
+        self.assertEqual(self.list_titles('-trending_score'), ['Flat 1', 'Flat 2', 'Flat 0'])
+
+    def test_popularity_ordering_revalidates_after_flush(self):
+        url = reverse('create_announcement')
+        response = self.client.get(url, {'ordering': '-view_count'})
+        self.assertFalse(response.has_header('Last-Modified'))
+        etag = response['ETag']
+
+        flush_views({self.announcements[2].pk: 1})
+        cache.clear()
+        response = self.client.get(url, {'ordering': '-view_count'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['results'][0]['title'], 'Flat 2')
+        self.assertNotIn('view_count', response.data['results'][0])
+
+
+@override_settings(ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS=0)
+class AddressAutocompleteTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the folded, listing-ranked city and street autocomplete.
+    """
+
+    def setUp(self):
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        places = [
+            ('München', 'Münchner Straße', 3),
+            ('Muenchen', 'Leopoldstraße', 1),
+            ('Mülheim', 'Schloßstraße', 2),
+            ('Berlin', 'Münzstraße', 1),
+            ('Mannheim', 'Marktplatz', 0),
+        ]
+        for number, (city, street, listings) in enumerate(places):
+            address = self.create_address(city=city, street=street, house_number=str(number))
+            for _ in range(listings):
+                self.create_announcement(self.lessor, address=address)
+        inactive_address = self.create_address(city='Mannheim', street='Marktplatz', house_number='9')
+        self.create_announcement(self.lessor, address=inactive_address, is_active=False)
+
+    def suggest(self, **params):
+        response = self.client.get(reverse('address_autocomplete'), params)
+        self.assertEqual(response.status_code, 200)
+        return [(item['name'], item['listings']) for item in response.data['results']]
+
+    def test_cities_are_folded_and_ranked_by_listings(self):
+        self.assertEqual(self.suggest(q='m'), [('München', 4), ('Mülheim', 2), ('Mannheim', 0)])
+        for prefix in ['mü', 'MÜ', 'mue', 'Mue']:
+            with self.subTest(prefix=prefix):
+                self.assertEqual(self.suggest(q=prefix), [('München', 4), ('Mülheim', 2)])
+        self.assertEqual(self.suggest(q='muenc', limit=1), [('München', 4)])
+        self.assertEqual(self.suggest(q='x'), [])
+
+    def test_streets(self):
+        self.assertEqual(self.suggest(q='muen', kind='street'), [('Münchner Straße', 3), ('Münzstraße', 1)])
+        self.assertEqual(self.suggest(q='SCHLOSS', kind='street'), [('Schloßstraße', 2)])
+        self.assertEqual(self.suggest(q='m', kind='street', city='Berlin'), [('Münzstraße', 1)])
+
+    def test_lookups_stay_in_memory_until_a_change(self):
+        self.suggest(q='m')
+        with self.assertNumQueries(0):
+            address_autocomplete.suggest('city', 'm')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_announcement(self.lessor, address=Address.objects.get(city='Mannheim', house_number='4'))
+        self.assertEqual(address_autocomplete.suggest('city', 'man'), [('Mannheim', 1)])
+
+    @override_settings(ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS=60)
+    def test_outdated_indexes_are_served_while_rebuilding(self):
+        autocomplete = AddressAutocomplete()
+        first, second = {CITY: 'first'}, {CITY: 'second'}
+        release = threading.Event()
+
+        def build():
+            if autocomplete.indexes is None:
+                return first
+            release.wait(10)
+            return second
+
+        autocomplete.build = build
+        self.assertIs(autocomplete.get_indexes(), first)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.create_announcement(self.lessor, address=Address.objects.get(city='Mannheim', house_number='4'))
+        self.assertIs(autocomplete.get_indexes(), first)
+        self.assertIsNone(autocomplete.rebuilder)
+
+        autocomplete.built_at -= 60
+        self.assertIs(autocomplete.get_indexes(), first)
+        rebuilder = autocomplete.rebuilder
+        self.assertIsNotNone(rebuilder)
+        self.assertIs(autocomplete.get_indexes(), first)
+        self.assertIs(autocomplete.rebuilder, rebuilder)
+        release.set()
+        rebuilder.join(10)
+        self.assertIs(autocomplete.get_indexes(), second)
+        self.assertIsNone(autocomplete.rebuilder)
+
+    @override_settings(ADDRESS_AUTOCOMPLETE_MAX_AGE_SECONDS=0)
+    def test_indexes_expire_without_a_change(self):
+        address_autocomplete.suggest('city', 'm')
+        Address.objects.filter(city='Mannheim').update(city='Magdeburg')
+        self.assertEqual(address_autocomplete.suggest('city', 'mag'), [('Magdeburg', 0)])
+
+    def test_requires_a_prefix(self):
+        response = self.client.get(reverse('address_autocomplete'), {'kind': 'country'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'q', 'kind'})
+
+
+class SimilarListingsTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the memory-mapped similar listings index.
+    """
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.enterContext(override_settings(SIMILAR_LISTINGS_INDEX_PATH=f'{directory.name}/similar.npy'))
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        self.berlin = self.create_address()
+        self.munich = self.create_address(city='München', federal_land=FederalLands.BAYERN.value, postal_code='80331')
+        self.flat = self.create_announcement(self.lessor, address=self.berlin, title='Flat', price=1000, rooms=2)
+        self.similar = [
+            self.create_announcement(self.lessor, address=self.berlin, title='Twin', price=1000, rooms=2),
+            self.create_announcement(self.lessor, address=self.berlin, title='Pricier', price=1300, rooms=2),
+            self.create_announcement(self.lessor, address=self.berlin, title='Larger', price=1300, rooms=4),
+            self.create_announcement(self.lessor, address=self.munich, title='Bavarian', price=1000, rooms=2),
+            self.create_announcement(self.lessor, address=self.berlin, title='House', price=1000, rooms=2,
+                                     type_of_object=HousingTypes.HOUSE.value),
+        ]
+        self.create_announcement(self.lessor, address=self.berlin, title='Inactive', price=1000, rooms=2,
+                                 is_active=False)
+
+    def similar_titles(self, announcement, **params):
+        response = self.client.get(reverse('similar_announcements', args=[announcement.pk]), params)
+        self.assertEqual(response.status_code, 200)
+        return [item['title'] for item in response.data['results']]
+
+    def test_ranks_by_weighted_distance(self):
+        similar_listings.rebuild()
+        self.assertEqual(self.similar_titles(self.flat), ['Twin', 'Pricier', 'Larger', 'House', 'Bavarian'])
+        self.assertEqual(self.similar_titles(self.flat, limit=2), ['Twin', 'Pricier'])
+        self.assertEqual(self.client.get(reverse('similar_announcements', args=[0])).status_code, 404)
+
+    def test_lookups_do_not_build_a_missing_index(self):
+        with self.assertLogs('apps.rental_announcement.similarity.similar_listings', 'WARNING'):
+            self.assertEqual(self.similar_titles(self.flat), [])
+        self.assertEqual(self.client.get(reverse('similar_announcements', args=[0])).status_code, 404)
+        self.assertIsNone(similar_listings.open())
+
+    def test_damaged_index_does_not_fail_updates(self):
+        similar_listings.path.write_bytes(b'not an index')
+        with self.assertLogs('apps.rental_announcement.similarity.similar_listings', 'ERROR'):
+            similar_listings.update_quietly([self.flat.pk])
+
+    def test_grows_by_the_whole_batch(self):
+        similar_listings.rebuild(min_capacity=8)
+        capacity = len(similar_listings.open())
+        Announcement.objects.bulk_create([
+            Announcement(owner=self.lessor, address=self.berlin, title=f'Batch {i}', description='A batch flat.',
+                         price=1000, rooms=2, type_of_object=HousingTypes.APARTMENT.value)
+            for i in range(capacity + 2 * MIN_CAPACITY)
+        ])
+        similar_listings.update(Announcement.objects.values_list('pk', flat=True))
+        self.assertEqual(int((similar_listings.open()['id'] != 0).sum()), Announcement.objects.active().count())
+
+    def test_lookups_read_the_mapped_file(self):
+        self.assertEqual(similar_listings.rebuild(), 6)
+        with self.assertNumQueries(0):
+            self.assertEqual(similar_listings.similar(self.flat.pk, limit=1), [self.similar[0].pk])
+
+    def test_saves_update_the_index_in_place(self):
+        similar_listings.rebuild()
+        identity = similar_listings.open() is not None and similar_listings.identity
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.similar[0].price = 3000
+            self.similar[0].save()
+            inactive = Announcement.objects.get(title='Inactive')
+            inactive.is_active = True
+            inactive.save()
+            self.munich.federal_land = FederalLands.BERLIN.value
+            self.munich.save()
+        with self.assertNumQueries(0):
+            nearest = similar_listings.similar(self.flat.pk)
+        self.assertEqual(nearest[:2], [self.similar[3].pk, inactive.pk])
+        self.assertEqual(nearest[-1], self.similar[0].pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            inactive.delete()
+        self.assertNotIn(inactive.pk, similar_listings.similar(self.flat.pk))
+        self.assertEqual(similar_listings.identity, identity)
+
+    def test_grows_when_slots_run_out(self):
+        similar_listings.rebuild(min_capacity=8)
+        capacity = len(similar_listings.open())
+        items = [{
+            'title': f'Portfolio {i}', 'description': 'A furnished flat of a large portfolio.', 'price': '1000.00',
+            'rooms': 2, 'type_of_object': HousingTypes.APARTMENT.value,
+            'address': {'federal_land': FederalLands.BERLIN.value, 'city': 'Berlin', 'street': 'Portfolioweg',
+                        'house_number': str(i), 'postal_code': '10115'},
+        } for i in range(capacity)]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('bulk_announcements'), items, format='json')
+        self.assertEqual(response.data['created'], capacity)
+        self.assertGreater(len(similar_listings.open()), capacity)
+        self.assertEqual(len(similar_listings.similar(self.flat.pk, limit=20)), capacity + len(self.similar))
+
+
+class SavedSearchTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for saved searches and their matching through the predicate index.
+    """
+
+    def setUp(self):
+        saved_search_matcher.clear()
+        self.addCleanup(saved_search_matcher.clear)
+        self.renter = self.create_user('renter')
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.renter)
+        self.berlin = self.create_address()
+        self.munich = self.create_address(city='München', federal_land=FederalLands.BAYERN.value, postal_code='80331')
+
+    def save_search(self, **criteria):
+        response = self.client.post(reverse('saved_searches'), criteria, format='json')
+        self.assertEqual(response.status_code, 201, response.data)
+        return response.data['id']
+
+    def publish(self, **kwargs):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create_announcement(self.lessor, **kwargs)
+
+    def matched(self, announcement):
+        return set(SearchMatch.objects.filter(announcement=announcement).values_list('saved_search', flat=True))
+
+    def test_bucket_bounds_are_inclusive_and_open_ends_match_everything(self):
+        matcher = SavedSearchMatcher()
+        apartment = HousingTypes.APARTMENT.value
+        matcher.apply([
+            (1, 10, True, 'München', '', apartment, Decimal('500'), Decimal('1000'), 2, 3),
+            (2, 10, True, '', '', '', None, None, None, None),
+            (3, 11, True, 'Berlin', '', '', None, Decimal('800'), None, None),
+            (4, 11, False, '', '', '', None, None, None, None),
+        ])
+        self.assertEqual(len(matcher), 3)
+
+        def match(city, price, rooms, type_of_object=apartment):
+            ids, _ = matcher.match(city, FederalLands.BAYERN.value, type_of_object, price, rooms)
+            return sorted(ids.tolist())
+
+        self.assertEqual(match('München', 500.0, 2), [1, 2])
+        self.assertEqual(match('München', 1000.0, 3), [1, 2])
+        self.assertEqual(match('Muenchen', 500.0, 2), [2])
+        self.assertEqual(match('München', 1000.01, 3), [2])
+        self.assertEqual(match('München', 700.0, 4), [2])
+        self.assertEqual(match('München', 700.0, 2, HousingTypes.HOUSE.value), [2])
+        self.assertEqual(match('Berlin', 800.0, 9), [2, 3])
+
+        matcher.apply([(2, 10, False, '', '', '', None, None, None, None)])
+        self.assertEqual(match('Berlin', 800.0, 9), [3])
+
+    def test_published_announcements_are_matched_once(self):
+        munich_flats = self.save_search(city='München', type_of_object=HousingTypes.APARTMENT.value,
+                                        max_price='1200.00', min_rooms=2)
+        anything = self.save_search()
+        bavaria = self.save_search(federal_land=FederalLands.BAYERN.value, min_price='2000.00')
+        self.client.force_authenticate(self.lessor)
+        self.save_search()
+
+        flat = self.publish(address=self.munich, price=1200, rooms=3)
+        self.assertEqual(self.matched(flat), {munich_flats, anything})
+        self.assertEqual(SearchMatch.objects.get(saved_search=anything).user, self.renter)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            flat.price = 2500
+            flat.save()
+        self.assertEqual(self.matched(flat), {munich_flats, anything, bavaria})
+        self.assertEqual(SearchMatch.objects.filter(announcement=flat).count(), 3)
+
+        inactive = self.publish(address=self.munich, price=1000, is_active=False)
+        self.assertEqual(self.matched(inactive), set())
+
+    def test_matches_are_listed_by_the_filter_params(self):
+        searches = {city: self.save_search(city=city) for city in ['München', 'muenchen', 'Muenchen']}
+        flat = self.publish(address=self.munich)
+        self.assertEqual(self.matched(flat), {searches['München']})
+        for city, search in searches.items():
+            with self.subTest(city=city):
+                params = SavedSearch.objects.get(pk=search).filter_params()
+                listed = AnnouncementFilter(params, queryset=Announcement.objects.all()).qs
+                self.assertEqual(listed.filter(pk=flat.pk).exists(), search in self.matched(flat))
+
+    def test_changed_and_deleted_searches_apply_to_later_announcements(self):
+        search = self.save_search(city='Berlin')
+        response = self.client.patch(reverse('update_saved_search', args=[search]), {'city': 'München'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['filter_params'], {'address__city': 'München'})
+
+        self.assertEqual(self.matched(self.publish(address=self.berlin)), set())
+        self.assertEqual(self.matched(self.publish(address=self.munich)), {search})
+
+        self.assertEqual(self.client.delete(reverse('update_saved_search', args=[search])).status_code, 204)
+        self.assertFalse(SavedSearch.objects.get(pk=search).is_active)
+        self.assertEqual(self.matched(self.publish(address=self.munich)), set())
+        self.assertEqual(self.client.get(reverse('saved_searches')).data, [])
+
+    def test_bulk_upserted_announcements_are_matched(self):
+        search = self.save_search(city='Berlin', max_rooms=2)
+        self.client.force_authenticate(self.lessor)
+        items = [{
+            'title': f'Portfolio flat {rooms}', 'description': 'A furnished flat of a large portfolio.',
+            'price': '900.00', 'rooms': rooms, 'type_of_object': HousingTypes.APARTMENT.value,
+            'address': {'federal_land': FederalLands.BERLIN.value, 'city': 'Berlin', 'street': 'Portfolio street',
+                        'house_number': str(rooms), 'postal_code': '10115'},
+        } for rooms in (1, 2, 3)]
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('bulk_announcements'), items, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(
+            sorted(SearchMatch.objects.filter(saved_search=search).values_list('announcement__rooms', flat=True)),
+            [1, 2],
+        )
+
+    def test_match_list_pages_newest_first(self):
+        search = self.save_search(name='Berlin flats', city='Berlin')
+        flats = [self.publish(address=self.berlin, title=f'Flat {number}') for number in range(3)]
+        SearchMatch.objects.filter(announcement=flats[0]).update(created_at=timezone.now() - timedelta(hours=1))
+
+        response = self.client.get(reverse('search_matches'), {'page_size': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['announcement']['title'] for item in response.data['results']], ['Flat 2', 'Flat 1'])
+        self.assertEqual(response.data['results'][0]['saved_search'], search)
+        self.assertEqual(response.data['results'][0]['saved_search_name'], 'Berlin flats')
+        self.assertEqual(response.data['results'][0]['announcement']['city'], 'Berlin')
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual([item['announcement']['title'] for item in response.data['results']], ['Flat 0'])
+        self.assertIsNone(response.data['next'])
+
+        self.client.force_authenticate(self.lessor)
+        self.assertEqual(self.client.get(reverse('search_matches')).data['results'], [])
+
+    def test_bounds_must_be_ordered(self):
+        response = self.client.post(reverse('saved_searches'), {'min_rooms': 3, 'max_rooms': 2}, format='json')
+        self.assertEqual(response.status_code, 400)
+        search = self.save_search(min_price='500.00')
+        response = self.client.patch(reverse('update_saved_search', args=[search]), {'max_price': '400.00'},
+                                     format='json')
+        self.assertEqual(response.status_code, 400)
+
+
+class StayPricingTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for rate rules, stay quotes and the total price search.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        address = self.create_address()
+        self.plain = self.create_announcement(self.lessor, address=address, title='Plain', price=100)
+        self.seasonal = self.create_announcement(self.lessor, address=address, title='Seasonal', price=80)
+        self.long_stay = self.create_announcement(self.lessor, address=address, title='Long stay', price=90)
+        for announcement, rule in [
+            (self.seasonal, {'kind': RateRuleKinds.SEASON.value, 'start_date': '2030-07-01',
+                             'end_date': '2030-08-31', 'nightly_price': '150.00'}),
+            (self.seasonal, {'kind': RateRuleKinds.WEEKEND.value, 'percent': '20'}),
+            (self.long_stay, {'kind': RateRuleKinds.MIN_NIGHTS.value, 'nights': 3}),
+            (self.long_stay, {'kind': RateRuleKinds.LENGTH_OF_STAY.value, 'nights': 7, 'percent': '10'}),
+        ]:
+            response = self.client.post(reverse('announcement_rate_rules', args=[announcement.pk]), rule, format='json')
+            self.assertEqual(response.status_code, 201, response.data)
+
+    def quote(self, announcement, check_in, check_out):
+        response = self.client.get(reverse('announcement_quote', args=[announcement.pk]),
+                                   {'check_in': check_in, 'check_out': check_out})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def list_totals(self, **params):
+        response = self.client.get(reverse('create_announcement'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(item['title'], item['total_price']) for item in response.data['results']], response.data['next']
+
+    def test_quote_applies_seasons_weekends_and_discounts(self):
+        # Sunday June 30th to Saturday July 6th 2030: one night before the season, Friday in it.
+        quote = self.quote(self.seasonal, '2030-06-30', '2030-07-06')
+        self.assertEqual([night['rate'] for night in quote['nights']],
+                         ['80.00', '150.00', '150.00', '150.00', '150.00', '180.00'])
+        self.assertEqual(quote['total_price'], '860.00')
+
+        self.assertFalse(self.quote(self.long_stay, '2030-07-01', '2030-07-03')['bookable'])
+        quote = self.quote(self.long_stay, '2030-07-01', '2030-07-08')
+        self.assertEqual((quote['subtotal'], quote['discount_percent'], quote['total_price']),
+                         ('630.00', '10.00', '567.00'))
+        self.assertTrue(quote['bookable'])
+
+        response = self.client.get(reverse('announcement_quote', args=[self.plain.pk]),
+                                   {'check_in': '2030-07-02', 'check_out': '2030-07-02'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_rules_need_the_fields_of_their_kind_and_an_owned_announcement(self):
+        url = reverse('announcement_rate_rules', args=[self.plain.pk])
+        response = self.client.post(url, {'kind': RateRuleKinds.SEASON.value, 'start_date': '2030-07-01'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.client.force_authenticate(self.create_user('other', is_lessor=True))
+        response = self.client.post(url, {'kind': RateRuleKinds.WEEKEND.value, 'percent': '5'}, format='json')
+        self.assertEqual(response.status_code, 404)
+        rule = RateRule.objects.filter(announcement=self.seasonal).first()
+        self.assertEqual(self.client.delete(reverse('update_rate_rule', args=[rule.pk])).status_code, 404)
+
+    def test_search_orders_and_filters_by_total_price(self):
+        stay = {'check_in': '2030-07-01', 'check_out': '2030-07-03'}
+        self.assertEqual(self.list_totals(**stay, ordering='total_price')[0],
+                         [('Plain', '200.00'), ('Seasonal', '300.00')])
+
+        stay = {'check_in': '2030-07-01', 'check_out': '2030-07-08'}
+        page, next_page = self.list_totals(**stay, ordering='-total_price', page_size=2)
+        self.assertEqual(page, [('Seasonal', '1110.00'), ('Plain', '700.00')])
+        response = self.client.get(next_page)
+        self.assertEqual([item['title'] for item in response.data['results']], ['Long stay'])
+        self.assertIsNone(response.data['next'])
+
+        self.assertEqual(self.list_totals(**stay, total_price__lte='700', ordering='total_price')[0],
+                         [('Long stay', '567.00'), ('Plain', '700.00')])
+
+        response = self.client.get(reverse('create_announcement'), {'total_price__lte': '700'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_search_narrows_the_queryset_only_by_dropped_announcements(self):
+        def id_filters(**params):
+            cache.clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.list_totals(**params)
+            return [query['sql'] for query in queries.captured_queries if '"announcements"."id" IN' in query['sql']]
+
+        stay = {'check_in': '2030-07-01', 'check_out': '2030-07-08'}
+        self.assertEqual(id_filters(**stay), [])
+        sql = id_filters(**stay, total_price__lte='700')
+        self.assertTrue(sql and all('NOT ("announcements"."id" IN' in query for query in sql))
+
+    def test_rule_changes_reprice_the_search(self):
+        stay = {'check_in': '2030-07-01', 'check_out': '2030-07-03', 'ordering': 'total_price'}
+        self.list_totals(**stay)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(reverse('announcement_rate_rules', args=[self.plain.pk]),
+                                        {'kind': RateRuleKinds.SEASON.value, 'start_date': '2030-07-01',
+                                         'end_date': '2030-07-31', 'nightly_price': '50.00'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.list_totals(**stay)[0][0], ('Plain', '100.00'))
+
+    def test_batch_quotes_match_single_quotes(self):
+        rng = np.random.default_rng(7)
+        kinds = [kind.value for kind in RateRuleKinds]
+        ids = np.arange(1, 41)
+        rules = []
+        for _ in range(120):
+            start = date(2030, 6, 20) + timedelta(days=int(rng.integers(0, 30)))
+            limited = rng.random() < 0.7
+            rules.append((int(rng.choice(ids)), str(rng.choice(kinds)),
+                          start if limited else None, start + timedelta(days=int(rng.integers(0, 10))) if limited else None,
+                          Decimal(int(rng.integers(50, 300))), Decimal(int(rng.integers(1, 40))),
+                          int(rng.integers(1, 10))))
+        prices = rng.integers(50, 300, len(ids))
+        batch = quote_stays(ids, prices, date(2030, 7, 1), date(2030, 7, 12), rules)
+        for position, pk in enumerate(ids.tolist()):
+            single = quote_stays([pk], [prices[position]], date(2030, 7, 1), date(2030, 7, 12),
+                                 [rule for rule in rules if rule[0] == pk])
+            self.assertEqual(single.breakdown(0), batch.breakdown(position))
+
+
+class AmenitiesTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the amenities bitmask, its filters and its serialization.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.client = APIClient()
+        self.client.force_authenticate(self.lessor)
+        address = self.create_address()
+        self.balcony_wifi = self.create_announcement(
+            self.lessor, address=address, title='Balcony and Wi-Fi',
+            amenities=Amenities.to_mask([Amenities.BALCONY.value, Amenities.WIFI.value]),
+        )
+        self.wifi = self.create_announcement(self.lessor, address=address, title='Wi-Fi',
+                                             amenities=Amenities.WIFI.bit)
+        self.bare = self.create_announcement(self.lessor, address=address, title='Bare')
+
+    def list_titles(self, **params):
+        response = self.client.get(reverse('create_announcement'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(item['title'] for item in response.data['results'])
+
+    def test_masks_round_trip(self):
+        bits = [amenity.bit for amenity in Amenities]
+        self.assertEqual(len(set(bits)), len(bits))
+        values = [Amenities.PARKING.value, Amenities.BALCONY.value]
+        self.assertEqual(Amenities.from_mask(Amenities.to_mask(values)), sorted(values, key=lambda v: Amenities(v).bit))
+        self.assertEqual(Amenities.lookup(' wi-fi '), Amenities.WIFI)
+
+    def test_filters_all_and_any(self):
+        self.assertEqual(self.list_titles(amenities_all='wi-fi'), ['Balcony and Wi-Fi', 'Wi-Fi'])
+        self.assertEqual(self.list_titles(amenities_all='Wi-Fi,BALCONY'), ['Balcony and Wi-Fi'])
+        self.assertEqual(self.list_titles(amenities_any='Balcony,Parking'), ['Balcony and Wi-Fi'])
+        self.assertEqual(self.list_titles(amenities_any='Parking'), [])
+        response = self.client.get(reverse('create_announcement'), {'amenities_any': 'Sauna'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_serializers_expand_the_mask(self):
+        url = reverse('update_announcement', args=[self.bare.pk])
+        response = self.client.patch(url, {'amenities': [Amenities.WASHING_MACHINE.value, Amenities.PETS_ALLOWED.value]},
+                                     format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['amenities'], [Amenities.PETS_ALLOWED.value, Amenities.WASHING_MACHINE.value])
+        self.bare.refresh_from_db()
+        self.assertEqual(self.bare.amenities, Amenities.PETS_ALLOWED.bit | Amenities.WASHING_MACHINE.bit)
+
+        response = self.client.patch(url, {'amenities': ['Sauna']}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.get(reverse('create_announcement'), {'fields': 'title,amenities'})
+        amenities = {item['title']: item['amenities'] for item in response.data['results']}
+        self.assertEqual(amenities['Balcony and Wi-Fi'], [Amenities.BALCONY.value, Amenities.WIFI.value])
+
+        response = self.client.post(reverse('bulk_announcements'),
+                                    [{'id': self.wifi.pk, 'amenities': [Amenities.GARDEN.value]}], format='json')
+        self.assertEqual(response.data['updated'], 1, response.data)
+        self.wifi.refresh_from_db()
+        self.assertEqual(self.wifi.amenities, Amenities.GARDEN.bit)
+
+    def test_search_cache_key_ignores_amenity_order_and_case(self):
+        self.assertEqual(normalize_query(QueryDict('amenities_all=Wi-Fi,balcony')),
+                         normalize_query(QueryDict('amenities_all=BALCONY, wi-fi')))
+
+
+@override_settings(ANNOUNCEMENT_VIEW_FLUSH_SECONDS=0)
+class DuplicateListingTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for MinHash signatures, duplicate flags, their moderation and the duplicate filter.
+    """
+    DESCRIPTION = (
+        'Bright two room flat on the third floor of a renovated Altbau in Kreuzberg, with oak floors, '
+        'a fitted kitchen with dishwasher, a quiet bedroom facing the courtyard and a balcony facing '
+        'south. Five minutes to the underground, supermarkets and the canal around the corner.'
+    )
+
+    def setUp(self):
+        cache.clear()
+        self.lessor = self.create_user('lessor', is_lessor=True)
+        self.moderator = self.create_user('moderator')
+        self.moderator.is_staff = True
+        self.moderator.save()
+        self.address = self.create_address()
+        self.client = APIClient()
+
+    def create_listing(self, title, description=DESCRIPTION):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.create_announcement(self.lessor, address=self.address, title=title, description=description)
+
+    def list_titles(self, **params):
+        self.client.force_authenticate(self.lessor)
+        response = self.client.get(reverse('create_announcement'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return sorted(item['title'] for item in response.data['results'])
+
+    def test_lsh_finds_the_pairs_of_a_brute_force_comparison(self):
+        texts = [listing_text('Flat', self.DESCRIPTION), listing_text('Cheap flat!', self.DESCRIPTION + ' Call now.'),
+                 listing_text('Villa', 'Large villa with a garden and pool at the lake, ten rooms and a sauna.'),
+                 listing_text('', '')]
+        signatures = signature_matrix(texts)
+        self.assertEqual(signatures.shape, (4, 128))
+        first, second, scores = find_duplicates(signatures)
+        self.assertEqual(list(zip(first.tolist(), second.tolist())), [(0, 1)])
+        self.assertGreater(scores[0], 0.8)
+        brute = [(i, j) for i in range(4) for j in range(i + 1, 4) if (signatures[i] == signatures[j]).mean() >= 0.8]
+        self.assertEqual(brute, [(0, 1)])
+
+    def test_saves_flag_the_newer_copy(self):
+        original = self.create_listing('Altbau flat in Kreuzberg')
+        copy = self.create_listing('KREUZBERG: Altbau, balcony!', self.DESCRIPTION.replace('Five', '5'))
+        self.create_listing('Villa', 'Large villa with a garden and pool at the lake, ten rooms and a sauna.')
+        self.assertEqual(ListingSignature.objects.count(), 3)
+        self.assertEqual(SignatureBand.objects.filter(announcement=copy).count(), 16)
+        flag = DuplicateListing.objects.get()
+        self.assertEqual((flag.original, flag.announcement, flag.status),
+                         (original, copy, DuplicateStatus.PENDING.value))
+
+        copy.description = 'A completely different text about a small studio next to the airport.'
+        with self.captureOnCommitCallbacks(execute=True):
+            copy.save()
+        self.assertFalse(DuplicateListing.objects.exists())
+
+    def test_exclude_duplicates_and_moderation(self):
+        self.create_listing('Original')
+        self.create_listing('Copy')
+        flag = DuplicateListing.objects.get()
+        self.assertEqual(self.list_titles(), ['Copy', 'Original'])
+        self.assertEqual(self.list_titles(exclude_duplicates='true'), ['Original'])
+
+        self.client.force_authenticate(self.lessor)
+        self.assertEqual(self.client.get(reverse('duplicate_listings')).status_code, 403)
+        self.client.force_authenticate(self.moderator)
+        response = self.client.get(reverse('duplicate_listings'))
+        self.assertEqual([item['announcement']['title'] for item in response.data['results']], ['Copy'])
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(reverse('update_duplicate_listing', args=[flag.pk]),
+                                         {'status': DuplicateStatus.DISMISSED.value}, format='json')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertEqual(response.data['reviewed_by'], self.moderator.pk)
+        self.assertEqual(self.list_titles(exclude_duplicates='true'), ['Copy', 'Original'])
+
+    def test_batch_detection_signs_every_announcement(self):
+        others = ['Small studio next to the airport, furnished.', 'Farmhouse with stables and a large meadow.',
+                  'Penthouse with roof terrace and a view over the harbour.']
+        Announcement.objects.bulk_create([
+            Announcement(owner=self.lessor, address=self.address, title=f'Flat {i}', price=100, rooms=2,
+                         type_of_object=HousingTypes.APARTMENT.value, description=description)
+            for i, description in enumerate([self.DESCRIPTION] * 3 + others)
+        ])
+        out = StringIO()
+        call_command('detect_duplicate_listings', stdout=out)
+        self.assertIn('Signed 6 announcements and found 3 duplicate pairs', out.getvalue())
+        self.assertEqual(ListingSignature.objects.count(), 6)
+        ids = sorted(Announcement.objects.filter(description=self.DESCRIPTION).values_list('pk', flat=True))
+        self.assertEqual(sorted(DuplicateListing.objects.values_list('original_id', 'announcement_id')),
+                         [(ids[0], ids[1]), (ids[0], ids[2]), (ids[1], ids[2])])
+
+
+class AnnouncementFacetsTests(AnnouncementTestMixin, TestCase):
+    """
+    Tests for the facet counts of the search sidebar.
+    """
+
+    def setUp(self):
+        cache.clear()
+        lessor = self.create_user('lessor', is_lessor=True)
+        rows = [
+            ('Berlin', FederalLands.BERLIN, HousingTypes.APARTMENT, 40, 1),
+            ('Berlin', FederalLands.BERLIN, HousingTypes.HOUSE, 150, 3),
+            ('München', FederalLands.BAYERN, HousingTypes.APARTMENT, 90, 2),
+            ('München', FederalLands.BAYERN, HousingTypes.APARTMENT, 2500, 5),
+        ]
+        for i, (city, land, housing, price, rooms) in enumerate(rows):
+            self.create_announcement(
+                lessor,
+                address=self.create_address(city=city, federal_land=land.value, house_number=str(i)),
+                type_of_object=housing.value,
+                price=price,
+                rooms=rooms,
+            )
+        self.create_announcement(lessor, address=self.create_address(house_number='9'), is_active=False)
+        self.client = APIClient()
+        self.client.force_authenticate(lessor)
+
+    def facets(self, params, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(reverse('announcement_facets'), params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    @staticmethod
+    def counts(entries):
+        return {entry['value']: entry['count'] for entry in entries if entry['count']}
+
+    def test_without_filters_uses_one_query(self):
+        data = self.facets({}, queries=1)
+        self.assertEqual(self.counts(data['type_of_object']), {'Apartment': 3, 'House': 1})
+        self.assertEqual(self.counts(data['city']), {'Berlin': 2, 'München': 2})
+        self.assertEqual(self.counts(data['rooms']), {1: 1, 2: 1, 3: 1, 5: 1})
+        self.assertEqual([bucket['count'] for bucket in data['price']], [1, 1, 1, 0, 0, 0, 1])
+        self.assertEqual(data['price'][-1]['max'], None)
+
+    def test_facet_ignores_its_own_filter(self):
+        data = self.facets({'type_of_object': HousingTypes.APARTMENT.value, 'address__city': 'München'}, queries=3)
+        self.assertEqual(self.counts(data['type_of_object']), {'Apartment': 2})
+        self.assertEqual(self.counts(data['city']), {'Berlin': 1, 'München': 2})
+        self.assertEqual(self.counts(data['federal_land']), {FederalLands.BAYERN.value: 2})
+        self.assertEqual(self.counts(data['rooms']), {2: 1, 5: 1})
+
+    def test_responses_are_cached(self):
+        self.facets({'rooms__gte': 2}, queries=2)
+        self.facets({'rooms__gte': 2}, queries=0)
+
+    def test_invalid_filter_is_rejected(self):
+        response = self.client.get(reverse('announcement_facets'), {'price__gte': 'cheap'})
+        self.assertEqual(response.status_code, 400)
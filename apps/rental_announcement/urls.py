@@ -3,22 +3,53 @@ from django.urls import path
 from apps.rental_announcement.views import (
     AddressListView,
     AddressRetrieveUpdateDestroyAPIView,
+    AddressAutocompleteAPIView,
     AnnouncementListCreateAPIView,
     AnnouncementRetrieveUpdateDestroyAPIView,
+    AnnouncementFacetsAPIView,
+    AnnouncementClustersAPIView,
+    AnnouncementChangesAPIView,
+    AnnouncementPriceStatisticsAPIView,
+    AnnouncementBulkUpsertAPIView,
+    AnnouncementSimilarAPIView,
+    AnnouncementQuoteAPIView,
     BookingListCreateAPIView,
     BookingRetrieveUpdateDestroyAPIView,
     BookingApproveAPIView,
     BookingCancelAPIView,
     AllBookingsAPIView,
+    AnnouncementReviewListAPIView,
     ReviewListCreateAPIView,
     ReviewRetrieveUpdateDestroyAPIView,
+    SavedSearchListCreateAPIView,
+    SavedSearchRetrieveUpdateDestroyAPIView,
+    SearchMatchListAPIView,
+    RateRuleListCreateAPIView,
+    RateRuleRetrieveUpdateDestroyAPIView,
+    DuplicateListingListAPIView,
+    DuplicateListingRetrieveUpdateAPIView,
 )
 
 urlpatterns = [
     path('addresses/', AddressListView.as_view(), name='create_address'),
+    path('addresses/autocomplete/', AddressAutocompleteAPIView.as_view(), name='address_autocomplete'),
     path('address/<int:pk>/', AddressRetrieveUpdateDestroyAPIView.as_view(), name='update_address'),
     path('announcement/', AnnouncementListCreateAPIView.as_view(), name='create_announcement'),
     path('announcement/<int:pk>/', AnnouncementRetrieveUpdateDestroyAPIView.as_view(), name='update_announcement'),
+    path('announcement/bulk/', AnnouncementBulkUpsertAPIView.as_view(), name='bulk_announcements'),
+    path('announcement/<int:pk>/similar/', AnnouncementSimilarAPIView.as_view(), name='similar_announcements'),
+    path('announcement/<int:pk>/quote/', AnnouncementQuoteAPIView.as_view(), name='announcement_quote'),
+    path('announcement/<int:pk>/rate-rules/', RateRuleListCreateAPIView.as_view(), name='announcement_rate_rules'),
+    path('rate-rules/<int:pk>/', RateRuleRetrieveUpdateDestroyAPIView.as_view(), name='update_rate_rule'),
+    path('announcement/<int:pk>/reviews/', AnnouncementReviewListAPIView.as_view(), name='announcement_reviews'),
+    path('announcement/facets/', AnnouncementFacetsAPIView.as_view(), name='announcement_facets'),
+    path('announcement/clusters/', AnnouncementClustersAPIView.as_view(), name='announcement_clusters'),
+    path('announcement/changes/', AnnouncementChangesAPIView.as_view(), name='announcement_changes'),
+    path(
+        'announcement/price-statistics/',
+        AnnouncementPriceStatisticsAPIView.as_view(),
+        name='announcement_price_statistics'
+    ),
     path('booking/', BookingListCreateAPIView.as_view(), name='create_booking'),
     path('booking/<int:pk>/', BookingRetrieveUpdateDestroyAPIView.as_view(), name='update_booking'),
     path('booking/approve/<int:pk>/', BookingApproveAPIView.as_view(), name='approve_booking'),
@@ -26,4 +57,9 @@ urlpatterns = [
     path('booking/history/', AllBookingsAPIView.as_view(), name='all_bookings'),
     path('review/', ReviewListCreateAPIView.as_view(), name='create_review'),
     path('review/<int:pk>/', ReviewRetrieveUpdateDestroyAPIView.as_view(), name='update_review'),
+    path('saved-searches/', SavedSearchListCreateAPIView.as_view(), name='saved_searches'),
+    path('saved-searches/<int:pk>/', SavedSearchRetrieveUpdateDestroyAPIView.as_view(), name='update_saved_search'),
+    path('saved-searches/matches/', SearchMatchListAPIView.as_view(), name='search_matches'),
+    path('duplicates/', DuplicateListingListAPIView.as_view(), name='duplicate_listings'),
+    path('duplicates/<int:pk>/', DuplicateListingRetrieveUpdateAPIView.as_view(), name='update_duplicate_listing'),
 ]
@@ -1,6 +1,7 @@
 from apps.rental_announcement.views.addresses_view import (
     AddressListView,
-    AddressRetrieveUpdateDestroyAPIView
+    AddressRetrieveUpdateDestroyAPIView,
+    AddressAutocompleteAPIView,
 )
 from apps.rental_announcement.views.booking_views import (
     BookingListCreateAPIView,
@@ -12,5 +13,29 @@ from apps.rental_announcement.views.booking_views import (
 from apps.rental_announcement.views.announcement_views import (
     AnnouncementListCreateAPIView,
     AnnouncementRetrieveUpdateDestroyAPIView,
+    AnnouncementFacetsAPIView,
+    AnnouncementClustersAPIView,
+    AnnouncementChangesAPIView,
+    AnnouncementPriceStatisticsAPIView,
+    AnnouncementBulkUpsertAPIView,
+    AnnouncementSimilarAPIView,
+    AnnouncementQuoteAPIView,
+)
+from apps.rental_announcement.views.review_views import (
+    AnnouncementReviewListAPIView,
+    ReviewListCreateAPIView,
+    ReviewRetrieveUpdateDestroyAPIView,
+)
+from apps.rental_announcement.views.saved_search_views import (
+    SavedSearchListCreateAPIView,
+    SavedSearchRetrieveUpdateDestroyAPIView,
+    SearchMatchListAPIView,
+)
+from apps.rental_announcement.views.rate_rule_views import (
+    RateRuleListCreateAPIView,
+    RateRuleRetrieveUpdateDestroyAPIView,
+)
+from apps.rental_announcement.views.duplicate_views import (
+    DuplicateListingListAPIView,
+    DuplicateListingRetrieveUpdateAPIView,
 )
-from apps.rental_announcement.views.review_views import ReviewListCreateAPIView, ReviewRetrieveUpdateDestroyAPIView
\ No newline at end of file
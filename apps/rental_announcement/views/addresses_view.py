@@ -3,12 +3,16 @@ from rest_framework.generics import (
     RetrieveUpdateDestroyAPIView,
     get_object_or_404
 )
+from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.request import Request
+from rest_framework.views import APIView
 from rest_framework import status
 
+from apps.rental_announcement.autocomplete import address_autocomplete
 from apps.rental_announcement.models import Address
 from apps.rental_announcement.serializers import DetailAddressSerializer
+from apps.rental_announcement.serializers.autocomplete_serializers import AddressAutocompleteQuerySerializer
 from apps.users.permissions import IsLessor
 
 
@@ -92,3 +96,41 @@ class AddressRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
             Http404: If no address is found with the given primary key.
         """
         return get_object_or_404(Address, pk=self.kwargs['pk'])
+
+
+class AddressAutocompleteAPIView(APIView):
+    """
+    View to suggest city and street names for a typed prefix.
+
+    The prefix is folded like search terms, so `mün`, `Muen` and `MÜN` all match `München`.
+    Suggestions come from in-memory sorted prefix indexes and are ranked by the number of
+    active announcements, so a keystroke does not query the database.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Returns the best ranked names starting with the prefix.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the names starting with the prefix in the query string.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object with the names and their listing counts.
+
+        Raises:
+            ValidationError: If a query parameter is invalid.
+        """
+        query = AddressAutocompleteQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        suggestions = address_autocomplete.suggest(
+            params['kind'], params['q'], city=params.get('city'), limit=params['limit'],
+        )
+        return Response({'results': [{'name': name, 'listings': listings} for name, listings in suggestions]})
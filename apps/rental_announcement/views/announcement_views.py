@@ -1,22 +1,56 @@
+from collections import Counter
+
+from rest_framework import status
 from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
-    get_object_or_404
 )
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticated
+from django.db.models import Count, Max, Sum
+from django.http import Http404, StreamingHttpResponse
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
 
 from apps.users.permissions.lessor_permissions import IsLessor
-from apps.rental_announcement.models import Announcement
-from apps.rental_announcement.filters import AnnouncementFilter
+from apps.rental_announcement.bulk import upsert_announcements
+from apps.rental_announcement.bulk.announcement_upsert import CREATED, NOT_FOUND, UPDATED
+from apps.rental_announcement.cache import get_cached_search, set_cached_search
+from apps.rental_announcement.counters import view_counter
+from apps.rental_announcement.feeds import iter_announcement_changes
+from apps.rental_announcement.models import Announcement, ArchivedAnnouncement
+from apps.rental_announcement.filters import (
+    AnnouncementFilter,
+    AnnouncementOrderingFilter,
+    AnnouncementSearchFilter,
+    StayPriceFilter,
+    compute_clusters,
+    compute_facets,
+)
+from apps.rental_announcement.pagination import AnnouncementCursorPagination
+from apps.rental_announcement.pricing import quote_announcements
+from apps.rental_announcement.rollups import get_price_statistic
 from apps.rental_announcement.serializers import (
     AnnouncementRetrieveUpdateDestroySerializer,
     AnnouncementListDetailSerializer,
 )
+from apps.rental_announcement.serializers.bulk_serializers import BulkAnnouncementSerializer
+from apps.rental_announcement.serializers.field_selection import EXPAND_PARAM, FIELDS_PARAM
+from apps.rental_announcement.serializers.map_cluster_serializers import MapClusterQuerySerializer
+from apps.rental_announcement.serializers.pricing_serializers import StayQuerySerializer
+from apps.rental_announcement.serializers.price_statistic_serializers import (
+    PriceStatisticQuerySerializer,
+    PriceStatisticSerializer,
+)
+from apps.rental_announcement.serializers.similarity_serializers import SimilarAnnouncementsQuerySerializer
+from apps.rental_announcement.similarity import similar_listings
+from apps.rental_announcement.views.archive_fallback import ArchiveFallbackMixin
+from apps.rental_announcement.views.conditional_get import ConditionalGetMixin
+from apps.rental_announcement.views.fast_read import FastReadMixin
 
 
-class AnnouncementListCreateAPIView(ListCreateAPIView):
+class AnnouncementListCreateAPIView(ConditionalGetMixin, FastReadMixin, ListCreateAPIView):
     """
     View to list all announcements or create a new announcement.
 
@@ -25,23 +59,168 @@ class AnnouncementListCreateAPIView(ListCreateAPIView):
         - `IsLessor`: Only users with the 'lessor' role can create announcements.
 
     Filtering:
-        - `DjangoFilterBackend`: Allows filtering using DjangoFilter.
-        - `SearchFilter`: Allows searching by `title` and `description`.
-        - `OrderingFilter`: Allows ordering by `price` and `created_at`.
+        - `DjangoFilterBackend`: Allows filtering using DjangoFilter, including a radius search
+          around `lat`/`lon` and a bounding box on the address coordinates.
+        - `AnnouncementSearchFilter`: Allows ranked full-text search in `title` and `description`.
+        - `StayPriceFilter`: With `check_in` and `check_out`, prices the stay for every filtered
+          announcement in vectorized batches, drops announcements whose minimum stay is not met
+          and filters by `total_price__gte` and `total_price__lte`.
+        - `AnnouncementOrderingFilter`: Allows ordering by `price`, `created_at`, `rating`, the
+          popularity fields `view_count` and `trending_score`, during a radius search `distance`
+          and for a priced stay `total_price`.
+
+    Pagination:
+        - `AnnouncementCursorPagination`: Keyset pagination on the active ordering with `id` as a tiebreaker.
+          For a priced stay, every result carries its `total_price`.
+
+    Field selection:
+        - `?fields=` limits the returned fields and `?expand=address,owner,reviews` nests relations.
+          The queryset only loads the columns, joins and prefetches of the selected fields.
+        - `FastReadMixin`: Without field selection, pages can be rendered from `values_list()` rows.
+
+    Caching:
+        - List responses are cached per normalized query string and invalidated on any change
+          to announcements, addresses or reviews. The `X-Cache` header reports `HIT` or `MISS`.
+        - `ConditionalGetMixin`: `ETag` and `Last-Modified` from the newest `updated_at` and the
+          number of matching announcements; matching conditional requests get a 304. Flushed views
+          do not touch `updated_at`, so popularity orderings add the view total to the `ETag` instead
+          of sending `Last-Modified`.
 
     Methods:
+        - `get_conditional_state`: Returns the newest `updated_at` and the count of the filtered announcements.
+        - `orders_by_popularity`: Tells whether the request orders by a popularity field.
+        - `get_values_serializer`: Disables the fast read path when fields are selected.
+        - `get_values_columns`: Returns the sort keys read by the paginator.
+        - `list`: Serves the list from the search cache when possible.
+        - `get_paginated_response`: Adds the total price of a priced stay to the results.
         - `get_serializer_class`: Chooses the serializer class based on the HTTP method.
         - `get_permissions`: Returns permissions based on the HTTP method.
     """
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    filter_backends = [DjangoFilterBackend, AnnouncementSearchFilter, StayPriceFilter, AnnouncementOrderingFilter]
     filterset_class = AnnouncementFilter
-    search_fields = ['title', 'description']
-    ordering_fields = ['price', 'created_at']
+    ordering_fields = ['price', 'created_at', 'rating', 'view_count', 'trending_score', 'distance', 'total_price']
+    popularity_fields = {'view_count', 'trending_score'}
+    pagination_class = AnnouncementCursorPagination
     permission_classes = [IsAuthenticated, IsLessor]
     # queryset = Announcement.objects.all()
 
     def get_queryset(self):
-        return Announcement.objects.filter(is_active=True)
+        """
+        Return active announcements, loading only what the requested fields render.
+
+        Returns:
+            QuerySet: A queryset of active announcements.
+        """
+        queryset = Announcement.objects.active()
+        if self.request.method not in SAFE_METHODS:
+            return queryset.for_list()
+        # The sort keys are loaded as well, the paginator reads them from the last row.
+        columns = ['created_at', *self.ordering_fields]
+        return self.get_serializer().plan_queryset(queryset, columns=columns)
+
+    def get_conditional_state(self):
+        """
+        Describe the current version of the filtered announcement list.
+
+        The state is stored with the cached response, so a cache hit answers
+        conditional requests without touching the database.
+
+        Returns:
+            tuple: The count and newest `updated_at` of the matching announcements,
+                and the newest `updated_at` as the last modification time. Popularity
+                orderings add the total view count and have no last modification time.
+        """
+        self.cached_search = get_cached_search(self.request)
+        if self.cached_search is not None:
+            return self.cached_search['state']
+
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.orders_by_popularity(queryset):
+            aggregates = queryset.order_by().aggregate(
+                count=Count('id'), last_modified=Max('updated_at'), views=Sum('view_count'),
+            )
+            self.conditional_state = (aggregates['count'], aggregates['last_modified'], aggregates['views']), None
+        else:
+            aggregates = queryset.order_by().aggregate(count=Count('id'), last_modified=Max('updated_at'))
+            self.conditional_state = (aggregates['count'], aggregates['last_modified']), aggregates['last_modified']
+        return self.conditional_state
+
+    def orders_by_popularity(self, queryset):
+        """
+        Tell whether the list is ordered by a popularity field.
+
+        Args:
+            queryset (QuerySet): The filtered queryset.
+
+        Returns:
+            bool: True if the requested ordering includes `view_count` or `trending_score`.
+        """
+        ordering = AnnouncementOrderingFilter().get_ordering(self.request, queryset, self) or []
+        return any(term.lstrip('-') in self.popularity_fields for term in ordering)
+
+    def get_values_serializer(self):
+        """
+        Return the values serializer, unless the request selects fields or expansions.
+
+        Returns:
+            ValuesSerializer: The compiled serializer, or None.
+        """
+        if FIELDS_PARAM in self.request.query_params or EXPAND_PARAM in self.request.query_params:
+            return None
+        return super().get_values_serializer()
+
+    def get_values_columns(self):
+        """
+        Return the sort keys the paginator reads from the last row of a page.
+
+        Returns:
+            list: The sortable columns and annotations.
+        """
+        return ['id', 'created_at', 'search_rank', *self.ordering_fields]
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return the paginated list of announcements, from the search cache when possible.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response object with a page of announcements.
+        """
+        cached_search = getattr(self, 'cached_search', None)
+        if cached_search is not None:
+            return Response(cached_search['data'], headers={'X-Cache': 'HIT'})
+
+        response = super().list(request, *args, **kwargs)
+        set_cached_search(request, {'state': self.conditional_state, 'data': response.data})
+        response['X-Cache'] = 'MISS'
+        return response
+
+    def get_paginated_response(self, data):
+        """
+        Return the page, with the total price of the stay on every result when a stay is priced.
+
+        The queryset is not narrowed to the quoted announcements when the stay dropped none,
+        so an announcement created or changed to match after the quotes were computed gets a
+        `null` total instead of failing the request.
+
+        Args:
+            data (list): The serialized announcements of the page.
+
+        Returns:
+            Response: The paginated response.
+        """
+        quotes = getattr(self, 'stay_quotes', None)
+        if quotes is not None:
+            totals = quotes.totals_by_id()
+            for item in data:
+                if 'id' in item:
+                    total = totals.get(item['id'])
+                    item['total_price'] = None if total is None else str(total)
+        return super().get_paginated_response(data)
 
     def get_serializer_class(self):
         """
@@ -66,7 +245,7 @@ class AnnouncementListCreateAPIView(ListCreateAPIView):
         return [IsAuthenticated()]
 
 
-class AnnouncementRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class AnnouncementRetrieveUpdateDestroyAPIView(ConditionalGetMixin, ArchiveFallbackMixin, RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, or delete a specific announcement.
 
@@ -74,9 +253,27 @@ class AnnouncementRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         - `IsAuthenticated`: Only authenticated users can access this view.
         - `IsLessor`: Only users with the 'lessor' role can access this view.
 
+    Conditional requests:
+        - `ConditionalGetMixin`: `ETag` and `Last-Modified` from the announcement `updated_at`;
+          matching conditional requests get a 304 before the announcement and its reviews are loaded.
+
+    Field selection:
+        - `?fields=` limits the returned fields and `?expand=` chooses the nested relations among
+          `address`, `owner` and `reviews`; by default `address` and `reviews` are nested.
+
+    Archive:
+        - `ArchiveFallbackMixin`: Reads of archived announcements are answered from the archive tables.
+
+    Popularity:
+        - Successful reads, including 304 responses, are counted by the write-behind `view_counter`.
+
     Methods:
+        - `get`: Returns the announcement and counts the view.
+        - `get_conditional_state`: Returns the `updated_at` of the requested announcement.
         - `get_queryset`: Returns announcements owned by the authenticated lessor.
+        - `get_archived_queryset`: Returns archived announcements with their owner, address and reviews.
         - `get_object`: Retrieves the announcement instance by primary key or returns a 404 error if not found.
+        - `perform_destroy`: Soft-deletes the announcement, so the changes feed reports it as deleted.
     """
     permission_classes = [IsAuthenticated, IsLessor]
     serializer_class = AnnouncementRetrieveUpdateDestroySerializer
@@ -89,17 +286,388 @@ class AnnouncementRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
             QuerySet: A queryset of announcements owned by the user or an empty queryset.
         """
         if self.request.user.is_authenticated and self.request.user.is_lessor:
-            return Announcement.objects.filter(owner=self.request.user)
+            return Announcement.objects.filter(owner=self.request.user).for_detail()
         return Announcement.objects.none()
 
+    def get(self, request, *args, **kwargs):
+        """
+        Return the announcement and count the view.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response object.
+        """
+        response = super().get(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            view_counter.record(self.kwargs['pk'])
+        return response
+
+    def get_conditional_state(self):
+        """
+        Describe the current version of the requested announcement.
+
+        Returns:
+            tuple: The `updated_at` of the announcement as both version and last modification time,
+                or None if it does not exist.
+        """
+        updated_at = self.get_updated_at_or_archived(Announcement.objects.filter(deleted=False))
+        if updated_at is None:
+            return None
+        return (updated_at,), updated_at
+
     def get_object(self):
         """
-        Retrieve the announcement instance by primary key.
+        Retrieve the announcement instance by primary key, or the archived announcement on reads.
 
         Returns:
             Announcement: The announcement instance with the given primary key.
 
         Raises:
-            Http404: If no announcement is found with the given primary key.
+            Http404: If no announcement is found with the given primary key, or it was deleted.
+        """
+        queryset = Announcement.objects.for_detail()
+        if self.request.method in SAFE_METHODS:
+            queryset = self.get_serializer().plan_queryset(Announcement.objects.all())
+        return self.get_object_or_archived(queryset.filter(deleted=False))
+
+    def get_archived_queryset(self):
+        """
+        Return archived announcements loaded for the detail serializer.
+
+        Returns:
+            QuerySet: A queryset of archived announcements that were not deleted.
+        """
+        return ArchivedAnnouncement.objects.filter(deleted=False).for_detail()
+
+    def perform_destroy(self, instance):
+        """
+        Soft-delete the announcement instead of removing the row.
+
+        The row stays with `deleted` set and `is_active` cleared, and the save refreshes
+        `updated_at`, so the changes feed delivers a `deleted` entry to partner mirrors. The
+        announcement leaves the search, statistics and similar listings like a deactivated one,
+        and is archived later by `archive_announcements`.
+
+        Args:
+            instance (Announcement): The announcement to delete.
+        """
+        instance.deleted = True
+        instance.is_active = False
+        instance.save(update_fields=['deleted', 'is_active', 'updated_at'])
+
+
+class AnnouncementFacetsAPIView(APIView):
+    """
+    View to count active announcements per value of each search sidebar facet.
+
+    Accepts the same filter and `search` parameters as the announcement list. Every facet
+    (`type_of_object`, `federal_land`, `city`, `price`, `rooms`) ignores the filters on its
+    own dimension, and facets with identical effective filters share one grouped query.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Caching:
+        - Responses are cached like the announcement list and invalidated by the same changes.
+          The `X-Cache` header reports `HIT` or `MISS`.
+
+    Methods:
+        - `get`: Returns the facet counts for the request filters.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the facet counts for the filters in the query string.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object with the counts per facet.
+        """
+        cached_search = get_cached_search(request)
+        if cached_search is not None:
+            return Response(cached_search['data'], headers={'X-Cache': 'HIT'})
+
+        data = compute_facets(Announcement.objects.active(), request)
+        set_cached_search(request, {'data': data})
+        return Response(data, headers={'X-Cache': 'MISS'})
+
+
+class AnnouncementClustersAPIView(APIView):
+    """
+    View to count the active announcements of a map viewport per grid cell.
+
+    Instead of every pin, the map receives one cluster per cell with the number of
+    announcements, the centroid of their coordinates and their price range. Cells are map
+    tiles two zoom levels below the requested zoom, grouped on the indexed address tile key.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Returns the clusters of the viewport for the request filters.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
         """
-        return get_object_or_404(Announcement, pk=self.kwargs['pk'])
+        Return the clusters of the viewport and zoom level in the query string.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object with the clusters.
+
+        Raises:
+            ValidationError: If the viewport, the zoom level or a filter parameter is invalid.
+        """
+        query = MapClusterQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return Response(compute_clusters(
+            Announcement.objects.active(), request, query.validated_data['bbox'], query.validated_data['zoom'],
+        ))
+
+
+class AnnouncementChangesAPIView(APIView):
+    """
+    View to stream the announcements created or changed since a watermark.
+
+    Partner portals mirror the catalogue by passing the `next_watermark` of their previous
+    sync as `since`. Every change carries its kind: `upserted` with the list representation,
+    `deactivated` or `deleted` with the id only. The response is streamed while the rows are
+    read in bounded chunks, and `has_more` tells the client to continue right away.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Streams the changes after the `since` watermark, at most `limit` of them.
+    """
+    permission_classes = [IsAuthenticated]
+    default_limit = 500
+    max_limit = 5000
+
+    def get(self, request, *args, **kwargs):
+        """
+        Stream the changes after the watermark in the query string.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            StreamingHttpResponse: The JSON document with the changes and the next watermark.
+
+        Raises:
+            ValidationError: If the watermark or the limit is invalid.
+        """
+        try:
+            limit = int(request.query_params.get('limit', self.default_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'A valid integer is required.'})
+        if not 1 <= limit <= self.max_limit:
+            raise ValidationError({'limit': f'Must be between 1 and {self.max_limit}.'})
+
+        changes = iter_announcement_changes(request.query_params.get('since') or None, limit)
+        return StreamingHttpResponse(changes, content_type='application/json')
+
+
+class AnnouncementPriceStatisticsAPIView(APIView):
+    """
+    View to read the price distribution of the active announcements in a slice.
+
+    The slice is selected by the optional `city`, `type_of_object` and `rooms` parameters.
+    Every combination, including the ones leaving dimensions open, is precomputed in the
+    `price_statistics` table, so a request costs one unique index lookup.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Returns the count, average and percentiles of prices in the slice.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the price statistics of the slice in the query string.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object with the price statistics. Empty slices
+                have a count of 0 and null prices.
+
+        Raises:
+            ValidationError: If a slice parameter is invalid.
+        """
+        query = PriceStatisticQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        return Response(PriceStatisticSerializer(get_price_statistic(**query.validated_data)).data)
+
+
+class AnnouncementSimilarAPIView(APIView):
+    """
+    View to list the active announcements most similar to an announcement.
+
+    Similarity is the distance of price, rooms, housing type and federal land in the
+    memory-mapped `similar_listings` index, so a lookup is one vectorized pass over the
+    matrix followed by one query loading the found announcements.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Returns the nearest announcements, nearest first.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the announcements most similar to the announcement in the URL.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The HTTP response object with the similar announcements.
+
+        Raises:
+            ValidationError: If `limit` is invalid.
+            Http404: If the announcement does not exist.
+        """
+        query = SimilarAnnouncementsQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        ids = similar_listings.similar(self.kwargs['pk'], limit=query.validated_data['limit'])
+        if ids is None:
+            raise Http404
+        # The index may lag a deactivation that has not been applied yet.
+        announcements = Announcement.objects.active().filter(pk__in=ids).for_list().in_bulk()
+        serializer = AnnouncementListDetailSerializer(
+            [announcements[pk] for pk in ids if pk in announcements], many=True, context={'request': request},
+        )
+        return Response({'results': serializer.data})
+
+
+class AnnouncementQuoteAPIView(APIView):
+    """
+    View to price a stay at an active announcement.
+
+    The base nightly rate is the announcement `price`; its rate rules add seasons, weekend
+    surcharges, minimum stays and length-of-stay discounts.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get`: Returns the nightly rates and the total price of the stay.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """
+        Return the quote of the stay in `check_in` and `check_out`.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The stay, its nights with their rates, the subtotal, the discount, the
+                total price, the minimum nights and whether the stay can be booked.
+
+        Raises:
+            ValidationError: If the stay is invalid.
+            Http404: If there is no active announcement with the given primary key.
+        """
+        query = StayQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        stay = query.validated_data
+        announcement = Announcement.objects.active().filter(pk=self.kwargs['pk']).values_list('pk', 'price').first()
+        if announcement is None:
+            raise Http404
+        quotes = quote_announcements([announcement], stay['check_in'], stay['check_out'])
+        return Response({
+            'announcement': announcement[0],
+            'check_in': stay['check_in'],
+            'check_out': stay['check_out'],
+            **quotes.breakdown(0),
+        })
+
+
+class AnnouncementBulkUpsertAPIView(APIView):
+    """
+    View to create and update many announcements of the authenticated lessor in one request.
+
+    The body is a list of announcements with nested addresses. Items with an `id` update that
+    announcement, the others are created. Every item is validated on its own and reported with
+    its index and status; the valid items are written together in one transaction.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+        - `IsLessor`: Only users with the 'lessor' role can upsert announcements.
+
+    Methods:
+        - `post`: Validates the items, upserts the valid ones and returns the result per item.
+    """
+    permission_classes = [IsAuthenticated, IsLessor]
+    max_items = 1000
+
+    def post(self, request, *args, **kwargs):
+        """
+        Upsert the announcements in the request body.
+
+        Args:
+            request (Request): The HTTP request object.
+
+        Returns:
+            Response: The number of created, updated and failed items and the result of
+                every item. The status is 400 if no item could be written.
+
+        Raises:
+            ValidationError: If the body is not a list of at most `max_items` items.
+        """
+        items = request.data
+        if not isinstance(items, list) or not 1 <= len(items) <= self.max_items:
+            raise ValidationError({'non_field_errors': [f'Expected a list of 1 to {self.max_items} announcements.']})
+
+        create_serializer = BulkAnnouncementSerializer()
+        update_serializer = BulkAnnouncementSerializer(partial=True)
+        results = [None] * len(items)
+        valid, positions, ids = [], [], set()
+        for index, item in enumerate(items):
+            serializer = update_serializer if isinstance(item, dict) and 'id' in item else create_serializer
+            try:
+                data = serializer.run_validation(item)
+            except ValidationError as exc:
+                results[index] = {'index': index, 'status': 'failed', 'errors': exc.detail}
+                continue
+            if data.get('id') in ids:
+                results[index] = {'index': index, 'status': 'failed', 'errors': {'id': ['Duplicate id.']}}
+                continue
+            if 'id' in data:
+                ids.add(data['id'])
+            valid.append(data)
+            positions.append(index)
+
+        for index, (outcome, announcement) in zip(positions, upsert_announcements(request.user, valid)):
+            if outcome == NOT_FOUND:
+                results[index] = {'index': index, 'status': 'failed', 'errors': {'id': ['Not found.']}}
+            else:
+                results[index] = {'index': index, 'status': outcome, 'id': announcement.pk}
+
+        counts = Counter(result['status'] for result in results)
+        data = {
+            'created': counts[CREATED],
+            'updated': counts[UPDATED],
+            'failed': counts['failed'],
+            'results': results,
+        }
+        written = counts[CREATED] + counts[UPDATED]
+        return Response(data, status=status.HTTP_200_OK if written else status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,63 @@
+from django.http import Http404
+from rest_framework.permissions import SAFE_METHODS
+
+
+class ArchiveFallbackMixin:
+    """
+    Mixin for detail views whose objects may have been moved to an archive table.
+
+    Safe requests for a primary key that is no longer in the hot table are answered from
+    the archive, so archived objects stay readable under their old URLs. Writes only see
+    the hot table.
+
+    Methods:
+        - `get_archived_queryset`: Returns the archived objects the view may read.
+        - `get_object_or_archived`: Returns the object from the hot queryset or the archive.
+        - `get_updated_at_or_archived`: Returns the `updated_at` from the hot queryset or the archive.
+    """
+
+    def get_archived_queryset(self):
+        """
+        Return the archived objects the view may read.
+
+        Returns:
+            QuerySet: The archived objects.
+        """
+        raise NotImplementedError
+
+    def get_object_or_archived(self, queryset):
+        """
+        Retrieve the object by primary key, falling back to the archive on safe requests.
+
+        Args:
+            queryset (QuerySet): The hot objects the view may access.
+
+        Returns:
+            Model: The hot or archived object.
+
+        Raises:
+            Http404: If the object is in neither table.
+        """
+        pk = self.kwargs['pk']
+        obj = queryset.filter(pk=pk).first()
+        if obj is None and self.request.method in SAFE_METHODS:
+            obj = self.get_archived_queryset().filter(pk=pk).first()
+        if obj is None:
+            raise Http404
+        return obj
+
+    def get_updated_at_or_archived(self, queryset):
+        """
+        Return the `updated_at` of the object, falling back to the archive.
+
+        Args:
+            queryset (QuerySet): The hot objects the view may access.
+
+        Returns:
+            datetime: The last modification of the object, or None if it does not exist.
+        """
+        pk = self.kwargs['pk']
+        updated_at = queryset.filter(pk=pk).values_list('updated_at', flat=True).first()
+        if updated_at is None:
+            updated_at = self.get_archived_queryset().filter(pk=pk).values_list('updated_at', flat=True).first()
+        return updated_at
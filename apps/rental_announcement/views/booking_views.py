@@ -2,15 +2,15 @@ from rest_framework.generics import (
     ListCreateAPIView,
     RetrieveUpdateDestroyAPIView,
     UpdateAPIView,
-    get_object_or_404,
     ListAPIView
 )
+from django.db.models import Count, Max
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
 
 from apps.rental_announcement.choices.booking_status import BookingStatus
-from apps.rental_announcement.models import Booking
+from apps.rental_announcement.models import ArchivedBooking, Booking
 from apps.rental_announcement.serializers import (
     BookingCreateSerializer,
     ApprovedBookingSerializer,
@@ -18,17 +18,28 @@ from apps.rental_announcement.serializers import (
     CancelBookingSerializer,
     AllBookingsSerializer
 )
+from apps.rental_announcement.views.archive_fallback import ArchiveFallbackMixin
+from apps.rental_announcement.views.conditional_get import ConditionalGetMixin
+from apps.rental_announcement.views.fast_read import FastReadMixin
 from apps.users.permissions import IsRenter, IsLessor
 
 
-class BookingListCreateAPIView(ListCreateAPIView):
+class BookingListCreateAPIView(ConditionalGetMixin, FastReadMixin, ListCreateAPIView):
     """
     View to list all bookings or create a new booking.
 
     Permissions:
         - `IsRenter` or `IsLessor`: Only renters or lessors can access this view.
 
+    Conditional requests:
+        - `ConditionalGetMixin`: `ETag` and `Last-Modified` from the user, the booking count and the
+          newest `updated_at` of the bookings, their announcements and their renters.
+
+    Fast reads:
+        - `FastReadMixin`: The list can be rendered from `values_list()` rows.
+
     Methods:
+        - `get_conditional_state`: Returns the user, the count and the newest changes of the listed bookings.
         - `get_queryset`: Returns bookings based on user type.
         - `perform_create`: Sets the renter of the booking to the current user.
     """
@@ -46,6 +57,29 @@ class BookingListCreateAPIView(ListCreateAPIView):
             return Booking.objects.filter(announcement__owner=self.request.user)
         return Booking.objects.filter(renter=self.request.user)
 
+    def get_conditional_state(self):
+        """
+        Describe the current version of the booking list.
+
+        The list differs per user and renders the renter email and the announcement of each
+        booking, so the user and the newest changes of renters and announcements are part
+        of the version.
+
+        Returns:
+            tuple: The user, the count and newest `updated_at` of the bookings, of their
+                announcements and of their renters, and the newest modification as the
+                last modification time.
+        """
+        state = self.get_queryset().aggregate(
+            count=Count('id'),
+            bookings_modified=Max('updated_at'),
+            announcements_modified=Max('announcement__updated_at'),
+            renters_modified=Max('renter__updated_at'),
+        )
+        modified = [value for value in (state['bookings_modified'], state['announcements_modified'],
+                                        state['renters_modified']) if value]
+        return (self.request.user.pk, state['count'], *modified), max(modified, default=None)
+
     def perform_create(self, serializer):
         """
         Save the booking with the current user as the renter.
@@ -56,15 +90,23 @@ class BookingListCreateAPIView(ListCreateAPIView):
         serializer.save(renter=self.request.user)
 
 
-class BookingRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class BookingRetrieveUpdateDestroyAPIView(ConditionalGetMixin, ArchiveFallbackMixin, RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, or delete a specific booking.
 
     Permissions:
         - `IsRenter` or `IsLessor`: Only renters or lessors can access this view.
 
+    Conditional requests:
+        - `ConditionalGetMixin`: `ETag` and `Last-Modified` from the booking `updated_at`.
+
+    Archive:
+        - `ArchiveFallbackMixin`: Reads of bookings of archived announcements are answered from the archive.
+
     Methods:
+        - `get_conditional_state`: Returns the `updated_at` of the requested booking.
         - `get_queryset`: Returns bookings for the authenticated user.
+        - `get_archived_queryset`: Returns archived bookings of the authenticated user.
         - `get_object`: Retrieves the booking instance or returns 404 if not found.
         - `perform_update`: Updates the booking instance with the current user as the renter.
     """
@@ -84,7 +126,7 @@ class BookingRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
 
     def get_object(self):
         """
-        Retrieve the booking instance by primary key.
+        Retrieve the booking instance by primary key, or the archived booking on reads.
 
         Returns:
             Booking: The booking instance with the given primary key.
@@ -92,7 +134,31 @@ class BookingRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         Raises:
             Http404: If no booking is found with the given primary key.
         """
-        return get_object_or_404(self.get_queryset(), pk=self.kwargs['pk'])
+        return self.get_object_or_archived(self.get_queryset())
+
+    def get_archived_queryset(self):
+        """
+        Return archived bookings of the authenticated user.
+
+        Returns:
+            QuerySet: A queryset of archived bookings for the current user.
+        """
+        if self.request.user.is_authenticated:
+            return ArchivedBooking.objects.filter(renter=self.request.user)
+        return ArchivedBooking.objects.none()
+
+    def get_conditional_state(self):
+        """
+        Describe the current version of the requested booking.
+
+        Returns:
+            tuple: The `updated_at` of the booking as both version and last modification time,
+                or None if it does not exist.
+        """
+        updated_at = self.get_updated_at_or_archived(self.get_queryset())
+        if updated_at is None:
+            return None
+        return (updated_at,), updated_at
 
     def perform_update(self, serializer):
         """
@@ -226,15 +292,27 @@ class BookingCancelAPIView(UpdateAPIView):
         )
 
 
-class AllBookingsAPIView(ListAPIView):
+class AllBookingsAPIView(ConditionalGetMixin, FastReadMixin, ListAPIView):
     """
     View to list all bookings for the authenticated user.
 
     Permissions:
         - `IsAuthenticated` or `IsRenter`: Authenticated users or renters can view their bookings.
 
+    Conditional requests:
+        - `ConditionalGetMixin`: `ETag` and `Last-Modified` from the newest `updated_at` of the bookings
+          and their announcements, and the booking count.
+
+    Fast reads:
+        - `FastReadMixin`: The list can be rendered from `values_list()` rows.
+
+    Archive:
+        - Bookings of archived announcements are listed after the current ones.
+
     Methods:
+        - `get_conditional_state`: Returns the count and newest `updated_at` of the bookings and their announcements.
         - `get_queryset`: Returns bookings for the authenticated user.
+        - `get_archived_queryset`: Returns archived bookings for the authenticated user.
     """
     permission_classes = [IsAuthenticated | IsRenter]
     serializer_class = AllBookingsSerializer
@@ -251,9 +329,41 @@ class AllBookingsAPIView(ListAPIView):
 
         return Booking.objects.none()
 
+    def get_archived_queryset(self):
+        """
+        Return archived bookings for the authenticated user.
+
+        Returns:
+            QuerySet: A queryset of archived bookings for the current user.
+        """
+        if self.request.user.is_authenticated:
+            return ArchivedBooking.objects.filter(renter=self.request.user)
+
+        return ArchivedBooking.objects.none()
+
+    def get_conditional_state(self):
+        """
+        Describe the current version of the booking history.
+
+        Archived bookings never change, so their count is enough to describe them.
+
+        Returns:
+            tuple: The user, the count and newest `updated_at` of the bookings and of their
+                announcements, the count of archived bookings, and the newest modification as
+                the last modification time.
+        """
+        state = self.get_queryset().aggregate(
+            count=Count('id'),
+            bookings_modified=Max('updated_at'),
+            announcements_modified=Max('announcement__updated_at'),
+        )
+        archived_count = self.get_archived_queryset().count()
+        modified = [value for value in (state['bookings_modified'], state['announcements_modified']) if value]
+        return (self.request.user.pk, state['count'], archived_count, *modified), max(modified, default=None)
+
     def list(self, request, *args, **kwargs):
         """
-        Return a list of bookings for the authenticated user.
+        Return a list of current and archived bookings for the authenticated user.
 
         Args:
             request (Request): The HTTP request object.
@@ -263,10 +373,9 @@ class AllBookingsAPIView(ListAPIView):
         Returns:
             Response: The HTTP response object with a list of bookings or a message if no bookings are found.
         """
-        queryset = self.get_queryset()
-        if queryset.exists():
-            serializer = self.get_serializer(queryset, many=True)
-            return Response(serializer.data)
+        bookings = [*self.serialize_many(self.get_queryset()), *self.serialize_many(self.get_archived_queryset())]
+        if bookings:
+            return Response(bookings)
 
         return Response(
             {'message': 'You have no reservations.'},
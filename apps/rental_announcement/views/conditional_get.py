@@ -0,0 +1,74 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+class ConditionalGetMixin:
+    """
+    Mixin that answers conditional GET requests before any serialization happens.
+
+    Views describe the current version of their response with `get_conditional_state`,
+    usually a `Max('updated_at')` and a row count. From it the mixin derives a strong
+    `ETag` and a `Last-Modified` header, and returns `304 Not Modified` when the
+    `If-None-Match` or `If-Modified-Since` headers of the request still match.
+
+    Methods:
+        - `get_conditional_state`: Returns the version parts and last modification time of the response.
+        - `get`: Short-circuits with a 304 response or adds the validators to the full response.
+    """
+
+    def get_conditional_state(self):
+        """
+        Describe the current version of the GET response.
+
+        Returns:
+            tuple: The values identifying the response version and its last modification
+                datetime (or None), or None when the response has no validators.
+        """
+        raise NotImplementedError
+
+    def get_validators(self):
+        """
+        Build the ETag and Last-Modified timestamp of the GET response.
+
+        Returns:
+            tuple: The quoted strong ETag and the last modification as a Unix timestamp (or None),
+                or None when the view has no conditional state.
+        """
+        state = self.get_conditional_state()
+        if state is None:
+            return None
+
+        version, last_modified = state
+        source = '|'.join(str(part) for part in (self.request.get_host(), self.request.get_full_path(), *version))
+        etag = '"%s"' % hashlib.sha1(source.encode('utf-8')).hexdigest()
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+        return etag, timestamp
+
+    def get(self, request, *args, **kwargs):
+        """
+        Handle GET requests with support for `If-None-Match` and `If-Modified-Since`.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: A 304 response if the client copy is current, otherwise the full response.
+        """
+        validators = self.get_validators()
+        if validators is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+        return response
@@ -0,0 +1,70 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import ListAPIView, RetrieveUpdateAPIView
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
+
+from apps.rental_announcement.choices.duplicate_status import DuplicateStatus
+from apps.rental_announcement.models import DuplicateListing
+from apps.rental_announcement.pagination import DuplicateListingCursorPagination
+from apps.rental_announcement.serializers.duplicate_serializers import DuplicateListingSerializer
+
+
+class DuplicateListingListAPIView(ListAPIView):
+    """
+    View to page through the suspected duplicate listings for moderation.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+        - `IsAdminUser`: Only staff users can access this view.
+
+    Pagination:
+        - `DuplicateListingCursorPagination`: Newest flags first.
+
+    Query Parameters:
+        - `status`: The moderation status to list, `Pending` by default.
+
+    Methods:
+        - `get_queryset`: Returns the flags of the requested status with both announcements.
+    """
+    serializer_class = DuplicateListingSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+    pagination_class = DuplicateListingCursorPagination
+
+    def get_queryset(self):
+        """
+        Return the flags of the requested moderation status.
+
+        Returns:
+            QuerySet: A queryset of flags with both announcements joined.
+
+        Raises:
+            ValidationError: If the status is unknown.
+        """
+        status = self.request.query_params.get('status', DuplicateStatus.PENDING.value)
+        if status not in {choice.value for choice in DuplicateStatus}:
+            raise ValidationError({'status': f'Unknown status "{status}".'})
+        return (DuplicateListing.objects.filter(status=status)
+                .select_related('announcement', 'original'))
+
+
+class DuplicateListingRetrieveUpdateAPIView(RetrieveUpdateAPIView):
+    """
+    View to retrieve a suspected duplicate listing and set its moderation status.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+        - `IsAdminUser`: Only staff users can access this view.
+
+    Methods:
+        - `get_queryset`: Returns all flags with both announcements.
+    """
+    serializer_class = DuplicateListingSerializer
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    def get_queryset(self):
+        """
+        Return all duplicate flags.
+
+        Returns:
+            QuerySet: A queryset of flags with both announcements joined.
+        """
+        return DuplicateListing.objects.select_related('announcement', 'original')
@@ -0,0 +1,78 @@
+from django.conf import settings
+from rest_framework.response import Response
+
+from apps.rental_announcement.serializers.fast_read import get_values_serializer
+
+
+class FastReadMixin:
+    """
+    Mixin that serves list GET requests from `values_list()` rows instead of model instances.
+
+    When the `FAST_READ_SERIALIZERS` setting is enabled, `list` renders the rows with the
+    compiled `ValuesSerializer` of the view's serializer class. The response is identical to
+    the `ModelSerializer` path, which is still used for every other request.
+
+    Methods:
+        - `get_values_serializer`: Returns the values serializer for the request, or None.
+        - `get_values_columns`: Returns additional columns the list needs, e.g. sort keys.
+        - `serialize_many`: Serializes a queryset through whichever path applies.
+        - `list`: Lists the objects through the values serializer when it applies.
+    """
+    values_columns = ()
+
+    def get_values_serializer(self):
+        """
+        Return the values serializer for the request.
+
+        Returns:
+            ValuesSerializer: The compiled serializer, or None when the fast path does not apply.
+        """
+        if not getattr(settings, 'FAST_READ_SERIALIZERS', False) or self.request.method != 'GET':
+            return None
+        return get_values_serializer(self.get_serializer_class())
+
+    def get_values_columns(self):
+        """
+        Return the columns read in addition to the serialized fields.
+
+        Returns:
+            iterable: Column or annotation names.
+        """
+        return self.values_columns
+
+    def serialize_many(self, queryset):
+        """
+        Serialize every object of the queryset, without pagination.
+
+        Args:
+            queryset (QuerySet): The objects to serialize.
+
+        Returns:
+            list: The serialized objects.
+        """
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return self.get_serializer(queryset, many=True).data
+        return values_serializer.represent(values_serializer.plan(queryset, self.get_values_columns()))
+
+    def list(self, request, *args, **kwargs):
+        """
+        List the objects, from `values_list()` rows when the fast path applies.
+
+        Args:
+            request (Request): The HTTP request object.
+            *args: Additional positional arguments.
+            **kwargs: Additional keyword arguments.
+
+        Returns:
+            Response: The HTTP response object with the serialized objects.
+        """
+        values_serializer = self.get_values_serializer()
+        if values_serializer is None:
+            return super().list(request, *args, **kwargs)
+
+        queryset = values_serializer.plan(self.filter_queryset(self.get_queryset()), self.get_values_columns())
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(values_serializer.represent(page))
+        return Response(values_serializer.represent(queryset))
@@ -0,0 +1,80 @@
+from django.shortcuts import get_object_or_404
+from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.rental_announcement.models import Announcement, RateRule
+from apps.rental_announcement.serializers.pricing_serializers import RateRuleSerializer
+from apps.users.permissions import IsLessor
+
+
+class RateRuleListCreateAPIView(ListCreateAPIView):
+    """
+    View to list and create the rate rules of an announcement of the authenticated lessor.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+        - `IsLessor`: Only users with the 'lessor' role can access this view.
+
+    Methods:
+        - `get_announcement`: Returns the announcement in the URL if the lessor owns it.
+        - `get_queryset`: Returns the rate rules of the announcement.
+        - `perform_create`: Attaches the rule to the announcement.
+    """
+    serializer_class = RateRuleSerializer
+    permission_classes = [IsAuthenticated, IsLessor]
+
+    def get_announcement(self):
+        """
+        Return the announcement in the URL.
+
+        Returns:
+            Announcement: The announcement, owned by the current user.
+
+        Raises:
+            Http404: If the current user owns no announcement with the given primary key.
+        """
+        return get_object_or_404(Announcement.objects.only('id'), pk=self.kwargs['pk'], owner=self.request.user)
+
+    def get_queryset(self):
+        """
+        Return the rate rules of the announcement in the URL.
+
+        Returns:
+            QuerySet: A queryset of rate rules.
+        """
+        return RateRule.objects.filter(announcement=self.get_announcement())
+
+    def perform_create(self, serializer):
+        """
+        Save the rule for the announcement in the URL.
+
+        Args:
+            serializer (serializers.ModelSerializer): The serializer instance.
+        """
+        serializer.save(announcement=self.get_announcement())
+
+
+class RateRuleRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+    """
+    View to retrieve, update, or delete a rate rule of an announcement of the authenticated lessor.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+        - `IsLessor`: Only users with the 'lessor' role can access this view.
+
+    Methods:
+        - `get_queryset`: Returns the rate rules of the lessor's announcements.
+    """
+    serializer_class = RateRuleSerializer
+    permission_classes = [IsAuthenticated, IsLessor]
+
+    def get_queryset(self):
+        """
+        Return the rate rules of the announcements owned by the current user.
+
+        Returns:
+            QuerySet: A queryset of rate rules.
+        """
+        if self.request.user.is_authenticated:
+            return RateRule.objects.filter(announcement__owner=self.request.user)
+        return RateRule.objects.none()
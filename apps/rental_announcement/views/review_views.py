@@ -1,9 +1,13 @@
-from rest_framework.generics import CreateAPIView, RetrieveUpdateDestroyAPIView, get_object_or_404
+from django.db import transaction
+from django.http import Http404
+from rest_framework.generics import CreateAPIView, ListAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
 
 from apps.rental_announcement.serializers import ReviewCreateSerializer
 from apps.rental_announcement.serializers.review_list_serializer import ReviewListSerializer
-from apps.rental_announcement.models import Review
+from apps.rental_announcement.models import Announcement, ArchivedAnnouncement, ArchivedReview, Review
+from apps.rental_announcement.pagination import ReviewCursorPagination
+from apps.rental_announcement.views.archive_fallback import ArchiveFallbackMixin
 from apps.users.permissions import IsRenter, IsLessor
 
 
@@ -32,7 +36,50 @@ class ReviewListCreateAPIView(CreateAPIView):
         return Review.objects.filter(user=self.request.user)
 
 
-class ReviewRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+class AnnouncementReviewListAPIView(ListAPIView):
+    """
+    View to page through all reviews of an announcement, newest first.
+
+    The announcement detail embeds the newest reviews and links here with a cursor
+    positioned after the last embedded one.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Archive:
+        - Reviews of archived announcements are read from the archive tables.
+
+    Methods:
+        - `get_queryset`: Returns the reviews of the announcement with their authors and its title.
+    """
+    serializer_class = ReviewListSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = ReviewCursorPagination
+
+    def get_queryset(self):
+        """
+        Return the reviews of the announcement in the URL.
+
+        Returns:
+            QuerySet: A queryset of the reviews with users and the announcement title joined.
+
+        Raises:
+            Http404: If neither a current nor an archived announcement has the given primary key.
+        """
+        announcement_id = self.kwargs['pk']
+        if Announcement.objects.filter(pk=announcement_id).exists():
+            model = Review
+        elif ArchivedAnnouncement.objects.filter(pk=announcement_id).exists():
+            model = ArchivedReview
+        else:
+            raise Http404
+        return (model.objects.filter(announcement_id=announcement_id)
+                .select_related('user', 'announcement')
+                .only('id', 'user', 'message', 'grade', 'created_at', 'user__name', 'user__surname',
+                      'user__phone', 'announcement__title'))
+
+
+class ReviewRetrieveUpdateDestroyAPIView(ArchiveFallbackMixin, RetrieveUpdateDestroyAPIView):
     """
     View to retrieve, update, or delete a specific review.
 
@@ -40,9 +87,15 @@ class ReviewRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         - `IsAuthenticated` or `IsRenter` or `IsLessor`: Only authenticated users,
            renters, or lessors can access this view.
 
+    Archive:
+        - `ArchiveFallbackMixin`: Reads of reviews of archived announcements are answered from the archive.
+
     Methods:
         - `get_queryset`: Returns reviews created by the current user.
         - `get_object`: Retrieves the review instance or returns 404 if not found.
+        - `get_archived_queryset`: Returns all archived reviews.
+        - `perform_update`: Saves the review and moves its grade in the announcement rating aggregates.
+        - `perform_destroy`: Deletes the review and removes its grade from the announcement rating aggregates.
     """
     serializer_class = ReviewListSerializer
     permission_classes = [IsAuthenticated | IsRenter | IsLessor]
@@ -60,7 +113,7 @@ class ReviewRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
 
     def get_object(self):
         """
-        Retrieve the review instance by primary key.
+        Retrieve the review instance by primary key, or the archived review on reads.
 
         Returns:
             Review: The review instance with the given primary key.
@@ -68,4 +121,44 @@ class ReviewRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
         Raises:
             Http404: If no review is found with the given primary key.
         """
-        return get_object_or_404(Review, pk=self.kwargs['pk'])
+        return self.get_object_or_archived(Review.objects.all())
+
+    def get_archived_queryset(self):
+        """
+        Return all archived reviews, readable like the current ones.
+
+        Returns:
+            QuerySet: A queryset of archived reviews.
+        """
+        return ArchivedReview.objects.all()
+
+    def perform_update(self, serializer):
+        """
+        Save the review and update the rating aggregates of its announcement.
+
+        The aggregates are written even when the grade is unchanged, so the announcement
+        `updated_at` also reflects edits of the review message. The replaced grade is read
+        from the locked review row rather than from the instance loaded before the
+        transaction, so a concurrent edit of the same review is not removed twice.
+
+        Args:
+            serializer (serializers.ModelSerializer): The serializer instance.
+        """
+        with transaction.atomic():
+            old_grade = (Review.objects.select_for_update()
+                         .values_list('grade', flat=True)
+                         .get(pk=serializer.instance.pk))
+            review = serializer.save()
+            Announcement.update_rating(review.announcement_id, removed_grade=old_grade, added_grade=review.grade)
+
+    def perform_destroy(self, instance):
+        """
+        Delete the review and remove its grade from the rating aggregates of its announcement.
+
+        Args:
+            instance (Review): The review instance to delete.
+        """
+        with transaction.atomic():
+            announcement_id, grade = instance.announcement_id, instance.grade
+            instance.delete()
+            Announcement.update_rating(announcement_id, removed_grade=grade)
@@ -0,0 +1,111 @@
+from rest_framework.generics import ListAPIView, ListCreateAPIView, RetrieveUpdateDestroyAPIView
+from rest_framework.permissions import IsAuthenticated
+
+from apps.rental_announcement.models import SavedSearch, SearchMatch
+from apps.rental_announcement.pagination import SearchMatchCursorPagination
+from apps.rental_announcement.serializers.saved_search_serializers import SavedSearchSerializer, SearchMatchSerializer
+
+
+class SavedSearchListCreateAPIView(ListCreateAPIView):
+    """
+    View to list and create the saved searches of the current user.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Methods:
+        - `get_queryset`: Returns the active saved searches of the current user.
+        - `perform_create`: Sets the user of the saved search to the current user.
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Return the active saved searches of the current user, newest first.
+
+        Returns:
+            QuerySet: A queryset of saved searches.
+        """
+        return SavedSearch.objects.filter(user=self.request.user, is_active=True)
+
+    def perform_create(self, serializer):
+        """
+        Save the search for the current user.
+
+        Args:
+            serializer (serializers.ModelSerializer): The serializer instance.
+        """
+        serializer.save(user=self.request.user)
+
+
+class SavedSearchRetrieveUpdateDestroyAPIView(RetrieveUpdateDestroyAPIView):
+    """
+    View to retrieve, update, or delete a saved search of the current user.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Matching:
+        - Changed criteria apply to announcements saved afterwards; earlier matches are kept.
+
+    Methods:
+        - `get_queryset`: Returns the active saved searches of the current user.
+        - `perform_destroy`: Deactivates the saved search.
+    """
+    serializer_class = SavedSearchSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        """
+        Return the active saved searches of the current user.
+
+        Returns:
+            QuerySet: A queryset of saved searches.
+        """
+        if self.request.user.is_authenticated:
+            return SavedSearch.objects.filter(user=self.request.user, is_active=True)
+        return SavedSearch.objects.none()
+
+    def perform_destroy(self, instance):
+        """
+        Deactivate the saved search instead of deleting it, so the matchers of all processes
+        drop it on their next sync and its matches stay listed.
+
+        Args:
+            instance (SavedSearch): The saved search to delete.
+        """
+        instance.is_active = False
+        instance.save(update_fields=['is_active', 'updated_at'])
+
+
+class SearchMatchListAPIView(ListAPIView):
+    """
+    View to page through the announcements matching the saved searches of the current user.
+
+    Permissions:
+        - `IsAuthenticated`: Only authenticated users can access this view.
+
+    Pagination:
+        - `SearchMatchCursorPagination`: Newest matches first.
+
+    Methods:
+        - `get_queryset`: Returns the matches of the current user with their announcements.
+    """
+    serializer_class = SearchMatchSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = SearchMatchCursorPagination
+
+    def get_queryset(self):
+        """
+        Return the matches of the current user.
+
+        Returns:
+            QuerySet: A queryset of matches with the saved search and the announcement
+                address joined.
+        """
+        return (SearchMatch.objects.filter(user=self.request.user)
+                .select_related('saved_search', 'announcement__address')
+                .only('id', 'saved_search', 'announcement', 'created_at', 'notified_at', 'saved_search__name',
+                      'announcement__title', 'announcement__price', 'announcement__rooms',
+                      'announcement__type_of_object', 'announcement__address__city'))
@@ -120,6 +120,45 @@ DATABASES = {
 }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# CACHE_URL examples: "rediscache://127.0.0.1:6379/1", "pymemcache://127.0.0.1:11211",
+# "filecache:///var/tmp/stayindeutschland_cache". The search cache generation and its hit/miss
+# counters live in this cache, so every worker and management command must share it; the
+# default file cache is shared by the processes of one host. "locmemcache://" is private to
+# each process and only suits a single-process development server.
+
+CACHES = {
+    'default': env.cache('CACHE_URL', default=f'filecache://{BASE_DIR / "var" / "cache"}'),
+}
+
+ANNOUNCEMENT_SEARCH_CACHE_TIMEOUT = env.int('ANNOUNCEMENT_SEARCH_CACHE_TIMEOUT', default=60)
+
+# Changes younger than this are held back from the delta feed until concurrent writes have committed.
+ANNOUNCEMENT_FEED_SETTLE_SECONDS = env.int('ANNOUNCEMENT_FEED_SETTLE_SECONDS', default=5)
+
+# Render the high-volume list endpoints from values_list() rows instead of model instances.
+FAST_READ_SERIALIZERS = env.bool('FAST_READ_SERIALIZERS', default=False)
+
+# Announcement views are buffered per process and written in batches this often; 0 disables the flusher thread.
+ANNOUNCEMENT_VIEW_FLUSH_SECONDS = env.int('ANNOUNCEMENT_VIEW_FLUSH_SECONDS', default=10)
+
+# Views lose half of their weight in the trending score after this many hours.
+ANNOUNCEMENT_TRENDING_HALF_LIFE_HOURS = env.float('ANNOUNCEMENT_TRENDING_HALF_LIFE_HOURS', default=24)
+
+# The in-memory city and street autocomplete indexes are rebuilt in the background after changes
+# at most this often, and after the maximum age in any case; 0 rebuilds them within the lookup.
+ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS = env.int('ADDRESS_AUTOCOMPLETE_REBUILD_SECONDS', default=60)
+ADDRESS_AUTOCOMPLETE_MAX_AGE_SECONDS = env.int('ADDRESS_AUTOCOMPLETE_MAX_AGE_SECONDS', default=900)
+
+# The complete GeoNames postal code dump of Germany (DE.zip from https://download.geonames.org/export/zip/),
+# copied onto the host once; load_postal_codes geocodes from it offline and falls back to the bundled CSV.
+POSTAL_CODES_FILE = env.str('POSTAL_CODES_FILE', default=str(BASE_DIR / 'var' / 'DE.zip'))
+
+# Memory-mapped feature matrix behind the similar announcements, shared by all workers of a host.
+SIMILAR_LISTINGS_INDEX_PATH = env.str('SIMILAR_LISTINGS_INDEX_PATH', default=str(BASE_DIR / 'var' / 'similar_listings.npy'))
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
 